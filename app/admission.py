@@ -0,0 +1,266 @@
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+from fastapi import HTTPException, Request
+from app.metrics import HTTP_REQUESTS_REJECTED
+from config.admission_config import AdmissionSettings
+
+
+logger = logging.getLogger('fastapi_logger')
+
+# Token bucket update run atomically by the shared store: refills the bucket from the server clock, takes a token if there is one,
+# and returns the seconds to wait for the next token (0 when the request is admitted); 'replicate_commands' lets Redis < 7 write
+# after reading the clock
+TOKEN_BUCKET_SCRIPT = """
+redis.replicate_commands()
+local rate, burst = tonumber(ARGV[1]), tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = math.min(burst, (tonumber(state[1]) or burst) + math.max(0, now - (tonumber(state[2]) or now)) * rate)
+local wait = 0
+if tokens >= 1 then tokens = tokens - 1 else wait = (1 - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+
+
+class TokenBuckets:
+    """
+    Class Overview:
+    Per-client token buckets kept in process: each client may send 'burst' requests at once, then 'rate' requests per second.
+
+    Function Logic:
+    1. A bucket is refilled lazily, from the time elapsed since it was last used, whenever its client sends a request.
+    2. Buckets are kept in least recently used order; beyond 'max_clients' the least recently seen client is dropped (and starts
+       again with a full bucket), so the memory used stays bounded whatever the number of clients.
+
+    Parameters:
+    rate (float): Tokens added to a bucket per second.
+    burst (int): Capacity of a bucket.
+    max_clients (int): Buckets kept before evicting.
+    """
+    def __init__(self, rate: float, burst: int, max_clients: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+
+    async def take(self, key: str) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(self.burst), now]
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / self.rate
+
+
+    async def close(self) -> None:
+        pass
+
+
+    def stats(self) -> dict:
+        return {"clients": len(self._buckets)}
+
+
+
+
+class RedisTokenBuckets:
+    """
+    Class Overview:
+    Per-client token buckets stored on a Redis-compatible server, so a client's rate is shared by every worker and instance.
+
+    Function Logic:
+    1. Every request runs a single Lua script, which refills and takes from the bucket atomically using the server's clock.
+    2. Idle buckets expire once they would be full again.
+    3. The 'redis' package is an optional dependency and is only imported when this backend is configured.
+
+    Parameters:
+    url (str): Connection URL of the Redis-compatible server.
+    rate (float): Tokens added to a bucket per second.
+    burst (int): Capacity of a bucket.
+    """
+    def __init__(self, url: str, rate: float, burst: int):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("The 'redis' package is required when RATE_LIMIT_REDIS_URL is set.") from e
+        self.rate = rate
+        self.burst = burst
+        self._redis = redis.from_url(url)
+        self._script = self._redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+
+    async def take(self, key: str) -> float:
+        return float(await self._script(keys=[f"rate_limit:{key}"], args=[self.rate, self.burst]))
+
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+    def stats(self) -> dict:
+        return {}
+
+
+
+
+class RouteLimiter:
+    """
+    Class Overview:
+    Caps the requests a route handles at once, with a bounded queue of requests waiting for a slot.
+
+    Function Logic:
+    1. A request takes a free slot immediately; otherwise it joins the queue, in arrival order.
+    2. A request is refused at once when the queue is full, and after 'timeout' seconds if no slot was freed meanwhile,
+       so a spike is shed quickly instead of piling up latency for every request behind it.
+
+    Parameters:
+    limit (int): Requests handled at once.
+    queue_size (int): Requests allowed to wait for a slot.
+    timeout (float): Seconds a request may wait for a slot.
+    """
+    def __init__(self, limit: int, queue_size: int, timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self.queued = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+
+    async def acquire(self) -> Optional[str]:
+        # Returns None once a slot is taken, or the reason the request is refused ('queue_full' or 'queue_timeout')
+        if self._semaphore.locked():
+            if self.queued >= self.queue_size:
+                return "queue_full"
+            self.queued += 1
+            try:
+                async with asyncio.timeout(self.timeout):
+                    await self._semaphore.acquire()
+            except TimeoutError:
+                return "queue_timeout"
+            finally:
+                self.queued -= 1
+        else:
+            await self._semaphore.acquire()
+        self.active += 1
+        return None
+
+
+    def release(self) -> None:
+        self.active -= 1
+        self._semaphore.release()
+
+
+
+
+class AdmissionController:
+    """
+    Class Overview:
+    Admission control applied by LoggingRoute to every API request before any work is done for it (body parsing, dependencies, queries).
+
+    Function Logic:
+    1. Per-client rate limit: each client (its address, or the 'X-Forwarded-For' address added by the outermost of the
+       'trusted_proxies' proxies, since the client controls the entries before it) has a token
+       bucket; a request finding it empty is rejected with '429 Too Many Requests' and a 'Retry-After' header telling when the next
+       token arrives. Buckets are held per worker, or in the optional shared store so the rate applies across workers.
+    2. Per-route concurrency cap: each route ('<METHOD> <route template>') handles at most its cap of requests at once in a worker,
+       so one endpoint (e.g. a burst of '/users/create') cannot take every database connection; requests beyond the cap wait in a
+       bounded queue and are rejected with '503 Service Unavailable' and a 'Retry-After' header when it is full or they time out.
+    3. If the shared store fails, requests are admitted and a warning is logged, so an outage of the store never takes the API down.
+    4. Rejections are counted in the '/metrics' registry by route and reason.
+
+    Parameters:
+    settings (AdmissionSettings): The rate limit, concurrency caps and queue settings.
+    """
+    def __init__(self, settings: AdmissionSettings):
+        self.settings = settings
+        self.buckets = None
+        if settings.rate > 0:
+            self.buckets = (
+                RedisTokenBuckets(settings.redis_url, settings.rate, settings.burst) if settings.redis_url
+                else TokenBuckets(settings.rate, settings.burst, settings.max_clients)
+                )
+        self._routes: Dict[str, Optional[RouteLimiter]] = {}
+
+
+    def client_key(self, request: Request) -> str:
+        if self.settings.trust_forwarded:
+            forwarded = [address.strip() for address in request.headers.get("x-forwarded-for", "").split(",") if address.strip()]
+            if forwarded:
+                return forwarded[-min(self.settings.trusted_proxies, len(forwarded))]
+        return request.client.host if request.client else "unknown"
+
+
+    def _limiter(self, route_key: str) -> Optional[RouteLimiter]:
+        if route_key not in self._routes:
+            limit = self.settings.route_limits.get(route_key, self.settings.route_concurrency)
+            self._routes[route_key] = RouteLimiter(limit, self.settings.queue_size, self.settings.queue_timeout) if limit > 0 else None
+        return self._routes[route_key]
+
+
+    async def _wait_for_token(self, request: Request) -> float:
+        try:
+            return await self.buckets.take(self.client_key(request))
+        except Exception as e:
+            logger.warning("Tag: Admission - Rate limit store failed, admitting the request: [%s]", e)
+            return 0.0
+
+
+    @asynccontextmanager
+    async def admit(self, request: Request, route: str) -> AsyncIterator[None]:
+        """
+        Function Overview:
+        Admits a request for the duration of the block, or raises the HTTPException rejecting it.
+
+        Parameters:
+        request (Request): The incoming request.
+        route (str): The route template that matched the request (e.g. '/users/{id}').
+        """
+        if self.buckets is not None:
+            wait = await self._wait_for_token(request)
+            if wait > 0:
+                HTTP_REQUESTS_REJECTED.inc(request.method, route, "rate_limited")
+                raise HTTPException(status_code=429, detail="Too many requests, retry later.", headers={"Retry-After": str(max(1, math.ceil(wait)))})
+
+        limiter = self._limiter(f"{request.method} {route}")
+        if limiter is None:
+            yield
+            return
+        refused = await limiter.acquire()
+        if refused:
+            HTTP_REQUESTS_REJECTED.inc(request.method, route, refused)
+            raise HTTPException(status_code=503, detail="Server busy, retry later.", headers={"Retry-After": str(max(1, math.ceil(limiter.timeout)))})
+        try:
+            yield
+        finally:
+            limiter.release()
+
+
+    async def close(self) -> None:
+        if self.buckets is not None:
+            await self.buckets.close()
+
+
+    def stats(self) -> dict:
+        return {
+            "rate_limit": self.buckets.stats() if self.buckets is not None else None,
+            "routes": {route: {"limit": limiter.limit, "active": limiter.active, "queued": limiter.queued} for route, limiter in self._routes.items() if limiter},
+            }
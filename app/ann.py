@@ -0,0 +1,475 @@
+import asyncio
+import json
+import logging
+import os
+import shutil
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from scipy import sparse
+from app.features import LOCK_FILE, Featurizer, StoreLockedError
+from app.locks import try_lock
+from config.ann_config import AnnSettings
+
+
+logger = logging.getLogger('fastapi_logger')
+
+# Non-zero entries per term of the random projection, and the seed of its hash functions (fixed so every process and restart agree)
+PROJECTION_NONZEROS = 4
+SEED = 20240101
+
+# Index metadata (the featurized rows covered by the saved segments, and their names) and the directory of the segments
+META_FILE = "meta.json"
+SEGMENTS_DIRECTORY = "segments"
+SEGMENT_ARRAYS = ("vectors", "ids", "times", "offsets", "centroids", "order")
+
+# Featurized rows projected at once when the index catches up with the featurizer
+CATCH_UP_CHUNK = 4096
+
+# Lloyd iterations of the k-means run when a segment is frozen, and vectors sampled per list to train it
+KMEANS_ITERATIONS = 8
+KMEANS_SAMPLE_PER_LIST = 64
+
+_MULTIPLIERS = np.random.default_rng(SEED).integers(1, 2 ** 63, size=PROJECTION_NONZEROS, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+
+
+
+
+def project(matrix: sparse.csr_matrix, dimensions: int) -> np.ndarray:
+    """
+    Function Overview:
+    Projects TF-IDF vectors to dense L2-normalized embeddings with a very sparse random projection.
+
+    Function Logic:
+    1. Every term is mapped to PROJECTION_NONZEROS dimensions with random signs, derived from hashes of its column, so the projection
+       needs no stored matrix and no fitting, and is the same in every process.
+    2. The contributions of all the values of the batch are summed with a single 'np.bincount' over '(row, dimension)' keys; inner
+       products (the cosine similarities of the TF-IDF vectors) are preserved in expectation.
+
+    Parameters:
+    matrix (sparse.csr_matrix): The TF-IDF vectors.
+    dimensions (int): The dimensions of the embeddings.
+
+    Returns:
+    np.ndarray: '(rows, dimensions)' float32 embeddings (zero for an empty vector).
+    """
+    count = matrix.shape[0]
+    rows = np.repeat(np.arange(count, dtype=np.int64), np.diff(matrix.indptr))
+    hashed = (matrix.indices.astype(np.uint64)[:, None] + np.uint64(1)) * _MULTIPLIERS[None, :]
+    columns = ((hashed >> np.uint64(32)) % np.uint64(dimensions)).astype(np.int64)
+    signs = np.where(hashed & np.uint64(1 << 31), 1.0, -1.0)
+    embeddings = np.bincount(
+        (rows[:, None] * dimensions + columns).ravel(),
+        weights = (matrix.data[:, None] * signs).ravel(),
+        minlength = count * dimensions,
+        ).reshape(count, dimensions)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return (embeddings / np.where(norms > 0, norms, 1)).astype(np.float32)
+
+
+
+
+def _kmeans(vectors: np.ndarray, lists: int, generator: np.random.Generator) -> np.ndarray:
+    # Spherical k-means (on cosine similarity) over a sample of the vectors, starting from random vectors of the sample
+    sample = vectors[np.sort(generator.choice(len(vectors), size=min(len(vectors), lists * KMEANS_SAMPLE_PER_LIST), replace=False))]
+    centroids = sample[generator.choice(len(sample), size=lists, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assigned = np.argmax(sample @ centroids.T, axis=1)
+        members = sparse.csr_matrix((np.ones(len(sample), dtype=np.float32), (assigned, np.arange(len(sample)))), shape=(lists, len(sample)))
+        sums = np.asarray(members @ sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = np.where(norms > 0, sums / np.where(norms > 0, norms, 1), centroids).astype(np.float32)
+    return centroids
+
+
+
+
+def _top(ids: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    if len(scores) > k:
+        best = np.argpartition(-scores, k - 1)[:k]
+        return ids[best], scores[best]
+    return ids, scores
+
+
+
+
+class _Segment:
+    """
+    Class Overview:
+    Immutable part of the index: the embeddings of 'segment_size' articles, grouped by the inverted list (k-means cluster) they
+    belong to and saved as '.npy' files, memory-mapped when loaded.
+
+    Attributes:
+    vectors (np.ndarray): '(n, dimensions)' float32 embeddings, sorted by list.
+    ids (np.ndarray): The article ID of every embedding.
+    times (np.ndarray): When every article was stored (its time in the featurizer's store), in seconds since the epoch.
+    offsets (np.ndarray): '(lists + 1,)' the first row of every list.
+    centroids (np.ndarray): '(lists, dimensions)' the normalized centroid of every list.
+    order (np.ndarray): The rows sorted by article ID, to find an article with a binary search.
+    """
+    def __init__(self, path: str, arrays: Dict[str, np.ndarray]):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.vectors, self.ids, self.times = arrays["vectors"], arrays["ids"], arrays["times"]
+        self.offsets, self.centroids, self.order = arrays["offsets"], arrays["centroids"], arrays["order"]
+        self.oldest = float(self.times.min()) if len(self.times) else 0.0
+        self.newest = float(self.times.max()) if len(self.times) else 0.0
+
+
+    @classmethod
+    def build(cls, path: str, ids: np.ndarray, vectors: np.ndarray, times: np.ndarray, lists: int) -> "_Segment":
+        """
+        Function Overview:
+        Clusters the embeddings into lists with k-means, writes the segment's files (into a temporary directory renamed once
+        complete) and loads it back memory-mapped.
+        """
+        lists = max(1, min(lists, len(ids) // KMEANS_SAMPLE_PER_LIST))
+        centroids = _kmeans(vectors, lists, np.random.default_rng(SEED))
+        assigned = np.argmax(vectors @ centroids.T, axis=1)
+        rows = np.argsort(assigned, kind="stable")
+        offsets = np.zeros(lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assigned, minlength=lists), out=offsets[1:])
+        arrays = {"vectors": vectors[rows], "ids": ids[rows], "times": times[rows], "offsets": offsets, "centroids": centroids}
+        arrays["order"] = np.argsort(arrays["ids"], kind="stable").astype(np.int32)
+
+        temporary = f"{path}.tmp"
+        shutil.rmtree(temporary, ignore_errors=True)
+        os.makedirs(temporary)
+        for name, array in arrays.items():
+            np.save(os.path.join(temporary, f"{name}.npy"), array)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(temporary, path)
+        return cls.load(path)
+
+
+    @classmethod
+    def load(cls, path: str) -> "_Segment":
+        return cls(path, {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in SEGMENT_ARRAYS})
+
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in (self.vectors, self.ids, self.times, self.offsets, self.centroids, self.order))
+
+
+    def find(self, id: int) -> Optional[np.ndarray]:
+        position = int(np.searchsorted(self.ids, id, sorter=self.order))
+        if position < len(self.order) and self.ids[self.order[position]] == id:
+            return np.array(self.vectors[self.order[position]])
+        return None
+
+
+    def search(self, query: np.ndarray, k: int, probes: int, horizon: float) -> Tuple[np.ndarray, np.ndarray]:
+        # The best 'k' articles of the 'probes' lists whose centroids are the most similar to the query
+        # Every list is a contiguous slice of the segment, scored without copying its vectors
+        lists = len(self.centroids)
+        nearest = np.argpartition(-(self.centroids @ query), probes - 1)[:probes] if probes < lists else range(lists)
+        slices = [slice(self.offsets[index], self.offsets[index + 1]) for index in nearest]
+        ids = np.concatenate([self.ids[rows] for rows in slices])
+        scores = np.concatenate([self.vectors[rows] @ query for rows in slices])
+        if self.oldest < horizon:
+            live = np.concatenate([self.times[rows] >= horizon for rows in slices])
+            ids, scores = ids[live], scores[live]
+        return _top(ids, scores, k)
+
+
+
+
+class _ActiveSegment:
+    """
+    Class Overview:
+    Mutable part of the index: the latest embeddings, searched exhaustively until 'capacity' are gathered and frozen into a _Segment.
+    """
+    def __init__(self, capacity: int, dimensions: int):
+        self.vectors = np.empty((capacity, dimensions), dtype=np.float32)
+        self.ids = np.empty(capacity, dtype=np.int64)
+        self.times = np.empty(capacity, dtype=np.float64)
+        self.size = 0
+        self.positions: Dict[int, int] = {}
+
+
+    def __len__(self) -> int:
+        return self.size
+
+
+    @property
+    def full(self) -> bool:
+        return self.size == len(self.ids)
+
+
+    def add(self, ids: np.ndarray, vectors: np.ndarray, times: np.ndarray) -> None:
+        end = self.size + len(ids)
+        self.vectors[self.size:end], self.ids[self.size:end], self.times[self.size:end] = vectors, ids, times
+        self.positions.update(zip(ids.tolist(), range(self.size, end)))
+        self.size = end
+
+
+    def tail(self, kept: int, extra: int) -> "_ActiveSegment":
+        # A copy holding the last 'kept' rows, with room for 'extra' more (readers replace their segment instead of changing it)
+        copy = _ActiveSegment(kept + extra, self.vectors.shape[1])
+        copy.add(self.ids[self.size - kept:self.size], self.vectors[self.size - kept:self.size], self.times[self.size - kept:self.size])
+        return copy
+
+
+    def find(self, id: int) -> Optional[np.ndarray]:
+        position = self.positions.get(id)
+        return None if position is None else self.vectors[position].copy()
+
+
+    def search(self, query: np.ndarray, k: int, horizon: float) -> Tuple[np.ndarray, np.ndarray]:
+        live = self.times[:self.size] >= horizon
+        return _top(self.ids[:self.size][live], self.vectors[:self.size][live] @ query, k)
+
+
+
+
+class ArticleIndex:
+    """
+    Class Overview:
+    Approximate nearest-neighbour index of article embeddings (IVF), answering "more like this" queries over the articles
+    stored in the last 'window' seconds.
+
+    Function Logic:
+    1. Embeddings are random projections ('project') of the articles' TF-IDF vectors to 'dimensions' dense values. The writer
+       catches up with the featurizer's store after every ingested batch, projecting the rows it has not indexed yet.
+    2. New embeddings go to an active segment searched exhaustively. Once it holds 'segment_size' articles it is frozen in a thread:
+       its embeddings are clustered into 'lists' inverted lists with k-means, so a query only scans the 'probes' lists closest to it
+       in every segment. Every segment has its own centroids, so none is ever retrained and the lists follow the news of their time.
+    3. Frozen segments are saved as '.npy' files under 'directory' and loaded memory-mapped, so a worker starting (or a reader
+       picking up a new segment) maps them in milliseconds instead of reading or rebuilding them, and all workers share the page cache.
+       'meta.json' lists the saved segments and the featurized rows they cover; the active segment is rebuilt from the featurizer's
+       store after a restart.
+    4. Articles stored more than 'window' seconds ago are left out of the results, and segments whose newest article expired are
+       deleted whole. The time of every article is the one kept in the featurizer's store, so rows indexed again (after a restart,
+       by a reader or into a new index) keep the age they had.
+    5. The writer runs in the process featurizing articles and holds an exclusive lock on the directory while open (raising
+       StoreLockedError if another process does); other workers open the index 'readonly', even before the writer created the
+       directory. Every 'refresh_interval' seconds ('refresh') they reload the segment list and project the rows featurized after
+       the saved segments (the writer's active segment, which is not saved) from their read-only featurizer into an active segment
+       of their own, so every worker finds the latest articles.
+
+    Parameters:
+    settings (AnnSettings): The directory, embedding, segment and search settings.
+    readonly (bool): Whether this process only reads the segments saved by the writer.
+    featurizer (Optional[Featurizer]): The read-only featurizer readers index the unsaved rows from (without it, they only see the
+        saved segments).
+    """
+    def __init__(self, settings: AnnSettings, readonly: bool = False, featurizer: Optional[Featurizer] = None):
+        self.settings = settings
+        self.readonly = readonly
+        self.featurizer = featurizer
+        self.segments_directory = os.path.join(settings.directory, SEGMENTS_DIRECTORY)
+        self.meta_path = os.path.join(settings.directory, META_FILE)
+        self.segments: List[_Segment] = []
+        self.active = _ActiveSegment(0 if readonly else settings.segment_size, settings.dimensions)
+        self.sealing: Optional[_ActiveSegment] = None
+        self.position = 0
+        self._lock = asyncio.Lock()
+        self._meta_mtime: Optional[float] = None
+        self._checked = time.monotonic()
+        self._lock_file = None
+        if not readonly:
+            os.makedirs(self.segments_directory, exist_ok=True)
+            self._lock_file = try_lock(os.path.join(settings.directory, LOCK_FILE))
+            if self._lock_file is None:
+                raise StoreLockedError(f"The index directory '{settings.directory}' is already open for writing by another index.")
+            self._load()
+        else:
+            self.segments, self.active, self.position, self._meta_mtime = self._read()
+
+
+    def _load(self) -> None:
+        # Maps the segments listed in the metadata and deletes unlisted leftovers (writer)
+        meta = {"position": 0, "segments": []}
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, encoding="utf-8") as file:
+                meta = json.load(file)
+        self.segments = [_Segment.load(os.path.join(self.segments_directory, name)) for name in meta["segments"]]
+        self.position = meta["position"]
+        for name in set(os.listdir(self.segments_directory)) - set(meta["segments"]):
+            shutil.rmtree(os.path.join(self.segments_directory, name), ignore_errors=True)
+
+
+    def _read(self) -> Tuple[List[_Segment], _ActiveSegment, int, Optional[float]]:
+        # Readers: the saved segments (keeping those already mapped) and an active segment holding the featurized rows after them
+        segments, active, position, mtime = self.segments, self.active, self.position, self._meta_mtime
+        saved = position - len(active)
+        if os.path.exists(self.meta_path) and os.path.getmtime(self.meta_path) != mtime:
+            mtime = os.path.getmtime(self.meta_path)
+            with open(self.meta_path, encoding="utf-8") as file:
+                meta = json.load(file)
+            mapped = {segment.name: segment for segment in segments}
+            segments = [mapped.get(name) or _Segment.load(os.path.join(self.segments_directory, name)) for name in meta["segments"]]
+            saved = meta["position"]
+        snapshot = None
+        if self.featurizer:
+            self.featurizer.refresh()
+            snapshot = self.featurizer.snapshot()
+        rows = max(position, saved, snapshot.rows if snapshot else 0)
+        if saved > position - len(active) or rows > position:
+            active = active.tail(min(len(active), max(0, position - saved)), rows - max(position, saved))
+            position = max(position, saved)
+        while position < rows:
+            positions = np.arange(position, min(rows, position + CATCH_UP_CHUNK))
+            active.add(np.array(snapshot.arrays["ids"][positions]), project(snapshot.matrix(positions), self.settings.dimensions), snapshot.arrays["times"][positions])
+            position += len(positions)
+        return segments, active, position, mtime
+
+
+    def _save_meta(self, position: int) -> None:
+        temporary = f"{self.meta_path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump({"position": position, "segments": [segment.name for segment in self.segments]}, file)
+        os.replace(temporary, self.meta_path)
+
+
+    async def refresh(self) -> None:
+        """
+        Function Overview:
+        Picks up the segments saved (or deleted) by the writer and the rows featurized since, at most every 'refresh_interval'
+        seconds (readers only). The work runs in a thread and its result replaces the segments and the active segment at once,
+        so searches never see them half-updated.
+        """
+        if not self.readonly or time.monotonic() - self._checked < self.settings.refresh_interval:
+            return
+        self._checked = time.monotonic()
+        async with self._lock:
+            try:
+                self.segments, self.active, self.position, self._meta_mtime = await asyncio.to_thread(self._read)
+            except Exception as e:
+                logger.warning("Tag: Similarity - Reloading the index failed: [%s]", e)
+
+
+    async def catch_up(self, featurizer: Featurizer) -> int:
+        """
+        Function Overview:
+        Indexes the articles featurized since the last call (or since the rows covered by the saved segments, after a restart).
+
+        Function Logic:
+        1. The featurized rows are projected in chunks of CATCH_UP_CHUNK rows, yielding to the event loop between chunks.
+        2. The active segment is frozen (in a thread) whenever it is full, then the expired segments are deleted.
+
+        Parameters:
+        featurizer (Featurizer): The featurizer of the ingested articles.
+
+        Returns:
+        int: The number of articles indexed.
+        """
+        async with self._lock:
+            snapshot, indexed = featurizer.snapshot(), 0
+            while self.position < snapshot.rows:
+                if self.active.full:
+                    await self._freeze()
+                positions = np.arange(self.position, min(snapshot.rows, self.position + CATCH_UP_CHUNK, self.position + len(self.active.ids) - self.active.size))
+                self.active.add(np.array(snapshot.arrays["ids"][positions]), project(snapshot.matrix(positions), self.settings.dimensions), snapshot.arrays["times"][positions])
+                self.position += len(positions)
+                indexed += len(positions)
+                await asyncio.sleep(0)
+            if self.active.full:
+                await self._freeze()
+            self._expire(time.time())
+            return indexed
+
+
+    async def _freeze(self) -> None:
+        # The full active segment stays searchable while it is clustered and saved in a thread
+        self.sealing, self.active = self.active, _ActiveSegment(self.settings.segment_size, self.settings.dimensions)
+        sealing = self.sealing
+        try:
+            segment = await asyncio.to_thread(
+                _Segment.build, os.path.join(self.segments_directory, f"{self.position:012d}"),
+                sealing.ids, sealing.vectors, sealing.times, self.settings.lists,
+                )
+        except BaseException:
+            self.active, self.sealing = sealing, None
+            raise
+        self.segments = [*self.segments, segment]
+        self.sealing = None
+        self._save_meta(self.position)
+
+
+    def _expire(self, now: float) -> None:
+        horizon = now - self.settings.window
+        expired = [segment for segment in self.segments if segment.newest < horizon]
+        if expired:
+            self.segments = [segment for segment in self.segments if segment.newest >= horizon]
+            self._save_meta(self.position - len(self.active))
+            for segment in expired:
+                shutil.rmtree(segment.path, ignore_errors=True)
+
+
+    def vector(self, id: int) -> Optional[np.ndarray]:
+        """
+        Function Overview:
+        Returns the embedding of an indexed article, or None if it is not indexed (unknown, not featurized yet or expired).
+        """
+        for part in (self.active, self.sealing, *reversed(self.segments)):
+            vector = part.find(id) if part is not None else None
+            if vector is not None:
+                return vector
+        return None
+
+
+    def search(self, query: np.ndarray, k: int, probes: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Function Overview:
+        Finds the indexed articles whose embeddings are the most similar to the query.
+
+        Parameters:
+        query (np.ndarray): A normalized embedding.
+        k (int): The number of articles to return.
+        probes (Optional[int]): Lists scanned per segment (defaults to the 'probes' setting; 'lists' for an exact search).
+
+        Returns:
+        List[Tuple[int, float]]: The article IDs and their cosine similarity with the query, best first.
+        """
+        horizon = time.time() - self.settings.window
+        probes = probes or self.settings.probes
+        parts = [segment.search(query, k, probes, horizon) for segment in self.segments if segment.newest >= horizon]
+        parts.extend(part.search(query, k, horizon) for part in (self.sealing, self.active) if part is not None and len(part))
+        if not parts:
+            return []
+        ids, scores = _top(np.concatenate([ids for ids, _ in parts]), np.concatenate([scores for _, scores in parts]), k)
+        best = np.argsort(-scores, kind="stable")
+        return list(zip(ids[best].tolist(), scores[best].tolist()))
+
+
+    def similar(self, id: int, k: int, probes: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Function Overview:
+        Finds the articles most similar to an indexed article (itself excluded); raises a ValueError if it is not indexed.
+
+        Parameters:
+        id (int): The article ID.
+        k (int): The number of articles to return.
+        probes (Optional[int]): Lists scanned per segment (defaults to the 'probes' setting).
+
+        Returns:
+        List[Tuple[int, float]]: The article IDs and their cosine similarity with the article, best first.
+        """
+        vector = self.vector(id)
+        if vector is None:
+            raise ValueError(f"Article ID '{id}' is not indexed.")
+        return [(other, score) for other, score in self.search(vector, k + 1, probes) if other != id][:k]
+
+
+    def close(self) -> None:
+        """
+        Function Overview:
+        Releases the directory, so another process may write the index; the active segment is rebuilt from the featurizer's store.
+        """
+        if self._lock_file:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+    def stats(self) -> dict:
+        return {
+            "articles": sum(len(segment) for segment in self.segments) + len(self.active) + (len(self.sealing) if self.sealing else 0),
+            "segments": len(self.segments),
+            "bytes": sum(segment.nbytes for segment in self.segments) + self.active.vectors.nbytes,
+            }
@@ -1,6 +1,8 @@
 from fastapi import APIRouter
-from .utils import LoggingRoute
+from .utils import LoggingRoute, FastJSONResponse
 from .users import router as users_router
+from .articles import router as articles_router
 
 master_router = APIRouter()
 master_router.include_router(users_router, prefix="/users", tags=["Users"])
+master_router.include_router(articles_router, prefix="/articles", tags=["Articles"])
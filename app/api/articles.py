@@ -0,0 +1,122 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import TYPE_CHECKING, Annotated, Optional
+from app.database import fetch_article, list_articles, fetch_similar_articles, ArticleRepository
+from app.schema.articles import ArticleListQuery, ArticleDetailsResponse, ArticlePageResponse, SimilarArticleQuery, SimilarArticlesResponse
+from .utils import LoggingRoute, get_article_repository, get_article_index
+import logging
+
+if TYPE_CHECKING:
+    from app.ann import ArticleIndex
+
+
+# Initialise router and logger (configured by the application lifespan)
+router = APIRouter()
+router.route_class = LoggingRoute
+logger = logging.getLogger('fastapi_logger')
+
+
+
+
+@router.get("/list", response_model=ArticlePageResponse)
+async def list_articles_data(query: Annotated[ArticleListQuery, Query()], repository: ArticleRepository = Depends(get_article_repository)) -> ArticlePageResponse:
+    """
+    Endpoint Overview:
+    Lists the latest ingested articles page by page, optionally only the copies of a story (a duplicate cluster).
+
+    Endpoint Logic:
+    1. The endpoint attempts to fetch a page of articles by calling the 'list_articles' function with the provided query parameters.
+    2. If successful, it returns the page, with the 'cluster_id' of every article, and the 'before_id' of the next page (if any)
+       wrapped in the GeneralResponse schema.
+    3. If a RuntimeError is raised, it returns a 500 internal server error.
+
+    Parameters:
+    query (ArticleListQuery): The page size, position and cluster filter of the listing.
+    repository (ArticleRepository): Articles storage backend injected by the 'get_article_repository' dependency.
+
+    Returns:
+    GeneralResponse: A response containing the page of articles and the position of the next page.
+    """
+    logger.info("Tag: Articles - Endpoint: List Articles - Request: [%s]", query)
+    try:
+        return await list_articles(query, repository)
+
+    except RuntimeError as e:
+        logger.critical("Tag: Articles - Endpoint: List Articles - Error listing articles: [%s]", e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+
+
+@router.get("/{id}", response_model=ArticleDetailsResponse)
+async def fetch_article_data(id: int, repository: ArticleRepository = Depends(get_article_repository)) -> ArticleDetailsResponse:
+    """
+    Endpoint Overview:
+    Fetches an ingested article, including the duplicate cluster it belongs to, based on its ID.
+
+    Endpoint Logic:
+    1. The endpoint attempts to fetch the article by calling the 'fetch_article' function with the provided article ID.
+    2. If successful, it returns the article wrapped in the GeneralResponse schema; its 'cluster_id' lists the copies of the same
+       story through '/articles/list?cluster_id=...'.
+    3. If a ValueError is raised, it returns a 404 not found status with the error message indicating the requested article does not exist.
+    4. If a RuntimeError is raised, it returns a 500 internal server error.
+
+    Parameters:
+    id (int): The article ID whose data is to be fetched.
+    repository (ArticleRepository): Articles storage backend injected by the 'get_article_repository' dependency.
+
+    Returns:
+    GeneralResponse: A response containing the article's data or an error message.
+    """
+    logger.info("Tag: Articles - Endpoint: Fetch Article Details - Request: [%s]", id)
+    try:
+        return await fetch_article(id, repository)
+
+    except ValueError as e:
+        logger.error("Tag: Articles - Endpoint: Fetch Article Details - Error fetching article ID '%s': [Value Error: %s]", id, e)
+        raise HTTPException(status_code=404, detail=str(e))
+
+    except RuntimeError as e:
+        logger.critical("Tag: Articles - Endpoint: Fetch Article Details - Error fetching article ID '%s': [%s]", id, e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+
+
+@router.get("/{id}/similar", response_model=SimilarArticlesResponse)
+async def fetch_similar_articles_data(id: int, query: Annotated[SimilarArticleQuery, Query()], index: Optional["ArticleIndex"] = Depends(get_article_index), repository: ArticleRepository = Depends(get_article_repository)) -> SimilarArticlesResponse:
+    """
+    Endpoint Overview:
+    Fetches the articles most similar to an ingested article ("more like this"), by the similarity of their TF-IDF vectors.
+
+    Endpoint Logic:
+    1. If this worker has no similarity index (it is built where articles are featurized, and read from its directory by the other
+       workers), it returns a 503 service unavailable status.
+    2. The endpoint attempts to fetch the similar articles by calling the 'fetch_similar_articles' function with the provided article ID and limit.
+    3. If successful, it returns the similar articles with their similarity, most similar first, wrapped in the GeneralResponse
+       schema; copies of the same story (its duplicate cluster) are left out.
+    4. If a ValueError is raised, it returns a 404 not found status with the error message indicating the article does not exist
+       or is not indexed (not indexed yet, or older than the index's window).
+    5. If a RuntimeError is raised, it returns a 500 internal server error.
+
+    Parameters:
+    id (int): The article ID whose similar articles are to be fetched.
+    query (SimilarArticleQuery): The number of articles to return.
+    index (Optional[ArticleIndex]): The similarity index injected by the 'get_article_index' dependency.
+    repository (ArticleRepository): Articles storage backend injected by the 'get_article_repository' dependency.
+
+    Returns:
+    GeneralResponse: A response containing the similar articles or an error message.
+    """
+    logger.info("Tag: Articles - Endpoint: Fetch Similar Articles - Request: [%s, %s]", id, query)
+    if index is None:
+        raise HTTPException(status_code=503, detail="Similar articles are not available.")
+    try:
+        return await fetch_similar_articles(id, query, index, repository)
+
+    except ValueError as e:
+        logger.error("Tag: Articles - Endpoint: Fetch Similar Articles - Error fetching articles similar to ID '%s': [Value Error: %s]", id, e)
+        raise HTTPException(status_code=404, detail=str(e))
+
+    except RuntimeError as e:
+        logger.critical("Tag: Articles - Endpoint: Fetch Similar Articles - Error fetching articles similar to ID '%s': [%s]", id, e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -1,22 +1,34 @@
-from fastapi import APIRouter, HTTPException
-from app.database import create_user, fetch_user, fetch_id, update_user, delete_user
-from app.schema.users import UserDataRequest, UserUpdateRequest, GeneralResponse
-from config.logging_config import fastapi_logging
-from .utils import LoggingRoute
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, Query
+from pydantic import ValidationError
+from typing import TYPE_CHECKING, Optional, Annotated
+from app.database import create_user, create_users, fetch_user, fetch_id, fetch_users, fetch_ids, list_users, authenticate_user, update_user, patch_user, delete_user, delete_users, UserCache, UserRepository
+from app.database import fetch_recommendations, record_interaction, ArticleRepository
+from app.database.users import BULK_CHUNK_SIZE
+from app.schema.users import UserDataRequest, UserLoginRequest, UserUpdateRequest, UserPatchRequest, UserBatchIdsRequest, UserBatchUsernamesRequest
+from app.schema.users import UserBulkCreateRequest, UserBulkDeleteRequest, UserBulkItem, UserBulkResponse, UserListQuery
+from app.schema.users import MessageResponse, UserDetailsResponse, UserIdResponse, UserDetailsBatchResponse, UserIdBatchResponse, UserBulkOutcomeResponse, UserPageResponse
+from app.schema.articles import RecommendationQuery, InteractionRequest, RecommendationResponse
+from .utils import LoggingRoute, get_user_repository, get_article_repository, get_user_cache, get_cache_control, get_password_hasher, get_recommender, conditional_response, iter_ndjson_lines
+from app.passwords import PasswordHasher
 import logging
 
+if TYPE_CHECKING:
+    from app.recommendations import Recommender
 
-# Initialise router and logger
+
+# Initialise router and logger (configured by the application lifespan)
 router = APIRouter()
 router.route_class = LoggingRoute
-fastapi_logging()
 logger = logging.getLogger('fastapi_logger')
 
+# Documents the conditional GET answer of the cacheable endpoints
+NOT_MODIFIED = {304: {"description": "Not Modified: the representation matching the 'If-None-Match' header is still current."}}
+
 
 
 
-@router.post("/create", response_model=GeneralResponse)
-async def create_new_user(request: UserDataRequest) -> GeneralResponse:
+@router.post("/create", response_model=MessageResponse)
+async def create_new_user(request: UserDataRequest, repository: UserRepository = Depends(get_user_repository), hasher: PasswordHasher = Depends(get_password_hasher), cache: Optional[UserCache] = Depends(get_user_cache)) -> MessageResponse:
     """
     Endpoint Overview:
     Creates a new user based on the provided data.
@@ -29,96 +41,379 @@ async def create_new_user(request: UserDataRequest) -> GeneralResponse:
 
     Parameters:
     request (UserDataRequest): The data for the new user to be created.
+    repository (UserRepository): Users storage backend injected by the 'get_user_repository' dependency.
+    hasher (PasswordHasher): Password hasher injected by the 'get_password_hasher' dependency, hashing passwords in its worker pool.
+    cache (Optional[UserCache]): Read-through user cache injected by the 'get_user_cache' dependency.
 
     Returns:
     GeneralResponse: A response indicating the outcome of the user creation operation.
     """
-    logger.info(f"Tag: Users - Endpoint: Create New User - Request: [{request}]")
+    logger.info("Tag: Users - Endpoint: Create New User - Request: [%s]", request)
     try:
-        query_response = await create_user(request)
+        query_response = await create_user(request, repository, hasher, cache)
         return query_response
     
     except ValueError as e:
-        logger.error(f"Tag: Users - Endpoint: Create New User - Error creating new user: [Value Error: {e}]")
+        logger.error("Tag: Users - Endpoint: Create New User - Error creating new user: [Value Error: %s]", e)
         raise HTTPException(status_code=409, detail=str(e))
     
     except RuntimeError as e:
-        logger.critical(f"Tag: Users - Endpoint: Create New User - Error creating new user: - [{e}]")
+        logger.critical("Tag: Users - Endpoint: Create New User - Error creating new user: - [%s]", e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
 
 
-@router.get("/{id}", response_model=GeneralResponse)
-async def fetch_user_data(id: int) -> GeneralResponse:
+@router.post("/bulk/create", response_model=UserBulkOutcomeResponse)
+async def create_new_users(request: UserBulkCreateRequest, repository: UserRepository = Depends(get_user_repository), hasher: PasswordHasher = Depends(get_password_hasher), cache: Optional[UserCache] = Depends(get_user_cache)) -> UserBulkOutcomeResponse:
+    """
+    Endpoint Overview:
+    Creates several new users at once based on the provided data.
+
+    Endpoint Logic:
+    1. The endpoint attempts to create every user by calling the 'create_users' function, which inserts the rows in chunks.
+    2. If successful, it returns the outcome of every row wrapped in the GeneralResponse schema; rows whose email ID or username
+       is already in use are reported as conflicts without aborting the rest of the batch.
+
+    Parameters:
+    request (UserBulkCreateRequest): The data for each new user to be created.
+    repository (UserRepository): Users storage backend injected by the 'get_user_repository' dependency.
+    hasher (PasswordHasher): Password hasher injected by the 'get_password_hasher' dependency, hashing passwords in its worker pool.
+    cache (Optional[UserCache]): Read-through user cache injected by the 'get_user_cache' dependency.
+
+    Returns:
+    GeneralResponse: A response containing the outcome of every row of the bulk creation.
+    """
+    logger.info("Tag: Users - Endpoint: Bulk Create New Users - Request: [%s users]", len(request.users))
+    return await create_users(request.users, repository, hasher, cache)
+
+
+
+
+@router.post("/bulk/create/ndjson", response_model=UserBulkOutcomeResponse)
+async def create_new_users_stream(http_request: Request, repository: UserRepository = Depends(get_user_repository), hasher: PasswordHasher = Depends(get_password_hasher), cache: Optional[UserCache] = Depends(get_user_cache)) -> UserBulkOutcomeResponse:
+    """
+    Endpoint Overview:
+    Creates any number of new users from a streamed newline-delimited JSON (NDJSON) body, one user per line.
+
+    Endpoint Logic:
+    1. The endpoint reads the request body as it arrives and validates each line against the UserDataRequest schema; invalid lines are reported and skipped.
+    2. Valid rows are created with the 'create_users' function every time a full chunk has been read, so the whole payload is never held in memory.
+    3. It returns the outcome of every line wrapped in the GeneralResponse schema.
+
+    Parameters:
+    http_request (Request): The incoming request, whose body is streamed.
+    repository (UserRepository): Users storage backend injected by the 'get_user_repository' dependency.
+    hasher (PasswordHasher): Password hasher injected by the 'get_password_hasher' dependency, hashing passwords in its worker pool.
+    cache (Optional[UserCache]): Read-through user cache injected by the 'get_user_cache' dependency.
+
+    Returns:
+    GeneralResponse: A response containing the outcome of every line of the bulk creation.
+    """
+    logger.info("Tag: Users - Endpoint: Bulk Create New Users (NDJSON) - Request: [streamed]")
+    results = []
+    pending, pending_lines = [], []
+
+    async def flush():
+        query_response = await create_users(pending, repository, hasher, cache)
+        for item in query_response.data.results:
+            item.index = pending_lines[item.index]
+            results.append(item)
+        pending.clear()
+        pending_lines.clear()
+
+    line_number = 0
+    async for line in iter_ndjson_lines(http_request.stream()):
+        try:
+            pending.append(UserDataRequest.model_validate_json(line))
+            pending_lines.append(line_number)
+        except ValidationError as e:
+            errors = "; ".join(f"{'.'.join(map(str, error['loc'])) or 'record'}: {error['msg']}" for error in e.errors())
+            results.append(UserBulkItem(index=line_number, key="", status="invalid", detail=f"Invalid user record: [{errors}]"))
+        line_number += 1
+        if len(pending) >= BULK_CHUNK_SIZE:
+            await flush()
+    if pending:
+        await flush()
+
+    results.sort(key=lambda item: item.index)
+    succeeded = sum(1 for item in results if item.status == "created")
+    logger.info("Tag: Users - Endpoint: Bulk Create New Users (NDJSON) - Created %s of %s users", succeeded, len(results))
+    return UserBulkOutcomeResponse(
+        detail = f"{succeeded} of {len(results)} users created successfully.",
+        data = UserBulkResponse(results=results, succeeded=succeeded, failed=len(results) - succeeded)
+        )
+
+
+
+
+@router.post("/bulk/delete", response_model=UserBulkOutcomeResponse)
+async def delete_users_data(request: UserBulkDeleteRequest, repository: UserRepository = Depends(get_user_repository), cache: Optional[UserCache] = Depends(get_user_cache)) -> UserBulkOutcomeResponse:
+    """
+    Endpoint Overview:
+    Deletes the user data for several user IDs at once.
+
+    Endpoint Logic:
+    1. The endpoint attempts to delete every requested user by calling the 'delete_users' function, which deletes the IDs in chunks.
+    2. If successful, it returns the outcome of every ID (deleted or not found) wrapped in the GeneralResponse schema.
+
+    Parameters:
+    request (UserBulkDeleteRequest): The user IDs whose data is to be deleted.
+    repository (UserRepository): Users storage backend injected by the 'get_user_repository' dependency.
+    cache (Optional[UserCache]): Read-through user cache injected by the 'get_user_cache' dependency.
+
+    Returns:
+    GeneralResponse: A response containing the outcome of every ID of the bulk deletion.
+    """
+    logger.info("Tag: Users - Endpoint: Bulk Delete Users - Request: [%s user IDs]", len(request.ids))
+    return await delete_users(request.ids, repository, cache)
+
+
+
+
+@router.post("/login", response_model=UserIdResponse)
+async def login_user(request: UserLoginRequest, repository: UserRepository = Depends(get_user_repository), hasher: PasswordHasher = Depends(get_password_hasher), cache: Optional[UserCache] = Depends(get_user_cache)) -> UserIdResponse:
+    """
+    Endpoint Overview:
+    Verifies a user's username and password.
+
+    Endpoint Logic:
+    1. The endpoint attempts to verify the credentials by calling the 'authenticate_user' function, which reads only the user ID
+       and password hash of the user and verifies the password in the hasher's worker pool (an outdated hash is replaced, and the
+       cached user refreshed).
+    2. If successful, it returns the user ID wrapped in the GeneralResponse schema.
+    3. If a ValueError is raised, it returns a 401 unauthorized status with the same error message whether the username or the password is wrong.
+    4. If a RuntimeError is raised, it returns a 500 internal server error.
+
+    Parameters:
+    request (UserLoginRequest): The username and password to verify.
+    repository (UserRepository): Users storage backend injected by the 'get_user_repository' dependency.
+    hasher (PasswordHasher): Password hasher injected by the 'get_password_hasher' dependency, hashing passwords in its worker pool.
+    cache (Optional[UserCache]): Read-through user cache injected by the 'get_user_cache' dependency.
+
+    Returns:
+    GeneralResponse: A response containing the user ID or an error message.
+    """
+    logger.info("Tag: Users - Endpoint: Login User - Request: [%s]", request)
+    try:
+        query_response = await authenticate_user(request, repository, hasher, cache)
+        return query_response
+
+    except ValueError as e:
+        logger.warning("Tag: Users - Endpoint: Login User - Failed login for '%s': [Value Error: %s]", request.username, e)
+        raise HTTPException(status_code=401, detail=str(e))
+
+    except RuntimeError as e:
+        logger.critical("Tag: Users - Endpoint: Login User - Error verifying credentials for '%s': [%s]", request.username, e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+
+
+@router.get("/cache/stats")
+async def fetch_cache_stats(cache: Optional[UserCache] = Depends(get_user_cache)) -> dict:
+    """
+    Endpoint Overview:
+    Reports the hit, miss and eviction counters of the user cache, used to size the cache.
+
+    Endpoint Logic:
+    1. The endpoint returns the statistics of the in-process cache and, if configured, of the shared cache backend.
+    2. If caching is disabled, it reports that the cache is disabled.
+
+    Parameters:
+    cache (Optional[UserCache]): Read-through user cache injected by the 'get_user_cache' dependency.
+
+    Returns:
+    dict: The cache statistics.
+    """
+    logger.info("Tag: Users - Endpoint: Fetch Cache Stats - Request: None")
+    return {"enabled": cache is not None, **(cache.stats() if cache else {})}
+
+
+
+
+@router.get("/list", response_model=UserPageResponse, responses=NOT_MODIFIED)
+async def list_users_data(http_request: Request, query: Annotated[UserListQuery, Query()], repository: UserRepository = Depends(get_user_repository), cache_control: str = Depends(get_cache_control)) -> Response:
+    """
+    Endpoint Overview:
+    Lists users page by page, with optional 'created_at' range and name prefix filters and a column projection.
+
+    Endpoint Logic:
+    1. The endpoint attempts to fetch a page of users by calling the 'list_users' function with the provided query parameters.
+    2. If successful, it returns the page and the cursor of the next page (if any) wrapped in the GeneralResponse schema, with its ETag,
+       or a 304 not modified status without a body if the 'If-None-Match' header matches it.
+    3. If a ValueError is raised, it returns a 400 bad request status with the error message indicating the cursor is invalid.
+    4. If a RuntimeError is raised, it returns a 500 internal server error.
+
+    Parameters:
+    http_request (Request): The incoming request, whose 'If-None-Match' header is evaluated.
+    query (UserListQuery): The page size, ordering, cursor, filters and projection of the listing.
+    repository (UserRepository): Users storage backend injected by the 'get_user_repository' dependency.
+    cache_control (str): 'Cache-Control' header of the response, injected by the 'get_cache_control' dependency.
+
+    Returns:
+    GeneralResponse: A response containing the page of users and the cursor of the next page.
+    """
+    logger.info("Tag: Users - Endpoint: List Users - Request: [%s]", query)
+    try:
+        query_response = await list_users(query, repository)
+        return conditional_response(http_request, query_response, cache_control)
+
+    except ValueError as e:
+        logger.error("Tag: Users - Endpoint: List Users - Error listing users: [Value Error: %s]", e)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    except RuntimeError as e:
+        logger.critical("Tag: Users - Endpoint: List Users - Error listing users: [%s]", e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+
+
+@router.get("/{id}", response_model=UserDetailsResponse, responses=NOT_MODIFIED)
+async def fetch_user_data(http_request: Request, id: int, repository: UserRepository = Depends(get_user_repository), cache: Optional[UserCache] = Depends(get_user_cache), cache_control: str = Depends(get_cache_control)) -> Response:
     """
     Endpoint Overview:
     Fetches data for a specific user based on their ID.
 
     Endpoint Logic:
     1. The endpoint attempts to fetch user data by calling the 'fetch_user' function with the provided user ID.
-    2. If successful, it returns the fetched data wrapped in the GeneralResponse schema.
+    2. If successful, it returns the fetched data wrapped in the GeneralResponse schema, with its ETag and its Last-Modified time
+       ('updated_at', or 'created_at' for users never updated since the column was added), or a 304 not modified status without
+       a body if the 'If-None-Match' header matches the ETag or, without it, the 'If-Modified-Since' date is not older.
     3. If a ValueError is raised, it returns a 404 not found status with the error message indicating the requested user does not exist.
     4. If a RuntimeError is raised, it returns a 500 internal server error.
 
     Parameters:
+    http_request (Request): The incoming request, whose 'If-None-Match' and 'If-Modified-Since' headers are evaluated.
     id (int): The user ID whose data is to be fetched.
+    repository (UserRepository): Users storage backend injected by the 'get_user_repository' dependency.
+    cache (Optional[UserCache]): Read-through user cache injected by the 'get_user_cache' dependency.
+    cache_control (str): 'Cache-Control' header of the response, injected by the 'get_cache_control' dependency.
 
     Returns:
     GeneralResponse: A response containing the user's data or an error message.
     """
-    logger.info(f"Tag: Users - Endpoint: Fetch User Details - Request: [{id}]")
+    logger.info("Tag: Users - Endpoint: Fetch User Details - Request: [%s]", id)
     try:
-        query_response = await fetch_user(id)
-        return query_response
+        query_response = await fetch_user(id, repository, cache)
+        user = query_response.data
+        return conditional_response(http_request, query_response, cache_control, user.updated_at or user.created_at)
     
     except ValueError as e:
-        logger.error(f"Tag: Users - Endpoint: Fetch User Details - Error fetching user ID '{id}': [Value Error: {e}]")
+        logger.error("Tag: Users - Endpoint: Fetch User Details - Error fetching user ID '%s': [Value Error: %s]", id, e)
         raise HTTPException(status_code=404, detail=str(e))
     
     except RuntimeError as e:
-        logger.critical(f"Tag: Users - Endpoint: Fetch User Details - Error fetching user ID '{id}': [{e}]")
+        logger.critical("Tag: Users - Endpoint: Fetch User Details - Error fetching user ID '%s': [%s]", id, e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
 
 
-@router.get("/get_id/{username}", response_model=GeneralResponse)
-async def fetch_user_id(username: str) -> GeneralResponse:
+@router.get("/get_id/{username}", response_model=UserIdResponse, responses=NOT_MODIFIED)
+async def fetch_user_id(http_request: Request, username: str, repository: UserRepository = Depends(get_user_repository), cache: Optional[UserCache] = Depends(get_user_cache), cache_control: str = Depends(get_cache_control)) -> Response:
     """
     Endpoint Overview:
     Fetches the user ID associated with the provided username.
 
     Endpoint Logic:
     1. The endpoint attempts to fetch the user ID by calling the 'fetch_id' function with the provided username.
-    2. If successful, it returns the user ID wrapped in the GeneralResponse schema.
+    2. If successful, it returns the user ID wrapped in the GeneralResponse schema, with its ETag, or a 304 not modified status
+       without a body if the 'If-None-Match' header matches it.
     3. If a ValueError is raised, it returns a 404 not found status with the error message indicating the requested username does not exist.
     4. If a RuntimeError is raised, it returns a 500 internal server error.
 
     Parameters:
+    http_request (Request): The incoming request, whose 'If-None-Match' header is evaluated.
     username (str): The username whose user ID is to be fetched.
+    repository (UserRepository): Users storage backend injected by the 'get_user_repository' dependency.
+    cache (Optional[UserCache]): Read-through user cache injected by the 'get_user_cache' dependency.
+    cache_control (str): 'Cache-Control' header of the response, injected by the 'get_cache_control' dependency.
 
     Returns:
     GeneralResponse: A response containing the user ID or an error message.
     """
-    logger.info(f"Tag: Users - Endpoint: Fetch User ID - Request: [{username}]")
+    logger.info("Tag: Users - Endpoint: Fetch User ID - Request: [%s]", username)
     try:
-        query_response = await fetch_id(username)
-        return query_response
+        query_response = await fetch_id(username, repository, cache)
+        return conditional_response(http_request, query_response, cache_control)
     
     except ValueError as e:
-        logger.error(f"Tag: Users - Endpoint: Fetch User ID - Error fetching user ID for '{username}': [Value Error: {e}]")
+        logger.error("Tag: Users - Endpoint: Fetch User ID - Error fetching user ID for '%s': [Value Error: %s]", username, e)
         raise HTTPException(status_code=404, detail=str(e))
     
     except RuntimeError as e:
-        logger.critical(f"Tag: Users - Endpoint: Fetch User ID - Error fetching user ID for '{username}': [{e}]")
+        logger.critical("Tag: Users - Endpoint: Fetch User ID - Error fetching user ID for '%s': [%s]", username, e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+
+
+@router.post("/batch/ids", response_model=UserDetailsBatchResponse)
+async def fetch_users_data(request: UserBatchIdsRequest, repository: UserRepository = Depends(get_user_repository), cache: Optional[UserCache] = Depends(get_user_cache)) -> UserDetailsBatchResponse:
+    """
+    Endpoint Overview:
+    Fetches data for several users at once based on their IDs.
+
+    Endpoint Logic:
+    1. The endpoint attempts to fetch the data of every requested user by calling the 'fetch_users' function, which uses a single query.
+    2. If successful, it returns the outcome for each requested ID (including the IDs that were not found) wrapped in the GeneralResponse schema.
+    3. If a RuntimeError is raised, it returns a 500 internal server error.
+
+    Parameters:
+    request (UserBatchIdsRequest): The user IDs whose data is to be fetched.
+    repository (UserRepository): Users storage backend injected by the 'get_user_repository' dependency.
+    cache (Optional[UserCache]): Read-through user cache injected by the 'get_user_cache' dependency.
+
+    Returns:
+    GeneralResponse: A response containing the outcome of the lookup for every requested user ID.
+    """
+    logger.info("Tag: Users - Endpoint: Batch Fetch User Details - Request: [%s]", request)
+    try:
+        query_response = await fetch_users(request.ids, repository, cache)
+        return query_response
+
+    except RuntimeError as e:
+        logger.critical("Tag: Users - Endpoint: Batch Fetch User Details - Error fetching %s user IDs: [%s]", len(request.ids), e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
 
 
-@router.put("/update", response_model=GeneralResponse)
-async def update_user_data(request: UserUpdateRequest) -> GeneralResponse:
+@router.post("/batch/usernames", response_model=UserIdBatchResponse)
+async def fetch_user_ids(request: UserBatchUsernamesRequest, repository: UserRepository = Depends(get_user_repository), cache: Optional[UserCache] = Depends(get_user_cache)) -> UserIdBatchResponse:
+    """
+    Endpoint Overview:
+    Fetches the user IDs associated with several usernames at once.
+
+    Endpoint Logic:
+    1. The endpoint attempts to fetch the user ID of every requested username by calling the 'fetch_ids' function, which uses a single query.
+    2. If successful, it returns the outcome for each requested username (including the usernames that were not found) wrapped in the GeneralResponse schema.
+    3. If a RuntimeError is raised, it returns a 500 internal server error.
+
+    Parameters:
+    request (UserBatchUsernamesRequest): The usernames whose user IDs are to be fetched.
+    repository (UserRepository): Users storage backend injected by the 'get_user_repository' dependency.
+    cache (Optional[UserCache]): Read-through user cache injected by the 'get_user_cache' dependency.
+
+    Returns:
+    GeneralResponse: A response containing the outcome of the lookup for every requested username.
+    """
+    logger.info("Tag: Users - Endpoint: Batch Fetch User IDs - Request: [%s]", request)
+    try:
+        query_response = await fetch_ids(request.usernames, repository, cache)
+        return query_response
+
+    except RuntimeError as e:
+        logger.critical("Tag: Users - Endpoint: Batch Fetch User IDs - Error fetching user IDs for %s usernames: [%s]", len(request.usernames), e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+
+
+@router.put("/update", response_model=MessageResponse)
+async def update_user_data(request: UserUpdateRequest, repository: UserRepository = Depends(get_user_repository), hasher: PasswordHasher = Depends(get_password_hasher), cache: Optional[UserCache] = Depends(get_user_cache)) -> MessageResponse:
     """
     Endpoint Overview:
     Updates the data for a specific user based on the provided request.
@@ -133,29 +428,73 @@ async def update_user_data(request: UserUpdateRequest) -> GeneralResponse:
 
     Parameters:
     request (UserUpdateRequest): The updated data for the user.
+    repository (UserRepository): Users storage backend injected by the 'get_user_repository' dependency.
+    hasher (PasswordHasher): Password hasher injected by the 'get_password_hasher' dependency, hashing passwords in its worker pool.
+    cache (Optional[UserCache]): Read-through user cache injected by the 'get_user_cache' dependency.
 
     Returns:
     GeneralResponse: A response indicating the outcome of the user data update operation.
     """
-    logger.info(f"Tag: Users - Endpoint: Update User Details - Request: [{request}]")
+    logger.info("Tag: Users - Endpoint: Update User Details - Request: [%s]", request)
     try:
-        query_response = await update_user(request)
+        query_response = await update_user(request, repository, hasher, cache)
         return query_response
     
     except ValueError as e:
         code = 409 if "already exists." in str(e) else 404
-        logger.error(f"Tag: Users - Endpoint: Update User Details - Error updating data for user ID '{request.user_id}': [Value Error: {e}]")
+        logger.error("Tag: Users - Endpoint: Update User Details - Error updating data for user ID '%s': [Value Error: %s]", request.user_id, e)
         raise HTTPException(status_code=code, detail=str(e))
     
     except RuntimeError as e:
-        logger.critical(f"Tag: Users - Endpoint: Update User Details - Error updating data for user ID '{request.user_id}': [{e}]")
+        logger.critical("Tag: Users - Endpoint: Update User Details - Error updating data for user ID '%s': [%s]", request.user_id, e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
 
 
-@router.delete("/delete/{id}", response_model=GeneralResponse)
-async def delete_user_data(id: int) -> GeneralResponse:
+@router.patch("/{id}", response_model=UserDetailsResponse)
+async def patch_user_data(id: int, request: UserPatchRequest, repository: UserRepository = Depends(get_user_repository), hasher: PasswordHasher = Depends(get_password_hasher), cache: Optional[UserCache] = Depends(get_user_cache)) -> UserDetailsResponse:
+    """
+    Endpoint Overview:
+    Updates any subset of the mutable fields of a specific user in a single, atomic operation.
+
+    Endpoint Logic:
+    1. The endpoint attempts to update every field present in the request by calling the 'patch_user' function with the provided user ID.
+    2. If successful, it returns the updated user data wrapped in the GeneralResponse schema.
+    3. If a ValueError is raised, a different HTTP status code is returned based on the cause of the error:
+        - Returns a 409 conflict status with the error message indicating the update failed because the email ID or username is in use.
+        - Returns a 404 not found status with the error message indicating the requested user does not exist.
+    4. If a RuntimeError is raised, it returns a 500 internal server error.
+
+    Parameters:
+    id (int): The user ID whose data is to be updated.
+    request (UserPatchRequest): The fields to update and their new values.
+    repository (UserRepository): Users storage backend injected by the 'get_user_repository' dependency.
+    hasher (PasswordHasher): Password hasher injected by the 'get_password_hasher' dependency, hashing passwords in its worker pool.
+    cache (Optional[UserCache]): Read-through user cache injected by the 'get_user_cache' dependency.
+
+    Returns:
+    GeneralResponse: A response containing the outcome of the update operation and the updated user's data.
+    """
+    logger.info("Tag: Users - Endpoint: Patch User Details - Request: [%s, %s]", id, request)
+    try:
+        query_response = await patch_user(id, request, repository, hasher, cache)
+        return query_response
+
+    except ValueError as e:
+        code = 409 if "already exists." in str(e) else 404
+        logger.error("Tag: Users - Endpoint: Patch User Details - Error updating data for user ID '%s': [Value Error: %s]", id, e)
+        raise HTTPException(status_code=code, detail=str(e))
+
+    except RuntimeError as e:
+        logger.critical("Tag: Users - Endpoint: Patch User Details - Error updating data for user ID '%s': [%s]", id, e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+
+
+@router.delete("/delete/{id}", response_model=MessageResponse)
+async def delete_user_data(id: int, repository: UserRepository = Depends(get_user_repository), cache: Optional[UserCache] = Depends(get_user_cache)) -> MessageResponse:
     """
     Endpoint Overview:
     Deletes the user data for the specified user ID.
@@ -168,19 +507,99 @@ async def delete_user_data(id: int) -> GeneralResponse:
 
     Parameters:
     id (int): The user ID whose data is to be deleted.
+    repository (UserRepository): Users storage backend injected by the 'get_user_repository' dependency.
+    cache (Optional[UserCache]): Read-through user cache injected by the 'get_user_cache' dependency.
 
     Returns:
     GeneralResponse: A response indicating the outcome of the deletion operation.
     """
-    logger.info(f"Tag: Users - Endpoint: Delete User Details - Request: [{id}]")
+    logger.info("Tag: Users - Endpoint: Delete User Details - Request: [%s]", id)
     try:
-        query_response = await delete_user(id)
+        query_response = await delete_user(id, repository, cache)
         return query_response
     
     except ValueError as e:
-        logger.error(f"Tag: Users - Endpoint: Delete User Details - Error deleting data for user ID '{id}': [Value Error: {e}]")
+        logger.error("Tag: Users - Endpoint: Delete User Details - Error deleting data for user ID '%s': [Value Error: %s]", id, e)
         raise HTTPException(status_code=404, detail=str(e))
     
     except RuntimeError as e:
-        logger.critical(f"Tag: Users - Endpoint: Delete User Details - Error deleting data for user ID '{id}': [{e}]")
+        logger.critical("Tag: Users - Endpoint: Delete User Details - Error deleting data for user ID '%s': [%s]", id, e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+
+
+@router.get("/{id}/recommendations", response_model=RecommendationResponse)
+async def fetch_user_recommendations(id: int, query: Annotated[RecommendationQuery, Query()], repository: ArticleRepository = Depends(get_article_repository), recommender: Optional["Recommender"] = Depends(get_recommender)) -> RecommendationResponse:
+    """
+    Endpoint Overview:
+    Fetches the latest articles ranked for a user by similarity with their interests.
+
+    Endpoint Logic:
+    1. If recommendations are not served (they are disabled, or no articles are featurized), it returns a 503 service unavailable status.
+    2. The endpoint attempts to fetch the recommendations by calling the 'fetch_recommendations' function with the provided user ID and limit.
+    3. If successful, it returns the recommended articles with their scores, best first, wrapped in the GeneralResponse schema;
+       a user without recorded interactions gets the latest articles.
+    4. If a RuntimeError is raised, it returns a 500 internal server error.
+
+    Parameters:
+    id (int): The user ID whose recommendations are to be fetched.
+    query (RecommendationQuery): The number of articles to recommend.
+    repository (ArticleRepository): Articles and interactions storage backend injected by the 'get_article_repository' dependency.
+    recommender (Optional[Recommender]): The ranking of articles by user interests, injected by the 'get_recommender' dependency.
+
+    Returns:
+    GeneralResponse: A response containing the recommended articles.
+    """
+    logger.info("Tag: Users - Endpoint: Fetch User Recommendations - Request: [%s, %s]", id, query)
+    if recommender is None:
+        raise HTTPException(status_code=503, detail="Recommendations are not available.")
+    try:
+        return await fetch_recommendations(id, query, recommender, repository)
+
+    except RuntimeError as e:
+        logger.critical("Tag: Users - Endpoint: Fetch User Recommendations - Error ranking articles for user ID '%s': [%s]", id, e)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+
+
+@router.post("/{id}/interactions", response_model=MessageResponse)
+async def record_user_interaction(id: int, request: InteractionRequest, repository: UserRepository = Depends(get_user_repository), article_repository: ArticleRepository = Depends(get_article_repository), cache: Optional[UserCache] = Depends(get_user_cache), recommender: Optional["Recommender"] = Depends(get_recommender)) -> MessageResponse:
+    """
+    Endpoint Overview:
+    Records an interaction of a user with an article (e.g. a read or a like), updating the interests their recommendations are ranked by.
+
+    Endpoint Logic:
+    1. If recommendations are not served (they are disabled, or no articles are featurized), it returns a 503 service unavailable status.
+    2. The endpoint checks that the user exists by calling the 'fetch_user' function (served from the user cache when possible).
+    3. It then stores the interaction by calling the 'record_interaction' function with the provided user ID and request data.
+    4. If successful, it returns a message response confirming the interaction was recorded.
+    5. If a ValueError is raised, it returns a 404 not found status with the error message indicating the user or the article does not exist.
+    6. If a RuntimeError is raised, it returns a 500 internal server error.
+
+    Parameters:
+    id (int): The user ID.
+    request (InteractionRequest): The article and the strength of the interaction.
+    repository (UserRepository): Users storage backend injected by the 'get_user_repository' dependency.
+    article_repository (ArticleRepository): Interactions storage backend injected by the 'get_article_repository' dependency.
+    cache (Optional[UserCache]): Read-through user cache injected by the 'get_user_cache' dependency.
+    recommender (Optional[Recommender]): The ranking of articles by user interests, injected by the 'get_recommender' dependency.
+
+    Returns:
+    MessageResponse: A response confirming the interaction was recorded.
+    """
+    logger.info("Tag: Users - Endpoint: Record User Interaction - Request: [%s, %s]", id, request)
+    if recommender is None:
+        raise HTTPException(status_code=503, detail="Recommendations are not available.")
+    try:
+        await fetch_user(id, repository, cache)
+        return await record_interaction(id, request, recommender, article_repository)
+
+    except ValueError as e:
+        logger.error("Tag: Users - Endpoint: Record User Interaction - Error recording interaction for user ID '%s': [Value Error: %s]", id, e)
+        raise HTTPException(status_code=404, detail=str(e))
+
+    except RuntimeError as e:
+        logger.critical("Tag: Users - Endpoint: Record User Interaction - Error recording interaction for user ID '%s': [%s]", id, e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
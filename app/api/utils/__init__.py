@@ -1 +1,5 @@
 from .logging_route import LoggingRoute
+from .dependencies import get_user_repository, get_article_repository, get_user_cache, get_cache_control, get_password_hasher, get_recommender, get_article_index
+from .streaming import iter_ndjson_lines
+from .responses import FastJSONResponse
+from .conditional import conditional_response
@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request, Response
+from pydantic import BaseModel
+import hashlib
+
+
+
+
+def entity_tag(body: bytes) -> str:
+    """
+    Function Overview:
+    Computes the strong entity tag of a response body: a 128-bit BLAKE2b digest of its bytes, quoted as required by the 'ETag' header.
+
+    Parameters:
+    body (bytes): The serialized response body.
+
+    Returns:
+    str: The quoted entity tag (e.g. '"3f2a..."').
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def none_match(if_none_match: str, etag: str) -> bool:
+    """
+    Function Overview:
+    Evaluates an 'If-None-Match' header against the current entity tag of a resource.
+
+    Function Logic:
+    1. '*' matches any current representation.
+    2. Otherwise the header is a comma-separated list of entity tags, compared with the weak comparison (a 'W/' prefix is ignored),
+       as required for 'If-None-Match'.
+
+    Parameters:
+    if_none_match (str): The value of the 'If-None-Match' request header.
+    etag (str): The quoted entity tag of the current representation.
+
+    Returns:
+    bool: True if the client already holds the current representation.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    """
+    Function Overview:
+    Evaluates an 'If-Modified-Since' header against the time a resource was last modified.
+
+    Function Logic:
+    1. The header is parsed as an HTTP date; a date that cannot be parsed is ignored, as required, so the full response is sent.
+    2. HTTP dates have a one-second resolution, so the modification time is truncated to the second before both are compared.
+
+    Parameters:
+    if_modified_since (str): The value of the 'If-Modified-Since' request header.
+    last_modified (datetime): The time the resource was last modified (timezone-aware).
+
+    Returns:
+    bool: True if the resource has not been modified since the given date.
+    """
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def conditional_response(request: Request, content: BaseModel, cache_control: str, last_modified: Optional[datetime] = None) -> Response:
+    """
+    Function Overview:
+    Builds the response of a cacheable GET endpoint, answering '304 Not Modified' without a body when the client's copy is current.
+
+    Function Logic:
+    1. The content is serialized to JSON bytes with pydantic, as FastAPI would, and its entity tag is computed from the bytes,
+       so the tag changes whenever any field of the response does, on every worker and backend.
+    2. If the request's 'If-None-Match' header matches the tag, a '304 Not Modified' response with no body is returned.
+    3. When the modification time of the resource is known, it is sent as 'Last-Modified', and a request without 'If-None-Match'
+       is answered with '304 Not Modified' if its 'If-Modified-Since' date is not older (the entity tag takes precedence when
+       both are sent, as HTTP requires).
+    4. Otherwise the JSON body is returned.
+    5. Both carry the 'ETag', 'Last-Modified' (if known) and 'Cache-Control' headers; LoggingRoute logs and counts either like any other response.
+
+    Parameters:
+    request (Request): The incoming request, whose 'If-None-Match' and 'If-Modified-Since' headers are evaluated.
+    content (BaseModel): The response, already built with the endpoint's response model.
+    cache_control (str): The value of the 'Cache-Control' header.
+    last_modified (Optional[datetime]): The time the resource was last modified (if known, timezone-aware).
+
+    Returns:
+    Response: The full JSON response or the empty '304 Not Modified' response.
+    """
+    body = content.__pydantic_serializer__.to_json(content)
+    etag = entity_tag(body)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        last_modified = last_modified if last_modified.tzinfo else last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if none_match(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+    elif last_modified is not None:
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is not None and not_modified_since(if_modified_since, last_modified):
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
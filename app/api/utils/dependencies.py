@@ -0,0 +1,115 @@
+from fastapi import Request
+from typing import TYPE_CHECKING, Optional
+from app.database.repository import UserRepository, ArticleRepository
+from app.database.cache import UserCache
+from app.passwords import PasswordHasher
+
+if TYPE_CHECKING:
+    from app.recommendations import Recommender
+    from app.ann import ArticleIndex
+
+
+
+
+def get_user_repository(request: Request) -> UserRepository:
+    """
+    Function Overview:
+    FastAPI dependency returning the users repository opened by the application's lifespan hook.
+
+    Function Logic:
+    1. The repository's backend (Supabase, Postgres or in-memory) is chosen at startup from the 'DATABASE_BACKEND' setting,
+       so endpoints never depend on a specific storage backend.
+
+    Parameters:
+    request (Request): The incoming request, used to reach the application state.
+
+    Returns:
+    UserRepository: The repository shared by every request handled by this worker.
+    """
+    return request.app.state.user_repository
+
+
+def get_article_repository(request: Request) -> ArticleRepository:
+    """
+    Function Overview:
+    FastAPI dependency returning the articles repository created by the application's lifespan hook, sharing the connections
+    of the users repository.
+
+    Parameters:
+    request (Request): The incoming request, used to reach the application state.
+
+    Returns:
+    ArticleRepository: The repository shared by every request handled by this worker.
+    """
+    return request.app.state.article_repository
+
+
+def get_user_cache(request: Request) -> Optional[UserCache]:
+    """
+    Function Overview:
+    FastAPI dependency returning the read-through user cache created by the application's lifespan hook.
+
+    Parameters:
+    request (Request): The incoming request, used to reach the application state.
+
+    Returns:
+    Optional[UserCache]: The worker's user cache, or None if caching is disabled.
+    """
+    return getattr(request.app.state, "user_cache", None)
+
+
+def get_cache_control(request: Request) -> str:
+    """
+    Function Overview:
+    FastAPI dependency returning the 'Cache-Control' header of the cacheable user responses, built by the application's lifespan hook
+    from the 'USER_HTTP_MAX_AGE' and 'USER_HTTP_PUBLIC' settings.
+
+    Parameters:
+    request (Request): The incoming request, used to reach the application state.
+
+    Returns:
+    str: The 'Cache-Control' header value (by default 'private, no-cache', i.e. revalidate with the ETag before every reuse).
+    """
+    return getattr(request.app.state, "user_cache_control", "private, no-cache")
+
+
+def get_password_hasher(request: Request) -> PasswordHasher:
+    """
+    Function Overview:
+    FastAPI dependency returning the password hasher, whose worker pool is created by the application's lifespan hook.
+
+    Parameters:
+    request (Request): The incoming request, used to reach the application state.
+
+    Returns:
+    PasswordHasher: The worker's password hasher.
+    """
+    return request.app.state.password_hasher
+
+
+def get_recommender(request: Request) -> Optional["Recommender"]:
+    """
+    Function Overview:
+    FastAPI dependency returning the recommender created by the application's lifespan hook where articles are featurized or read.
+
+    Parameters:
+    request (Request): The incoming request, used to reach the application state.
+
+    Returns:
+    Optional[Recommender]: The worker's recommender, or None if recommendations are not served by this worker.
+    """
+    return getattr(request.app.state, "recommender", None)
+
+
+def get_article_index(request: Request) -> Optional["ArticleIndex"]:
+    """
+    Function Overview:
+    FastAPI dependency returning the similarity index of the articles opened by the application's lifespan hook.
+
+    Parameters:
+    request (Request): The incoming request, used to reach the application state.
+
+    Returns:
+    Optional[ArticleIndex]: The worker's similarity index, or None if similar articles are not served by this worker.
+    """
+    return getattr(request.app.state, "article_index", None)
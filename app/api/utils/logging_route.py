@@ -1,17 +1,76 @@
 from fastapi import Request, Response, HTTPException
+from fastapi.exceptions import RequestValidationError
 from fastapi.routing import APIRoute
-from fastapi.responses import JSONResponse
 from http import HTTPStatus
-from config.logging_config import fastapi_logging, healthcheck_logging
+from contextlib import nullcontext
+from typing import Optional
+from config.logging_config import request_id_var, request_stats_var
+from app.metrics import HTTP_REQUESTS, HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
+from .responses import FastJSONResponse
 import logging
+import re
+import time
+import uuid
 
 
-# Initialise loggers
-fastapi_logging()
-healthcheck_logging()
+# Loggers (configured by the application lifespan)
 app_logger = logging.getLogger('fastapi_logger')
 health_check_logger = logging.getLogger('health_check_logger')
 
+# Operational endpoints polled by orchestrators and scrapers, logged to the health check logger
+OPERATIONAL_PATHS = ("/health", "/metrics")
+
+# Request IDs supplied by the client are only reused when they are short and free of control characters
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+
+
+def log_request(logger: logging.Logger, request: Request, route: str, status_code: int, duration: float, stats: dict, response: Optional[Response]) -> None:
+    """
+    Function Overview:
+    Emits the structured log record summarising a handled request.
+
+    Function Logic:
+    1. Returns immediately when the INFO level is disabled for the logger, so nothing is built for filtered records.
+    2. Otherwise logs the status line with the method, route template, status, durations and response size as structured fields.
+       Responses that never carry a body ('204 No Content', '304 Not Modified') are logged with a size of 0.
+
+    Parameters:
+    logger (logging.Logger): The logger the record is emitted on.
+    request (Request): The handled request.
+    route (str): The route template that matched the request (e.g. '/users/{id}').
+    status_code (int): The status code of the response.
+    duration (float): Seconds spent in the route handler.
+    stats (dict): The database time and number of database calls made while handling the request.
+    response (Optional[Response]): The response, if one was produced.
+    """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    try:
+        status_phrase = HTTPStatus(status_code).phrase
+    except ValueError:
+        status_phrase = "Unknown"
+    content_length = response.headers.get("content-length") if response is not None else None
+    if content_length is None and status_code in (204, 304):
+        content_length = 0
+    logger.info(
+        "HTTP Response: %s %s",
+        status_code,
+        status_phrase,
+        extra = {
+            "method": request.method,
+            "route": route,
+            "status": status_code,
+            "duration_ms": round(duration * 1000, 3),
+            "db_ms": round(stats["db_time"] * 1000, 3),
+            "db_calls": stats["db_calls"],
+            "response_bytes": int(content_length) if content_length is not None else None,
+            },
+        )
+
+
+
 
 class LoggingRoute(APIRoute):
     """
@@ -21,10 +80,14 @@ class LoggingRoute(APIRoute):
     Function Logic:
     1. Overrides the `get_route_handler` method from `APIRoute`.
     2. Wraps the original route handler with a custom handler that intercepts the response.
-    3. Logs the HTTP response details:
-        - If the request URL contains "/health", it uses the health check logger.
+    3. Assigns a request ID (reusing a valid 'X-Request-ID' header), stores it in a context variable so every record logged while
+       handling the request carries it, and returns it in the 'X-Request-ID' response header.
+    4. Records the request count, latency and in-flight gauge of the route template in the '/metrics' registry.
+    5. Applies the application's admission control (rate limits and route concurrency caps) to every request but the operational ones,
+       before the request is parsed; rejections are returned with their 'Retry-After' header, and logged and counted like any response.
+    6. Measures the handler duration and the time spent waiting on the database, then logs one structured record per request:
+        - If the request is for an operational endpoint ('/health', '/metrics'), it uses the health check logger.
         - Otherwise, it uses the default app logger.
-    4. Retrieves the status phrase for the response status code, defaulting to "Unknown" if the code is not standard.
 
     Returns:
     - The original response object after logging details.
@@ -32,34 +95,57 @@ class LoggingRoute(APIRoute):
     def get_route_handler(self):
 
         original_route_handler = super().get_route_handler()
+        route_depth = self.path_format.rstrip("/").count("/")
         async def custom_route_handler(request: Request):
 
-            logger = app_logger if "/health" not in str(request.url) else health_check_logger
+            operational = request.url.path.startswith(OPERATIONAL_PATHS)
+            logger = health_check_logger if operational else app_logger
+            admission = None if operational else getattr(request.app.state, "admission", None)
+            # The route only knows its path within its router; the leading segments of the URL are the prefixes it was included under
+            segments = request.url.path.rstrip("/").split("/")
+            route = "/".join(segments[:len(segments) - route_depth]) + self.path_format
+            request_id = request.headers.get("x-request-id", "")
+            if not REQUEST_ID_PATTERN.match(request_id):
+                request_id = uuid.uuid4().hex
+            stats = {"db_time": 0.0, "db_calls": 0}
+            request_id_token = request_id_var.set(request_id)
+            stats_token = request_stats_var.set(stats)
+            HTTP_REQUESTS_IN_FLIGHT.inc(request.method, route)
+            started = time.perf_counter()
+            status_code, response = 500, None
             try:
-                response: Response = await original_route_handler(request)
                 try:
-                    status_phrase = HTTPStatus(response.status_code).phrase
-                except ValueError:
-                    status_phrase = "Unknown"
-                logger.debug(f"HTTP Response: {response.status_code} {status_phrase}\n")
-                return response
+                    async with admission.admit(request, route) if admission is not None else nullcontext():
+                        response = await original_route_handler(request)
 
-            except HTTPException as e:
-                try:
-                    status_phrase = HTTPStatus(e.status_code).phrase
-                except ValueError:
-                    status_phrase = "Unknown"
-                logger.debug(f"HTTP Response: {e.status_code} {status_phrase}\n")
-                return JSONResponse(
-                    content = {"detail": e.detail},
-                    status_code = e.status_code
+                except HTTPException as e:
+                    response = FastJSONResponse(
+                        content = {"detail": e.detail},
+                        status_code = e.status_code,
+                        headers = e.headers,
+                        )
+
+                except RequestValidationError:
+                    status_code = 422
+                    raise
+
+                except Exception:
+                    response = FastJSONResponse(
+                        content = {"detail": "Internal Server Error"},
+                        status_code = 500,
                     )
-            
-            except Exception as e:
-                logger.debug("HTTP Response: 500 Internal Server Error")
-                return JSONResponse(
-                    content = {"detail": "Internal Server Error"},
-                    status_code = 500,
-                )
+
+                status_code = response.status_code
+                response.headers["X-Request-ID"] = request_id
+                return response
+
+            finally:
+                duration = time.perf_counter() - started
+                HTTP_REQUESTS_IN_FLIGHT.dec(request.method, route)
+                HTTP_REQUESTS.inc(request.method, route, status_code)
+                HTTP_REQUEST_DURATION.observe(duration, request.method, route, status_code)
+                log_request(logger, request, route, status_code, duration, stats, response)
+                request_stats_var.reset(stats_token)
+                request_id_var.reset(request_id_token)
 
         return custom_route_handler
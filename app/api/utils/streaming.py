@@ -0,0 +1,29 @@
+from typing import AsyncIterator
+
+
+
+
+async def iter_ndjson_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Function Overview:
+    Splits a streamed request body into newline-delimited JSON records as the bytes arrive.
+
+    Function Logic:
+    1. Buffers only the incomplete trailing record of each received chunk, so the whole body is never held in memory.
+    2. Yields every non-blank line, including a final line without a trailing newline.
+
+    Parameters:
+    stream (AsyncIterator[bytes]): The raw request body stream (e.g. 'Request.stream()').
+
+    Returns:
+    AsyncIterator[bytes]: The non-blank lines of the body.
+    """
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
@@ -1,13 +1,31 @@
 from fastapi import FastAPI
-from .api import master_router, LoggingRoute
+from fastapi.responses import PlainTextResponse
+from .api import master_router, LoggingRoute, FastJSONResponse
+from .database import UserCache, ReadinessProbe, create_repository, create_article_repository
 from contextlib import asynccontextmanager
-from config.logging_config import fastapi_logging, healthcheck_logging
+from .metrics import registry
+from .passwords import PasswordHasher
+from .admission import AdmissionController
+from .ingestion import FeedIngestor
+from .locks import try_lock
+from config.logging_config import configure_logging, flush_logging, logging_stats
+from config.database_config import PoolSettings
+from config.cache_config import CacheSettings
+from config.health_config import HealthSettings
+from config.password_config import PasswordSettings
+from config.admission_config import AdmissionSettings
+from config.ingestion_config import IngestionSettings
+from config.dedup_config import DedupSettings
+from config.features_config import FeatureSettings
+from config.recommendation_config import RecommendationSettings
+from config.ann_config import AnnSettings
+from dotenv import load_dotenv
+import asyncio
+import os
 import logging
 
 
-# Initialise loggers
-fastapi_logging()
-healthcheck_logging()
+# Loggers (configured by the application lifespan, so importing the app has no side effect)
 app_logger = logging.getLogger('fastapi_logger')
 health_check_logger = logging.getLogger('health_check_logger')
 
@@ -21,12 +39,85 @@ async def lifespan(app: FastAPI):
     Lifecycle manager for the FastAPI application, used for setting up resources before the application starts.
 
     Function Logic:
-    1. Wait for the required resources (if any) to be setup before starting the application.
-    2. Yield control back to FastAPI to start the app, ensuring setup is completed first.
+    1. Load the environment variables from '.env' and configure the loggers, once per worker.
+    2. Open the users repository of the configured backend (Supabase, Postgres or in-memory), including its connection pool
+       (sized and tuned from environment variables), and the articles repository sharing its connections.
+    3. Create the read-through user cache, unless it is disabled, the 'Cache-Control' header of the cacheable user responses,
+       the password hasher's worker pool, the admission control applied by LoggingRoute and the readiness probe used by '/health/ready'.
+    4. Start the feed ingestion pipeline, if it is enabled and feeds are configured, in the single worker that takes the ingestion
+       lock ('INGESTION_LOCK_FILE'), with its article deduplication index and its TF-IDF featurizer unless they are disabled
+       (imported only then, so NumPy and SciPy are not loaded otherwise), and the recommender ranking the featurized articles for
+       '/users/{id}/recommendations' and the similarity index of their embeddings for '/articles/{id}/similar'. Workers not running
+       the ingestion open the featurized articles and the similarity index saved by the ingesting worker read-only, even before
+       it created their directories, and serve recommendations from them too.
+    5. Yield control back to FastAPI to start the app, ensuring setup is completed first.
+    6. Stop the feed ingestion (writing the articles already parsed), release the similarity index, close the featurizer's files
+       and release the ingestion lock, then close the user cache, the password hasher, the admission control and the repository
+       (draining its connection pool) once the application shuts down.
+    7. Flush the queued log records to their handlers.
     """
-    # Functions to setup any resources will be added here.
+    load_dotenv()
+    configure_logging()
+    cache_settings = CacheSettings.from_env()
+    pool_settings = PoolSettings.from_env()
+    ingestion_settings = IngestionSettings.from_env()
+    app.state.user_repository = create_repository(pool_settings)
+    app.state.article_repository = create_article_repository(pool_settings, app.state.user_repository)
+    app.state.user_cache = UserCache.from_settings(cache_settings) if cache_settings.enabled else None
+    app.state.user_cache_control = cache_settings.cache_control()
+    app.state.password_hasher = PasswordHasher(PasswordSettings.from_env())
+    app.state.admission = AdmissionController(AdmissionSettings.from_env())
+    app.state.readiness_probe = ReadinessProbe(app.state.user_repository, HealthSettings.from_env())
+    app.state.ingestor = app.state.deduplicator = app.state.featurizer = app.state.recommender = app.state.article_index = None
+    app.state.ingestion_lock = None
+    ann_settings = AnnSettings.from_env()
+    feature_settings = FeatureSettings.from_env()
+    ingesting = ingestion_settings.enabled and bool(ingestion_settings.feeds)
+    if ingesting:
+        app.state.ingestion_lock = try_lock(ingestion_settings.lock_file)
+        if app.state.ingestion_lock is None:
+            app_logger.info("Tag: Ingestion - Running in another worker process (lock '%s' is held)", ingestion_settings.lock_file)
+    if app.state.ingestion_lock:
+        dedup_settings = DedupSettings.from_env()
+        if dedup_settings.enabled:
+            from .dedup import Deduplicator
+            app.state.deduplicator = Deduplicator(dedup_settings)
+        if feature_settings.enabled:
+            from .features import Featurizer
+            app.state.featurizer = Featurizer(feature_settings)
+            if ann_settings.enabled:
+                from .ann import ArticleIndex
+                app.state.article_index = ArticleIndex(ann_settings)
+        app.state.ingestor = FeedIngestor(ingestion_settings, app.state.article_repository, app.state.deduplicator, app.state.featurizer, app.state.article_index)
+    else:
+        if feature_settings.enabled and (ingesting or os.path.isdir(feature_settings.directory)):
+            from .features import Featurizer
+            app.state.featurizer = Featurizer(feature_settings, readonly=True)
+        if ann_settings.enabled and (ingesting or os.path.isdir(ann_settings.directory)):
+            from .ann import ArticleIndex
+            app.state.article_index = ArticleIndex(ann_settings, readonly=True, featurizer=app.state.featurizer)
+    recommendation_settings = RecommendationSettings.from_env()
+    if app.state.featurizer and recommendation_settings.enabled:
+        from .recommendations import Recommender
+        app.state.recommender = Recommender(recommendation_settings, app.state.featurizer)
+    await app.state.user_repository.open()
+    if app.state.ingestor:
+        await app.state.ingestor.start()
     yield
-    # Functions to tear down any resources will be added here.
+    if app.state.ingestor:
+        await app.state.ingestor.stop()
+    if app.state.article_index:
+        app.state.article_index.close()
+    if app.state.featurizer:
+        app.state.featurizer.close()
+    if app.state.ingestion_lock:
+        app.state.ingestion_lock.close()
+    if app.state.user_cache:
+        await app.state.user_cache.close()
+    app.state.password_hasher.close()
+    await app.state.admission.close()
+    await app.state.user_repository.close()
+    await asyncio.to_thread(flush_logging)
 
 
 
@@ -43,6 +134,94 @@ app.router.route_class = LoggingRoute
 
 
 
+def collect_resource_metrics():
+    """
+    Function Overview:
+    Metrics collector reporting the stats already kept by the repository's connection pool, the user cache, the password hasher,
+    the admission control, the feed ingestion, deduplication, featurization, recommendations and similarity index and the log queues, read when '/metrics' is scraped.
+
+    Returns:
+    - An iterable of '(name, type, help, labels, value)' rows.
+    """
+    repository = getattr(app.state, "user_repository", None)
+    if repository is not None:
+        stats = repository.stats()
+        yield "database_pool_max_connections", "gauge", "Maximum connections in the database pool.", {}, stats["max_size"]
+        yield "database_pool_connections", "gauge", "Connections in the database pool.", {"state": "open"}, stats["open"]
+        yield "database_pool_connections", "gauge", "Connections in the database pool.", {"state": "in_use"}, stats["in_use"]
+
+    cache = getattr(app.state, "user_cache", None)
+    if cache is not None:
+        for tier, stats in cache.stats().items():
+            for event in ("hits", "misses", "evictions", "expirations"):
+                if event in stats:
+                    yield f"user_cache_{event}_total", "counter", f"User cache {event}.", {"tier": tier}, stats[event]
+            if "entries" in stats:
+                yield "user_cache_entries", "gauge", "Entries in the user cache.", {"tier": tier}, stats["entries"]
+
+    hasher = getattr(app.state, "password_hasher", None)
+    if hasher is not None:
+        stats = hasher.stats()
+        yield "password_hash_workers", "gauge", "Threads hashing and verifying passwords.", {}, stats["workers"]
+        yield "password_hash_pending", "gauge", "Password hashes and verifications running or waiting for a thread.", {}, stats["pending"]
+
+    admission = getattr(app.state, "admission", None)
+    if admission is not None:
+        stats = admission.stats()
+        if stats["rate_limit"] and "clients" in stats["rate_limit"]:
+            yield "rate_limit_clients", "gauge", "Clients with a rate limit bucket in this worker.", {}, stats["rate_limit"]["clients"]
+        for route_key, route_stats in stats["routes"].items():
+            method, route = route_key.split(" ", 1)
+            yield "admission_route_limit", "gauge", "Requests a route may handle at once.", {"method": method, "route": route}, route_stats["limit"]
+            yield "admission_route_active", "gauge", "Requests a route is handling.", {"method": method, "route": route}, route_stats["active"]
+            yield "admission_route_queued", "gauge", "Requests waiting for a route.", {"method": method, "route": route}, route_stats["queued"]
+
+    ingestor = getattr(app.state, "ingestor", None)
+    if ingestor is not None:
+        stats = ingestor.stats()
+        yield "ingestion_feeds", "gauge", "Feeds polled by the ingestion pipeline.", {}, stats["feeds"]
+        yield "ingestion_feeds_queued", "gauge", "Feeds due and waiting for an ingestion worker.", {}, stats["queued"]
+        yield "ingestion_feeds_fetching", "gauge", "Feeds being fetched and parsed.", {}, stats["fetching"]
+        yield "ingestion_articles_pending", "gauge", "Parsed articles waiting to be written.", {}, stats["pending_articles"]
+
+    deduplicator = getattr(app.state, "deduplicator", None)
+    if deduplicator is not None:
+        stats = deduplicator.stats()
+        yield "dedup_index_articles", "gauge", "Articles of the deduplication window.", {}, stats["articles"]
+        yield "dedup_index_bytes", "gauge", "Approximate memory used by the deduplication index.", {}, stats["bytes"]
+
+    featurizer = getattr(app.state, "featurizer", None)
+    if featurizer is not None:
+        stats = featurizer.stats()
+        yield "features_articles", "gauge", "Articles with a stored TF-IDF vector.", {}, stats["articles"]
+        yield "features_terms", "gauge", "Terms of the TF-IDF vocabulary.", {}, stats["terms"]
+        yield "features_store_bytes", "gauge", "Size of the TF-IDF vector files.", {}, stats["bytes"]
+
+    recommender = getattr(app.state, "recommender", None)
+    if recommender is not None:
+        stats = recommender.stats()
+        yield "recommendation_candidates", "gauge", "Latest articles ranked for recommendations.", {}, stats["candidates"]
+        yield "recommendation_candidate_bytes", "gauge", "Memory used by the candidate article vectors.", {}, stats["candidate_bytes"]
+        for event in ("hits", "misses", "evictions", "expirations"):
+            yield f"recommendation_cache_{event}_total", "counter", f"Recommendation cache {event}.", {}, stats["cache"][event]
+
+    article_index = getattr(app.state, "article_index", None)
+    if article_index is not None:
+        stats = article_index.stats()
+        yield "ann_articles", "gauge", "Articles in the similarity index.", {}, stats["articles"]
+        yield "ann_segments", "gauge", "Saved segments of the similarity index.", {}, stats["segments"]
+        yield "ann_bytes", "gauge", "Size of the similarity index's embeddings and lists.", {}, stats["bytes"]
+
+    for logger_name, stats in logging_stats().items():
+        yield "log_queue_records", "gauge", "Log records waiting to be written.", {"logger": logger_name}, stats["queued"]
+        yield "log_records_dropped_total", "counter", "Log records dropped because the log queue was full.", {"logger": logger_name}, stats["dropped"]
+
+
+registry.add_collector(collect_resource_metrics)
+
+
+
+
 @app.get('/')
 async def read_root() -> dict:
     """
@@ -64,16 +243,55 @@ async def read_root() -> dict:
 
 
 @app.get('/health')
+@app.get('/health/live')
 async def health_check() -> dict:
     """
     Endpoint Overview:
-    Health check route to monitor the FastAPI application.
+    Liveness check route to monitor the FastAPI application.
 
     Function Logic:
-    1. The endpoint responds with a simple JSON message indicating that the health of the application is OK.
+    1. The endpoint responds with a simple JSON message indicating that the process is up and its event loop is responsive.
+    2. It does not check any dependency, so a database outage never causes the process to be restarted; use '/health/ready' for that.
 
     Returns:
     - A dictionary with the status of the application.
     """
     health_check_logger.info("FastAPI application healthy.")
     return {"status": "healthy"}
+
+
+
+
+@app.get('/health/ready')
+async def readiness_check() -> FastJSONResponse:
+    """
+    Endpoint Overview:
+    Readiness check route used by load balancers and orchestrators to decide whether the instance should receive traffic.
+
+    Function Logic:
+    1. The endpoint checks that the database answers and that the connection pool is not saturated, reusing the result for a short window.
+    2. It responds with 200 when the instance is ready, and 503 otherwise so the instance is drained.
+    3. The body carries the status and latency of every component.
+
+    Returns:
+    - A JSON response with the readiness of the instance and of each component.
+    """
+    result = await app.state.readiness_probe.check()
+    return FastJSONResponse(content=result, status_code=200 if result["status"] == "ready" else 503)
+
+
+
+
+@app.get('/metrics', response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """
+    Endpoint Overview:
+    Exposes the application metrics in the Prometheus text exposition format.
+
+    Function Logic:
+    1. Renders the request, latency and data layer metrics recorded so far, plus the current pool, cache and log queue stats.
+
+    Returns:
+    - A plain text response in the Prometheus text format (version 0.0.4).
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1 +1,22 @@
-from .users import create_user, fetch_user, fetch_id, update_user, delete_user
+from .users import create_user, create_users, fetch_user, fetch_id, fetch_users, fetch_ids, list_users, authenticate_user, update_user, patch_user, delete_user, delete_users
+from .articles import store_articles, fetch_article, list_articles, fetch_recommendations, record_interaction, fetch_similar_articles
+from .cache import UserCache, MemoryCache, RedisCache
+from .health import ReadinessProbe
+from .repository import UserRepository, ArticleRepository, RepositoryError, DuplicateKeyError, create_repository, create_article_repository
+from .singleflight import SingleFlight
+from .memory_repository import MemoryUserRepository, MemoryArticleRepository
+
+
+# Exports that pull in the Supabase client (a large import), loaded on first access so importing the app stays fast
+LAZY_EXPORTS = {
+    "DatabasePool": ".pool",
+    "SupabaseUserRepository": ".supabase_repository",
+    "SupabaseArticleRepository": ".supabase_repository",
+    }
+
+
+def __getattr__(name: str):
+    if name in LAZY_EXPORTS:
+        import importlib
+        return getattr(importlib.import_module(LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
@@ -0,0 +1,289 @@
+from typing import TYPE_CHECKING, List, Dict, Any
+from .repository import ArticleRepository, RepositoryError, ARTICLE_KEY
+from .users import BULK_CHUNK_SIZE
+from app.metrics import track_database_call
+from app.schema.users import MessageResponse
+from app.schema.articles import ArticleRecord, ArticleDataResponse, ArticleListQuery, ArticleListResponse, ArticleDetailsResponse, ArticlePageResponse
+from app.schema.articles import RecommendationQuery, InteractionRequest, RecommendedArticle, RecommendationListResponse, RecommendationResponse
+from app.schema.articles import SimilarArticleQuery, SimilarArticle, SimilarArticleListResponse, SimilarArticlesResponse
+
+if TYPE_CHECKING:
+    from app.recommendations import Recommender
+    from app.ann import ArticleIndex
+
+
+
+
+@track_database_call
+async def store_articles(records: List[ArticleRecord], repository: ArticleRepository, chunk_size: int = BULK_CHUNK_SIZE) -> List[Dict[str, Any]]:
+    """
+    Function Overview:
+    Stores a batch of ingested articles, sending the rows to the database in chunks of multi-row inserts.
+
+    Function Logic:
+    1. Articles repeating the feed URL and GUID of an earlier article of the batch are dropped.
+    2. The function splits the remaining articles into chunks of 'chunk_size' rows and inserts each chunk with a single statement;
+       articles already stored (e.g. read again from a feed that was not cached) are skipped by the database.
+    3. It returns the rows actually inserted, so the caller can count the duplicates.
+    4. Depending on the error raised:
+        - RepositoryError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message. The chunks
+          inserted before the failure stay stored; inserting the batch again is safe.
+
+    Parameters:
+    records (List[ArticleRecord]): The articles to store.
+    repository (ArticleRepository): Storage backend of the articles table.
+    chunk_size (int): Number of rows sent in a single insert statement.
+
+    Returns:
+    List[Dict[str, Any]]: The stored rows of the articles that were not already stored.
+    """
+    try:
+        unique: Dict[tuple, ArticleRecord] = {}
+        for record in records:
+            unique.setdefault(tuple(getattr(record, column) for column in ARTICLE_KEY), record)
+        rows = [record.model_dump(mode="json") for record in unique.values()]
+
+        inserted: List[Dict[str, Any]] = []
+        for start in range(0, len(rows), chunk_size):
+            inserted.extend(await repository.insert_articles(rows[start:start + chunk_size]))
+        return inserted
+
+    except RepositoryError as e:
+        raise RuntimeError(f"API Error: {e}") from e
+
+    except Exception as e:
+        raise RuntimeError(f"Unexpected Error: {e}") from e
+
+
+
+
+@track_database_call
+async def fetch_article(id: int, repository: ArticleRepository) -> ArticleDetailsResponse:
+    """
+    Function Overview:
+    Fetches the data of an article, including its duplicate cluster, based on the given article ID.
+
+    Function Logic:
+    1. The function attempts to fetch the article for the provided article ID.
+    2. If successful, it returns a structured response wrapped in the GeneralResponse schema.
+    3. Depending on the error raised:
+        - ValueError: Raised if the requested article does not exist.
+        - RepositoryError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
+
+    Parameters:
+    id (int): The article ID whose data is to be fetched.
+    repository (ArticleRepository): Storage backend of the articles table.
+
+    Returns:
+    GeneralResponse: A response containing the requested article's data.
+    """
+    try:
+        rows = await repository.get_articles([id])
+        if not rows:
+            raise ValueError()
+        return ArticleDetailsResponse(
+            detail = f"Details for article ID '{id}' fetched successfully.",
+            data = ArticleDataResponse(**rows[0])
+            )
+
+    except RepositoryError as e:
+        raise RuntimeError(f"API Error: {e}") from e
+
+    except ValueError as e:
+        raise ValueError(f"Article ID '{id}' not found.") from e
+
+    except Exception as e:
+        raise RuntimeError(f"Unexpected Error: {e}") from e
+
+
+
+
+@track_database_call
+async def list_articles(query: ArticleListQuery, repository: ArticleRepository) -> ArticlePageResponse:
+    """
+    Function Overview:
+    Fetches a page of the latest articles, optionally limited to a duplicate cluster, using keyset pagination on the article ID.
+
+    Function Logic:
+    1. The function fetches the articles below 'before_id' (if provided), newest first, plus one extra row to know whether a next page exists.
+    2. It returns the page and the 'before_id' of the next page (the ID of the last article of the page) wrapped in the GeneralResponse schema.
+    3. Depending on the error raised:
+        - RepositoryError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
+
+    Parameters:
+    query (ArticleListQuery): The page size, position and cluster filter of the listing.
+    repository (ArticleRepository): Storage backend of the articles table.
+
+    Returns:
+    GeneralResponse: A response containing the page of articles and the position of the next page.
+    """
+    try:
+        fetched = await repository.list_articles(query.cluster_id, query.before_id, query.limit + 1)
+
+        rows = fetched[:query.limit]
+        return ArticlePageResponse(
+            detail = f"{len(rows)} articles fetched successfully.",
+            data = ArticleListResponse(
+                articles = [ArticleDataResponse(**row) for row in rows],
+                next_before_id = rows[-1]["article_id"] if len(fetched) > query.limit else None,
+                )
+            )
+
+    except RepositoryError as e:
+        raise RuntimeError(f"API Error: {e}") from e
+
+    except Exception as e:
+        raise RuntimeError(f"Unexpected Error: {e}") from e
+
+
+
+
+@track_database_call
+async def fetch_recommendations(id: int, query: RecommendationQuery, recommender: "Recommender", repository: ArticleRepository) -> RecommendationResponse:
+    """
+    Function Overview:
+    Fetches the articles recommended to a user, ranked by similarity with the user's interests.
+
+    Function Logic:
+    1. The function returns the list cached in this worker for the user and the limit, if it is still fresh, without reading the
+       database.
+    2. Otherwise it reads the user's stored interest vector (kept current by 'record_interaction' in every worker), ranks the
+       latest articles with the recommender, fetches the ranked articles with a single 'in' query and caches the list (articles
+       removed in the meantime are left out).
+    3. If successful, it returns the recommended articles with their scores, best first, wrapped in the GeneralResponse schema.
+    4. Depending on the error raised:
+        - RepositoryError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
+
+    Parameters:
+    id (int): The user ID whose recommendations are to be fetched.
+    query (RecommendationQuery): The number of articles to recommend.
+    recommender (Recommender): The ranking of articles by user interests, with its cache of ranked lists.
+    repository (ArticleRepository): Storage backend of the articles and user interests tables.
+
+    Returns:
+    GeneralResponse: A response containing the recommended articles.
+    """
+    try:
+        recommendations = await recommender.cached(id, query.limit)
+        if recommendations is None:
+            generation = recommender.generation
+            ranked = await recommender.recommend(await repository.get_interests(id), query.limit)
+            rows = {row["article_id"]: row for row in await repository.get_articles([article_id for article_id, _ in ranked])} if ranked else {}
+            recommendations = [{**rows[article_id], "score": score} for article_id, score in ranked if article_id in rows]
+            await recommender.cache_list(id, query.limit, recommendations, generation)
+
+        return RecommendationResponse(
+            detail = f"{len(recommendations)} articles recommended for user ID '{id}'.",
+            data = RecommendationListResponse(recommendations=[RecommendedArticle(**row) for row in recommendations])
+            )
+
+    except RepositoryError as e:
+        raise RuntimeError(f"API Error: {e}") from e
+
+    except Exception as e:
+        raise RuntimeError(f"Unexpected Error: {e}") from e
+
+
+
+
+@track_database_call
+async def record_interaction(id: int, data: InteractionRequest, recommender: "Recommender", repository: ArticleRepository) -> MessageResponse:
+    """
+    Function Overview:
+    Records an interaction of a user with an article and folds it into the user's stored interest vector.
+
+    Function Logic:
+    1. The function checks that the article has been featurized, then inserts the interaction into the 'interactions' table.
+    2. It reads the user's stored interest vector and the interactions recorded after its version (the latest interaction folded
+       into it), including those recorded concurrently by other requests, folds them into the vector (rebuilding it from the
+       latest 'history' interactions if it is missing or that far behind) and stores it unless a newer version was stored in the
+       meantime; the user's recommendations cached in this worker are dropped.
+    3. If successful, it returns a message response confirming the interaction was recorded.
+    4. Depending on the error raised:
+        - ValueError: Raised if the article does not exist or has not been featurized yet.
+        - RepositoryError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
+
+    Parameters:
+    id (int): The user ID.
+    data (InteractionRequest): The article and the strength of the interaction.
+    recommender (Recommender): The ranking of articles by user interests, which checks the article has a TF-IDF vector.
+    repository (ArticleRepository): Storage backend of the interactions and user interests tables.
+
+    Returns:
+    MessageResponse: A response confirming the interaction was recorded.
+    """
+    try:
+        await recommender.check(data.article_id)
+        await repository.insert_interaction({"user_id": id, "article_id": data.article_id, "weight": data.weight})
+        stored = await repository.get_interests(id)
+        history = recommender.settings.history
+        pending = await repository.get_interactions(id, history, after=stored["interaction_id"] if stored else None)
+        await repository.save_interests(recommender.update(id, stored if len(pending) < history else None, pending))
+        await recommender.invalidate(id)
+        return MessageResponse(
+            detail = f"Interaction of user ID '{id}' with article ID '{data.article_id}' recorded successfully.",
+            data = None
+            )
+
+    except ValueError as e:
+        raise ValueError(f"Article ID '{data.article_id}' not found.") from e
+
+    except RepositoryError as e:
+        raise RuntimeError(f"API Error: {e}") from e
+
+    except Exception as e:
+        raise RuntimeError(f"Unexpected Error: {e}") from e
+
+
+
+
+@track_database_call
+async def fetch_similar_articles(id: int, query: SimilarArticleQuery, index: "ArticleIndex", repository: ArticleRepository) -> SimilarArticlesResponse:
+    """
+    Function Overview:
+    Fetches the articles most similar to an article ("more like this"), from the approximate nearest-neighbour index.
+
+    Function Logic:
+    1. The function refreshes a read-only index (at most every 'refresh_interval' seconds, in a thread), then searches it for
+       twice the requested number of neighbours of the article's embedding.
+    2. It fetches the neighbours and the article itself with a single 'in' query, and leaves out the copies of the same story
+       (the articles of the article's duplicate cluster) and the articles removed in the meantime.
+    3. If successful, it returns the remaining articles with their similarity, most similar first, wrapped in the GeneralResponse schema.
+    4. Depending on the error raised:
+        - ValueError: Raised if the article does not exist, has not been indexed yet or has expired from the index.
+        - RepositoryError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
+
+    Parameters:
+    id (int): The article ID whose similar articles are to be fetched.
+    query (SimilarArticleQuery): The number of articles to return.
+    index (ArticleIndex): The nearest-neighbour index of the article embeddings.
+    repository (ArticleRepository): Storage backend of the articles table.
+
+    Returns:
+    GeneralResponse: A response containing the similar articles.
+    """
+    try:
+        await index.refresh()
+        neighbours = index.similar(id, 2 * query.limit)
+        rows = {row["article_id"]: row for row in await repository.get_articles([id, *(article_id for article_id, _ in neighbours)])}
+        if id not in rows:
+            raise ValueError()
+        cluster = rows[id].get("cluster_id")
+        similar = [
+            {**rows[article_id], "similarity": similarity} for article_id, similarity in neighbours
+            if article_id in rows and (cluster is None or rows[article_id].get("cluster_id") != cluster)
+            ][:query.limit]
+
+        return SimilarArticlesResponse(
+            detail = f"{len(similar)} articles similar to article ID '{id}' found.",
+            data = SimilarArticleListResponse(articles=[SimilarArticle(**row) for row in similar])
+            )
+
+    except RepositoryError as e:
+        raise RuntimeError(f"API Error: {e}") from e
+
+    except ValueError as e:
+        raise ValueError(f"Article ID '{id}' not found.") from e
+
+    except Exception as e:
+        raise RuntimeError(f"Unexpected Error: {e}") from e
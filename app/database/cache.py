@@ -0,0 +1,412 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from config.cache_config import CacheSettings
+from app.schema.users import PUBLIC_USER_FIELDS
+
+
+logger = logging.getLogger('fastapi_logger')
+
+# Shared invalidation clock: every invalidation advances it and stamps the invalidated keys' version keys with its value
+VERSION_CLOCK_KEY = "version:clock"
+
+# Stamps the version keys (KEYS) with a new value of the clock (ARGV: the version keys' TTL in milliseconds)
+BUMP_SCRIPT = """
+local clock = redis.call('INCR', '""" + VERSION_CLOCK_KEY + """')
+for index = 1, #KEYS do
+    redis.call('SET', KEYS[index], clock, 'PX', ARGV[1])
+end
+return clock
+"""
+
+# Sets a group of entries only if none of its guarding version keys was stamped after the clock value read before the query
+# (KEYS: the version keys, then the entries' keys; ARGV: the clock value, the number of version keys, the TTL in milliseconds,
+# then the entries' values)
+SET_IF_VERSION_SCRIPT = """
+local guards = tonumber(ARGV[2])
+for index = 1, guards do
+    if tonumber(redis.call('GET', KEYS[index]) or '0') > tonumber(ARGV[1]) then
+        return 0
+    end
+end
+for index = guards + 1, #KEYS do
+    redis.call('SET', KEYS[index], ARGV[index - guards + 3], 'PX', ARGV[3])
+end
+return 1
+"""
+
+# Version keys outlive the entries they guard by this factor, so a slow read cannot see a version reset by expiry
+VERSION_TTL_FACTOR = 10
+
+
+
+
+class MemoryCache:
+    """
+    Class Overview:
+    In-process LRU cache whose entries also expire after a fixed time-to-live.
+
+    Function Logic:
+    1. Entries are kept in insertion/access order; reading an entry moves it to the most recently used end.
+    2. Expired entries are dropped when they are read; when the cache is full the least recently used entry is evicted.
+    3. Hit, miss, eviction and expiration counters are kept to help size the cache.
+
+    Parameters:
+    max_entries (int): Number of entries kept before evicting.
+    ttl (float): Seconds an entry stays valid.
+    """
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        return [await self.get(key) for key in keys]
+
+
+    async def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            }
+
+
+
+
+class RedisCache:
+    """
+    Class Overview:
+    Shared cache backend stored on a Redis-compatible server, so every worker sees the same entries.
+
+    Function Logic:
+    1. Values are stored as JSON with the configured time-to-live; the server handles expiry and eviction.
+    2. Invalidations advance a shared clock and stamp the 'version:{key}' of the invalidated keys with it; backfills from reads
+       are only stored (atomically, by a server-side script) if none of their keys was stamped after the clock value read before
+       the database query, so a read that raced a write in any worker cannot store its stale row.
+    3. The 'redis' package is an optional dependency and is only imported when this backend is configured.
+
+    Parameters:
+    url (str): Connection URL of the Redis-compatible server.
+    ttl (float): Seconds an entry stays valid.
+    """
+    def __init__(self, url: str, ttl: float):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("The 'redis' package is required when USER_CACHE_REDIS_URL is set.") from e
+        self.ttl = ttl
+        self._redis = redis.from_url(url)
+        self.hits = self.misses = 0
+
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._redis.get(key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        # A single MGET round trip for the whole batch
+        raw = await self._redis.mget(keys) if keys else []
+        self.hits += sum(1 for value in raw if value is not None)
+        self.misses += sum(1 for value in raw if value is None)
+        return [json.loads(value) if value is not None else None for value in raw]
+
+
+    async def set(self, key: str, value: Any) -> None:
+        await self._redis.set(key, json.dumps(value), px=int(self.ttl * 1000))
+
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._redis.delete(*keys)
+
+
+    async def clock(self) -> int:
+        return int(await self._redis.get(VERSION_CLOCK_KEY) or 0)
+
+
+    async def bump(self, *keys: str) -> None:
+        await self._redis.eval(BUMP_SCRIPT, len(keys), *(f"version:{key}" for key in keys), int(self.ttl * 1000 * VERSION_TTL_FACTOR))
+
+
+    async def set_if_version(self, clock: int, groups: List[Tuple[List[str], Dict[str, Any]]]) -> None:
+        # Every group is '(guarding keys, entries)'; all groups are sent in one round trip
+        async with self._redis.pipeline(transaction=False) as pipeline:
+            for guards, entries in groups:
+                pipeline.eval(
+                    SET_IF_VERSION_SCRIPT, len(guards) + len(entries), *(f"version:{key}" for key in guards), *entries,
+                    clock, len(guards), int(self.ttl * 1000), *(json.dumps(value) for value in entries.values()),
+                    )
+            await pipeline.execute()
+
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+
+
+class UserCache:
+    """
+    Class Overview:
+    Read-through cache for user profiles ('user:{id}') and username lookups ('username:{username}').
+
+    Function Logic:
+    1. Reads check the in-process cache first, then the optional shared backend (populating the in-process cache on a hit).
+    2. Whenever a username to ID entry is stored, the reverse 'username_of:{id}' entry is stored too,
+       so invalidating a user also removes the entry for the username it had before an update or delete.
+    3. Failures of the shared backend are logged and treated as misses, so the database remains the source of truth.
+    4. Entries stored by reads are backfills: a read takes the cache's 'generation' before querying the database, and its rows
+       are only stored if no write invalidated their keys since (the user's, and the username's for a username lookup).
+       Invalidations advance the generation (a counter per process, and a clock in the shared backend) and stamp the invalidated
+       keys with it before deleting the entries, so a read that raced a write never brings back the row the write replaced or
+       deleted. Writes store their own rows unconditionally.
+    5. Invalidated keys are remembered up to the local cache's 'max_entries'; a generation older than the oldest forgotten
+       invalidation is treated as changed, which only skips a backfill.
+
+    Parameters:
+    local (MemoryCache): The in-process LRU/TTL cache.
+    shared (Optional[RedisCache]): An optional backend shared between workers.
+    """
+    def __init__(self, local: MemoryCache, shared: Optional[RedisCache] = None):
+        self.local = local
+        self.shared = shared
+        self._sequence = 0
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self._forgotten = 0
+
+
+    @classmethod
+    def from_settings(cls, settings: CacheSettings) -> "UserCache":
+        shared = RedisCache(settings.redis_url, settings.ttl) if settings.redis_url else None
+        return cls(MemoryCache(settings.max_entries, settings.local_ttl), shared)
+
+
+    async def _get(self, key: str) -> Optional[Any]:
+        value = await self.local.get(key)
+        if value is None and self.shared is not None:
+            sequence = self._sequence
+            try:
+                value = await self.shared.get(key)
+            except Exception as e:
+                logger.warning("Tag: Cache - Shared cache read failed for '%s': [%s]", key, e)
+                return None
+            if value is not None and self._unchanged(key, sequence):
+                await self.local.set(key, value)
+        return value
+
+
+    async def _get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        # Like '_get' for a batch: one local lookup per key, then a single shared round trip for all the local misses
+        values = await self.local.get_many(keys)
+        missing = [index for index, value in enumerate(values) if value is None]
+        if missing and self.shared is not None:
+            sequence = self._sequence
+            try:
+                shared = await self.shared.get_many([keys[index] for index in missing])
+            except Exception as e:
+                logger.warning("Tag: Cache - Shared cache read failed for %s keys: [%s]", len(missing), e)
+                return values
+            for index, value in zip(missing, shared):
+                values[index] = value
+                if value is not None and self._unchanged(keys[index], sequence):
+                    await self.local.set(keys[index], value)
+        return values
+
+
+    def _unchanged(self, key: str, sequence: int) -> bool:
+        # Whether no invalidation of the key happened after the local generation 'sequence' was taken
+        return self._forgotten <= sequence and self._invalidated.get(key, 0) <= sequence
+
+
+    async def generation(self) -> Tuple[int, Optional[int]]:
+        """
+        Function Overview:
+        Returns the current generation of the cache, to be taken before reading users from the database and passed to
+        'backfill_users' or 'backfill_user_ids'.
+        """
+        clock = None
+        if self.shared is not None:
+            try:
+                clock = await self.shared.clock()
+            except Exception as e:
+                # Without the shared clock the backfill only goes to the local cache
+                logger.warning("Tag: Cache - Shared cache clock read failed: [%s]", e)
+        return self._sequence, clock
+
+
+    async def _backfill(self, generation: Tuple[int, Optional[int]], groups: List[Tuple[List[str], Dict[str, Any]]]) -> None:
+        # Stores the entries of every '(guarding keys, entries)' group none of whose keys was invalidated since the generation
+        sequence, clock = generation
+        groups = [(guards, entries) for guards, entries in groups if all(self._unchanged(key, sequence) for key in guards)]
+        for _, entries in groups:
+            for key, value in entries.items():
+                await self.local.set(key, value)
+        if self.shared is not None and clock is not None and groups:
+            try:
+                await self.shared.set_if_version(clock, groups)
+            except Exception as e:
+                logger.warning("Tag: Cache - Shared cache backfill failed for %s entries: [%s]", len(groups), e)
+
+
+    async def _bump(self, *keys: str) -> None:
+        self._sequence += 1
+        for key in keys:
+            self._invalidated[key] = self._sequence
+            self._invalidated.move_to_end(key)
+        while len(self._invalidated) > self.local.max_entries:
+            _, sequence = self._invalidated.popitem(last=False)
+            self._forgotten = max(self._forgotten, sequence)
+        if self.shared is not None:
+            try:
+                await self.shared.bump(*keys)
+            except Exception as e:
+                logger.warning("Tag: Cache - Shared cache version bump failed for %s: [%s]", keys, e)
+
+
+    async def _set(self, entries: dict) -> None:
+        for key, value in entries.items():
+            await self.local.set(key, value)
+            if self.shared is not None:
+                try:
+                    await self.shared.set(key, value)
+                except Exception as e:
+                    logger.warning("Tag: Cache - Shared cache write failed for '%s': [%s]", key, e)
+
+
+    async def _delete(self, *keys: str) -> None:
+        await self.local.delete(*keys)
+        if self.shared is not None:
+            try:
+                await self.shared.delete(*keys)
+            except Exception as e:
+                logger.warning("Tag: Cache - Shared cache delete failed for %s: [%s]", keys, e)
+
+
+    async def get_user(self, id: int) -> Optional[dict]:
+        return await self._get(f"user:{id}")
+
+
+    async def get_user_id(self, username: str) -> Optional[int]:
+        return await self._get(f"username:{username}")
+
+
+    async def get_users(self, ids: List[int]) -> Dict[int, dict]:
+        # The cached profiles among the given user IDs, fetched with a single shared round trip
+        return {id: value for id, value in zip(ids, await self._get_many([f"user:{id}" for id in ids])) if value}
+
+
+    async def get_user_ids(self, usernames: List[str]) -> Dict[str, int]:
+        values = await self._get_many([f"username:{username}" for username in usernames])
+        return {username: value for username, value in zip(usernames, values) if value is not None}
+
+
+    @staticmethod
+    def _user_entries(row: dict) -> dict:
+        # Rows returned by writes carry the password hash, which must never reach the cache (possibly shared with other services)
+        id, username = row["user_id"], row["username"]
+        profile = {column: row.get(column) for column in PUBLIC_USER_FIELDS}
+        return {f"user:{id}": profile, f"username:{username}": id, f"username_of:{id}": username}
+
+
+    async def set_user(self, row: dict) -> None:
+        await self._set(self._user_entries(row))
+
+
+    async def set_user_id(self, username: str, id: int) -> None:
+        await self._set({f"username:{username}": id, f"username_of:{id}": username})
+
+
+    async def backfill_users(self, rows: List[dict], generation: Tuple[int, Optional[int]]) -> None:
+        """
+        Function Overview:
+        Stores users read from the database, skipping those invalidated by a write since the generation was taken.
+        """
+        await self._backfill(generation, [([f"user:{row['user_id']}"], self._user_entries(row)) for row in rows])
+
+
+    async def backfill_user_ids(self, user_ids: Dict[str, int], generation: Tuple[int, Optional[int]]) -> None:
+        """
+        Function Overview:
+        Stores username lookups read from the database, skipping those whose username or user was invalidated by a write since
+        the generation was taken (e.g. a user renamed while its previous username was being looked up).
+        """
+        await self._backfill(generation, [
+            ([f"username:{username}", f"user:{id}"], {f"username:{username}": id, f"username_of:{id}": username})
+            for username, id in user_ids.items()
+            ])
+
+
+    async def invalidate_user(self, id: int, *usernames: str) -> None:
+        """
+        Function Overview:
+        Removes every entry related to a user, keeping the username and profile entries consistent; the generation of the user
+        and of its usernames is bumped first, so reads started before the write cannot store their rows afterwards.
+
+        Parameters:
+        id (int): The user ID whose entries are removed.
+        usernames (str): Usernames known to belong (or to have belonged) to the user.
+        """
+        previous = await self._get(f"username_of:{id}")
+        keys = {f"user:{id}", f"username_of:{id}", *(f"username:{username}" for username in usernames)}
+        if previous is not None:
+            keys.add(f"username:{previous}")
+        await self._bump(*(key for key in keys if not key.startswith("username_of:")))
+        await self._delete(*keys)
+
+
+    async def close(self) -> None:
+        if self.shared is not None:
+            await self.shared.close()
+
+
+    def stats(self) -> dict:
+        stats = {"local": self.local.stats()}
+        if self.shared is not None:
+            stats["shared"] = self.shared.stats()
+        return stats
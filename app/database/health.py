@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional
+from config.health_config import HealthSettings
+from .repository import UserRepository
+
+
+logger = logging.getLogger('health_check_logger')
+
+
+
+
+class ReadinessProbe:
+    """
+    Class Overview:
+    Checks whether the instance can serve traffic: the database answers and the connection pool is not saturated.
+
+    Function Logic:
+    1. The database is probed with the cheapest possible query, bounded by 'probe_timeout', and its latency is recorded; a failed
+       probe is logged and only reported by the class of its error.
+    2. The connection pool utilisation (if the backend has a pool) is compared with 'pool_saturation_threshold', so an instance queueing for connections is drained.
+    3. Results are cached for 'cache_ttl' seconds and concurrent checks share a single probe, so frequent
+       readiness probes from load balancers and orchestrators do not add load on the database.
+
+    Parameters:
+    repository (UserRepository): The users repository to check.
+    settings (HealthSettings): Cache window, probe timeout and saturation threshold.
+    """
+    def __init__(self, repository: UserRepository, settings: HealthSettings):
+        self.repository = repository
+        self.settings = settings
+        self._result: Optional[dict] = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+
+    async def check(self) -> dict:
+        """
+        Function Overview:
+        Returns the current readiness of the instance, probing the dependencies only if the cached result has expired.
+
+        Returns:
+        dict: The overall status ('ready' or 'not_ready'), whether the result came from the cache, when it was checked,
+              and the status and latency of every component.
+        """
+        if self._result is not None and time.monotonic() < self._expires_at:
+            return {**self._result, "cached": True}
+        async with self._lock:
+            if self._result is not None and time.monotonic() < self._expires_at:
+                return {**self._result, "cached": True}
+            self._result = await self._probe()
+            self._expires_at = time.monotonic() + self.settings.cache_ttl
+            return {**self._result, "cached": False}
+
+
+    async def _probe(self) -> dict:
+        pool_stats = self.repository.stats()
+        utilisation = pool_stats["in_use"] / pool_stats["max_size"] if pool_stats["max_size"] else 0.0
+        pool_status = "up" if utilisation < self.settings.pool_saturation_threshold else "saturated"
+
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.repository.ping(), timeout=self.settings.probe_timeout)
+            database = {"status": "up"}
+        except asyncio.TimeoutError:
+            database = {"status": "down", "error": f"No response within {self.settings.probe_timeout}s"}
+        except Exception as e:
+            # The reason is logged; the unauthenticated response only names the kind of failure, never hosts or credentials
+            logger.error("Tag: Health - Database probe failed: [%s: %s]", type(e).__name__, e)
+            database = {"status": "down", "error": type(e).__name__}
+        database["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+        ready = database["status"] == "up" and pool_status == "up"
+        if not ready:
+            logger.warning("Tag: Health - Readiness check failed: [database: %s, pool: %s]", database["status"], pool_status)
+        return {
+            "status": "ready" if ready else "not_ready",
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+            "components": {
+                "database": database,
+                "pool": {"status": pool_status, "utilisation": round(utilisation, 3), **pool_stats},
+                },
+            }
@@ -0,0 +1,247 @@
+import functools
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.schema.users import UserListQuery, PUBLIC_USER_FIELDS
+from .repository import UserRepository, ArticleRepository, DuplicateKeyError, record_database_call, UNIQUE_COLUMNS, ARTICLE_KEY
+
+
+
+
+def _counted(method: Callable) -> Callable:
+    # Counts every operation as a database round-trip of the API request being handled, like the statements of the other backends
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            record_database_call(started)
+
+    return wrapper
+
+
+
+
+class MemoryUserRepository(UserRepository):
+    """
+    Class Overview:
+    User repository keeping the 'users' table in process, with hash indexes on the unique columns.
+
+    Function Logic:
+    1. Rows are stored by 'user_id', assigned from an auto-incrementing counter, and stamped with 'created_at' and 'updated_at'
+       on insert, and with a new 'updated_at' on every update.
+    2. A hash index per unique column ('email_id', 'username') makes lookups O(1) and rejects duplicates like Postgres would.
+    3. Every write is validated before any row is changed, so multi-row statements are atomic.
+    4. IDs are kept in a sorted list; since both 'user_id' and 'created_at' grow with every insert, that list is also the
+       'created_at' order, so a page is found by binary search on the cursor and costs O(page size) without filters.
+    5. 'created_at' and 'updated_at' are stored as fixed-width UTC ISO 8601 strings, so range filters compare strings.
+    6. Rows are copied on the way in and out, so callers can never mutate the stored table.
+    7. The table is only shared by the coroutines of one worker, which never yield inside an operation, so no lock is needed.
+    8. Every operation is counted as a database round-trip of the API request being handled (see LoggingRoute).
+    """
+    def __init__(self):
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self.index: Dict[str, Dict[Any, int]] = {column: {} for column in UNIQUE_COLUMNS}
+        self.ids: List[int] = []
+        self.next_id = 1
+
+
+    @_counted
+    async def ping(self) -> None:
+        return None
+
+
+    @_counted
+    async def insert_users(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        pending = {column: set() for column in UNIQUE_COLUMNS}
+        for record in records:
+            for column in UNIQUE_COLUMNS:
+                value = record.get(column)
+                if value in self.index[column] or value in pending[column]:
+                    raise DuplicateKeyError(column, value)
+                pending[column].add(value)
+
+        inserted = []
+        for record in records:
+            now = datetime.now(timezone.utc).isoformat(timespec="microseconds")
+            row = {**record, "user_id": self.next_id, "created_at": now, "updated_at": now}
+            self.next_id += 1
+            self.rows[row["user_id"]] = row
+            self.ids.append(row["user_id"])
+            for column in UNIQUE_COLUMNS:
+                self.index[column][row[column]] = row["user_id"]
+            inserted.append(dict(row))
+        return inserted
+
+
+    @_counted
+    async def find_existing(self, column: str, values: List[Any]) -> set:
+        return {value for value in values if value in self.index[column]}
+
+
+    @_counted
+    async def get_users(self, ids: List[int]) -> List[Dict[str, Any]]:
+        return [{column: self.rows[id].get(column) for column in PUBLIC_USER_FIELDS} for id in dict.fromkeys(ids) if id in self.rows]
+
+
+    @_counted
+    async def get_user_ids(self, usernames: List[str]) -> Dict[str, int]:
+        index = self.index["username"]
+        return {username: index[username] for username in usernames if username in index}
+
+
+    @_counted
+    async def get_credentials(self, username: str) -> Optional[Dict[str, Any]]:
+        id = self.index["username"].get(username)
+        return {"user_id": id, "password": self.rows[id]["password"]} if id is not None else None
+
+
+    @_counted
+    async def list_users(self, query: UserListQuery, columns: List[str], cursor: Optional[Tuple[Any, int]], limit: int) -> List[Dict[str, Any]]:
+        if query.descending:
+            end = bisect_left(self.ids, cursor[1]) if cursor else len(self.ids)
+            positions = range(end - 1, -1, -1)
+        else:
+            start = bisect_right(self.ids, cursor[1]) if cursor else 0
+            positions = range(start, len(self.ids))
+
+        created_after = query.created_after.astimezone(timezone.utc).isoformat(timespec="microseconds") if query.created_after else None
+        created_before = query.created_before.astimezone(timezone.utc).isoformat(timespec="microseconds") if query.created_before else None
+        prefixes = [(column, getattr(query, f"{column}_prefix")) for column in ("username", "first_name", "last_name")]
+        prefixes = [(column, prefix) for column, prefix in prefixes if prefix]
+
+        page = []
+        for position in positions:
+            row = self.rows[self.ids[position]]
+            if created_after and row["created_at"] < created_after:
+                continue
+            if created_before and row["created_at"] >= created_before:
+                continue
+            if any(not (row.get(column) or "").startswith(prefix) for column, prefix in prefixes):
+                continue
+            page.append({column: row.get(column) for column in columns})
+            if len(page) == limit:
+                break
+        return page
+
+
+    @_counted
+    async def update_user(self, id: int, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        row = self.rows.get(id)
+        if row is None:
+            return None
+        for column in UNIQUE_COLUMNS:
+            if column in changes:
+                owner = self.index[column].get(changes[column])
+                if owner is not None and owner != id:
+                    raise DuplicateKeyError(column, changes[column])
+
+        for column in UNIQUE_COLUMNS:
+            if column in changes:
+                del self.index[column][row[column]]
+                self.index[column][changes[column]] = id
+        row.update(changes, updated_at=datetime.now(timezone.utc).isoformat(timespec="microseconds"))
+        return dict(row)
+
+
+    @_counted
+    async def delete_users(self, ids: List[int]) -> List[Dict[str, Any]]:
+        deleted = []
+        for id in dict.fromkeys(ids):
+            row = self.rows.pop(id, None)
+            if row is None:
+                continue
+            del self.ids[bisect_left(self.ids, id)]
+            for column in UNIQUE_COLUMNS:
+                del self.index[column][row[column]]
+            deleted.append(row)
+        return deleted
+
+
+
+
+
+class MemoryArticleRepository(ArticleRepository):
+    """
+    Class Overview:
+    Article repository keeping the 'articles' table in process, with a hash index on ('feed_url', 'guid') and one on 'cluster_id'.
+
+    Function Logic:
+    1. Rows are stored by 'article_id', assigned from an auto-incrementing counter, and stamped with 'ingested_at' on insert.
+    2. Rows whose ('feed_url', 'guid') is already stored, or repeated within the statement, are skipped like 'ON CONFLICT DO NOTHING'.
+    3. IDs are kept in a sorted list, globally and per cluster, so a page is found by binary search on 'before_id'.
+    4. Interactions are kept per user in insertion order, so the latest are read from the end of the user's list; interest vectors
+       are kept per user and only replaced by one folding in a later interaction.
+    5. Rows are copied on the way in and out, so callers can never mutate the stored table.
+    6. Every operation is counted as a database round-trip of the API request being handled (see LoggingRoute).
+    """
+    def __init__(self):
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self.index: Dict[Tuple[Any, ...], int] = {}
+        self.ids: List[int] = []
+        self.clusters: Dict[int, List[int]] = {}
+        self.next_id = 1
+        self.interactions: Dict[int, List[Dict[str, Any]]] = {}
+        self.next_interaction_id = 1
+        self.interests: Dict[int, Dict[str, Any]] = {}
+
+
+    @_counted
+    async def insert_articles(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        inserted = []
+        ingested_at = datetime.now(timezone.utc).isoformat(timespec="microseconds")
+        for record in records:
+            key = tuple(record[column] for column in ARTICLE_KEY)
+            if key in self.index:
+                continue
+            row = {**record, "article_id": self.next_id, "ingested_at": ingested_at}
+            self.next_id += 1
+            self.rows[row["article_id"]] = row
+            self.index[key] = row["article_id"]
+            self.ids.append(row["article_id"])
+            if row.get("cluster_id") is not None:
+                self.clusters.setdefault(row["cluster_id"], []).append(row["article_id"])
+            inserted.append(dict(row))
+        return inserted
+
+
+    @_counted
+    async def get_articles(self, ids: List[int]) -> List[Dict[str, Any]]:
+        return [dict(self.rows[id]) for id in dict.fromkeys(ids) if id in self.rows]
+
+
+    @_counted
+    async def list_articles(self, cluster_id: Optional[int], before_id: Optional[int], limit: int) -> List[Dict[str, Any]]:
+        ids = self.ids if cluster_id is None else self.clusters.get(cluster_id, [])
+        end = bisect_left(ids, before_id) if before_id is not None else len(ids)
+        return [dict(self.rows[id]) for id in ids[max(0, end - limit):end][::-1]]
+
+
+    @_counted
+    async def insert_interaction(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        row = {**record, "interaction_id": self.next_interaction_id, "created_at": datetime.now(timezone.utc).isoformat(timespec="microseconds")}
+        self.next_interaction_id += 1
+        self.interactions.setdefault(row["user_id"], []).append(row)
+        return dict(row)
+
+
+    @_counted
+    async def get_interactions(self, user_id: int, limit: int, after: Optional[int] = None) -> List[Dict[str, Any]]:
+        rows = self.interactions.get(user_id, [])
+        rows = [row for row in rows[max(0, len(rows) - limit):][::-1] if after is None or row["interaction_id"] > after]
+        return [dict(row) for row in rows]
+
+
+    @_counted
+    async def get_interests(self, user_id: int) -> Optional[Dict[str, Any]]:
+        row = self.interests.get(user_id)
+        return None if row is None else {**row, "terms": list(row["terms"]), "weights": list(row["weights"]), "seen": list(row["seen"])}
+
+
+    @_counted
+    async def save_interests(self, record: Dict[str, Any]) -> None:
+        stored = self.interests.get(record["user_id"])
+        if stored is None or stored["interaction_id"] < record["interaction_id"]:
+            self.interests[record["user_id"]] = {**record, "terms": list(record["terms"]), "weights": list(record["weights"]), "seen": list(record["seen"])}
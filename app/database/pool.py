@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+import httpx
+from supabase import AsyncClient, AsyncClientOptions
+from config.database_config import PoolSettings
+from config.logging_config import request_stats_var
+from .repository import record_database_call
+
+
+logger = logging.getLogger('fastapi_logger')
+
+
+
+
+async def _start_timer(request: httpx.Request) -> None:
+    if request_stats_var.get() is not None:
+        request.extensions["started"] = time.perf_counter()
+
+
+async def _record_database_time(response: httpx.Response) -> None:
+    # Adds the round-trip (until the response headers arrive) to the counters of the API request being handled, if any
+    started = response.request.extensions.get("started")
+    if started is not None:
+        record_database_call(started)
+
+
+
+
+class DatabasePool:
+    """
+    Class Overview:
+    Bounded pool of keep-alive HTTP connections to Supabase, shared by every request handled by a worker.
+
+    Function Logic:
+    1. 'open' builds a single httpx client whose connection limits, acquire timeout and idle expiry come from PoolSettings,
+       hands it to the Supabase AsyncClient, and warms 'min_size' connections so the first requests skip the TCP/TLS handshake.
+    2. Every database round-trip is timed and added to the counters of the API request it was made for (see LoggingRoute).
+    3. A background keep-alive task re-probes the warm connections every 'keepalive_interval' seconds so they are not recycled while idle.
+    4. 'close' stops the keep-alive task and drains the pool, closing every open connection.
+
+    Parameters:
+    settings (PoolSettings): Pool size, timeout and connection settings.
+    """
+    def __init__(self, settings: PoolSettings):
+        self.settings = settings
+        self._http: Optional[httpx.AsyncClient] = None
+        self._client: Optional[AsyncClient] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
+
+
+    @property
+    def client(self) -> AsyncClient:
+        if self._client is None:
+            raise RuntimeError("Database pool is not open.")
+        return self._client
+
+
+    async def open(self) -> None:
+        settings = self.settings
+        self._http = httpx.AsyncClient(
+            limits = httpx.Limits(
+                max_connections = settings.max_size,
+                max_keepalive_connections = settings.max_size,
+                keepalive_expiry = settings.idle_timeout,
+                ),
+            timeout = httpx.Timeout(settings.request_timeout, pool=settings.acquire_timeout),
+            follow_redirects = True,
+            http2 = True,
+            event_hooks = {"request": [_start_timer], "response": [_record_database_time]},
+            )
+        self._client = AsyncClient(
+            settings.database_url,
+            settings.database_api_key,
+            AsyncClientOptions(httpx_client=self._http),
+            )
+        await self.warm_up()
+        if settings.keepalive_interval > 0:
+            self._keepalive_task = asyncio.create_task(self._keepalive())
+        logger.info("Tag: Database - Pool opened (min_size=%s, max_size=%s)", settings.min_size, settings.max_size)
+
+
+    async def close(self) -> None:
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            try:
+                await self._keepalive_task
+            except asyncio.CancelledError:
+                pass
+            self._keepalive_task = None
+        if self._http is not None:
+            await self._http.aclose()
+        self._http = None
+        self._client = None
+        logger.info("Tag: Database - Pool closed")
+
+
+    async def warm_up(self) -> None:
+        """
+        Function Overview:
+        Opens up to 'min_size' connections by issuing that many lightweight queries concurrently.
+
+        Function Logic:
+        1. Each probe selects a single 'user_id' so the round-trip is as cheap as possible.
+        2. Failures are logged rather than raised, so an unreachable database does not prevent the app from starting.
+        """
+        probes = min(self.settings.min_size, self.settings.max_size)
+        results = await asyncio.gather(
+            *(self.client.table("users").select("user_id").limit(1).execute() for _ in range(probes)),
+            return_exceptions = True,
+            )
+        failures = [result for result in results if isinstance(result, Exception)]
+        if failures:
+            logger.warning("Tag: Database - Pool warm-up failed for %s/%s connections: [%s]", len(failures), probes, failures[0])
+
+
+    async def _keepalive(self) -> None:
+        while True:
+            await asyncio.sleep(self.settings.keepalive_interval)
+            await self.warm_up()
+
+
+    def stats(self) -> dict:
+        """
+        Function Overview:
+        Reports the current size and usage of the pool.
+
+        Returns:
+        dict: The configured maximum, the number of open connections and how many of them are currently in use.
+        """
+        connections = getattr(getattr(getattr(self._http, "_transport", None), "_pool", None), "connections", [])
+        return {
+            "max_size": self.settings.max_size,
+            "open": len(connections),
+            "in_use": sum(1 for connection in connections if not connection.is_idle()),
+            }
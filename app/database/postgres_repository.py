@@ -0,0 +1,238 @@
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import asyncpg
+from app.schema.users import UserListQuery, MUTABLE_USER_FIELDS, LISTABLE_USER_FIELDS, PUBLIC_USER_FIELDS
+from app.schema.articles import ARTICLE_RECORD_FIELDS
+from config.database_config import PoolSettings
+from .repository import UserRepository, ArticleRepository, RepositoryError, DuplicateKeyError, parse_duplicate_key, record_database_call, escape_like, UNIQUE_COLUMNS, ARTICLE_KEY
+
+
+# Columns of the 'articles' table that are not text, sent as text by multi-row inserts and cast by the database
+ARTICLE_CASTS = {"published_at": "timestamptz", "cluster_id": "bigint"}
+
+
+def _row(record: asyncpg.Record) -> Dict[str, Any]:
+    # Rows are returned in the same shape as PostgREST returns them, with timestamps as ISO 8601 strings
+    return {key: value.isoformat() if isinstance(value, datetime) else value for key, value in record.items()}
+
+
+class PostgresUserRepository(UserRepository):
+    """
+    Class Overview:
+    User repository connecting directly to the Postgres database behind Supabase (or any Postgres with the same 'users' table),
+    through an asyncpg connection pool, skipping the PostgREST HTTP hop.
+
+    Function Logic:
+    1. The pool is sized from PoolSettings ('min_size', 'max_size', 'acquire_timeout', 'request_timeout', 'idle_timeout').
+    2. Every operation is a single parameterised statement; multi-row inserts use 'unnest' so they stay a single atomic statement.
+       Column names are only interpolated into SQL after being checked against the schema's column whitelists.
+    3. Unique violations raise DuplicateKeyError, any other database error raises RepositoryError.
+    4. Inserts rely on the column defaults of 'created_at' and 'updated_at' ('now()'); updates set 'updated_at = now()'.
+    5. Every statement is timed and added to the counters of the API request it was sent for (see LoggingRoute).
+
+    Parameters:
+    settings (PoolSettings): The connection string ('database_dsn') and the pool settings.
+    """
+    def __init__(self, settings: PoolSettings):
+        self.settings = settings
+        self._pool: Optional[asyncpg.Pool] = None
+
+
+    @property
+    def pool(self) -> asyncpg.Pool:
+        if self._pool is None:
+            raise RuntimeError("Database pool is not open.")
+        return self._pool
+
+
+    async def open(self) -> None:
+        settings = self.settings
+        self._pool = await asyncpg.create_pool(
+            settings.database_dsn,
+            min_size = min(settings.min_size, settings.max_size),
+            max_size = settings.max_size,
+            timeout = settings.acquire_timeout,
+            command_timeout = settings.request_timeout,
+            max_inactive_connection_lifetime = settings.idle_timeout,
+            )
+
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+        self._pool = None
+
+
+    def stats(self) -> dict:
+        if self._pool is None:
+            return {"max_size": self.settings.max_size, "open": 0, "in_use": 0}
+        return {
+            "max_size": self._pool.get_max_size(),
+            "open": self._pool.get_size(),
+            "in_use": self._pool.get_size() - self._pool.get_idle_size(),
+            }
+
+
+    async def _fetch(self, sql: str, *args) -> List[Dict[str, Any]]:
+        started = time.perf_counter()
+        try:
+            return [_row(record) for record in await self.pool.fetch(sql, *args)]
+        except asyncpg.UniqueViolationError as e:
+            duplicate = parse_duplicate_key(e.detail)
+            if duplicate:
+                raise DuplicateKeyError(*duplicate) from e
+            raise RepositoryError(str(e)) from e
+        except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError) as e:
+            raise RepositoryError(str(e)) from e
+        finally:
+            record_database_call(started)
+
+
+    async def ping(self) -> None:
+        await self._fetch("SELECT 1")
+
+
+    async def insert_users(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        columns = [column for column in MUTABLE_USER_FIELDS if column in records[0]]
+        arrays = ", ".join(f"${position}::text[]" for position in range(1, len(columns) + 1))
+        return await self._fetch(
+            f"INSERT INTO users ({', '.join(columns)}) SELECT * FROM unnest({arrays}) RETURNING *",
+            *([record.get(column) for record in records] for column in columns),
+            )
+
+
+    async def find_existing(self, column: str, values: List[Any]) -> set:
+        if column not in UNIQUE_COLUMNS:
+            raise RepositoryError(f"Column '{column}' has no unique constraint.")
+        rows = await self._fetch(f"SELECT {column} FROM users WHERE {column} = ANY($1::text[])", list(values))
+        return {row[column] for row in rows}
+
+
+    async def get_users(self, ids: List[int]) -> List[Dict[str, Any]]:
+        return await self._fetch(f"SELECT {', '.join(PUBLIC_USER_FIELDS)} FROM users WHERE user_id = ANY($1::bigint[])", list(ids))
+
+
+    async def get_user_ids(self, usernames: List[str]) -> Dict[str, int]:
+        rows = await self._fetch("SELECT user_id, username FROM users WHERE username = ANY($1::text[])", list(usernames))
+        return {row["username"]: row["user_id"] for row in rows}
+
+
+    async def get_credentials(self, username: str) -> Optional[Dict[str, Any]]:
+        rows = await self._fetch("SELECT user_id, password FROM users WHERE username = $1", username)
+        return rows[0] if rows else None
+
+
+    async def list_users(self, query: UserListQuery, columns: List[str], cursor: Optional[Tuple[Any, int]], limit: int) -> List[Dict[str, Any]]:
+        invalid = [column for column in columns if column not in LISTABLE_USER_FIELDS]
+        if invalid:
+            raise RepositoryError(f"Columns {invalid} cannot be listed.")
+        conditions, args = [], []
+
+        def parameter(value: Any) -> str:
+            args.append(value)
+            return f"${len(args)}"
+
+        if query.created_after:
+            conditions.append(f"created_at >= {parameter(query.created_after)}")
+        if query.created_before:
+            conditions.append(f"created_at < {parameter(query.created_before)}")
+        for column in ("username", "first_name", "last_name"):
+            prefix = getattr(query, f"{column}_prefix")
+            if prefix:
+                conditions.append(f"{column} LIKE {parameter(escape_like(prefix) + '%')}")
+
+        comparison = "<" if query.descending else ">"
+        if cursor and query.order_by == "user_id":
+            conditions.append(f"user_id {comparison} {parameter(cursor[1])}")
+        elif cursor:
+            conditions.append(f"(created_at, user_id) {comparison} ({parameter(datetime.fromisoformat(cursor[0]))}, {parameter(cursor[1])})")
+
+        direction = "DESC" if query.descending else "ASC"
+        order = f"user_id {direction}" if query.order_by == "user_id" else f"created_at {direction}, user_id {direction}"
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return await self._fetch(f"SELECT {', '.join(columns)} FROM users {where} ORDER BY {order} LIMIT {parameter(limit)}", *args)
+
+
+    async def update_user(self, id: int, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        columns = [column for column in changes if column in MUTABLE_USER_FIELDS]
+        if len(columns) != len(changes):
+            raise RepositoryError(f"Only {', '.join(MUTABLE_USER_FIELDS)} can be updated.")
+        assignments = ", ".join(f"{column} = ${position}" for position, column in enumerate(columns, 2))
+        rows = await self._fetch(f"UPDATE users SET {assignments}, updated_at = now() WHERE user_id = $1 RETURNING *", id, *(changes[column] for column in columns))
+        return rows[0] if rows else None
+
+
+    async def delete_users(self, ids: List[int]) -> List[Dict[str, Any]]:
+        return await self._fetch("DELETE FROM users WHERE user_id = ANY($1::bigint[]) RETURNING *", list(ids))
+
+
+
+
+
+class PostgresArticleRepository(ArticleRepository):
+    """
+    Class Overview:
+    Article repository connecting directly to the Postgres database, through the asyncpg pool of the user repository.
+
+    Function Logic:
+    1. Multi-row inserts are a single 'unnest' statement with 'ON CONFLICT (feed_url, guid) DO NOTHING', returning only the
+       rows actually inserted; every column is sent as text and the non-text ones are cast by the database.
+    2. Database errors raise RepositoryError.
+
+    Parameters:
+    users (PostgresUserRepository): The user repository whose pool (opened and closed by it) runs the statements.
+    """
+    def __init__(self, users: PostgresUserRepository):
+        self.users = users
+
+
+    async def insert_articles(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        columns = ", ".join(ARTICLE_RECORD_FIELDS)
+        arrays = ", ".join(f"${position}::text[]" for position in range(1, len(ARTICLE_RECORD_FIELDS) + 1))
+        values = ", ".join(f"{column}::{ARTICLE_CASTS[column]}" if column in ARTICLE_CASTS else column for column in ARTICLE_RECORD_FIELDS)
+        return await self.users._fetch(
+            f"INSERT INTO articles ({columns}) SELECT {values} FROM unnest({arrays}) AS record ({columns}) "
+            f"ON CONFLICT ({', '.join(ARTICLE_KEY)}) DO NOTHING RETURNING *",
+            *([None if record.get(column) is None else str(record[column]) for record in records] for column in ARTICLE_RECORD_FIELDS),
+            )
+
+
+    async def get_articles(self, ids: List[int]) -> List[Dict[str, Any]]:
+        return await self.users._fetch("SELECT * FROM articles WHERE article_id = ANY($1::bigint[])", list(ids))
+
+
+    async def list_articles(self, cluster_id: Optional[int], before_id: Optional[int], limit: int) -> List[Dict[str, Any]]:
+        return await self.users._fetch(
+            "SELECT * FROM articles WHERE ($1::bigint IS NULL OR cluster_id = $1) AND ($2::bigint IS NULL OR article_id < $2) ORDER BY article_id DESC LIMIT $3",
+            cluster_id, before_id, limit,
+            )
+
+
+    async def insert_interaction(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        rows = await self.users._fetch(
+            "INSERT INTO interactions (user_id, article_id, weight) VALUES ($1, $2, $3) RETURNING *",
+            record["user_id"], record["article_id"], record["weight"],
+            )
+        return rows[0]
+
+
+    async def get_interactions(self, user_id: int, limit: int, after: Optional[int] = None) -> List[Dict[str, Any]]:
+        return await self.users._fetch(
+            "SELECT * FROM interactions WHERE user_id = $1 AND ($2::bigint IS NULL OR interaction_id > $2) ORDER BY interaction_id DESC LIMIT $3",
+            user_id, after, limit,
+            )
+
+
+    async def get_interests(self, user_id: int) -> Optional[Dict[str, Any]]:
+        rows = await self.users._fetch("SELECT * FROM user_interests WHERE user_id = $1", user_id)
+        return rows[0] if rows else None
+
+
+    async def save_interests(self, record: Dict[str, Any]) -> None:
+        await self.users._fetch(
+            "INSERT INTO user_interests (user_id, interaction_id, terms, weights, seen, updated_at) VALUES ($1, $2, $3, $4, $5, $6::text::timestamptz) "
+            "ON CONFLICT (user_id) DO UPDATE SET interaction_id = EXCLUDED.interaction_id, terms = EXCLUDED.terms, weights = EXCLUDED.weights, "
+            "seen = EXCLUDED.seen, updated_at = EXCLUDED.updated_at WHERE user_interests.interaction_id < EXCLUDED.interaction_id",
+            record["user_id"], record["interaction_id"], record["terms"], record["weights"], record["seen"], record["updated_at"],
+            )
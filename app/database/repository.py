@@ -0,0 +1,292 @@
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+from app.schema.users import UserListQuery
+from config.database_config import PoolSettings
+from config.logging_config import request_stats_var
+
+
+# Columns with a unique constraint in the 'users' table
+UNIQUE_COLUMNS = ("email_id", "username")
+
+# Columns whose combination is unique in the 'articles' table: an article is identified by its GUID within its feed
+ARTICLE_KEY = ("feed_url", "guid")
+
+
+
+
+class RepositoryError(Exception):
+    """
+    Class Overview:
+    Raised by a user repository when the storage backend fails or rejects a statement.
+    """
+
+
+
+
+class DuplicateKeyError(RepositoryError):
+    """
+    Class Overview:
+    Raised by a user repository when a write would duplicate the value of a unique column (Postgres error code 23505).
+
+    Attributes:
+    column (str): The unique column ('email_id' or 'username').
+    value (str): The duplicated value.
+    """
+    def __init__(self, column: str, value: str):
+        super().__init__(f"Key ({column})=({value}) already exists.")
+        self.column = column
+        self.value = value
+
+
+
+
+def record_database_call(started: float) -> None:
+    """
+    Function Overview:
+    Adds a database round-trip to the counters of the API request being handled, if any (the 'db_ms' and 'db_calls' fields
+    logged by LoggingRoute); every backend calls it once per statement or HTTP request it sends.
+
+    Parameters:
+    started (float): When the round-trip started ('time.perf_counter()').
+    """
+    stats = request_stats_var.get()
+    if stats is not None:
+        stats["db_time"] += time.perf_counter() - started
+        stats["db_calls"] += 1
+
+
+
+
+def escape_like(prefix: str) -> str:
+    """
+    Function Overview:
+    Escapes the characters of a prefix that LIKE patterns treat specially ('\\', '%' and '_'), so it is matched literally
+    by 'LIKE' in Postgres and by the 'like' filter of PostgREST (with the default '\\' escape character).
+    """
+    return prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+
+
+def parse_duplicate_key(detail: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    Function Overview:
+    Identifies the unique column and value from the details of a duplicate key violation (e.g. "Key (email_id)=(x) already exists.").
+
+    Parameters:
+    detail (Optional[str]): The error details reported by Postgres.
+
+    Returns:
+    Optional[Tuple[str, str]]: The duplicated column ('email_id' or 'username') and value, or None if they cannot be identified.
+    """
+    if not detail:
+        return None
+    error_field = detail.split(" ")[1] if " " in detail else detail
+    value = detail[detail.find(")=(") + 3:detail.rfind(") already exists")]
+    for column in UNIQUE_COLUMNS:
+        if column in error_field:
+            return column, value
+    return None
+
+
+
+
+class UserRepository(ABC):
+    """
+    Class Overview:
+    Storage interface of the 'users' table used by the data layer ('app/database/users.py'), so the backend can be swapped.
+
+    Function Logic:
+    1. Rows are plain dictionaries with the columns of the table ('created_at' and 'updated_at' as ISO 8601 strings). Reads never
+       return the password column, except 'get_credentials', which returns nothing else.
+    2. Multi-row statements are atomic: either every row is written or none is.
+    3. Writes that would duplicate a unique column raise DuplicateKeyError; any other backend failure raises RepositoryError.
+    4. 'open' and 'close' acquire and release the backend's resources (e.g. connection pools); 'stats' reports their usage.
+
+    Implementations:
+    - SupabaseUserRepository: The Supabase PostgREST API, through the pooled Supabase client.
+    - PostgresUserRepository: A Postgres database reached directly through an asyncpg connection pool.
+    - MemoryUserRepository: An indexed in-process table, for tests, benchmarks and local runs without a network.
+    """
+    async def open(self) -> None:
+        pass
+
+
+    async def close(self) -> None:
+        pass
+
+
+    def stats(self) -> dict:
+        return {"max_size": 0, "open": 0, "in_use": 0}
+
+
+    @abstractmethod
+    async def ping(self) -> None:
+        """Runs the cheapest possible query, raising if the backend cannot be reached."""
+
+
+    @abstractmethod
+    async def insert_users(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Inserts the rows with a single atomic statement ('created_at' and 'updated_at' set to the insertion time) and returns them as stored."""
+
+
+    @abstractmethod
+    async def find_existing(self, column: str, values: List[Any]) -> set:
+        """Returns the values of a unique column that are already in use."""
+
+
+    @abstractmethod
+    async def get_users(self, ids: List[int]) -> List[Dict[str, Any]]:
+        """Returns the rows (projected to PUBLIC_USER_FIELDS, without the password) of the given user IDs that exist, in any order."""
+
+
+    @abstractmethod
+    async def get_user_ids(self, usernames: List[str]) -> Dict[str, int]:
+        """Returns the user ID of every given username that exists."""
+
+
+    @abstractmethod
+    async def get_credentials(self, username: str) -> Optional[Dict[str, Any]]:
+        """Returns only the 'user_id' and 'password' columns of the user with the given username, or None if it does not exist."""
+
+
+    @abstractmethod
+    async def list_users(self, query: UserListQuery, columns: List[str], cursor: Optional[Tuple[Any, int]], limit: int) -> List[Dict[str, Any]]:
+        """Returns up to 'limit' rows (projected to 'columns') matching the filters of the query, after the cursor, in the requested order."""
+
+
+    @abstractmethod
+    async def update_user(self, id: int, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Applies the changes to a user with a single statement, stamping 'updated_at', and returns the updated row, or None if the user does not exist."""
+
+
+    @abstractmethod
+    async def delete_users(self, ids: List[int]) -> List[Dict[str, Any]]:
+        """Deletes the given user IDs with a single statement and returns the deleted rows."""
+
+
+
+
+class ArticleRepository(ABC):
+    """
+    Class Overview:
+    Storage interface of the 'articles' table used by the ingestion pipeline ('app/database/articles.py').
+
+    Function Logic:
+    1. Rows are plain dictionaries with the columns of the table: 'article_id' (assigned by the database), 'feed_url', 'guid',
+       'link', 'title', 'summary', 'author', 'published_at', 'cluster_id' (the duplicate cluster, indexed) and 'ingested_at'
+       (set by the database), timestamps as ISO 8601 strings.
+    2. ('feed_url', 'guid') is unique; inserts skip the rows already stored instead of failing, so feeds can be ingested again safely.
+    3. The 'interactions' table records the interactions of users with articles: 'interaction_id' (assigned by the database, in
+       insertion order), 'user_id', 'article_id', 'weight' and 'created_at' (set by the database), indexed on
+       ('user_id', 'interaction_id').
+    4. The 'user_interests' table holds the interest vector of every user, updated from their interactions: 'user_id' (primary
+       key), 'interaction_id' (the latest interaction folded into the vector, i.e. its version), 'terms' (integer[]), 'weights'
+       (real[]), 'seen' (bigint[], the articles interacted with last) and 'updated_at' (the time of that interaction); every worker
+       reads it to rank the articles for a user.
+    5. Any backend failure raises RepositoryError.
+    6. The repository shares the connections of the user repository of the same backend, which opens and closes them.
+
+    Implementations:
+    - SupabaseArticleRepository: The Supabase PostgREST API, through the pooled Supabase client.
+    - PostgresArticleRepository: A Postgres database reached directly through the asyncpg pool of the user repository.
+    - MemoryArticleRepository: An indexed in-process table, for tests, benchmarks and local runs without a network.
+    """
+    @abstractmethod
+    async def insert_articles(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Inserts the rows with a single statement, skipping those whose ('feed_url', 'guid') is already stored, and returns the inserted rows."""
+
+
+    @abstractmethod
+    async def get_articles(self, ids: List[int]) -> List[Dict[str, Any]]:
+        """Returns the rows of the given article IDs that exist, in any order."""
+
+
+    @abstractmethod
+    async def list_articles(self, cluster_id: Optional[int], before_id: Optional[int], limit: int) -> List[Dict[str, Any]]:
+        """Returns up to 'limit' rows, newest (highest 'article_id') first, below 'before_id' and of the cluster (if given)."""
+
+
+    @abstractmethod
+    async def insert_interaction(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Inserts an interaction ('user_id', 'article_id' and 'weight') and returns it as stored."""
+
+
+    @abstractmethod
+    async def get_interactions(self, user_id: int, limit: int, after: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Returns up to 'limit' interactions of a user, latest (highest 'interaction_id') first, above 'after' (if given)."""
+
+
+    @abstractmethod
+    async def get_interests(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Returns the stored interest vector of a user, or None if none was stored."""
+
+
+    @abstractmethod
+    async def save_interests(self, record: Dict[str, Any]) -> None:
+        """Stores the interest vector of a user, unless the stored one already folds in the same or a later interaction."""
+
+
+
+
+def create_repository(settings: PoolSettings) -> UserRepository:
+    """
+    Function Overview:
+    Builds the user repository selected by the 'backend' setting ('DATABASE_BACKEND').
+
+    Function Logic:
+    1. 'supabase' (default) uses the Supabase PostgREST API through a pooled client.
+    2. 'postgres' connects directly to the Postgres database at 'database_dsn' through an asyncpg pool.
+    3. 'memory' keeps the table in process; its content is lost when the worker stops.
+    4. Backends are imported only when selected, so unused drivers are never loaded.
+
+    Parameters:
+    settings (PoolSettings): The backend, connection and pool settings.
+
+    Returns:
+    UserRepository: The repository (not yet opened).
+    """
+    if settings.backend == "memory":
+        from .memory_repository import MemoryUserRepository
+        return MemoryUserRepository()
+    if settings.backend == "postgres":
+        from .postgres_repository import PostgresUserRepository
+        return PostgresUserRepository(settings)
+    if settings.backend == "supabase":
+        from .pool import DatabasePool
+        from .supabase_repository import SupabaseUserRepository
+        return SupabaseUserRepository(DatabasePool(settings))
+    raise ValueError(f"Unknown database backend '{settings.backend}' (expected 'supabase', 'postgres' or 'memory').")
+
+
+
+
+
+def create_article_repository(settings: PoolSettings, users: UserRepository) -> ArticleRepository:
+    """
+    Function Overview:
+    Builds the article repository of the backend selected by the 'backend' setting ('DATABASE_BACKEND').
+
+    Function Logic:
+    1. The 'supabase' and 'postgres' backends reuse the connections of the user repository (its Supabase client or asyncpg pool),
+       so the articles never hold connections of their own.
+    2. 'memory' keeps the table in process; its content is lost when the worker stops.
+
+    Parameters:
+    settings (PoolSettings): The backend, connection and pool settings.
+    users (UserRepository): The user repository of the same backend, built by 'create_repository'.
+
+    Returns:
+    ArticleRepository: The repository, usable once the user repository is opened.
+    """
+    if settings.backend == "memory":
+        from .memory_repository import MemoryArticleRepository
+        return MemoryArticleRepository()
+    if settings.backend == "postgres":
+        from .postgres_repository import PostgresArticleRepository
+        return PostgresArticleRepository(users)
+    if settings.backend == "supabase":
+        from .supabase_repository import SupabaseArticleRepository
+        return SupabaseArticleRepository(users.pool)
+    raise ValueError(f"Unknown database backend '{settings.backend}' (expected 'supabase', 'postgres' or 'memory').")
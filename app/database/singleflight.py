@@ -0,0 +1,59 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+from app.metrics import SINGLE_FLIGHT_CALLS
+
+
+T = TypeVar("T")
+
+
+
+
+class SingleFlight:
+    """
+    Class Overview:
+    Coalesces concurrent identical reads: while a call for a key is in flight, later callers for the same key wait for its result
+    instead of issuing their own database query (flattening thundering-herd spikes on popular users).
+
+    Function Logic:
+    1. The first caller for a key runs the call as a task and records it as in flight; the key is released as soon as the task finishes.
+    2. Every caller, including the first, awaits the shielded task, so a caller that is cancelled (e.g. a client disconnecting) does not
+       cancel the call for the others.
+    3. The result, or the exception, of the call is delivered to every caller; results are shared, so callers must not mutate them.
+    4. 'forget' releases a key without waiting, so reads issued after a write never join a call that started before it. That call
+       still completes for its own callers, so whatever it stores (e.g. a cache backfill) must be guarded against the write by the caller.
+    5. Executed and coalesced calls are counted in the '/metrics' registry.
+
+    Parameters:
+    name (str): The name of the coalesced operation, used as the metric label.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+            SINGLE_FLIGHT_CALLS.inc(self.name, "executed")
+        else:
+            SINGLE_FLIGHT_CALLS.inc(self.name, "coalesced")
+        return await asyncio.shield(task)
+
+
+    def forget(self, key: Hashable) -> None:
+        self._calls.pop(key, None)
+
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Marks the exception as retrieved, in case every caller was cancelled before the call failed
+        if not task.cancelled():
+            task.exception()
+
+
+    def in_flight(self) -> int:
+        return len(self._calls)
@@ -0,0 +1,203 @@
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from postgrest.exceptions import APIError
+from app.schema.users import UserListQuery, PUBLIC_USER_FIELDS
+from .pool import DatabasePool
+from .repository import UserRepository, ArticleRepository, RepositoryError, DuplicateKeyError, parse_duplicate_key, escape_like, ARTICLE_KEY
+
+
+# PostgREST projection of the columns returned by reads
+PUBLIC_COLUMNS = ",".join(PUBLIC_USER_FIELDS)
+
+
+
+
+class SupabaseUserRepository(UserRepository):
+    """
+    Class Overview:
+    User repository backed by the Supabase PostgREST API, using the pooled Supabase client.
+
+    Function Logic:
+    1. Every operation is a single PostgREST request; multi-row inserts and deletes are single statements and therefore atomic.
+    2. PostgREST errors are translated: duplicate key violations (code 23505) raise DuplicateKeyError, other errors raise RepositoryError.
+    3. Inserts rely on the column defaults of 'created_at' and 'updated_at' ('now()'); updates send 'updated_at' themselves, since
+       a PostgREST update cannot call 'now()'.
+
+    Parameters:
+    pool (DatabasePool): The pool of connections to Supabase, opened and closed with the repository.
+    """
+    def __init__(self, pool: DatabasePool):
+        self.pool = pool
+
+
+    async def open(self) -> None:
+        await self.pool.open()
+
+
+    async def close(self) -> None:
+        await self.pool.close()
+
+
+    def stats(self) -> dict:
+        return self.pool.stats()
+
+
+    @property
+    def table(self):
+        return self.pool.client.table("users")
+
+
+    async def _execute(self, builder) -> List[Dict[str, Any]]:
+        try:
+            return (await builder.execute()).data
+        except APIError as e:
+            duplicate = parse_duplicate_key(e.details) if e.code == "23505" else None
+            if duplicate:
+                raise DuplicateKeyError(*duplicate) from e
+            raise RepositoryError(str(e)) from e
+
+
+    async def ping(self) -> None:
+        await self._execute(self.table.select("user_id").limit(1))
+
+
+    async def insert_users(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await self._execute(self.table.insert(records))
+
+
+    async def find_existing(self, column: str, values: List[Any]) -> set:
+        rows = await self._execute(self.table.select(column).in_(column, values))
+        return {row[column] for row in rows}
+
+
+    async def get_users(self, ids: List[int]) -> List[Dict[str, Any]]:
+        if len(ids) == 1:
+            return await self._execute(self.table.select(PUBLIC_COLUMNS).eq("user_id", ids[0]))
+        return await self._execute(self.table.select(PUBLIC_COLUMNS).in_("user_id", ids))
+
+
+    async def get_user_ids(self, usernames: List[str]) -> Dict[str, int]:
+        if len(usernames) == 1:
+            rows = await self._execute(self.table.select("user_id").eq("username", usernames[0]))
+            return {usernames[0]: row["user_id"] for row in rows}
+        rows = await self._execute(self.table.select("user_id, username").in_("username", usernames))
+        return {row["username"]: row["user_id"] for row in rows}
+
+
+    async def get_credentials(self, username: str) -> Optional[Dict[str, Any]]:
+        rows = await self._execute(self.table.select("user_id, password").eq("username", username))
+        return rows[0] if rows else None
+
+
+    async def list_users(self, query: UserListQuery, columns: List[str], cursor: Optional[Tuple[Any, int]], limit: int) -> List[Dict[str, Any]]:
+        builder = self.table.select(",".join(columns))
+
+        if query.created_after:
+            builder = builder.gte("created_at", query.created_after.isoformat())
+        if query.created_before:
+            builder = builder.lt("created_at", query.created_before.isoformat())
+        for column in ("username", "first_name", "last_name"):
+            prefix = getattr(query, f"{column}_prefix")
+            if prefix:
+                builder = builder.like(column, f"{escape_like(prefix)}*")
+
+        comparison = "lt" if query.descending else "gt"
+        if cursor and query.order_by == "user_id":
+            builder = builder.filter("user_id", comparison, cursor[1])
+        elif cursor:
+            value, id = json.dumps(cursor[0]), cursor[1]
+            builder = builder.or_(f"created_at.{comparison}.{value},and(created_at.eq.{value},user_id.{comparison}.{id})")
+
+        builder = builder.order(query.order_by, desc=query.descending)
+        if query.order_by != "user_id":
+            builder = builder.order("user_id", desc=query.descending)
+        return await self._execute(builder.limit(limit))
+
+
+    async def update_user(self, id: int, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        changes = {**changes, "updated_at": datetime.now(timezone.utc).isoformat()}
+        rows = await self._execute(self.table.update(changes).eq("user_id", id))
+        return rows[0] if rows else None
+
+
+    async def delete_users(self, ids: List[int]) -> List[Dict[str, Any]]:
+        if len(ids) == 1:
+            return await self._execute(self.table.delete().eq("user_id", ids[0]))
+        return await self._execute(self.table.delete().in_("user_id", ids))
+
+
+
+
+
+class SupabaseArticleRepository(ArticleRepository):
+    """
+    Class Overview:
+    Article repository backed by the Supabase PostgREST API, sharing the pooled Supabase client of the user repository.
+
+    Function Logic:
+    1. Inserts are a single PostgREST upsert ignoring duplicates on ('feed_url', 'guid'), i.e. 'ON CONFLICT DO NOTHING',
+       which only returns the rows actually inserted.
+    2. PostgREST errors raise RepositoryError.
+
+    Parameters:
+    pool (DatabasePool): The pool of connections to Supabase, opened and closed by the user repository.
+    """
+    def __init__(self, pool: DatabasePool):
+        self.pool = pool
+
+
+    @property
+    def table(self):
+        return self.pool.client.table("articles")
+
+
+    async def _execute(self, builder) -> List[Dict[str, Any]]:
+        try:
+            return (await builder.execute()).data
+        except APIError as e:
+            raise RepositoryError(str(e)) from e
+
+
+    async def insert_articles(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await self._execute(self.table.upsert(records, on_conflict=",".join(ARTICLE_KEY), ignore_duplicates=True))
+
+
+    async def get_articles(self, ids: List[int]) -> List[Dict[str, Any]]:
+        return await self._execute(self.table.select("*").in_("article_id", ids))
+
+
+    async def list_articles(self, cluster_id: Optional[int], before_id: Optional[int], limit: int) -> List[Dict[str, Any]]:
+        builder = self.table.select("*")
+        if cluster_id is not None:
+            builder = builder.eq("cluster_id", cluster_id)
+        if before_id is not None:
+            builder = builder.lt("article_id", before_id)
+        return await self._execute(builder.order("article_id", desc=True).limit(limit))
+
+
+    async def insert_interaction(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        rows = await self._execute(self.pool.client.table("interactions").insert(record))
+        return rows[0]
+
+
+    async def get_interactions(self, user_id: int, limit: int, after: Optional[int] = None) -> List[Dict[str, Any]]:
+        builder = self.pool.client.table("interactions").select("*").eq("user_id", user_id)
+        if after is not None:
+            builder = builder.gt("interaction_id", after)
+        return await self._execute(builder.order("interaction_id", desc=True).limit(limit))
+
+
+    async def get_interests(self, user_id: int) -> Optional[Dict[str, Any]]:
+        rows = await self._execute(self.pool.client.table("user_interests").select("*").eq("user_id", user_id))
+        return rows[0] if rows else None
+
+
+    async def save_interests(self, record: Dict[str, Any]) -> None:
+        # PostgREST has no conditional upsert: the stored row is replaced only if older, and inserted (ignoring a concurrent
+        # insert of the same user, then replacing it if older) if there is none
+        table = self.pool.client.table("user_interests")
+        if await self._execute(table.update(record).eq("user_id", record["user_id"]).lt("interaction_id", record["interaction_id"])):
+            return
+        if not await self._execute(table.upsert(record, on_conflict="user_id", ignore_duplicates=True)):
+            await self._execute(table.update(record).eq("user_id", record["user_id"]).lt("interaction_id", record["interaction_id"]))
@@ -1,72 +1,98 @@
-import os
-from dotenv import load_dotenv
-from supabase import create_client, Client
-from postgrest.exceptions import APIError
-from app.schema.users import UserDataRequest, UserDataResponse, UserUpdateRequest, GeneralResponse
+import asyncio
+import base64
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Optional, List, Tuple, Dict, Any
+from .cache import UserCache
+from .repository import UserRepository, RepositoryError, DuplicateKeyError, UNIQUE_COLUMNS
+from .singleflight import SingleFlight
+from app.metrics import track_database_call
+from app.passwords import PasswordHasher
+from app.schema.users import UserDataRequest, UserDataResponse, UserLoginRequest, UserUpdateRequest, UserPatchRequest, UserBulkItem, UserBulkResponse, UserListQuery, UserListItem, UserListResponse, LISTABLE_USER_FIELDS
+from app.schema.users import MessageResponse, UserDetailsResponse, UserIdResponse, UserDetailsBatchItem, UserIdBatchItem, UserDetailsBatch, UserIdBatch, UserDetailsBatchResponse, UserIdBatchResponse, UserBulkOutcomeResponse, UserPageResponse
 
 
-load_dotenv()
-DATABASE_URL = os.getenv('SUPABASE_URL')
-DATABASE_API_KEY = os.getenv('SUPABASE_API_KEY')
-supabase: Client = create_client(DATABASE_URL, DATABASE_API_KEY)
+logger = logging.getLogger('fastapi_logger')
 
+# Number of rows sent in a single multi-row insert or delete statement by bulk operations
+BULK_CHUNK_SIZE = 500
 
+# Concurrent reads of the same user (by ID) or user ID (by username) that miss the cache share a single in-flight query
+USER_READS = SingleFlight("fetch_user")
+USER_ID_READS = SingleFlight("fetch_id")
 
 
-async def create_user(data: UserDataRequest) -> GeneralResponse:
+
+
+async def _load_user(id: int, repository: UserRepository, cache: Optional[UserCache]) -> List[Dict[str, Any]]:
+    # The generation is taken before the query, so a write landing while it runs keeps its (possibly stale) row out of the cache
+    generation = await cache.generation() if cache else None
+    rows = await repository.get_users([id])
+    if rows and cache:
+        await cache.backfill_users(rows[:1], generation)
+    return rows
+
+
+async def _load_user_id(username: str, repository: UserRepository, cache: Optional[UserCache]) -> Dict[str, int]:
+    generation = await cache.generation() if cache else None
+    user_ids = await repository.get_user_ids([username])
+    if username in user_ids and cache:
+        await cache.backfill_user_ids({username: user_ids[username]}, generation)
+    return user_ids
+
+
+def _forget_user(repository: UserRepository, id: int, username: str) -> None:
+    # Reads issued after a write must not join a read that started before it (whose result the cache invalidation keeps out of the cache)
+    USER_READS.forget((repository, id))
+    USER_ID_READS.forget((repository, username))
+
+
+
+
+@track_database_call
+async def create_user(data: UserDataRequest, repository: UserRepository, hasher: PasswordHasher, cache: Optional[UserCache] = None) -> MessageResponse:
     """
     Function Overview:
     Creates a new user based on the provided data.
 
     Function Logic:
-    1. The function attempts to create a new user with the given request data.
+    1. The function hashes the password in the hasher's worker pool, then attempts to create a new user with the given request data.
     2. If successful, it returns a structured response wrapped in the GeneralResponse schema.
     3. Depending on the error raised:
         - ValueError: Returns a structured response indicating the given email ID or username is in use by another user.
-        - APIError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
+        - RepositoryError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
 
     Parameters:
     request (UserDataRequest): Data required to create a new user.
+    repository (UserRepository): Storage backend of the users table.
+    hasher (PasswordHasher): Hashes the password before it is stored.
+    cache (Optional[UserCache]): Read-through user cache, refreshed or invalidated by this operation (if provided).
 
     Returns:
     GeneralResponse: A response containing the result of the user creation operation.
     """
     try:
-        request_dict = data.model_dump()
-        response = (
-            supabase
-            .table("users")
-            .insert(request_dict)
-            .execute()
-            )
+        rows = await repository.insert_users([{**data.model_dump(), "password": await hasher.hash(data.password)}])
 
-        if response.data:
-            return GeneralResponse(
+        if rows:
+            _forget_user(repository, rows[0]["user_id"], data.username)
+            if cache:
+                await cache.set_user(rows[0])
+            return MessageResponse(
                 detail = f"User '{data.username}' created successfully.",
                 data = None
                 )
         else:
             raise Exception("Unknown error occurred while trying to create a new user.")
         
-    except APIError as e:
-
-        if (e.json()["code"] == "23505"):
-            error_detail = (
-                e.json()["details"]
-                ).split(" ")
-            error_field = error_detail[1]
-
-            if "email_id" in error_field:
-                raise ValueError(f"User with email ID '{data.email_id}' already exists.")
-            
-            if "username" in error_field:
-                raise ValueError(f"User with username '{data.username}' already exists.")
-            
-            else:
-                raise RuntimeError(f"API Error: {e}") from e
-            
-        else:
-            raise RuntimeError(f"API Error: {e}") from e
+    except DuplicateKeyError as e:
+        if e.column == "email_id":
+            raise ValueError(f"User with email ID '{data.email_id}' already exists.")
+        raise ValueError(f"User with username '{data.username}' already exists.")
+
+    except RepositoryError as e:
+        raise RuntimeError(f"API Error: {e}") from e
 
     except Exception as e:
         raise RuntimeError(f"Unexpected Error: {e}") from e
@@ -74,44 +100,172 @@ async def create_user(data: UserDataRequest) -> GeneralResponse:
 
 
 
-async def fetch_user(id: int) -> GeneralResponse:
+@track_database_call
+async def create_users(data: List[UserDataRequest], repository: UserRepository, hasher: PasswordHasher, cache: Optional[UserCache] = None, chunk_size: int = BULK_CHUNK_SIZE) -> UserBulkOutcomeResponse:
+    """
+    Function Overview:
+    Creates several new users, sending the rows to the database in chunks of multi-row inserts.
+
+    Function Logic:
+    1. The function splits the request data into chunks of 'chunk_size' rows and creates each chunk with '_create_users_chunk'.
+    2. Rows whose email ID or username is already in use are reported as conflicts without aborting the rest of the batch.
+    3. If a chunk fails for any other reason, the rows of that chunk and of every later chunk are reported as errors and no further chunks are sent.
+    4. It returns a structured response wrapped in the GeneralResponse schema, reporting the outcome of every row.
+
+    Parameters:
+    data (List[UserDataRequest]): Data required to create each new user.
+    repository (UserRepository): Storage backend of the users table.
+    hasher (PasswordHasher): Hashes the passwords before they are stored.
+    cache (Optional[UserCache]): Read-through user cache, refreshed with the created users (if provided).
+    chunk_size (int): Number of rows sent in a single insert statement.
+
+    Returns:
+    GeneralResponse: A response containing the outcome of every row of the bulk creation.
+    """
+    results: List[UserBulkItem] = []
+    for start in range(0, len(data), chunk_size):
+        chunk = list(enumerate(data[start:start + chunk_size], start))
+        try:
+            results.extend(await _create_users_chunk(chunk, repository, hasher, cache))
+        except Exception as e:
+            logger.error("Tag: Database - Bulk user creation failed at row %s: [%s]", start, e)
+            results.extend(
+                UserBulkItem(index=index, key=record.username, status="error", detail="Unknown error occurred while trying to create a new user.")
+                for index, record in enumerate(data[start:], start)
+                )
+            break
+
+    succeeded = sum(1 for item in results if item.status == "created")
+    return UserBulkOutcomeResponse(
+        detail = f"{succeeded} of {len(data)} users created successfully.",
+        data = UserBulkResponse(results=results, succeeded=succeeded, failed=len(results) - succeeded)
+        )
+
+
+
+
+async def _create_users_chunk(chunk: List[Tuple[int, UserDataRequest]], repository: UserRepository, hasher: PasswordHasher, cache: Optional[UserCache]) -> List[UserBulkItem]:
+    """
+    Function Overview:
+    Creates a single chunk of new users with one multi-row insert, flagging every conflicting row.
+
+    Function Logic:
+    1. Rows reusing the email ID or username of an earlier row in the chunk are flagged as conflicts.
+    2. Rows whose email ID or username already exists are found with two concurrent 'in' queries and flagged as conflicts.
+    3. The passwords of the remaining rows are hashed concurrently in the hasher's worker pool, and the rows are inserted with a single statement. If a duplicate key violation still occurs (e.g. a concurrent insert),
+       the offending row is identified from the error, flagged, and the insert is retried without it.
+
+    Parameters:
+    chunk (List[Tuple[int, UserDataRequest]]): The rows to create, each paired with its position in the request.
+    repository (UserRepository): Storage backend of the users table.
+    hasher (PasswordHasher): Hashes the passwords before they are stored.
+    cache (Optional[UserCache]): Read-through user cache, refreshed with the created users (if provided).
+
+    Returns:
+    List[UserBulkItem]: The outcome of every row of the chunk, in request order.
+    """
+    outcomes: Dict[int, UserBulkItem] = {}
+
+    def flag_conflict(index: int, record: UserDataRequest, column: str) -> None:
+        detail = (
+            f"User with email ID '{record.email_id}' already exists." if column == "email_id"
+            else f"User with username '{record.username}' already exists."
+            )
+        outcomes[index] = UserBulkItem(index=index, key=record.username, status="conflict", detail=detail)
+
+    seen = {column: set() for column in UNIQUE_COLUMNS}
+    for index, record in chunk:
+        column = next((column for column in UNIQUE_COLUMNS if getattr(record, column) in seen[column]), None)
+        if column:
+            flag_conflict(index, record, column)
+            continue
+        for column in UNIQUE_COLUMNS:
+            seen[column].add(getattr(record, column))
+
+    found = await asyncio.gather(*(repository.find_existing(column, list(seen[column])) for column in UNIQUE_COLUMNS))
+    existing = dict(zip(UNIQUE_COLUMNS, found))
+
+    pending = []
+    for index, record in chunk:
+        if index in outcomes:
+            continue
+        column = next((column for column in UNIQUE_COLUMNS if getattr(record, column) in existing[column]), None)
+        if column:
+            flag_conflict(index, record, column)
+        else:
+            pending.append((index, record))
+
+    hashes = await asyncio.gather(*(hasher.hash(record.password) for _, record in pending))
+    passwords = {index: password for (index, _), password in zip(pending, hashes)}
+    while pending:
+        try:
+            rows = await repository.insert_users([{**record.model_dump(), "password": passwords[index]} for index, record in pending])
+        except DuplicateKeyError as e:
+            conflicting = [(index, record) for index, record in pending if getattr(record, e.column) == e.value]
+            if not conflicting:
+                raise
+            for index, record in conflicting:
+                flag_conflict(index, record, e.column)
+            pending = [(index, record) for index, record in pending if index not in outcomes]
+            continue
+
+        created = {row["username"]: row for row in rows}
+        for index, record in pending:
+            row = created[record.username]
+            outcomes[index] = UserBulkItem(index=index, key=record.username, status="created", detail=f"User '{record.username}' created successfully.", data=row["user_id"])
+            _forget_user(repository, row["user_id"], row["username"])
+            if cache:
+                await cache.set_user(row)
+        break
+
+    return [outcomes[index] for index, _ in chunk]
+
+
+
+
+@track_database_call
+async def fetch_user(id: int, repository: UserRepository, cache: Optional[UserCache] = None) -> UserDetailsResponse:
     """
     Function Overview:
     Fetches the data of a user based on the given user ID.
 
     Function Logic:
-    1. The function attempts to fetch user data for the provided user ID.
+    1. The function attempts to fetch user data for the provided user ID, from the cache first; on a miss, concurrent requests
+       for the same user share a single database query.
     2. If successful, it returns a structured response wrapped in the GeneralResponse schema.
     3. Depending on the error raised:
         - ValueError: Returns a structured response indicating the requested user does not exist.
-        - APIError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
+        - RepositoryError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
 
     Parameters:
     id (int): The user ID whose data is to be fetched.
+    repository (UserRepository): Storage backend of the users table.
+    cache (Optional[UserCache]): Read-through user cache, refreshed or invalidated by this operation (if provided).
 
     Returns:
     GeneralResponse: A response containing the result of the fetch operation and the requested user's data.
     """
     try:
-        response = (
-            supabase
-            .table("users")
-            .select("*")
-            .eq("user_id", id)
-            .execute()
-            )
+        cached = await cache.get_user(id) if cache else None
+        if cached:
+            return UserDetailsResponse(
+                detail = f"Details for user ID '{id}' fetched successfully.",
+                data = UserDataResponse(**cached)
+                )
+
+        rows = await USER_READS.do((repository, id), lambda: _load_user(id, repository, cache))
         
-        if response.data:
-            return GeneralResponse(
+        if rows:
+            return UserDetailsResponse(
                 detail = f"Details for user ID '{id}' fetched successfully.", 
-                data = UserDataResponse(**(response.data[0]))
+                data = UserDataResponse(**(rows[0]))
                 )
-        elif not response.data:
+        elif not rows:
             raise ValueError()
         else:
             raise Exception("Unknown error occurred while trying to fetch user details.")
         
-    except APIError as e:
+    except RepositoryError as e:
         raise RuntimeError(f"API Error: {e}") from e
     
     except ValueError as e:
@@ -123,44 +277,49 @@ async def fetch_user(id: int) -> GeneralResponse:
 
 
 
-async def fetch_id(username: str) -> GeneralResponse:
+@track_database_call
+async def fetch_id(username: str, repository: UserRepository, cache: Optional[UserCache] = None) -> UserIdResponse:
     """
     Function Overview:
     Fetches the user ID based on the provided username.
 
     Function Logic:
-    1. The function attempts to fetch the user ID for the given username.
+    1. The function attempts to fetch the user ID for the given username, from the cache first; on a miss, concurrent requests
+       for the same username share a single database query.
     2. If successful, it returns a structured response wrapped in the GeneralResponse schema.
     3. Depending on the error raised:
         - ValueError: Returns a structured response indicating the requested user does not exist.
-        - APIError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
+        - RepositoryError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
 
     Parameters:
     username (str): The username for which the user ID is to be fetched.
+    repository (UserRepository): Storage backend of the users table.
+    cache (Optional[UserCache]): Read-through user cache, refreshed or invalidated by this operation (if provided).
 
     Returns:
     GeneralResponse: A response containing the result of the fetch operation and the user ID associated with the requested username.
     """
     try:
-        response = (
-            supabase
-            .table("users")
-            .select("user_id")
-            .eq("username", username)
-            .execute()
-            )
+        cached = await cache.get_user_id(username) if cache else None
+        if cached is not None:
+            return UserIdResponse(
+                detail = f"User ID for username '{username}' fetched successfully.",
+                data = cached
+                )
 
-        if response.data:
-            return GeneralResponse(
+        user_ids = await USER_ID_READS.do((repository, username), lambda: _load_user_id(username, repository, cache))
+
+        if username in user_ids:
+            return UserIdResponse(
                 detail = f"User ID for username '{username}' fetched successfully.", 
-                data = response.data[0]["user_id"]
+                data = user_ids[username]
                 )
-        elif not response.data:
+        elif username not in user_ids:
             raise ValueError()
         else:
             raise Exception("Unknown error occurred while trying to fetch user ID.")
         
-    except APIError as e:
+    except RepositoryError as e:
         raise RuntimeError(f"API Error: {e}") from e
     
     except ValueError as e:
@@ -172,66 +331,360 @@ async def fetch_id(username: str) -> GeneralResponse:
 
 
 
-async def update_user(request: UserUpdateRequest) -> GeneralResponse:
+@track_database_call
+async def fetch_users(ids: List[int], repository: UserRepository, cache: Optional[UserCache] = None) -> UserDetailsBatchResponse:
+    """
+    Function Overview:
+    Fetches the data of several users in a single round-trip based on the given user IDs.
+
+    Function Logic:
+    1. The function serves every ID it can from the cache (if provided, with a single round trip to a shared cache) and fetches
+       the remaining IDs with a single 'in' query.
+       The fetched rows are stored in the cache, except those a concurrent write invalidated during the query.
+    2. It returns a structured response wrapped in the GeneralResponse schema, reporting each requested ID as found or not found.
+    3. Depending on the error raised:
+        - RepositoryError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
+
+    Parameters:
+    ids (List[int]): The user IDs whose data is to be fetched.
+    repository (UserRepository): Storage backend of the users table.
+    cache (Optional[UserCache]): Read-through user cache, refreshed by this operation (if provided).
+
+    Returns:
+    GeneralResponse: A response containing the outcome of the lookup for every requested user ID.
+    """
+    try:
+        requested = list(dict.fromkeys(ids))
+        rows = await cache.get_users(requested) if cache else {}
+
+        missing = [id for id in requested if id not in rows]
+        if missing:
+            generation = await cache.generation() if cache else None
+            fetched = await repository.get_users(missing)
+            rows.update((row["user_id"], row) for row in fetched)
+            if cache:
+                await cache.backfill_users(fetched, generation)
+
+        results = [
+            UserDetailsBatchItem(key=id, found=id in rows, data=UserDataResponse(**rows[id]) if id in rows else None)
+            for id in ids
+            ]
+        not_found = [id for id in requested if id not in rows]
+        return UserDetailsBatchResponse(
+            detail = f"Details for {len(requested) - len(not_found)} of {len(requested)} requested user IDs fetched successfully.",
+            data = UserDetailsBatch(results=results, not_found=not_found)
+            )
+
+    except RepositoryError as e:
+        raise RuntimeError(f"API Error: {e}") from e
+
+    except Exception as e:
+        raise RuntimeError(f"Unexpected Error: {e}") from e
+
+
+
+
+@track_database_call
+async def fetch_ids(usernames: List[str], repository: UserRepository, cache: Optional[UserCache] = None) -> UserIdBatchResponse:
+    """
+    Function Overview:
+    Fetches the user IDs of several usernames in a single round-trip.
+
+    Function Logic:
+    1. The function serves every username it can from the cache (if provided, with a single round trip to a shared cache) and
+       fetches the remaining usernames with a single 'in' query.
+       The fetched IDs are stored in the cache, except those a concurrent write invalidated during the query.
+    2. It returns a structured response wrapped in the GeneralResponse schema, reporting each requested username as found or not found.
+    3. Depending on the error raised:
+        - RepositoryError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
+
+    Parameters:
+    usernames (List[str]): The usernames whose user IDs are to be fetched.
+    repository (UserRepository): Storage backend of the users table.
+    cache (Optional[UserCache]): Read-through user cache, refreshed by this operation (if provided).
+
+    Returns:
+    GeneralResponse: A response containing the outcome of the lookup for every requested username.
+    """
+    try:
+        requested = list(dict.fromkeys(usernames))
+        user_ids = await cache.get_user_ids(requested) if cache else {}
+
+        missing = [username for username in requested if username not in user_ids]
+        if missing:
+            generation = await cache.generation() if cache else None
+            fetched = await repository.get_user_ids(missing)
+            user_ids.update(fetched)
+            if cache:
+                await cache.backfill_user_ids(fetched, generation)
+
+        results = [
+            UserIdBatchItem(key=username, found=username in user_ids, data=user_ids.get(username))
+            for username in usernames
+            ]
+        not_found = [username for username in requested if username not in user_ids]
+        return UserIdBatchResponse(
+            detail = f"User IDs for {len(requested) - len(not_found)} of {len(requested)} requested usernames fetched successfully.",
+            data = UserIdBatch(results=results, not_found=not_found)
+            )
+
+    except RepositoryError as e:
+        raise RuntimeError(f"API Error: {e}") from e
+
+    except Exception as e:
+        raise RuntimeError(f"Unexpected Error: {e}") from e
+
+
+
+
+@track_database_call
+async def list_users(query: UserListQuery, repository: UserRepository) -> UserPageResponse:
+    """
+    Function Overview:
+    Fetches a page of users using keyset (cursor) pagination, with optional filters and a column projection.
+
+    Function Logic:
+    1. The function selects only the requested columns (plus the ordering columns needed to build the next cursor) and applies the
+       'created_at' range and name prefix filters.
+    2. If a cursor is provided, only the users after the last user of the previous page (in the requested order) are fetched,
+       so every page costs the same regardless of its position.
+    3. It fetches one extra row to know whether a next page exists and returns the page wrapped in the GeneralResponse schema.
+    4. Depending on the error raised:
+        - ValueError: Raised if the cursor is invalid or does not match the requested ordering.
+        - RepositoryError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
+
+    Parameters:
+    query (UserListQuery): The page size, ordering, cursor, filters and projection of the listing.
+    repository (UserRepository): Storage backend of the users table.
+
+    Returns:
+    GeneralResponse: A response containing the page of users and the cursor of the next page.
+    """
+    cursor = _decode_cursor(query.cursor, query.order_by) if query.cursor else None
+    try:
+        fields = query.fields or list(LISTABLE_USER_FIELDS)
+        columns = list(dict.fromkeys([*fields, query.order_by, "user_id"]))
+        fetched = await repository.list_users(query, columns, cursor, query.limit + 1)
+
+        rows = fetched[:query.limit]
+        next_cursor = _encode_cursor(query.order_by, rows[-1]) if len(fetched) > query.limit else None
+        return UserPageResponse(
+            detail = f"{len(rows)} users fetched successfully.",
+            data = UserListResponse(
+                users = [UserListItem(**{field: row.get(field) for field in fields}) for row in rows],
+                next_cursor = next_cursor,
+                )
+            )
+
+    except RepositoryError as e:
+        raise RuntimeError(f"API Error: {e}") from e
+
+    except Exception as e:
+        raise RuntimeError(f"Unexpected Error: {e}") from e
+
+
+
+
+def _encode_cursor(order_by: str, row: Dict[str, Any]) -> str:
+    # Opaque cursor holding the ordering column and the position of the last row of a page
+    payload = json.dumps([order_by, row[order_by], row["user_id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, order_by: str) -> Tuple[Any, int]:
+    # The position is checked here, so a forged cursor is a client error rather than a failed query: 'user_id' must be an integer,
+    # 'created_at' an ISO 8601 timestamp with a time zone, normalized to the UTC form the rows are stored and compared in
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        cursor_order_by, value, id = payload
+        if cursor_order_by != order_by or type(id) is not int:
+            raise ValueError()
+        if order_by == "user_id" and type(value) is not int:
+            raise ValueError()
+        if order_by == "created_at":
+            created_at = datetime.fromisoformat(value)
+            if created_at.tzinfo is None:
+                raise ValueError()
+            value = created_at.astimezone(timezone.utc).isoformat(timespec="microseconds")
+        return value, id
+    except Exception as e:
+        raise ValueError("Invalid cursor for the requested ordering.") from e
+
+
+
+
+@track_database_call
+async def authenticate_user(request: UserLoginRequest, repository: UserRepository, hasher: PasswordHasher, cache: Optional[UserCache] = None) -> UserIdResponse:
+    """
+    Function Overview:
+    Verifies a user's credentials.
+
+    Function Logic:
+    1. The function fetches only the user ID and password hash of the given username.
+    2. The password is verified in the hasher's worker pool; an unknown username is verified against a decoy hash instead,
+       so it takes as long to reject as a wrong password.
+    3. If the stored value is a legacy plaintext password or a hash made with other cost parameters, it is replaced by a fresh hash
+       with '_update_user_fields', so the cached user (whose 'updated_at' changes) is refreshed too; a failure to do so is logged
+       and does not fail the login.
+    4. If successful, it returns the user ID wrapped in the GeneralResponse schema.
+    5. Depending on the error raised:
+        - ValueError: Returns a structured response indicating the credentials are invalid, without revealing whether the username exists.
+        - RepositoryError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
+
+    Parameters:
+    request (UserLoginRequest): The username and password to verify.
+    repository (UserRepository): Storage backend of the users table.
+    hasher (PasswordHasher): Verifies the password against the stored hash.
+    cache (Optional[UserCache]): Read-through user cache, refreshed when the password is rehashed (if provided).
+
+    Returns:
+    GeneralResponse: A response containing the result of the verification and the user ID.
+    """
+    try:
+        credentials = await repository.get_credentials(request.username)
+
+        if credentials is None:
+            await hasher.verify_decoy(request.password)
+            raise ValueError()
+        if not await hasher.verify(request.password, credentials["password"]):
+            raise ValueError()
+
+        if hasher.needs_rehash(credentials["password"]):
+            try:
+                await _update_user_fields(credentials["user_id"], {"password": await hasher.hash(request.password)}, repository, cache)
+            except (RuntimeError, ValueError) as e:
+                logger.warning("Tag: Database - Password rehash failed for user ID '%s': [%s]", credentials["user_id"], e)
+        return UserIdResponse(
+            detail = f"User '{request.username}' authenticated successfully.",
+            data = credentials["user_id"]
+            )
+
+    except RepositoryError as e:
+        raise RuntimeError(f"API Error: {e}") from e
+
+    except ValueError as e:
+        raise ValueError("Invalid username or password.") from e
+
+    except Exception as e:
+        raise RuntimeError(f"Unexpected Error: {e}") from e
+
+
+
+
+@track_database_call
+async def update_user(request: UserUpdateRequest, repository: UserRepository, hasher: PasswordHasher, cache: Optional[UserCache] = None) -> MessageResponse:
     """
     Function Overview:
     Updates the data for an existing user.
 
     Function Logic:
-    1. The function attempts to update user data based on the provided request.
+    1. The function attempts to update user data based on the provided request, using '_update_user_fields' (a new password is hashed first).
     2. If successful, it returns a structured response wrapped in the GeneralResponse schema.
     3. Depending on the error raised:
         - ValueError: Returns a structured response indicating the given email ID or username is in use by another user
-        - APIError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
+        - RepositoryError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
 
     Parameters:
     request (UserUpdateRequest): Data to update the existing user.
+    repository (UserRepository): Storage backend of the users table.
+    hasher (PasswordHasher): Hashes a new password before it is stored.
+    cache (Optional[UserCache]): Read-through user cache, refreshed or invalidated by this operation (if provided).
 
     Returns:
     GeneralResponse: A response indicating the outcome of the update operation.
     """
+    id = request.user_id
+    field = request.field
+    data = await hasher.hash(request.data) if field == "password" else request.data
+    await _update_user_fields(id, {field: data}, repository, cache)
+
+    if field == "first_name" or field == "last_name" or field == "email_id":
+        field = field.replace('_', ' ')
+    return MessageResponse(
+        detail = f"{field.capitalize()} updated successfully for user ID '{id}'.",
+        data = None
+        )
+
+
+
+
+@track_database_call
+async def patch_user(id: int, request: UserPatchRequest, repository: UserRepository, hasher: PasswordHasher, cache: Optional[UserCache] = None) -> UserDetailsResponse:
+    """
+    Function Overview:
+    Updates any subset of the mutable fields of an existing user in a single, atomic update.
+
+    Function Logic:
+    1. The function applies every field present in the request with a single update statement, using '_update_user_fields' (a new password is hashed first).
+    2. If successful, it returns the updated user data wrapped in the GeneralResponse schema.
+    3. Depending on the error raised:
+        - ValueError: Returns a structured response indicating the given email ID or username is in use by another user, or the user does not exist.
+        - RepositoryError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
+
+    Parameters:
+    id (int): The user ID whose data is to be updated.
+    request (UserPatchRequest): The fields to update and their new values.
+    repository (UserRepository): Storage backend of the users table.
+    hasher (PasswordHasher): Hashes a new password before it is stored.
+    cache (Optional[UserCache]): Read-through user cache, refreshed or invalidated by this operation (if provided).
+
+    Returns:
+    GeneralResponse: A response containing the result of the update operation and the updated user's data.
+    """
+    changes = request.model_dump(exclude_unset=True)
+    if "password" in changes:
+        changes["password"] = await hasher.hash(changes["password"])
+    row = await _update_user_fields(id, changes, repository, cache)
+    return UserDetailsResponse(
+        detail = f"Details updated successfully for user ID '{id}'.",
+        data = UserDataResponse(**row)
+        )
+
+
+
+
+async def _update_user_fields(id: int, changes: dict, repository: UserRepository, cache: Optional[UserCache]) -> dict:
+    """
+    Function Overview:
+    Applies a set of column changes to an existing user with a single update statement.
+
+    Function Logic:
+    1. The function attempts to update the given columns of the user and, if a cache is provided, refreshes the cached user.
+    2. If successful, it returns the updated row.
+    3. Depending on the error raised:
+        - ValueError: Raised if the given email ID or username is in use by another user, or the user does not exist.
+        - RepositoryError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
+
+    Parameters:
+    id (int): The user ID whose data is to be updated.
+    changes (dict): The new value of every column to update.
+    repository (UserRepository): Storage backend of the users table.
+    cache (Optional[UserCache]): Read-through user cache, refreshed or invalidated by this operation (if provided).
+
+    Returns:
+    dict: The updated row.
+    """
     try:
-        id = request.user_id
-        field = request.field
-        data = request.data
-        response = (
-            supabase
-            .table("users")
-            .update({field: data})
-            .eq("user_id", id)
-            .execute()
-            )
+        row = await repository.update_user(id, changes)
         
-        if response.data:
-            if field == "first_name" or field == "last_name" or field == "email_id":
-                field = field.replace('_', ' ')
-            return GeneralResponse(
-                detail = f"{field.capitalize()} updated successfully for user ID '{id}'.",
-                data = None
-                )
-        elif not response.data:
+        if row:
+            _forget_user(repository, id, row["username"])
+            if cache:
+                await cache.invalidate_user(id, row["username"])
+                await cache.set_user(row)
+            return row
+        elif not row:
             raise ValueError()
         else:
             raise Exception("Unknown error occurred while trying to update user details.")
         
-    except APIError as e:
-        if (e.json()["code"] == "23505"):
-            error_detail = (
-                e.json()["details"]
-                ).split(" ")
-            error_field = error_detail[1]
-
-            if "email_id" in error_field:
-                raise ValueError(f"User with email ID '{request.data}' already exists.")
-            
-            if "username" in error_field:
-                raise ValueError(f"User with username '{request.data}' already exists.")
-            
-            else:
-                raise RuntimeError(f"API Error: {e}") from e
-            
-        else:
-            raise RuntimeError(f"API Error: {e}") from e
+    except DuplicateKeyError as e:
+        if e.column == "email_id":
+            raise ValueError(f"User with email ID '{changes['email_id']}' already exists.")
+        raise ValueError(f"User with username '{changes['username']}' already exists.")
+
+    except RepositoryError as e:
+        raise RuntimeError(f"API Error: {e}") from e
     
     except ValueError as e:
         raise ValueError(f"User ID '{id}' not found.") from e
@@ -242,7 +695,8 @@ async def update_user(request: UserUpdateRequest) -> GeneralResponse:
 
 
 
-async def delete_user(id: int) -> GeneralResponse:
+@track_database_call
+async def delete_user(id: int, repository: UserRepository, cache: Optional[UserCache] = None) -> MessageResponse:
     """
     Function Overview:
     Deletes the user data for the specified user ID.
@@ -252,34 +706,33 @@ async def delete_user(id: int) -> GeneralResponse:
     2. If successful, it returns a structured response wrapped in the GeneralResponse schema.
     3. Depending on the error raised:
         - ValueError: Returns a structured response indicating the requested user does not exist.
-        - APIError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
+        - RepositoryError, Exception or an Unexpected Error:  Raises a RuntimeError with a detailed error message.
 
     Parameters:
     id (int): The user ID whose data is to be deleted.
+    repository (UserRepository): Storage backend of the users table.
+    cache (Optional[UserCache]): Read-through user cache, refreshed or invalidated by this operation (if provided).
 
     Returns:
     GeneralResponse: A response indicating the outcome of the deletion operation.
     """
     try:
-        response = (
-            supabase
-            .table("users")
-            .delete()
-            .eq("user_id", id)
-            .execute()
-            )
+        rows = await repository.delete_users([id])
         
-        if response.data:
-            return GeneralResponse(
+        if rows:
+            _forget_user(repository, id, rows[0]["username"])
+            if cache:
+                await cache.invalidate_user(id, rows[0]["username"])
+            return MessageResponse(
                 detail = f"User details deleted successfully for user ID '{id}'.",
                 data = None
                 )
-        elif not response.data:
+        elif not rows:
             raise ValueError()
         else:
             raise Exception("Unknown error occurred while trying to delete user details.")
         
-    except APIError as e:
+    except RepositoryError as e:
         raise RuntimeError(f"API Error: {e}") from e
     
     except ValueError as e:
@@ -287,3 +740,59 @@ async def delete_user(id: int) -> GeneralResponse:
 
     except Exception as e:
         raise RuntimeError(f"Unexpected Error: {e}")
+
+
+
+
+@track_database_call
+async def delete_users(ids: List[int], repository: UserRepository, cache: Optional[UserCache] = None, chunk_size: int = BULK_CHUNK_SIZE) -> UserBulkOutcomeResponse:
+    """
+    Function Overview:
+    Deletes the user data for several user IDs, sending the IDs to the database in chunks of multi-row deletes.
+
+    Function Logic:
+    1. The function splits the requested IDs into chunks of 'chunk_size' and deletes each chunk with a single 'in' statement.
+    2. Every requested ID is reported as deleted or not found (an ID repeated in the request is only deleted once).
+    3. If a chunk fails, the IDs of that chunk and of every later chunk are reported as errors and no further chunks are sent.
+    4. It returns a structured response wrapped in the GeneralResponse schema, reporting the outcome of every ID.
+
+    Parameters:
+    ids (List[int]): The user IDs whose data is to be deleted.
+    repository (UserRepository): Storage backend of the users table.
+    cache (Optional[UserCache]): Read-through user cache, invalidated for the deleted users (if provided).
+    chunk_size (int): Number of IDs sent in a single delete statement.
+
+    Returns:
+    GeneralResponse: A response containing the outcome of every ID of the bulk deletion.
+    """
+    results: List[UserBulkItem] = []
+    deleted = set()
+    for start in range(0, len(ids), chunk_size):
+        chunk = list(enumerate(ids[start:start + chunk_size], start))
+        try:
+            rows = await repository.delete_users(list(dict.fromkeys(id for _, id in chunk)))
+        except Exception as e:
+            logger.error("Tag: Database - Bulk user deletion failed at row %s: [%s]", start, e)
+            results.extend(
+                UserBulkItem(index=index, key=id, status="error", detail="Unknown error occurred while trying to delete user details.")
+                for index, id in enumerate(ids[start:], start)
+                )
+            break
+
+        for row in rows:
+            _forget_user(repository, row["user_id"], row["username"])
+            if cache:
+                await cache.invalidate_user(row["user_id"], row["username"])
+        chunk_deleted = {row["user_id"] for row in rows}
+        for index, id in chunk:
+            if id in chunk_deleted and id not in deleted:
+                deleted.add(id)
+                results.append(UserBulkItem(index=index, key=id, status="deleted", detail=f"User details deleted successfully for user ID '{id}'."))
+            else:
+                results.append(UserBulkItem(index=index, key=id, status="not_found", detail=f"User ID '{id}' not found."))
+
+    succeeded = len(deleted)
+    return UserBulkOutcomeResponse(
+        detail = f"{succeeded} of {len(ids)} users deleted successfully.",
+        data = UserBulkResponse(results=results, succeeded=succeeded, failed=len(results) - succeeded)
+        )
@@ -0,0 +1,334 @@
+import hashlib
+import math
+import re
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.metrics import DEDUP_ARTICLES
+from app.schema.articles import ArticleRecord
+from config.dedup_config import DedupSettings
+
+
+# Words of an article, compared case-insensitively and regardless of punctuation and markup
+TOKEN = re.compile(r"\w+")
+
+# Seed of the MinHash permutations and band hashes, fixed so every process computes the same signatures
+SEED = 20240101
+
+# Articles hashed in a single vectorized step (bounds the temporary 'permutations x shingles' matrix)
+SIGNATURE_CHUNK = 128
+
+# Words whose hash is remembered, so the common words of the news are hashed once (the cache is emptied when it is full)
+TOKEN_CACHE_SIZE = 200000
+
+# Articles gathered in the mutable part of the index before it is frozen into sorted arrays
+ACTIVE_MAX_SIZE = 4096
+
+# Cluster IDs are the content hash of the first article of the cluster, kept positive to fit a signed 64-bit column
+CLUSTER_MASK = 2 ** 63 - 1
+
+# Key columns of an indexed article: its identity (feed URL and GUID), the hash of its text, then one column per LSH band
+IDENTITY, CONTENT, FIRST_BAND = 0, 1, 2
+
+
+
+
+def _digest(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+
+
+class _Segment:
+    """
+    Class Overview:
+    Frozen part of the index: the articles of one time slice, with every key column sorted for binary search.
+
+    Attributes:
+    started (float): Start of the time slice of the articles.
+    sorted_keys (np.ndarray): '(columns, n)' uint64, every key column sorted.
+    order (np.ndarray): '(columns, n)' int32, the article position of every sorted key.
+    sketches (np.ndarray): '(n, permutations)' uint8, the lowest byte of every MinHash value (b-bit MinHash).
+    clusters (np.ndarray): '(n,)' int64, the cluster ID of every article.
+    """
+    def __init__(self, started: float, keys: np.ndarray, sketches: np.ndarray, clusters: np.ndarray):
+        self.started = started
+        self.order = np.ascontiguousarray(np.argsort(keys, axis=0, kind="stable").T, dtype=np.int32)
+        self.sorted_keys = np.ascontiguousarray(np.take_along_axis(keys, self.order.T.astype(np.intp), axis=0).T)
+        self.sketches = sketches
+        self.clusters = clusters
+
+
+    def __len__(self) -> int:
+        return len(self.clusters)
+
+
+    @property
+    def nbytes(self) -> int:
+        return self.order.nbytes + self.sorted_keys.nbytes + self.sketches.nbytes + self.clusters.nbytes
+
+
+    def keys(self) -> np.ndarray:
+        keys = np.empty(self.sorted_keys.shape[::-1], dtype=np.uint64)
+        for column in range(self.sorted_keys.shape[0]):
+            keys[self.order[column], column] = self.sorted_keys[column]
+        return keys
+
+
+    def matches(self, queries: np.ndarray, column: int) -> Dict[int, np.ndarray]:
+        # Positions of the articles sharing the key of every query (only the queries with a match), one binary search per query
+        keys = self.sorted_keys[column]
+        low = np.searchsorted(keys, queries[:, column], side="left")
+        high = np.searchsorted(keys, queries[:, column], side="right")
+        return {int(query): self.order[column][low[query]:high[query]] for query in np.flatnonzero(high > low)}
+
+
+
+
+class _ActiveSegment:
+    """
+    Class Overview:
+    Mutable part of the index: the latest articles, indexed by hash tables until they are frozen into a _Segment.
+    """
+    def __init__(self, started: float, columns: int):
+        self.started = started
+        self.index: List[Dict[int, List[int]]] = [{} for _ in range(columns)]
+        self.keys: List[np.ndarray] = []
+        self.sketches: List[np.ndarray] = []
+        self.clusters: List[int] = []
+
+
+    def __len__(self) -> int:
+        return len(self.clusters)
+
+
+    @property
+    def nbytes(self) -> int:
+        # Rough size of the hash tables and of the rows kept until the segment is frozen
+        return len(self.clusters) * (len(self.index) * 100 + (self.keys[0].nbytes + self.sketches[0].nbytes if self.keys else 0))
+
+
+    def add(self, keys: np.ndarray, sketch: np.ndarray, cluster: int) -> None:
+        position = len(self.clusters)
+        for column, key in enumerate(keys.tolist()):
+            self.index[column].setdefault(key, []).append(position)
+        self.keys.append(keys)
+        self.sketches.append(sketch)
+        self.clusters.append(cluster)
+
+
+    def matches(self, keys: np.ndarray, column: int) -> List[int]:
+        return self.index[column].get(int(keys[column]), [])
+
+
+    def freeze(self, previous: Optional[_Segment] = None) -> _Segment:
+        # Merged with the frozen articles of the same time slice, so a slice is always a single segment
+        keys, sketches, clusters = np.stack(self.keys), np.stack(self.sketches), np.array(self.clusters, dtype=np.int64)
+        if previous is not None:
+            keys = np.concatenate([previous.keys(), keys])
+            sketches = np.concatenate([previous.sketches, sketches])
+            clusters = np.concatenate([previous.clusters, clusters])
+        return _Segment(self.started, keys, sketches, clusters)
+
+
+
+
+class Deduplicator:
+    """
+    Class Overview:
+    Incremental deduplication of ingested articles, grouping the copies of a story (e.g. a wire story republished by many feeds)
+    into clusters identified by 'cluster_id'.
+
+    Function Logic:
+    1. The text of an article (title and summary, lowercased words) is hashed for exact matching, and split into shingles of
+       'shingle_size' words whose MinHash signature ('permutations' values, computed for a whole batch with NumPy) estimates the
+       Jaccard similarity between articles. The signature is split into 'bands' LSH bands, each hashed into a key, so near-duplicates
+       are found by key lookups instead of comparing every pair; candidates are then confirmed with their b-bit sketches (the lowest
+       byte of every MinHash value) against 'threshold'.
+    2. An article is, in this order: a repeat (same feed and GUID as an indexed article, e.g. a feed re-read without validators),
+       which keeps its cluster; an exact duplicate (same text), dropped when 'drop_exact' is set; a near-duplicate, which joins the
+       cluster of its most similar article; or the first article of a new cluster.
+    3. The index is split by time slices of 'segment' seconds: the latest articles sit in hash tables, which are frozen every
+       ACTIVE_MAX_SIZE articles into sorted NumPy arrays (merged with the slice's earlier arrays) searched with one vectorized binary
+       search per key column and batch. Slices older than 'window' are dropped whole, so the memory used is bounded by the articles
+       of the window, about 200 bytes per article.
+    4. The index lives in the process running the ingestion and starts empty; articles are only compared with those of the window.
+    5. 'assign' is CPU-bound and called from a worker thread by the ingestion's single writer task, so it never runs twice at once;
+       'stats' may run meanwhile on the event loop and only reads sizes.
+
+    Parameters:
+    settings (DedupSettings): The window, shingling, MinHash and LSH settings.
+    """
+    def __init__(self, settings: DedupSettings):
+        self.settings = settings
+        self.rows = settings.permutations // settings.bands
+        self.columns = FIRST_BAND + settings.bands
+        generator = np.random.default_rng(SEED)
+        self._a = generator.integers(1, 2 ** 63, size=settings.permutations, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = generator.integers(0, 2 ** 63, size=settings.permutations, dtype=np.uint64)
+        self._shingle_weights = generator.integers(1, 2 ** 63, size=settings.shingle_size, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._band_weights = generator.integers(1, 2 ** 63, size=self.rows, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.segments: List[_Segment] = []
+        self.active: Optional[_ActiveSegment] = None
+        self._token_hashes: Dict[str, int] = {}
+
+
+    def _hash_tokens(self, tokens: List[str]) -> np.ndarray:
+        cache = self._token_hashes
+        try:
+            return np.array([cache[token] for token in tokens], dtype=np.uint64)
+        except KeyError:
+            if len(cache) > TOKEN_CACHE_SIZE:
+                cache.clear()
+            for token in tokens:
+                if token not in cache:
+                    cache[token] = zlib.crc32(token.encode())
+            return np.array([cache[token] for token in tokens], dtype=np.uint64)
+
+
+    def _shingles(self, tokens: List[str]) -> np.ndarray:
+        hashes = self._hash_tokens(tokens)
+        size = min(self.settings.shingle_size, len(tokens))
+        count = len(tokens) - size + 1
+        shingles = np.zeros(count, dtype=np.uint64)
+        for offset in range(size):
+            shingles += hashes[offset:offset + count] * self._shingle_weights[offset]
+        return shingles
+
+
+    def signatures(self, texts: List[List[str]]) -> np.ndarray:
+        """
+        Function Overview:
+        Computes the MinHash signatures of a batch of (non-empty) tokenized texts.
+
+        Function Logic:
+        1. Every shingle hash is mapped through 'permutations' multiply-shift hash functions at once, as a
+           'permutations x shingles' matrix covering SIGNATURE_CHUNK articles.
+        2. The minimum of every function over the shingles of each article is taken with a single 'np.minimum.reduceat'.
+
+        Parameters:
+        texts (List[List[str]]): The words of every article.
+
+        Returns:
+        np.ndarray: '(articles, permutations)' uint32 signatures.
+        """
+        signatures = []
+        for start in range(0, len(texts), SIGNATURE_CHUNK):
+            shingles = [self._shingles(tokens) for tokens in texts[start:start + SIGNATURE_CHUNK]]
+            offsets = np.cumsum([0] + [len(values) for values in shingles[:-1]])
+            hashed = (self._a[:, None] * np.concatenate(shingles)[None, :] + self._b[:, None]) >> np.uint64(32)
+            signatures.append(np.minimum.reduceat(hashed, offsets, axis=1).T.astype(np.uint32))
+        return np.concatenate(signatures) if signatures else np.empty((0, self.settings.permutations), dtype=np.uint32)
+
+
+    def _keys(self, records: List[ArticleRecord]) -> Tuple[np.ndarray, np.ndarray]:
+        # Key columns and b-bit sketches of a batch; articles without text get their identity as every key, so they only match themselves
+        keys = np.empty((len(records), self.columns), dtype=np.uint64)
+        sketches = np.zeros((len(records), self.settings.permutations), dtype=np.uint8)
+        texts = [TOKEN.findall(f"{record.title} {record.summary or ''}".lower()) for record in records]
+        for position, (record, tokens) in enumerate(zip(records, texts)):
+            keys[position] = _digest(f"{record.feed_url}\n{record.guid}")
+            if tokens:
+                keys[position, CONTENT] = _digest(" ".join(tokens))
+
+        with_text = [position for position, tokens in enumerate(texts) if tokens]
+        if with_text:
+            signatures = self.signatures([texts[position] for position in with_text])
+            bands = signatures.astype(np.uint64).reshape(len(with_text), self.settings.bands, self.rows)
+            keys[with_text, FIRST_BAND:] = (bands * self._band_weights).sum(axis=2, dtype=np.uint64)
+            sketches[with_text] = signatures.astype(np.uint8)
+        return keys, sketches
+
+
+    def _similarity(self, sketch: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        # Two b-bit values collide by chance with probability 1/256, which is removed from the observed agreement
+        agreement = (candidates == sketch).mean(axis=1)
+        return (agreement - 1 / 256) / (1 - 1 / 256)
+
+
+    def _expire(self, now: float) -> None:
+        started = math.floor(now / self.settings.segment) * self.settings.segment
+        if self.active is not None and (self.active.started != started or len(self.active) >= ACTIVE_MAX_SIZE):
+            if len(self.active):
+                previous = self.segments.pop() if self.segments and self.segments[-1].started == self.active.started else None
+                self.segments.append(self.active.freeze(previous))
+            self.active = None
+        if self.active is None:
+            self.active = _ActiveSegment(started, self.columns)
+        horizon = now - self.settings.window
+        self.segments = [segment for segment in self.segments if segment.started + self.settings.segment > horizon]
+
+
+    def assign(self, records: List[ArticleRecord], now: Optional[float] = None) -> List[ArticleRecord]:
+        """
+        Function Overview:
+        Sets the 'cluster_id' of a batch of articles and adds them to the index.
+
+        Function Logic:
+        1. The index is rotated first: the active segment is frozen if it is full or its time slice ended, and expired slices are dropped.
+        2. The key columns of the batch are computed at once, and looked up in every frozen segment with one vectorized search per column.
+        3. The articles are then resolved in order against those matches and the active segment (which receives every new article
+           of the batch, so copies within the same batch are found too).
+
+        Parameters:
+        records (List[ArticleRecord]): The articles, in the order they were read.
+        now (Optional[float]): The current time in seconds since the epoch (defaults to the system clock).
+
+        Returns:
+        List[ArticleRecord]: The articles to store, with their 'cluster_id' set; exact duplicates are left out when 'drop_exact' is set.
+        """
+        if not records:
+            return []
+        self._expire(time.time() if now is None else now)
+        keys, sketches = self._keys(records)
+        found = [
+            [(segment, segment.matches(keys, column)) for segment in self.segments]
+            for column in range(self.columns)
+            ]
+
+        def candidates(position: int, column: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+            # The sketches and clusters of the indexed articles sharing a key column with an article
+            matched = [(segment.sketches[hits[position]], segment.clusters[hits[position]]) for segment, hits in found[column] if position in hits]
+            active = self.active.matches(keys[position], column)
+            if active:
+                matched.append((np.stack([self.active.sketches[index] for index in active]), np.array([self.active.clusters[index] for index in active])))
+            return matched
+
+        kept = []
+        for position, record in enumerate(records):
+            repeat = candidates(position, IDENTITY)
+            if repeat:
+                record.cluster_id = int(repeat[0][1][0])
+                DEDUP_ARTICLES.inc("repeat")
+                kept.append(record)
+                continue
+
+            exact = candidates(position, CONTENT)
+            if exact:
+                DEDUP_ARTICLES.inc("exact_duplicate")
+                if self.settings.drop_exact:
+                    continue
+                record.cluster_id = int(exact[0][1][0])
+            else:
+                best, cluster = self.settings.threshold, None
+                for column in range(FIRST_BAND, self.columns):
+                    for matched_sketches, clusters in candidates(position, column):
+                        similarity = self._similarity(sketches[position], matched_sketches)
+                        index = int(similarity.argmax())
+                        if similarity[index] >= best:
+                            best, cluster = similarity[index], int(clusters[index])
+                DEDUP_ARTICLES.inc("near_duplicate" if cluster is not None else "unique")
+                record.cluster_id = cluster if cluster is not None else int(keys[position, CONTENT]) & CLUSTER_MASK
+
+            self.active.add(keys[position], sketches[position], record.cluster_id)
+            kept.append(record)
+        return kept
+
+
+    def stats(self) -> dict:
+        return {
+            "articles": sum(len(segment) for segment in self.segments) + (len(self.active) if self.active else 0),
+            "segments": len(self.segments),
+            "bytes": sum(segment.nbytes for segment in self.segments) + (self.active.nbytes if self.active else 0),
+            }
@@ -0,0 +1,516 @@
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from scipy import sparse
+from app.locks import try_lock
+from config.features_config import FeatureSettings
+
+
+# Raw array files of the vector store, appended as they are written so each can be memory-mapped as a flat array
+STORE_FILES = {"indptr": np.int64, "indices": np.int32, "data": np.float32, "ids": np.int64, "times": np.float64}
+
+# Vocabulary of the featurizer, one term per line in the order columns were given, and the document frequency snapshot
+TERMS_FILE = "terms.txt"
+FREQUENCIES_FILE = "frequencies.npz"
+
+# Lock file held by the single process writing the directory
+LOCK_FILE = "writer.lock"
+
+
+
+
+class StoreLockedError(RuntimeError):
+    """
+    Class Overview:
+    Raised when a featurizer is opened on a directory already written by another process (or another featurizer of this one).
+    """
+
+
+
+
+class FeatureStore:
+    """
+    Class Overview:
+    Append-only CSR matrix of article vectors kept in a directory, each of its arrays in a raw file memory-mapped for reads.
+
+    Function Logic:
+    1. 'indptr' (int64), 'indices' (int32) and 'data' (float32) are the arrays of a SciPy CSR matrix with one row per article,
+       'ids' (int64) holds the article ID of every row and 'times' (float64) when the article was stored, in seconds since the epoch
+       (rows of stores written before the times were kept get the time the writer first opens them).
+    2. A batch is appended by writing its values, indices, IDs and times first and its 'indptr' entries last, so a row only exists
+       once it is complete; the writer cuts off the values of incomplete rows (e.g. after a crash) when it opens the store.
+    3. Reads memory-map the files, so opening the store reads nothing and every process reading the directory shares the page cache.
+    4. A single thread appends at a time, while others may read: the files are written before the maps are dropped and the row
+       count raised, so a reader that reads 'rows' first, then maps the arrays, always maps at least 'rows' complete rows.
+    5. Other processes open the store 'readonly': they never write or truncate the files (which may not exist yet), and 'refresh'
+       picks up the complete rows appended by the writer since.
+
+    Parameters:
+    directory (str): The directory of the files, created if needed (unless 'readonly').
+    readonly (bool): Whether this process only reads the rows appended by the writing process.
+    """
+    def __init__(self, directory: str, readonly: bool = False):
+        self.directory = directory
+        self.readonly = readonly
+        self.paths = {name: os.path.join(directory, f"{name}.bin") for name in STORE_FILES}
+        self._maps: Optional[Dict[str, np.ndarray]] = None
+        self._order: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        if readonly:
+            self.rows = self.nnz = 0
+            self.sorted, self.last_id = True, None
+            self._files = {}
+            self.refresh()
+            return
+        os.makedirs(directory, exist_ok=True)
+        for path in self.paths.values():
+            open(path, "ab").close()
+        if os.path.getsize(self.paths["indptr"]) < 8:
+            with open(self.paths["indptr"], "wb") as file:
+                file.write(np.zeros(1, dtype=np.int64).tobytes())
+        missing = min(self._length("indptr") - 1, self._length("ids")) - self._length("times")
+        if missing > 0:
+            # Rows appended before the times were kept are dated from now on (a crash never leaves times missing, as 'indptr' is written last)
+            with open(self.paths["times"], "ab") as file:
+                file.write(np.full(missing, time.time(), dtype=np.float64).tobytes())
+        self._recover()
+        self._files = {name: open(path, "ab") for name, path in self.paths.items()}
+        ids = self.array("ids")
+        self.sorted = bool(np.all(ids[1:] > ids[:-1])) if len(ids) else True
+        self.last_id = int(ids[-1]) if len(ids) else None
+
+
+    def _length(self, name: str) -> int:
+        try:
+            return os.path.getsize(self.paths[name]) // np.dtype(STORE_FILES[name]).itemsize
+        except FileNotFoundError:
+            return 0
+
+
+    def _complete(self) -> Tuple[int, int]:
+        # The complete rows and their values: those whose 'indptr' entry, values, indices, ID and time were all written
+        rows = min(self._length("indptr") - 1, self._length("ids"), self._length("times"))
+        if rows <= 0:
+            return 0, 0
+        indptr = np.memmap(self.paths["indptr"], dtype=np.int64, mode="r", shape=(rows + 1,))
+        values = min(self._length("indices"), self._length("data"))
+        rows = int(np.searchsorted(indptr, values, side="right")) - 1
+        return rows, int(indptr[rows])
+
+
+    def _recover(self) -> None:
+        # Keeps the complete rows only, cutting off what a crash left of the others
+        self.rows, self.nnz = self._complete()
+        rows = self.rows
+        for name, length in (("indptr", rows + 1), ("ids", rows), ("times", rows), ("indices", self.nnz), ("data", self.nnz)):
+            if self._length(name) != length:
+                os.truncate(self.paths[name], length * np.dtype(STORE_FILES[name]).itemsize)
+
+
+    def refresh(self, count: Optional[Callable[[np.ndarray], None]] = None) -> bool:
+        """
+        Function Overview:
+        Picks up the complete rows appended by the writing process since the last refresh (read-only stores).
+
+        Parameters:
+        count (Optional[Callable[[np.ndarray], None]]): Called with the column indices of the new rows before the row count is
+            raised, so statistics derived from them are current by the time readers see the rows.
+
+        Returns:
+        bool: Whether rows were added.
+        """
+        rows, nnz = self._complete()
+        if rows <= self.rows:
+            return False
+        self._maps = None
+        ids = self.array("ids")[self.rows:rows]
+        if self.sorted and not (np.all(ids[1:] > ids[:-1]) and (self.last_id is None or ids[0] > self.last_id)):
+            self.sorted = False
+        self.last_id = int(ids[-1])
+        if count:
+            count(self.array("indices")[self.nnz:nnz])
+        self._order = None
+        self.rows, self.nnz = rows, nnz
+        return True
+
+
+    def array(self, name: str) -> np.ndarray:
+        """
+        Function Overview:
+        Returns one of the store's arrays, memory-mapped read-only (remapped after every append).
+        """
+        maps = self._maps
+        if maps is None:
+            maps = self._maps = {}
+        if name not in maps:
+            length = self._length(name)
+            maps[name] = np.memmap(self.paths[name], dtype=STORE_FILES[name], mode="r", shape=(length,)) if length else np.empty(0, dtype=STORE_FILES[name])
+        return maps[name]
+
+
+    def append(self, ids: np.ndarray, times: np.ndarray, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray) -> None:
+        """
+        Function Overview:
+        Appends rows to the store, given as the arrays of a CSR matrix whose 'indptr' starts at 0.
+
+        Parameters:
+        ids (np.ndarray): The article ID of every row.
+        times (np.ndarray): When every article was stored, in seconds since the epoch.
+        indptr (np.ndarray): The row offsets into 'indices' and 'data', of length 'len(ids) + 1'.
+        indices (np.ndarray): The column of every value.
+        data (np.ndarray): The values.
+        """
+        for name, values in (("data", data), ("indices", indices), ("ids", ids), ("times", times), ("indptr", indptr[1:] + self.nnz)):
+            self._files[name].write(np.ascontiguousarray(values, dtype=STORE_FILES[name]).tobytes())
+            self._files[name].flush()
+        if len(ids):
+            if self.sorted and not (np.all(ids[1:] > ids[:-1]) and (self.last_id is None or ids[0] > self.last_id)):
+                self.sorted = False
+            self.last_id = int(ids[-1])
+        self._maps = self._order = None
+        self.rows += len(ids)
+        self.nnz += len(indices)
+
+
+    def positions(self, ids: np.ndarray) -> np.ndarray:
+        """
+        Function Overview:
+        Finds the rows of the given article IDs with a binary search over the stored IDs (sorted once if they were not appended in order).
+
+        Parameters:
+        ids (np.ndarray): The article IDs.
+
+        Returns:
+        np.ndarray: The row of every ID, or -1 for the IDs not stored.
+        """
+        stored, ids = self.array("ids")[:self.rows], np.asarray(ids, dtype=np.int64)
+        if not len(stored):
+            return np.full(len(ids), -1, dtype=np.int64)
+        if self.sorted:
+            order, keys = None, stored
+        else:
+            if self._order is None or len(self._order[1]) != len(stored):
+                order = np.argsort(stored, kind="stable")
+                self._order = (order, stored[order])
+            order, keys = self._order
+        found = np.minimum(np.searchsorted(keys, ids), len(keys) - 1)
+        positions = found if order is None else order[found]
+        return np.where(keys[found] == ids, positions, -1)
+
+
+    @property
+    def nbytes(self) -> int:
+        return sum(self._length(name) * np.dtype(dtype).itemsize for name, dtype in STORE_FILES.items())
+
+
+    def close(self) -> None:
+        for file in self._files.values():
+            file.close()
+        self._maps = None
+
+
+
+
+class FeatureSnapshot:
+    """
+    Class Overview:
+    Read-only view of the featurized articles at a point in time: the memory-mapped arrays of the store and the IDF weights then.
+    Nothing it holds is modified by later batches, so it can be read from another thread while the featurizer keeps appending.
+
+    Parameters:
+    arrays (Dict[str, np.ndarray]): The arrays of the FeatureStore.
+    rows (int): The rows stored when the snapshot was taken.
+    idf (np.ndarray): The IDF weight of every column.
+    """
+    def __init__(self, arrays: Dict[str, np.ndarray], rows: int, idf: np.ndarray):
+        self.arrays = arrays
+        self.rows = rows
+        self.idf = idf
+
+
+    def matrix(self, positions: np.ndarray) -> sparse.csr_matrix:
+        """
+        Function Overview:
+        Gathers the TF-IDF vectors of the given rows, copying only their values out of the memory-mapped files.
+
+        Function Logic:
+        1. The values of every row are gathered with a single fancy index built from the row offsets.
+        2. The IDF weights are applied and every row is L2-normalized, vectorized over the whole matrix.
+
+        Parameters:
+        positions (np.ndarray): The rows to gather.
+
+        Returns:
+        sparse.csr_matrix: '(rows, columns)' L2-normalized vectors, in the given order.
+        """
+        indptr = self.arrays["indptr"]
+        positions = np.asarray(positions, dtype=np.int64)
+        starts = indptr[positions]
+        lengths = indptr[positions + 1] - starts
+        offsets = np.zeros(len(positions) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        gather = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        counts = sparse.csr_matrix((self.arrays["data"][gather], self.arrays["indices"][gather], offsets), shape=(len(positions), len(self.idf)))
+        return weigh(counts, self.idf)
+
+
+    def latest(self, count: int) -> Tuple[np.ndarray, sparse.csr_matrix]:
+        """
+        Function Overview:
+        Returns the article IDs and TF-IDF vectors of the 'count' articles featurized last, oldest first.
+        """
+        positions = np.arange(max(0, self.rows - count), self.rows)
+        return np.array(self.arrays["ids"][positions]), self.matrix(positions)
+
+
+
+
+def weigh(counts: sparse.csr_matrix, idf: np.ndarray) -> sparse.csr_matrix:
+    """
+    Function Overview:
+    Turns term frequencies into L2-normalized TF-IDF vectors (a new matrix; the frequencies are not modified).
+
+    Parameters:
+    counts (sparse.csr_matrix): The term frequencies, one row per article.
+    idf (np.ndarray): The IDF weight of every column.
+
+    Returns:
+    sparse.csr_matrix: The TF-IDF vectors.
+    """
+    rows = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+    data = counts.data * idf[counts.indices]
+    norms = np.sqrt(np.bincount(rows, weights=np.square(data, dtype=np.float64), minlength=counts.shape[0]))
+    data /= np.where(norms > 0, norms, 1).astype(np.float32)[rows]
+    return sparse.csr_matrix((data, counts.indices, counts.indptr), shape=counts.shape)
+
+
+
+
+class Featurizer:
+    """
+    Class Overview:
+    Incremental TF-IDF featurization of articles, turning the text of every stored article into a sparse vector.
+
+    Function Logic:
+    1. The text of a batch (title and summary) is split into lowercased words of at least 'min_term_length' characters, mapped to
+       columns through the vocabulary, and counted for the whole batch at once with 'np.unique' over '(article, column)' keys; the
+       counts are dampened to '1 + log(count)' when 'sublinear_tf' is set.
+    2. Words never seen are appended to the vocabulary (until 'max_terms'), and the document frequency of every term is updated with
+       the batch, so new articles never require refitting the model. The term frequencies are stored in a FeatureStore, and the
+       IDF weights ('log((1 + articles) / (1 + frequency)) + 1') are applied when vectors are read, so they always use the current
+       statistics and a vector is never rewritten.
+    3. Vectors are returned as L2-normalized SciPy CSR rows 'max_terms' wide, so vectors read at different times can be compared.
+    4. The vocabulary file and the store are append-only; the document frequencies are saved on 'close' and completed from the
+       rows appended since on opening, so the state survives restarts without a full recount.
+    5. A single process may write the directory: the featurizer holds an exclusive lock on it while open, and raises
+       StoreLockedError if another one does, since two writers would interleave their rows and number new terms differently.
+    6. 'add' may run in a worker thread (it is serialized by a lock) while the event loop reads: reads take the row count first and
+       the IDF weights are cached per row count, so they never see a batch half-added.
+    7. The other processes (e.g. the uvicorn workers not running the ingestion) open the directory 'readonly', without the lock:
+       'refresh' picks up the rows and terms appended by the writer since, and counts their document frequencies.
+
+    Parameters:
+    settings (FeatureSettings): The directory, vocabulary and weighting settings.
+    readonly (bool): Whether this process only reads the vectors written by the featurizing process.
+    """
+    def __init__(self, settings: FeatureSettings, readonly: bool = False):
+        self.settings = settings
+        self.readonly = readonly
+        self.token = re.compile(rf"\w{{{settings.min_term_length},}}")
+        self._lock = threading.Lock()
+        self._lock_file = self._terms_file = None
+        if not readonly:
+            os.makedirs(settings.directory, exist_ok=True)
+            self._lock_file = try_lock(os.path.join(settings.directory, LOCK_FILE))
+            if self._lock_file is None:
+                raise StoreLockedError(f"The feature directory '{settings.directory}' is already open for writing by another featurizer.")
+        self.store = FeatureStore(settings.directory, readonly)
+        self.terms: List[str] = []
+        self.columns: Dict[str, int] = {}
+        self._terms_read = 0
+        self._read_terms()
+        if not readonly:
+            # A term cut short by a crash is dropped, as are the incomplete rows of the store
+            self._terms_file = open(os.path.join(settings.directory, TERMS_FILE), "a", encoding="utf-8")
+            self._terms_file.truncate(self._terms_read)
+        self.frequencies = self._load_frequencies()
+        self._idf: Optional[Tuple[int, np.ndarray]] = None
+
+
+    def _read_terms(self) -> None:
+        # Reads the complete lines appended to the vocabulary file since the last read
+        path = os.path.join(self.settings.directory, TERMS_FILE)
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as file:
+            file.seek(self._terms_read)
+            appended = file.read()
+        appended = appended[:appended.rfind(b"\n") + 1]
+        self._terms_read += len(appended)
+        new = [term for term in appended.decode("utf-8").split("\n") if term]
+        self.columns.update((term, column) for column, term in enumerate(new, start=len(self.terms)))
+        self.terms.extend(new)
+
+
+    def _load_frequencies(self) -> np.ndarray:
+        frequencies, counted = np.zeros(self.settings.max_terms, dtype=np.int64), 0
+        path = os.path.join(self.settings.directory, FREQUENCIES_FILE)
+        if os.path.exists(path):
+            with np.load(path) as saved:
+                if int(saved["rows"]) <= self.store.rows and len(saved["frequencies"]) <= self.settings.max_terms:
+                    frequencies[:len(saved["frequencies"])] = saved["frequencies"]
+                    counted = int(saved["rows"])
+        start = int(self.store.array("indptr")[counted]) if self.store.rows else 0
+        counts = np.bincount(self.store.array("indices")[start:self.store.nnz])
+        frequencies[:len(counts)] += counts
+        return frequencies
+
+
+    def refresh(self) -> bool:
+        """
+        Function Overview:
+        Picks up the articles and terms added by the featurizing process since the last refresh, and counts their document
+        frequencies (read-only featurizers; the writer is always current). It may run in a worker thread while the event loop
+        reads: the terms are read first (the writer appends them before the rows using them) and the frequencies are counted
+        before the rows are visible.
+
+        Returns:
+        bool: Whether articles were added.
+        """
+        if not self.readonly:
+            return False
+
+        def count(indices: np.ndarray) -> None:
+            counts = np.bincount(indices)
+            self.frequencies[:len(counts)] += counts
+
+        with self._lock:
+            self._read_terms()
+            return self.store.refresh(count)
+
+
+    def _counts(self, texts: List[str], grow: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Term frequencies of a batch as CSR arrays (rows sorted by column), adding the new words to the vocabulary if 'grow' is set
+        tokens = [self.token.findall(text.lower()) for text in texts]
+        words = [word for article in tokens for word in article]
+        if grow and len(self.terms) < self.settings.max_terms:
+            new = [word for word in dict.fromkeys(words) if word not in self.columns][:self.settings.max_terms - len(self.terms)]
+            if new:
+                self.columns.update((word, column) for column, word in enumerate(new, start=len(self.terms)))
+                self.terms.extend(new)
+                self._terms_file.write("".join(f"{word}\n" for word in new))
+                self._terms_file.flush()
+
+        columns = np.fromiter((self.columns.get(word, -1) for word in words), dtype=np.int64, count=len(words))
+        articles = np.repeat(np.arange(len(texts), dtype=np.int64), [len(article) for article in tokens])
+        known = columns >= 0
+        keys, counts = np.unique(articles[known] * self.settings.max_terms + columns[known], return_counts=True)
+        indptr = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys // self.settings.max_terms, minlength=len(texts)), out=indptr[1:])
+        values = counts.astype(np.float32)
+        if self.settings.sublinear_tf:
+            values = 1 + np.log(values)
+        return indptr, (keys % self.settings.max_terms).astype(np.int32), values
+
+
+    def idf(self) -> np.ndarray:
+        """
+        Function Overview:
+        Returns the current IDF weight of every column (cached until the next batch is added).
+        """
+        rows, cached = self.store.rows, self._idf
+        if cached is None or cached[0] != rows:
+            terms = len(self.terms)
+            idf = np.zeros(self.settings.max_terms, dtype=np.float32)
+            idf[:terms] = np.log((1 + rows) / (1 + self.frequencies[:terms])) + 1
+            cached = self._idf = (rows, idf)
+        return cached[1]
+
+
+    def add(self, ids: List[int], texts: List[str], times: Optional[List[float]] = None) -> None:
+        """
+        Function Overview:
+        Featurizes a batch of stored articles, updating the vocabulary and the document frequencies, and appends their vectors to the store.
+
+        Parameters:
+        ids (List[int]): The article IDs.
+        texts (List[str]): The text of every article.
+        times (Optional[List[float]]): When every article was stored, in seconds since the epoch (defaults to now).
+        """
+        if self.readonly:
+            raise RuntimeError("A read-only featurizer cannot add articles.")
+        if not texts:
+            return
+        with self._lock:
+            indptr, indices, values = self._counts(texts, grow=True)
+            counts = np.bincount(indices)
+            self.frequencies[:len(counts)] += counts
+            times = np.asarray(times, dtype=np.float64) if times is not None else np.full(len(ids), time.time())
+            self.store.append(np.asarray(ids, dtype=np.int64), times, indptr, indices, values)
+
+
+    def transform(self, texts: List[str]) -> sparse.csr_matrix:
+        """
+        Function Overview:
+        Computes the TF-IDF vectors of texts without adding them to the model (e.g. a search query); unknown words are ignored.
+
+        Parameters:
+        texts (List[str]): The texts.
+
+        Returns:
+        sparse.csr_matrix: '(texts, max_terms)' L2-normalized vectors.
+        """
+        indptr, indices, values = self._counts(texts, grow=False)
+        return weigh(sparse.csr_matrix((values, indices, indptr), shape=(len(texts), self.settings.max_terms)), self.idf())
+
+
+    def vectors(self, ids: List[int]) -> Tuple[np.ndarray, sparse.csr_matrix]:
+        """
+        Function Overview:
+        Reads the TF-IDF vectors of stored articles.
+
+        Parameters:
+        ids (List[int]): The article IDs.
+
+        Returns:
+        Tuple[np.ndarray, sparse.csr_matrix]: The IDs found (in the given order) and their L2-normalized vectors.
+        """
+        snapshot = self.snapshot()
+        positions = self.store.positions(np.asarray(ids, dtype=np.int64))
+        found = (positions >= 0) & (positions < snapshot.rows)
+        return np.asarray(ids, dtype=np.int64)[found], snapshot.matrix(positions[found])
+
+
+    def snapshot(self) -> FeatureSnapshot:
+        """
+        Function Overview:
+        Captures the stored vectors and the current IDF weights, for reads that run outside the event loop (e.g. in a thread).
+        """
+        rows = self.store.rows
+        return FeatureSnapshot({name: self.store.array(name) for name in STORE_FILES}, rows, self.idf())
+
+
+    def stats(self) -> dict:
+        return {
+            "articles": self.store.rows,
+            "terms": len(self.terms),
+            "bytes": self.store.nbytes,
+            }
+
+
+    def close(self) -> None:
+        """
+        Function Overview:
+        Saves the document frequencies (so the next start only counts the rows appended later), closes the files and releases the directory.
+        """
+        if self.readonly:
+            return
+        with self._lock:
+            path = os.path.join(self.settings.directory, FREQUENCIES_FILE)
+            np.savez(f"{path}.tmp.npz", frequencies=self.frequencies[:len(self.terms)], rows=self.store.rows)
+            os.replace(f"{path}.tmp.npz", path)
+            self._terms_file.close()
+            self.store.close()
+            self._lock_file.close()
@@ -0,0 +1,455 @@
+import asyncio
+import email.utils
+import html
+import logging
+import math
+import re
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional
+from xml.etree.ElementTree import Element, XMLPullParser
+import httpx
+from app.database import ArticleRepository, store_articles
+from app.metrics import INGESTION_FEED_FETCHES, INGESTION_FEED_DURATION, INGESTION_ARTICLES
+from app.schema.articles import ArticleRecord
+from config.ingestion_config import IngestionSettings
+
+if TYPE_CHECKING:
+    from app.dedup import Deduplicator
+    from app.features import Featurizer
+    from app.ann import ArticleIndex
+
+
+logger = logging.getLogger('fastapi_logger')
+
+# XML namespaces of the feed formats: Atom, RSS 1.0 (RDF) and the RSS modules carrying authors, dates and full content
+ATOM = "{http://www.w3.org/2005/Atom}"
+RSS1 = "{http://purl.org/rss/1.0/}"
+RDF_ABOUT = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about"
+DC = "{http://purl.org/dc/elements/1.1/}"
+CONTENT_ENCODED = "{http://purl.org/rss/1.0/modules/content/}encoded"
+
+# Elements holding a single article: RSS 2.0 and RSS 1.0 items, Atom entries
+ENTRY_TAGS = {"item", f"{RSS1}item", f"{ATOM}entry"}
+
+# Summaries are stored as plain text, cut to this many characters
+SUMMARY_MAX_LENGTH = 2000
+
+MARKUP = re.compile(r"<[^>]*>")
+WHITESPACE = re.compile(r"\s+")
+
+USER_AGENT = "Newsalyzer feed ingestion"
+
+
+
+
+def _plain_text(element: Optional[Element], limit: int) -> Optional[str]:
+    # Titles and summaries often carry (escaped or inline XHTML) markup
+    if element is None:
+        return None
+    text = WHITESPACE.sub(" ", html.unescape(MARKUP.sub(" ", "".join(element.itertext())))).strip()
+    return text[:limit] or None
+
+
+def _timestamp(element: Optional[Element]) -> Optional[datetime]:
+    # Atom dates are RFC 3339 ('2003-12-13T18:30:02Z'), RSS dates RFC 822 ('Sat, 13 Dec 2003 18:30:02 GMT')
+    value = (element.text or "").strip() if element is not None else ""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def parse_entry(entry: Element, feed_url: str) -> Optional[ArticleRecord]:
+    """
+    Function Overview:
+    Builds the article of an RSS item or Atom entry.
+
+    Function Logic:
+    1. The first occurrence of every child element is looked up by its (namespaced) tag.
+    2. The GUID is the RSS 'guid' or Atom 'id', else the RDF 'about' attribute, the link or the title, so every article of a feed
+       has a stable identity; entries with none of them are skipped.
+    3. The summary falls back to the full content, the author to the Dublin Core creator and the publication date to the
+       last update; markup is stripped from the title and the summary.
+
+    Parameters:
+    entry (Element): The complete 'item' or 'entry' element.
+    feed_url (str): The URL of the feed the entry was read from.
+
+    Returns:
+    Optional[ArticleRecord]: The article, or None if the entry cannot be identified.
+    """
+    children: Dict[str, Element] = {}
+    link = None
+    for child in entry:
+        if child.tag == f"{ATOM}link":
+            if link is None and child.get("rel", "alternate") == "alternate":
+                link = child.get("href")
+            continue
+        children.setdefault(child.tag, child)
+
+    if entry.tag == f"{ATOM}entry":
+        guid = children.get(f"{ATOM}id")
+        summary = children.get(f"{ATOM}summary", children.get(f"{ATOM}content"))
+        author = children[f"{ATOM}author"].find(f"{ATOM}name") if f"{ATOM}author" in children else None
+        published = children.get(f"{ATOM}published", children.get(f"{ATOM}updated"))
+        title = children.get(f"{ATOM}title")
+    else:
+        namespace = entry.tag[:-len("item")]
+        link = (children[f"{namespace}link"].text or "").strip() if f"{namespace}link" in children else None
+        link = link or None
+        guid = children.get("guid")
+        summary = children.get(f"{namespace}description", children.get(CONTENT_ENCODED))
+        author = children.get("author", children.get(f"{DC}creator"))
+        published = children.get("pubDate", children.get(f"{DC}date"))
+        title = children.get(f"{namespace}title")
+
+    title_text = _plain_text(title, SUMMARY_MAX_LENGTH)
+    identifier = (guid.text or "").strip() if guid is not None else ""
+    identifier = identifier or entry.get(RDF_ABOUT) or link or title_text
+    if not identifier:
+        return None
+    return ArticleRecord(
+        feed_url = feed_url,
+        guid = identifier,
+        link = link,
+        title = title_text or "",
+        summary = _plain_text(summary, SUMMARY_MAX_LENGTH),
+        author = _plain_text(author, SUMMARY_MAX_LENGTH),
+        published_at = _timestamp(published),
+        )
+
+
+
+
+class FeedParser:
+    """
+    Class Overview:
+    Incremental parser of an RSS 2.0, RSS 1.0 or Atom document, fed with the chunks of the response as they arrive.
+
+    Function Logic:
+    1. Chunks are passed to an expat pull parser; every article is returned as soon as its closing tag has been read, so
+       parsing overlaps with the download and never waits for the whole document.
+    2. Parsed entries are detached from the document tree, so the memory used stays bounded by the largest entry, whatever the
+       size of the feed.
+    3. A malformed or truncated document raises xml.etree.ElementTree.ParseError (the articles returned before stay valid).
+
+    Parameters:
+    feed_url (str): The URL of the feed, stored with its articles.
+    """
+    def __init__(self, feed_url: str):
+        self.feed_url = feed_url
+        self._parser = XMLPullParser(events=("start", "end"))
+        self._open: List[Element] = []
+
+
+    def feed(self, data: bytes) -> List[ArticleRecord]:
+        self._parser.feed(data)
+        return self._read()
+
+
+    def close(self) -> List[ArticleRecord]:
+        self._parser.close()
+        return self._read()
+
+
+    def _read(self) -> List[ArticleRecord]:
+        articles = []
+        for event, element in self._parser.read_events():
+            if event == "start":
+                self._open.append(element)
+                continue
+            self._open.pop()
+            if element.tag in ENTRY_TAGS:
+                article = parse_entry(element, self.feed_url)
+                if article is not None:
+                    articles.append(article)
+                if self._open:
+                    self._open[-1].remove(element)
+        return articles
+
+
+
+
+class FeedState:
+    """
+    Class Overview:
+    Polling state of a feed.
+
+    Attributes:
+    url (str): The URL of the feed.
+    etag (Optional[str]): The 'ETag' of the last complete fetch, sent back as 'If-None-Match'.
+    last_modified (Optional[str]): The 'Last-Modified' of the last complete fetch, sent back as 'If-Modified-Since'.
+    due (float): Monotonic time at which the feed is polled next ('inf' while it is queued or being fetched).
+    failures (int): Polls that failed in a row.
+    """
+    def __init__(self, url: str):
+        self.url = url
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.due = 0.0
+        self.failures = 0
+
+
+
+
+class FeedIngestor:
+    """
+    Class Overview:
+    Ingestion pipeline polling the configured RSS and Atom feeds and writing their articles to the 'articles' table.
+
+    Function Logic:
+    1. A scheduler queues every feed once it is due; the queue holds at most one feed per worker, so the scheduler never runs
+       ahead of the workers.
+    2. A fixed pool of 'workers' tasks fetches the queued feeds concurrently over a shared HTTP client (one connection per worker).
+       Each request is conditional ('If-None-Match' / 'If-Modified-Since' from the last fetch), so an unchanged feed costs a
+       '304 Not Modified' and no parsing.
+    3. Responses are streamed through FeedParser, and every parsed article is handed to the writer right away; the hand-off queue
+       is bounded, so a slow database slows the fetches down instead of buffering articles without limit.
+    4. A single writer task groups the articles into batches of 'batch_size' (or whatever arrived within 'flush_interval'), assigns
+       their duplicate clusters with the deduplicator (if any), dropping exact copies, and stores each batch with 'store_articles';
+       articles already stored are skipped by the database. Deduplication and featurization run in worker threads, so their
+       CPU-bound work never blocks the event loop. The articles actually inserted are then turned into TF-IDF vectors by
+       the featurizer (if any), stored with their 'ingested_at' time, and the similarity index (if any) catches up with them.
+    5. A feed that fails is polled again after an exponentially growing delay (capped at 'max_backoff'); if a batch cannot be
+       written, the validators of its feeds are forgotten so their articles are fetched again on the next poll.
+    6. The pipeline runs in a single worker process, the one holding the ingestion lock (see the application lifespan): the
+       deduplication index only knows the articles of its own process, and the feature store and similarity index accept a single
+       writer.
+
+    Parameters:
+    settings (IngestionSettings): The feeds, pool, polling and batching settings.
+    repository (ArticleRepository): Storage backend of the articles table.
+    deduplicator (Optional[Deduplicator]): Groups the copies of a story into clusters before they are stored (if provided).
+    featurizer (Optional[Featurizer]): Computes the TF-IDF vectors of the stored articles (if provided).
+    index (Optional[ArticleIndex]): Indexes the featurized articles for similarity search (if provided, with a featurizer).
+    client (Optional[httpx.AsyncClient]): HTTP client used to fetch the feeds; by default one is created (and closed) by the pipeline.
+    """
+    def __init__(self, settings: IngestionSettings, repository: ArticleRepository, deduplicator: Optional["Deduplicator"] = None, featurizer: Optional["Featurizer"] = None, index: Optional["ArticleIndex"] = None, client: Optional[httpx.AsyncClient] = None):
+        self.settings = settings
+        self.repository = repository
+        self.deduplicator = deduplicator
+        self.featurizer = featurizer
+        self.index = index if featurizer is not None else None
+        self.feeds = {url: FeedState(url) for url in settings.feeds}
+        self.fetching = 0
+        self._client = client
+        self._owns_client = client is None
+        self._feed_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.workers)
+        self._articles: asyncio.Queue = asyncio.Queue(maxsize=2 * settings.batch_size)
+        self._batch: List[ArticleRecord] = []
+        self._pollers: List[asyncio.Task] = []
+        self._writer: Optional[asyncio.Task] = None
+
+
+    async def start(self, schedule: bool = True) -> None:
+        """
+        Function Overview:
+        Starts the writer and the worker pool, and the scheduler polling the feeds unless 'schedule' is False
+        (feeds are then only polled by 'poll_all').
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers = {"User-Agent": USER_AGENT},
+                timeout = self.settings.fetch_timeout,
+                limits = httpx.Limits(max_connections=self.settings.workers, max_keepalive_connections=self.settings.workers),
+                follow_redirects = True,
+                )
+        self._writer = asyncio.create_task(self._write())
+        self._pollers = [asyncio.create_task(self._work()) for _ in range(self.settings.workers)]
+        if schedule and self.feeds:
+            self._pollers.append(asyncio.create_task(self._schedule()))
+        if self.index is not None:
+            # Indexes the articles featurized before a restart but not saved in the index yet
+            self._pollers.append(asyncio.create_task(self._index()))
+
+
+    async def stop(self) -> None:
+        """
+        Function Overview:
+        Stops polling, abandoning the fetches in progress, writes the articles already parsed and closes the HTTP client.
+        """
+        for task in self._pollers:
+            task.cancel()
+        await asyncio.gather(*self._pollers, return_exceptions=True)
+        self._pollers = []
+        if self._writer is not None:
+            await self.flush()
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+    async def poll_all(self) -> None:
+        """
+        Function Overview:
+        Polls every feed once through the worker pool and returns once all their articles are written.
+        """
+        for state in self.feeds.values():
+            state.due = math.inf
+            await self._feed_queue.put(state)
+        await self._feed_queue.join()
+        await self.flush()
+
+
+    async def flush(self) -> None:
+        """
+        Function Overview:
+        Waits until every article handed to the writer so far is written.
+        """
+        written = asyncio.get_running_loop().create_future()
+        await self._articles.put(written)
+        await written
+
+
+    async def _schedule(self) -> None:
+        while True:
+            now = time.monotonic()
+            for state in self.feeds.values():
+                if state.due <= now:
+                    state.due = math.inf
+                    await self._feed_queue.put(state)
+            # Woken at least every second, to pick up the feeds rescheduled by the workers meanwhile
+            due = min(state.due for state in self.feeds.values())
+            await asyncio.sleep(min(max(due - time.monotonic(), 0.0), 1.0))
+
+
+    async def _work(self) -> None:
+        while True:
+            state = await self._feed_queue.get()
+            self.fetching += 1
+            try:
+                await self.poll(state)
+            finally:
+                self.fetching -= 1
+                self._feed_queue.task_done()
+
+
+    async def poll(self, state: FeedState) -> None:
+        """
+        Function Overview:
+        Fetches a feed with a conditional request, streams its articles to the writer and schedules its next poll.
+
+        Parameters:
+        state (FeedState): The polling state of the feed, updated with the new validators and due time.
+        """
+        started = time.perf_counter()
+        headers = {}
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+        try:
+            async with self._client.stream("GET", state.url, headers=headers) as response:
+                if response.status_code == 304:
+                    outcome = "not_modified"
+                else:
+                    response.raise_for_status()
+                    parser, received = FeedParser(state.url), 0
+                    async for chunk in response.aiter_bytes():
+                        received += len(chunk)
+                        if received > self.settings.max_feed_bytes:
+                            raise ValueError(f"Feed larger than {self.settings.max_feed_bytes} bytes.")
+                        await self._emit(parser.feed(chunk))
+                    await self._emit(parser.close())
+                    # Only kept once the whole document was read, so a failed fetch is never skipped as not modified later
+                    state.etag = response.headers.get("etag")
+                    state.last_modified = response.headers.get("last-modified")
+                    outcome = "fetched"
+            state.failures = 0
+            state.due = time.monotonic() + self.settings.interval
+        except Exception as e:
+            outcome = "failed"
+            state.failures += 1
+            state.due = time.monotonic() + min(self.settings.interval * 2 ** (state.failures - 1), self.settings.max_backoff)
+            logger.warning("Tag: Ingestion - Feed '%s' failed (%s in a row): [%s]", state.url, state.failures, e)
+        INGESTION_FEED_FETCHES.inc(outcome)
+        INGESTION_FEED_DURATION.observe(time.perf_counter() - started)
+
+
+    async def _emit(self, articles: List[ArticleRecord]) -> None:
+        for article in articles:
+            await self._articles.put(article)
+        INGESTION_ARTICLES.inc("parsed", amount=len(articles))
+
+
+    async def _write(self) -> None:
+        deadline = math.inf
+        while True:
+            try:
+                async with asyncio.timeout_at(deadline if self._batch else None):
+                    item = await self._articles.get()
+            except TimeoutError:
+                item = None
+
+            if isinstance(item, ArticleRecord):
+                if not self._batch:
+                    deadline = asyncio.get_running_loop().time() + self.settings.flush_interval
+                self._batch.append(item)
+                if len(self._batch) < self.settings.batch_size:
+                    continue
+            if self._batch:
+                await self._store(self._batch)
+                self._batch = []
+            if isinstance(item, asyncio.Future) and not item.done():
+                item.set_result(None)
+
+
+    async def _store(self, batch: List[ArticleRecord]) -> None:
+        if self.deduplicator is not None:
+            try:
+                batch = await asyncio.to_thread(self.deduplicator.assign, batch)
+            except Exception as e:
+                # The articles are still stored, without a cluster, rather than stalling the pipeline
+                logger.error("Tag: Ingestion - Deduplicating %s articles failed: [%s]", len(batch), e)
+            if not batch:
+                return
+        try:
+            rows = await store_articles(batch, self.repository, self.settings.batch_size)
+        except RuntimeError as e:
+            INGESTION_ARTICLES.inc("failed", amount=len(batch))
+            logger.error("Tag: Ingestion - Storing %s articles failed: [%s]", len(batch), e)
+            for url in {article.feed_url for article in batch}:
+                if url in self.feeds:
+                    self.feeds[url].etag = self.feeds[url].last_modified = None
+            return
+        INGESTION_ARTICLES.inc("stored", amount=len(rows))
+        INGESTION_ARTICLES.inc("duplicate", amount=len(batch) - len(rows))
+        if self.featurizer is not None and rows:
+            try:
+                await asyncio.to_thread(
+                    self.featurizer.add, [row["article_id"] for row in rows], [f"{row['title']} {row.get('summary') or ''}" for row in rows],
+                    [datetime.fromisoformat(row["ingested_at"]).timestamp() for row in rows],
+                    )
+            except Exception as e:
+                # The articles stay stored without a vector rather than stalling the pipeline
+                logger.error("Tag: Ingestion - Featurizing %s articles failed: [%s]", len(rows), e)
+            await self._index()
+
+
+    async def _index(self) -> None:
+        if self.index is None:
+            return
+        try:
+            await self.index.catch_up(self.featurizer)
+        except Exception as e:
+            # The articles are indexed on the next catch-up rather than stalling the pipeline
+            logger.error("Tag: Ingestion - Indexing articles failed: [%s]", e)
+
+
+    def stats(self) -> dict:
+        return {
+            "feeds": len(self.feeds),
+            "queued": self._feed_queue.qsize(),
+            "fetching": self.fetching,
+            "pending_articles": self._articles.qsize() + len(self._batch),
+            }
@@ -0,0 +1,31 @@
+import fcntl
+import os
+from typing import BinaryIO, Optional
+
+
+
+
+def try_lock(path: str) -> Optional[BinaryIO]:
+    """
+    Function Overview:
+    Takes an exclusive lock on a file without waiting, so a single process of the host (e.g. one uvicorn worker) owns a resource.
+
+    Function Logic:
+    1. The file (and its directory) is created if needed and locked with 'flock'; the lock belongs to the open file, so it is held
+       until the returned file is closed, and released by the kernel if the process dies.
+    2. If another process (or another open file of this process) holds the lock, None is returned.
+
+    Parameters:
+    path (str): The path of the lock file.
+
+    Returns:
+    Optional[BinaryIO]: The open file holding the lock (close it to release the lock), or None if the lock is held elsewhere.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    file = open(path, "ab")
+    try:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        file.close()
+        return None
+    return file
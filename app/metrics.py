@@ -0,0 +1,223 @@
+"""
+Lightweight in-process metrics exposed in the Prometheus text exposition format on '/metrics'.
+Metrics are updated from the event loop thread only, so updates are plain dictionary operations without locking.
+"""
+
+
+import functools
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+
+# Latency buckets in seconds, matching the Prometheus client defaults
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[Any, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+
+
+class Counter:
+    """
+    Class Overview:
+    Monotonically increasing value, kept per combination of label values.
+
+    Parameters:
+    name (str): The metric name.
+    documentation (str): The help text.
+    labels (Tuple[str, ...]): The label names.
+    """
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values: Dict[tuple, float] = {}
+
+
+    def inc(self, *label_values: Any, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+
+    def samples(self) -> Iterable[str]:
+        for label_values, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}"
+
+
+
+
+class Gauge(Counter):
+    """
+    Class Overview:
+    Value that can go up and down (e.g. requests in flight), kept per combination of label values.
+    """
+    kind = "gauge"
+
+    def dec(self, *label_values: Any, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) - amount
+
+
+    def set(self, value: float, *label_values: Any) -> None:
+        self._values[label_values] = value
+
+
+
+
+class Histogram:
+    """
+    Class Overview:
+    Distribution of observed values (e.g. latencies) over fixed buckets, kept per combination of label values.
+
+    Function Logic:
+    1. Each observation increments a single (non-cumulative) bucket found by binary search, and adds to the sum.
+    2. Buckets are only made cumulative when the metrics are rendered, keeping observations cheap.
+
+    Parameters:
+    name (str): The metric name.
+    documentation (str): The help text.
+    labels (Tuple[str, ...]): The label names.
+    buckets (Tuple[float, ...]): The upper bounds of the buckets, in increasing order ('+Inf' is implicit).
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.bounds = tuple(buckets)
+        self._series: Dict[tuple, list] = {}
+
+
+    def observe(self, value: float, *label_values: Any) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.bounds) + 1), 0.0]
+        series[0][bisect_left(self.bounds, value)] += 1
+        series[1] += value
+
+
+    def samples(self) -> Iterable[str]:
+        for label_values, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.bounds + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labels, label_values, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, label_values)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labels, label_values)} {cumulative}"
+
+
+
+
+class MetricsRegistry:
+    """
+    Class Overview:
+    Collection of the metrics exposed on '/metrics'.
+
+    Function Logic:
+    1. Metrics updated on the hot path (counters, gauges, histograms) are registered once and updated in place.
+    2. Collectors are callbacks run only when the metrics are rendered, for values that already exist elsewhere
+       (pool, cache and log queue stats); they return '(name, type, help, labels, value)' rows.
+    3. 'render' produces the Prometheus text exposition format (version 0.0.4).
+    """
+    def __init__(self):
+        self.metrics: List[Any] = []
+        self.collectors: List[Callable[[], Iterable[Tuple[str, str, str, Dict[str, Any], float]]]] = []
+
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+
+    def add_collector(self, collector: Callable[[], Iterable[Tuple[str, str, str, Dict[str, Any], float]]]) -> None:
+        self.collectors.append(collector)
+
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+
+        # Samples of a metric family must be contiguous, so collected rows are grouped by name
+        families: Dict[str, list] = {}
+        for collector in self.collectors:
+            for name, kind, documentation, labels, value in collector():
+                family = families.setdefault(name, [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"])
+                family.append(f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} {_format_value(value)}")
+        for family in families.values():
+            lines.extend(family)
+        return "\n".join(lines) + "\n"
+
+
+
+
+# Registry rendered by the '/metrics' endpoint
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.register(Counter("http_requests_total", "Total HTTP requests handled.", ("method", "route", "status")))
+HTTP_REQUEST_DURATION = registry.register(Histogram("http_request_duration_seconds", "Time spent handling HTTP requests.", ("method", "route", "status")))
+HTTP_REQUESTS_IN_FLIGHT = registry.register(Gauge("http_requests_in_flight", "HTTP requests currently being handled.", ("method", "route")))
+HTTP_REQUESTS_REJECTED = registry.register(Counter("http_requests_rejected_total", "HTTP requests rejected by admission control (rate_limited, queue_full or queue_timeout).", ("method", "route", "reason")))
+DATABASE_CALL_DURATION = registry.register(Histogram("database_call_duration_seconds", "Time spent in data layer calls, including cache hits.", ("function",)))
+DATABASE_CALL_ERRORS = registry.register(Counter("database_call_errors_total", "Data layer calls that failed with a database or unexpected error.", ("function",)))
+SINGLE_FLIGHT_CALLS = registry.register(Counter("database_single_flight_calls_total", "Coalescable data layer reads that ran a query (executed) or shared one already in flight (coalesced).", ("function", "outcome")))
+PASSWORD_HASH_DURATION = registry.register(Histogram("password_hash_duration_seconds", "Time spent hashing or verifying a password, including the wait for a worker thread.", ("operation",)))
+INGESTION_FEED_FETCHES = registry.register(Counter("ingestion_feed_fetches_total", "Feed polls by outcome (fetched, not_modified or failed).", ("outcome",)))
+INGESTION_FEED_DURATION = registry.register(Histogram("ingestion_feed_fetch_duration_seconds", "Time spent fetching and parsing a feed."))
+INGESTION_ARTICLES = registry.register(Counter("ingestion_articles_total", "Articles read from feeds (parsed), and written (stored), skipped as already stored (duplicate) or lost to a write error (failed).", ("outcome",)))
+DEDUP_ARTICLES = registry.register(Counter("dedup_articles_total", "Ingested articles by deduplication outcome (unique, near_duplicate, exact_duplicate or repeat).", ("outcome",)))
+
+
+
+
+def track_database_call(function: Callable) -> Callable:
+    """
+    Function Overview:
+    Decorator recording the latency and the errors of an asynchronous data layer function, labelled with its name.
+
+    Function Logic:
+    1. The latency of every call is observed in 'database_call_duration_seconds'.
+    2. ValueErrors (not found, conflicts) are expected outcomes and are not counted; any other exception increments 'database_call_errors_total'.
+
+    Parameters:
+    function (Callable): The data layer coroutine function to instrument.
+
+    Returns:
+    Callable: The instrumented coroutine function.
+    """
+    name = function.__name__
+
+    @functools.wraps(function)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await function(*args, **kwargs)
+        except ValueError:
+            raise
+        except Exception:
+            DATABASE_CALL_ERRORS.inc(name)
+            raise
+        finally:
+            DATABASE_CALL_DURATION.observe(time.perf_counter() - started, name)
+
+    return wrapper
@@ -0,0 +1,159 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+from app.metrics import PASSWORD_HASH_DURATION
+from config.password_config import PasswordSettings
+
+
+# Identifier of the hashes produced here; stored passwords without it are legacy plaintext values, replaced on the next login
+SCHEME = "scrypt"
+
+# Sizes of the random salt and of the derived key, in bytes
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+
+
+def _encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _decode(data: str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+def _derive(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    # scrypt needs 128 * r * (n + p + 2) bytes; OpenSSL refuses to allocate more than 'maxmem', 32 MiB by default
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=128 * r * (n + p + 2) + 2 ** 20, dklen=KEY_BYTES)
+
+
+def parse_hash(stored: str) -> Optional[Tuple[int, int, int, bytes, bytes]]:
+    """
+    Function Overview:
+    Splits a stored hash ('$scrypt$n=16384,r=8,p=1$<salt>$<key>', salt and key in unpadded base64) into its parts.
+
+    Parameters:
+    stored (str): The value of the password column.
+
+    Returns:
+    Optional[Tuple[int, int, int, bytes, bytes]]: The cost parameters, salt and key, or None if the value is not an scrypt hash.
+    """
+    parts = stored.split("$")
+    if len(parts) != 5 or parts[0] or parts[1] != SCHEME:
+        return None
+    try:
+        parameters = dict(item.split("=", 1) for item in parts[2].split(","))
+        return int(parameters["n"]), int(parameters["r"]), int(parameters["p"]), _decode(parts[3]), _decode(parts[4])
+    except (KeyError, ValueError):
+        return None
+
+
+def hash_password(password: str, n: int, r: int, p: int) -> str:
+    """
+    Function Overview:
+    Hashes a password with scrypt, a memory-hard key derivation function, and a random salt (CPU-bound: run it in a worker thread).
+
+    Parameters:
+    password (str): The password.
+    n (int): CPU/memory cost.
+    r (int): Block size.
+    p (int): Parallelization.
+
+    Returns:
+    str: The self-describing hash ('$scrypt$n=...,r=...,p=...$<salt>$<key>') to store in the password column.
+    """
+    salt = os.urandom(SALT_BYTES)
+    return f"${SCHEME}$n={n},r={r},p={p}${_encode(salt)}${_encode(_derive(password, salt, n, r, p))}"
+
+
+def verify_password(password: str, stored: str) -> bool:
+    """
+    Function Overview:
+    Checks a password against a stored value, with the cost parameters recorded in the hash (CPU-bound for scrypt hashes).
+
+    Function Logic:
+    1. scrypt hashes are recomputed with their own salt and parameters, so hashes made before a cost change still verify.
+    2. Any other value is a legacy plaintext password, compared directly.
+    3. Both comparisons take constant time.
+
+    Parameters:
+    password (str): The password to check.
+    stored (str): The value of the password column.
+
+    Returns:
+    bool: True if the password matches.
+    """
+    parsed = parse_hash(stored)
+    if parsed is None:
+        return hmac.compare_digest(password.encode(), stored.encode())
+    n, r, p, salt, key = parsed
+    return hmac.compare_digest(_derive(password, salt, n, r, p), key)
+
+
+
+
+class PasswordHasher:
+    """
+    Class Overview:
+    Hashes and verifies passwords in a bounded pool of worker threads, so the event loop keeps serving other requests meanwhile.
+
+    Function Logic:
+    1. 'hashlib.scrypt' releases the GIL, so the worker threads run in parallel on separate cores, without the cost of sending
+       every password to another process.
+    2. At most 'worker_count' hashes run at once, bounding their CPU use and their memory (128 * r * n bytes each, 16 MiB by default);
+       further calls wait in the pool's queue.
+    3. The time spent by every call, queueing included, is recorded in the '/metrics' registry.
+
+    Parameters:
+    settings (PasswordSettings): The scrypt cost parameters and the number of worker threads.
+    """
+    def __init__(self, settings: PasswordSettings):
+        self.settings = settings
+        self.workers = settings.worker_count()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hasher")
+        self._pending = 0
+        self._decoy: Optional[str] = None
+
+
+    async def _run(self, operation: str, function: Callable[..., Any], *args: Any) -> Any:
+        self._pending += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+        finally:
+            self._pending -= 1
+            PASSWORD_HASH_DURATION.observe(time.perf_counter() - started, operation)
+
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", hash_password, password, self.settings.scrypt_n, self.settings.scrypt_r, self.settings.scrypt_p)
+
+
+    async def verify(self, password: str, stored: str) -> bool:
+        return await self._run("verify", verify_password, password, stored)
+
+
+    async def verify_decoy(self, password: str) -> None:
+        # Verifies against a throwaway hash, so unknown usernames take as long to reject as wrong passwords
+        if self._decoy is None:
+            self._decoy = await self.hash(os.urandom(SALT_BYTES).hex())
+        await self.verify(password, self._decoy)
+
+
+    def needs_rehash(self, stored: str) -> bool:
+        parsed = parse_hash(stored)
+        return parsed is None or parsed[:3] != (self.settings.scrypt_n, self.settings.scrypt_r, self.settings.scrypt_p)
+
+
+    def stats(self) -> dict:
+        return {"workers": self.workers, "pending": self._pending}
+
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
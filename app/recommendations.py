@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from scipy import sparse
+from app.database.cache import MemoryCache
+from app.features import Featurizer, FeatureSnapshot
+from config.recommendation_config import RecommendationSettings
+
+
+logger = logging.getLogger('fastapi_logger')
+
+
+
+
+class UserInterests:
+    """
+    Class Overview:
+    Interest vector of a user: the heaviest TF-IDF terms of the articles they interacted with, decayed over time and L2-normalized,
+    as stored in the 'user_interests' table.
+
+    Attributes:
+    terms (np.ndarray): The columns of the terms, sorted (int32).
+    weights (np.ndarray): The weight of every term (float32).
+    seen (List[int]): The latest articles the user interacted with, oldest first, left out of their recommendations.
+    interaction_id (int): The latest interaction folded into the vector (its version), 0 for none.
+    updated_at (Optional[str]): When that interaction was recorded, as an ISO 8601 string.
+    """
+    def __init__(self, terms: np.ndarray, weights: np.ndarray, seen: List[int], interaction_id: int = 0, updated_at: Optional[str] = None):
+        self.terms = terms
+        self.weights = weights
+        self.seen = seen
+        self.interaction_id = interaction_id
+        self.updated_at = updated_at
+
+
+    @classmethod
+    def load(cls, row: Optional[Dict[str, Any]]) -> "UserInterests":
+        if row is None:
+            return cls(np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32), [])
+        return cls(np.asarray(row["terms"], dtype=np.int32), np.asarray(row["weights"], dtype=np.float32), list(row["seen"]), row["interaction_id"], row["updated_at"])
+
+
+    def row(self, user_id: int) -> Dict[str, Any]:
+        return {
+            "user_id": user_id,
+            "interaction_id": self.interaction_id,
+            "terms": self.terms.tolist(),
+            "weights": self.weights.tolist(),
+            "seen": self.seen,
+            "updated_at": self.updated_at,
+            }
+
+
+
+
+class CandidateMatrix:
+    """
+    Class Overview:
+    The TF-IDF vectors of the latest articles, precomputed for ranking.
+
+    Function Logic:
+    1. The vectors are kept column-major (CSC, one column per term), so scoring a user only reads the columns of their interest
+       terms: 'matrix[:, terms] @ weights' is the cosine similarity of every candidate with the user's interests.
+
+    Parameters:
+    ids (np.ndarray): The article ID of every candidate, oldest first.
+    matrix (sparse.csc_matrix): '(candidates, terms)' L2-normalized vectors.
+    rows (int): The featurized articles when the matrix was built.
+    """
+    def __init__(self, ids: np.ndarray, matrix: sparse.csc_matrix, rows: int):
+        self.ids = ids
+        self.matrix = matrix
+        self.rows = rows
+        self.built = time.monotonic()
+
+
+    @classmethod
+    def build(cls, snapshot: FeatureSnapshot, count: int) -> "CandidateMatrix":
+        ids, matrix = snapshot.latest(count)
+        return cls(ids, matrix.tocsc(), snapshot.rows)
+
+
+    @property
+    def nbytes(self) -> int:
+        return self.ids.nbytes + self.matrix.data.nbytes + self.matrix.indices.nbytes + self.matrix.indptr.nbytes
+
+
+    def scores(self, terms: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        return np.asarray(self.matrix[:, terms] @ weights).ravel()
+
+
+
+
+class Recommender:
+    """
+    Class Overview:
+    Personalised ranking of the latest articles for every user, by similarity between the user's interest vector and the TF-IDF
+    vectors of the articles.
+
+    Function Logic:
+    1. Interest vectors are precomputed and stored in the 'user_interests' table, so every worker reads the same ones and they
+       survive restarts. Recording an interaction folds the interactions stored since the vector's version into it ('update'):
+       the vector is decayed by the time elapsed since its last interaction ('half_life'), the article's vector scaled by the
+       interaction's weight is added, the 'interest_terms' heaviest terms are kept and the vector is normalized. A vector missing
+       or 'history' interactions behind is rebuilt from the user's latest 'history' interactions the same way.
+    2. The vectors of the latest 'candidates' articles are gathered from the featurizer's store into a CandidateMatrix. It is
+       rebuilt in a thread once articles were added and it is older than 'refresh_interval', while requests keep using the previous
+       one; a read-only featurizer (workers not running the ingestion) is refreshed in that thread first, to pick up the articles
+       added since.
+    3. A ranking reads the user's stored vector (one row), then runs one sparse product over the columns of the user's terms and a
+       vectorized top-k ('np.argpartition') of the scores, highest first and newest first on ties; the articles the user
+       interacted with last ('seen') are left out. A user without interests gets the latest articles.
+    4. Ranked lists are cached in process for 'cache_ttl' seconds per user and limit, so a cached request reads nothing. Recording
+       an interaction drops the user's lists in the worker that recorded it; the other workers serve theirs until they expire.
+
+    Parameters:
+    settings (RecommendationSettings): The candidate, interest and cache settings.
+    featurizer (Featurizer): The featurizer of the ingested articles (read-only outside the process running the ingestion).
+    """
+    def __init__(self, settings: RecommendationSettings, featurizer: Featurizer):
+        self.settings = settings
+        self.featurizer = featurizer
+        self.candidates: Optional[CandidateMatrix] = None
+        self.cache = MemoryCache(settings.cache_max_entries, settings.cache_ttl)
+        self.generation = 0
+        self._refresh: Optional[asyncio.Task] = None
+
+
+    async def _current(self) -> CandidateMatrix:
+        # Starts a refresh when the matrix is stale; only the first requests, before any matrix exists, wait for it
+        current = self.candidates
+        stale = current is None or time.monotonic() - current.built >= self.settings.refresh_interval
+        if stale and self._refresh is None:
+            self._refresh = asyncio.create_task(self._rebuild())
+        if current is None:
+            await asyncio.shield(self._refresh)
+            if self.candidates is None:
+                raise RuntimeError("The candidate articles could not be loaded.")
+            current = self.candidates
+        return current
+
+
+    async def _rebuild(self) -> None:
+        try:
+            await asyncio.to_thread(self.featurizer.refresh)
+            current = self.candidates
+            if current is not None and current.rows == self.featurizer.store.rows:
+                current.built = time.monotonic()
+                return
+            self.candidates = await asyncio.to_thread(CandidateMatrix.build, self.featurizer.snapshot(), self.settings.candidates)
+        except Exception as e:
+            logger.error("Tag: Recommendations - Building the candidate matrix failed: [%s]", e)
+        finally:
+            self._refresh = None
+
+
+    def update(self, user_id: int, stored: Optional[Dict[str, Any]], interactions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Function Overview:
+        Folds interactions into a user's interest vector; articles without a TF-IDF vector only count as seen.
+
+        Parameters:
+        user_id (int): The user ID.
+        stored (Optional[Dict[str, Any]]): The user's stored interest vector, or None to build one from the interactions alone.
+        interactions (List[Dict[str, Any]]): The interactions recorded after the stored vector's version, latest first.
+
+        Returns:
+        Dict[str, Any]: The row of the updated interest vector, to store.
+        """
+        interests = UserInterests.load(stored)
+        ids, vectors = self.featurizer.vectors([row["article_id"] for row in interactions])
+        rows = {id: (vectors.indices[vectors.indptr[index]:vectors.indptr[index + 1]], vectors.data[vectors.indptr[index]:vectors.indptr[index + 1]]) for index, id in enumerate(ids.tolist())}
+        for interaction in reversed(interactions):
+            vector = rows.get(interaction["article_id"])
+            if vector is not None:
+                elapsed = datetime.fromisoformat(interaction["created_at"]).timestamp() - datetime.fromisoformat(interests.updated_at).timestamp() if interests.updated_at else 0.0
+                terms, inverse = np.unique(np.concatenate([interests.terms, vector[0]]), return_inverse=True)
+                weights = np.bincount(inverse, weights=np.concatenate([interests.weights * 0.5 ** (max(0.0, elapsed) / self.settings.half_life), vector[1] * interaction["weight"]])).astype(np.float32)
+                if len(terms) > self.settings.interest_terms:
+                    keep = np.sort(np.argpartition(-weights, self.settings.interest_terms - 1)[:self.settings.interest_terms])
+                    terms, weights = terms[keep], weights[keep]
+                norm = np.linalg.norm(weights)
+                interests.terms, interests.weights = terms.astype(np.int32), weights / (norm if norm > 0 else 1)
+                interests.updated_at = interaction["created_at"]
+            interests.seen = [*interests.seen, interaction["article_id"]][-self.settings.seen:]
+            interests.interaction_id = interaction["interaction_id"]
+        return interests.row(user_id)
+
+
+    async def recommend(self, stored: Optional[Dict[str, Any]], limit: int) -> List[Tuple[int, float]]:
+        """
+        Function Overview:
+        Ranks the candidate articles for a user.
+
+        Parameters:
+        stored (Optional[Dict[str, Any]]): The user's stored interest vector, or None if they have none.
+        limit (int): The number of articles to return.
+
+        Returns:
+        List[Tuple[int, float]]: The article IDs and their similarity with the user's interests, best first.
+        """
+        candidates = await self._current()
+        interests = UserInterests.load(stored)
+        if not len(interests.terms):
+            return [(int(id), 0.0) for id in candidates.ids[::-1][:limit].tolist()]
+        if not len(candidates.ids):
+            return []
+
+        seen = set(interests.seen)
+        scores = candidates.scores(interests.terms, interests.weights)
+        count = min(limit + len(seen), len(scores))
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.lexsort((-candidates.ids[top], -scores[top]))]
+        ranked = [(id, score) for id, score in zip(candidates.ids[top].tolist(), scores[top].tolist()) if id not in seen]
+        return ranked[:limit]
+
+
+    async def check(self, article_id: int) -> None:
+        """
+        Function Overview:
+        Checks that an article can be interacted with; raises a ValueError if it has no TF-IDF vector (unknown, or not featurized
+        yet), after refreshing a read-only featurizer (in a thread) in case it was featurized since the last refresh.
+
+        Parameters:
+        article_id (int): The article ID.
+        """
+        ids, _ = self.featurizer.vectors([article_id])
+        if not len(ids) and await asyncio.to_thread(self.featurizer.refresh):
+            ids, _ = self.featurizer.vectors([article_id])
+        if not len(ids):
+            raise ValueError(f"Article ID '{article_id}' not found.")
+
+
+    async def cached(self, user_id: int, limit: int) -> Optional[List[Dict[str, Any]]]:
+        lists = await self.cache.get(f"recommendations:{user_id}")
+        return lists.get(limit) if lists else None
+
+
+    async def cache_list(self, user_id: int, limit: int, recommendations: List[Dict[str, Any]], generation: int) -> None:
+        # A list ranked while an interaction was recorded in this worker may predate it, so it is not cached
+        if generation == self.generation:
+            key = f"recommendations:{user_id}"
+            await self.cache.set(key, {**(await self.cache.get(key) or {}), limit: recommendations})
+
+
+    async def invalidate(self, user_id: int) -> None:
+        self.generation += 1
+        await self.cache.delete(f"recommendations:{user_id}")
+
+
+    def stats(self) -> dict:
+        return {
+            "candidates": len(self.candidates.ids) if self.candidates else 0,
+            "candidate_bytes": self.candidates.nbytes if self.candidates else 0,
+            "cache": self.cache.stats(),
+            }
@@ -1 +1,9 @@
-from .users import UserDataRequest, UserDataResponse, UserUpdateRequest, GeneralResponse
+from .users import UserDataRequest, UserDataResponse, UserLoginRequest, UserUpdateRequest, UserPatchRequest, GeneralResponse
+from .users import UserBatchIdsRequest, UserBatchUsernamesRequest, UserBatchItem, UserBatchResponse
+from .users import UserBulkCreateRequest, UserBulkDeleteRequest, UserBulkItem, UserBulkResponse
+from .users import UserListQuery, UserListItem, UserListResponse
+from .users import MessageResponse, UserDetailsResponse, UserIdResponse, UserDetailsBatchItem, UserIdBatchItem, UserDetailsBatch, UserIdBatch
+from .users import UserDetailsBatchResponse, UserIdBatchResponse, UserBulkOutcomeResponse, UserPageResponse
+from .articles import ArticleRecord, ArticleDataResponse, ArticleListQuery, ArticleListResponse, ArticleDetailsResponse, ArticlePageResponse
+from .articles import RecommendationQuery, InteractionRequest, RecommendedArticle, RecommendationListResponse, RecommendationResponse
+from .articles import SimilarArticleQuery, SimilarArticle, SimilarArticleListResponse, SimilarArticlesResponse
@@ -0,0 +1,178 @@
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional, List
+from datetime import datetime
+from .users import GeneralResponse
+
+
+# Columns of the 'articles' table written by the ingestion pipeline ('article_id' and 'ingested_at' are set by the database)
+ARTICLE_RECORD_FIELDS = ("feed_url", "guid", "link", "title", "summary", "author", "published_at", "cluster_id")
+
+# Columns of the 'articles' table returned by reads
+ARTICLE_FIELDS = ("article_id", *ARTICLE_RECORD_FIELDS, "ingested_at")
+
+# Maximum number of articles returned by a single page of the article listing
+MAX_ARTICLE_PAGE_SIZE = 100
+
+# Maximum number of articles recommended to a user at once
+MAX_RECOMMENDATIONS = 100
+
+# Maximum number of similar articles returned at once
+MAX_SIMILAR_ARTICLES = 50
+
+
+class ArticleRecord(BaseModel):
+    """
+    Class Overview:
+    Schema for an article parsed from a news feed, as written to the 'articles' table.
+
+    Attributes:
+    feed_url (str): The URL of the feed the article was read from.
+    guid (str): The identifier of the article within its feed (RSS 'guid' or Atom 'id', else its link or title).
+    link (Optional[str]): The URL of the article (if provided).
+    title (str): The title of the article.
+    summary (Optional[str]): The summary or content of the article as plain text (if provided).
+    author (Optional[str]): The author of the article (if provided).
+    published_at (Optional[datetime]): The timestamp indicating when the article was published (if provided).
+    cluster_id (Optional[int]): The duplicate cluster of the article, shared by the copies of the same story (if deduplicated).
+    """
+    feed_url: str
+    guid: str
+    link: Optional[str] = None
+    title: str
+    summary: Optional[str] = None
+    author: Optional[str] = None
+    published_at: Optional[datetime] = None
+    cluster_id: Optional[int] = None
+
+
+class ArticleDataResponse(ArticleRecord):
+    """
+    Class Overview:
+    Schema for responses containing all data related to a stored article.
+
+    Attributes:
+    article_id (int): The unique identifier of the article.
+    ingested_at (datetime): The timestamp indicating when the article was stored.
+    """
+    article_id: int
+    ingested_at: datetime
+
+
+class ArticleListQuery(BaseModel):
+    """
+    Class Overview:
+    Schema for the query parameters of the article listing, newest articles first.
+
+    Attributes:
+    limit (int): The number of articles per page (between 1 and MAX_ARTICLE_PAGE_SIZE).
+    before_id (Optional[int]): Only list articles stored before this article ID, i.e. the 'next_before_id' of the previous page (if provided).
+    cluster_id (Optional[int]): Only list the articles of this duplicate cluster (if provided).
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    limit: int = Field(20, ge=1, le=MAX_ARTICLE_PAGE_SIZE)
+    before_id: Optional[int] = None
+    cluster_id: Optional[int] = None
+
+
+class ArticleListResponse(BaseModel):
+    """
+    Class Overview:
+    Schema for a page of the article listing.
+
+    Attributes:
+    articles (List[ArticleDataResponse]): The articles of the page, newest first.
+    next_before_id (Optional[int]): The 'before_id' to request the next page with, or none if this is the last page.
+    """
+    articles: List[ArticleDataResponse]
+    next_before_id: Optional[int] = None
+
+
+class RecommendationQuery(BaseModel):
+    """
+    Class Overview:
+    Schema for the query parameters of a user's recommendations.
+
+    Attributes:
+    limit (int): The number of articles to recommend (between 1 and MAX_RECOMMENDATIONS).
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    limit: int = Field(20, ge=1, le=MAX_RECOMMENDATIONS)
+
+
+class InteractionRequest(BaseModel):
+    """
+    Class Overview:
+    Schema for recording an interaction of a user with an article, which updates the user's interests.
+
+    Attributes:
+    article_id (int): The article the user interacted with.
+    weight (float): The strength of the interaction, e.g. 1 for a read and more for a like or a share (between 0 and 10).
+    """
+    article_id: int
+    weight: float = Field(1.0, gt=0, le=10)
+
+
+class RecommendedArticle(ArticleDataResponse):
+    """
+    Class Overview:
+    Schema for an article recommended to a user.
+
+    Attributes:
+    score (float): The cosine similarity between the article and the user's interests (0 for a user without interactions).
+    """
+    score: float
+
+
+class RecommendationListResponse(BaseModel):
+    """
+    Class Overview:
+    Schema for the articles recommended to a user.
+
+    Attributes:
+    recommendations (List[RecommendedArticle]): The recommended articles, best first.
+    """
+    recommendations: List[RecommendedArticle]
+
+
+class SimilarArticleQuery(BaseModel):
+    """
+    Class Overview:
+    Schema for the query parameters of the articles similar to an article.
+
+    Attributes:
+    limit (int): The number of articles to return (between 1 and MAX_SIMILAR_ARTICLES).
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    limit: int = Field(10, ge=1, le=MAX_SIMILAR_ARTICLES)
+
+
+class SimilarArticle(ArticleDataResponse):
+    """
+    Class Overview:
+    Schema for an article similar to another article.
+
+    Attributes:
+    similarity (float): The estimated cosine similarity between the two articles' TF-IDF vectors.
+    """
+    similarity: float
+
+
+class SimilarArticleListResponse(BaseModel):
+    """
+    Class Overview:
+    Schema for the articles similar to an article.
+
+    Attributes:
+    articles (List[SimilarArticle]): The similar articles, most similar first.
+    """
+    articles: List[SimilarArticle]
+
+
+# Schemas of each kind of article response, parametrised once here
+ArticleDetailsResponse = GeneralResponse[ArticleDataResponse]
+ArticlePageResponse = GeneralResponse[ArticleListResponse]
+RecommendationResponse = GeneralResponse[RecommendationListResponse]
+SimilarArticlesResponse = GeneralResponse[SimilarArticleListResponse]
@@ -1,8 +1,32 @@
-from pydantic import BaseModel
-from typing import Optional, Union
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator, model_serializer, SerializerFunctionWrapHandler
+from typing import Optional, Union, List, Literal, Dict, Any, Generic, TypeVar
 from datetime import datetime
 
 
+# Maximum number of users that can be resolved by a single batch lookup request
+MAX_BATCH_SIZE = 100
+
+# Maximum number of users that can be created or deleted by a single (non-streaming) bulk request
+MAX_BULK_SIZE = 10000
+
+# Columns of the 'users' table that clients are allowed to update
+MUTABLE_USER_FIELDS = ("email_id", "username", "password", "first_name", "last_name")
+
+# Columns of the 'users' table returned by reads; the password hash never leaves the data layer
+# ('created_at' and 'updated_at' are set by the database on insert, 'updated_at' again by every update)
+PUBLIC_USER_FIELDS = ("user_id", "email_id", "username", "first_name", "last_name", "created_at", "updated_at")
+
+# Columns of the 'users' table that can be returned by the user listing
+LISTABLE_USER_FIELDS = PUBLIC_USER_FIELDS
+
+# Maximum number of users returned by a single page of the user listing
+MAX_PAGE_SIZE = 100
+
+# Type of the data carried by a response; every endpoint declares a single type, so responses are validated and serialized
+# without trying each member of a union
+DataT = TypeVar("DataT")
+
+
 class UserDataRequest(BaseModel):
     """
     Class Overview:
@@ -17,7 +41,7 @@ class UserDataRequest(BaseModel):
     """
     email_id: str
     username: str
-    password: str
+    password: str = Field(repr=False)
     first_name: str
     last_name: Optional[str] = None
 
@@ -25,24 +49,37 @@ class UserDataRequest(BaseModel):
 class UserDataResponse(BaseModel):
     """
     Class Overview:
-    Schema for responses containing all data related to a user.
+    Schema for responses containing all data related to a user, except their password.
 
     Attributes:
     user_id (int): The unique identifier of the user.
     email_id (str): The email address of the user.
     username (str): The username of the user.
-    password (str): The password for the user.
     first_name (str): The first name of the user.
     last_name (Optional[str]): The last name of the user (if provided).
     created_at (datetime): The timestamp indicating when the user account was created.
+    updated_at (Optional[datetime]): The timestamp of the latest change to the user account (if known).
     """
     user_id: int
     email_id: str
     username: str
-    password: str
     first_name: str
     last_name: Optional[str] = None
     created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class UserLoginRequest(BaseModel):
+    """
+    Class Overview:
+    Schema for requests verifying a user's credentials.
+
+    Attributes:
+    username (str): The username of the user.
+    password (str): The password to verify.
+    """
+    username: str
+    password: str = Field(repr=False)
 
 
 class UserUpdateRequest(BaseModel):
@@ -52,22 +89,273 @@ class UserUpdateRequest(BaseModel):
 
     Attributes:
     user_id (int): The unique identifier of the user whose data is to be updated.
-    field (str): The field in the user's data that is to be updated ('email', 'username', 'first_name' or 'last_name').
+    field (str): The field in the user's data that is to be updated (one of MUTABLE_USER_FIELDS).
     data (str): The new value to be set for the specified field.
     """
     user_id: int
     field: str
     data: str
 
+    @field_validator("field")
+    @classmethod
+    def validate_field(cls, field: str) -> str:
+        if field not in MUTABLE_USER_FIELDS:
+            raise ValueError(f"Field must be one of {', '.join(MUTABLE_USER_FIELDS)}.")
+        return field
+
+    def __repr_args__(self):
+        # Requests are logged: a new password is masked like the 'password' fields of the other requests, which are left out of their repr
+        for name, value in super().__repr_args__():
+            yield name, ("*" * 8 if name == "data" and self.field == "password" else value)
+
+
+class UserPatchRequest(BaseModel):
+    """
+    Class Overview:
+    Schema for requests updating any subset of a user's mutable fields at once.
+
+    Attributes:
+    email_id (Optional[str]): The new email address of the user (if provided).
+    username (Optional[str]): The new username of the user (if provided).
+    password (Optional[str]): The new password for the user (if provided).
+    first_name (Optional[str]): The new first name of the user (if provided).
+    last_name (Optional[str]): The new last name of the user (if provided, may be null to clear it).
+
+    Only the fields present in the request are updated, fields outside MUTABLE_USER_FIELDS are rejected, and at least one field must be provided.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    email_id: Optional[str] = None
+    username: Optional[str] = None
+    password: Optional[str] = Field(default=None, repr=False)
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+
+    @model_validator(mode="after")
+    def validate_fields(self) -> "UserPatchRequest":
+        if not self.model_fields_set:
+            raise ValueError("At least one field must be provided.")
+        for field in self.model_fields_set - {"last_name"}:
+            if getattr(self, field) is None:
+                raise ValueError(f"Field '{field}' cannot be null.")
+        return self
+
 
-class GeneralResponse(BaseModel):
+class UserBatchIdsRequest(BaseModel):
     """
     Class Overview:
-    Schema for responding with details about the outcome of any operation.
+    Schema for requests to fetch the data of several users at once.
+
+    Attributes:
+    ids (List[int]): The user IDs whose data is to be fetched (at most MAX_BATCH_SIZE).
+    """
+    ids: List[int] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class UserBatchUsernamesRequest(BaseModel):
+    """
+    Class Overview:
+    Schema for requests to fetch the user IDs of several usernames at once.
+
+    Attributes:
+    usernames (List[str]): The usernames whose user IDs are to be fetched (at most MAX_BATCH_SIZE).
+    """
+    usernames: List[str] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class UserBatchItem(BaseModel, Generic[DataT]):
+    """
+    Class Overview:
+    Schema for the outcome of a single item of a batch lookup, parametrised by the type of its data
+    (UserBatchItem[UserDataResponse] for lookups by ID, UserBatchItem[int] for lookups by username).
+
+    Attributes:
+    key (Union[int, str]): The requested user ID or username.
+    found (bool): Whether a matching user exists.
+    data (Optional[DataT]): The user's data or user ID, or none if the user was not found.
+    """
+    key: Union[int, str]
+    found: bool
+    data: Optional[DataT] = None
+
+
+class UserBatchResponse(BaseModel, Generic[DataT]):
+    """
+    Class Overview:
+    Schema for responses to batch lookups, reporting the outcome of every requested item, parametrised by the type of the items' data.
+
+    Attributes:
+    results (List[UserBatchItem[DataT]]): The outcome of each requested item, in request order.
+    not_found (List[Union[int, str]]): The requested user IDs or usernames that do not exist.
+    """
+    results: List[UserBatchItem[DataT]]
+    not_found: List[Union[int, str]]
+
+
+class UserBulkCreateRequest(BaseModel):
+    """
+    Class Overview:
+    Schema for requests to create several users at once.
+
+    Attributes:
+    users (List[UserDataRequest]): The data for each new user to be created (at most MAX_BULK_SIZE).
+    """
+    users: List[UserDataRequest] = Field(min_length=1, max_length=MAX_BULK_SIZE)
+
+
+class UserBulkDeleteRequest(BaseModel):
+    """
+    Class Overview:
+    Schema for requests to delete several users at once.
+
+    Attributes:
+    ids (List[int]): The user IDs whose data is to be deleted (at most MAX_BULK_SIZE).
+    """
+    ids: List[int] = Field(min_length=1, max_length=MAX_BULK_SIZE)
+
+
+class UserBulkItem(BaseModel):
+    """
+    Class Overview:
+    Schema for the outcome of a single row of a bulk operation.
+
+    Attributes:
+    index (int): The position of the row in the request (the line number for NDJSON requests).
+    key (Union[int, str]): The username of the user to be created, or the user ID to be deleted.
+    status (str): The outcome of the row ('created', 'deleted', 'conflict', 'not_found', 'invalid' or 'error').
+    detail (str): A message describing the outcome of the row.
+    data (Optional[int]): The user ID of the created user (if any).
+    """
+    index: int
+    key: Union[int, str]
+    status: str
+    detail: str
+    data: Optional[int] = None
+
+
+class UserBulkResponse(BaseModel):
+    """
+    Class Overview:
+    Schema for responses to bulk operations, reporting the outcome of every row.
+
+    Attributes:
+    results (List[UserBulkItem]): The outcome of each row, in request order.
+    succeeded (int): The number of rows that were created or deleted.
+    failed (int): The number of rows that were not created or deleted.
+    """
+    results: List[UserBulkItem]
+    succeeded: int
+    failed: int
+
+
+class UserListQuery(BaseModel):
+    """
+    Class Overview:
+    Schema for the query parameters of the cursor-paginated user listing.
+
+    Attributes:
+    limit (int): The number of users per page (between 1 and MAX_PAGE_SIZE).
+    order_by (Literal['user_id', 'created_at']): The column the users are ordered by (ties on 'created_at' are broken by 'user_id').
+    descending (bool): Whether the users are listed in descending order.
+    cursor (Optional[str]): The 'next_cursor' returned by the previous page (if any).
+    created_after (Optional[datetime]): Only list users created at or after this timestamp (if provided).
+    created_before (Optional[datetime]): Only list users created before this timestamp (if provided).
+    username_prefix (Optional[str]): Only list users whose username starts with this prefix (if provided).
+    first_name_prefix (Optional[str]): Only list users whose first name starts with this prefix (if provided).
+    last_name_prefix (Optional[str]): Only list users whose last name starts with this prefix (if provided).
+    fields (Optional[List[str]]): The columns to return, as a comma-separated list of LISTABLE_USER_FIELDS (all of them if not provided).
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    limit: int = Field(20, ge=1, le=MAX_PAGE_SIZE)
+    order_by: Literal["user_id", "created_at"] = "user_id"
+    descending: bool = False
+    cursor: Optional[str] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    username_prefix: Optional[str] = None
+    first_name_prefix: Optional[str] = None
+    last_name_prefix: Optional[str] = None
+    fields: Optional[List[str]] = None
+
+    @field_validator("fields", mode="before")
+    @classmethod
+    def validate_fields(cls, fields: Union[None, str, List[str]]) -> Optional[List[str]]:
+        if fields is None:
+            return None
+        fields = [field.strip() for entry in ([fields] if isinstance(fields, str) else fields) for field in entry.split(",") if field.strip()]
+        invalid = [field for field in fields if field not in LISTABLE_USER_FIELDS]
+        if invalid or not fields:
+            raise ValueError(f"Fields must be a comma-separated list of {', '.join(LISTABLE_USER_FIELDS)}.")
+        return list(dict.fromkeys(fields))
+
+    @field_validator("username_prefix", "first_name_prefix", "last_name_prefix")
+    @classmethod
+    def validate_prefix(cls, prefix: Optional[str]) -> Optional[str]:
+        if prefix is not None and any(char in prefix for char in "*%"):
+            raise ValueError("Prefixes cannot contain wildcard characters ('*' or '%').")
+        return prefix
+
+
+class UserListItem(BaseModel):
+    """
+    Class Overview:
+    Schema for a user of the user listing: the fields of UserDataResponse, validated and serialized the same way (so a user reads
+    the same from '/list' and '/{id}'), limited to the requested fields.
+
+    Function Logic:
+    1. Every field is optional; only the fields the item was built with are serialized, so a projection omits the other fields
+       while a requested field without a value (e.g. no last name) is still returned as null.
+    """
+    user_id: Optional[int] = None
+    email_id: Optional[str] = None
+    username: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @model_serializer(mode="wrap")
+    def serialize_requested(self, handler: SerializerFunctionWrapHandler) -> Dict[str, Any]:
+        return {field: value for field, value in handler(self).items() if field in self.model_fields_set}
+
+
+class UserListResponse(BaseModel):
+    """
+    Class Overview:
+    Schema for a page of the user listing.
+
+    Attributes:
+    users (List[UserListItem]): The users of the page, limited to the requested fields.
+    next_cursor (Optional[str]): The cursor to request the next page with, or none if this is the last page.
+    """
+    users: List[UserListItem]
+    next_cursor: Optional[str] = None
+
+
+class GeneralResponse(BaseModel, Generic[DataT]):
+    """
+    Class Overview:
+    Schema for responding with details about the outcome of any operation, parametrised by the type of its data
+    (e.g. GeneralResponse[UserDataResponse], GeneralResponse[int] or GeneralResponse[None]).
 
     Attributes:
     detail (str): A message describing the outcome of the operation.
-    data (Union[None, str, int, UserDataResponse]): The data related to the operation, which can be empty (none), an ID, a username, or user data wrapped in the UserDataResponse schema.
+    data (DataT): The data related to the operation, which can be empty (none), an ID, user data wrapped in the UserDataResponse schema, the outcome of a batch lookup or bulk operation wrapped in the UserBatchResponse or UserBulkResponse schema, or a page of users wrapped in the UserListResponse schema.
     """
     detail: str
-    data: Union[None, str, int, UserDataResponse]
+    data: DataT
+
+
+# Schemas of each kind of response, parametrised once here: subscripting a generic model costs a cache lookup on every call
+MessageResponse = GeneralResponse[None]
+UserDetailsResponse = GeneralResponse[UserDataResponse]
+UserIdResponse = GeneralResponse[int]
+UserDetailsBatchItem = UserBatchItem[UserDataResponse]
+UserIdBatchItem = UserBatchItem[int]
+UserDetailsBatch = UserBatchResponse[UserDataResponse]
+UserIdBatch = UserBatchResponse[int]
+UserDetailsBatchResponse = GeneralResponse[UserDetailsBatch]
+UserIdBatchResponse = GeneralResponse[UserIdBatch]
+UserBulkOutcomeResponse = GeneralResponse[UserBulkResponse]
+UserPageResponse = GeneralResponse[UserListResponse]
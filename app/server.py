@@ -0,0 +1,68 @@
+import argparse
+import os
+import uvicorn
+from dotenv import load_dotenv
+from config.server_config import ServerSettings
+from config.logging_config import LOG_FILE_PER_PROCESS_ENV
+
+
+
+
+def run(settings: ServerSettings) -> None:
+    """
+    Function Overview:
+    Serves the application with uvicorn, either as a pool of worker processes (production) or as a single reloading process (development).
+
+    Function Logic:
+    1. Production: a supervisor process binds the socket and runs 'worker_count' workers, replacing any worker that dies.
+       Each worker imports 'app.app:app' and runs the lifespan, so it opens its own repository, connection pool and caches.
+    2. Development ('reload'): a single worker restarted whenever a file of the project changes.
+    3. uvloop and httptools are used when they are installed ('auto'), falling back to asyncio and h11.
+    4. Uvicorn's access log is disabled, since LoggingRoute already logs every request with its timings.
+    5. With several workers, every worker writes (and rotates) its own log files, named after its PID, unless 'LOG_FILE_PER_PROCESS'
+       is set explicitly; the workers inherit the setting from the supervisor's environment.
+
+    Parameters:
+    settings (ServerSettings): The bind address, worker count and connection tuning.
+    """
+    workers = None if settings.reload else settings.worker_count()
+    if workers and workers > 1 and not os.getenv(LOG_FILE_PER_PROCESS_ENV):
+        os.environ[LOG_FILE_PER_PROCESS_ENV] = 'true'
+    uvicorn.run(
+        "app.app:app",
+        host = settings.host,
+        port = settings.port,
+        workers = workers,
+        reload = settings.reload,
+        loop = "auto",
+        http = "auto",
+        backlog = settings.backlog,
+        timeout_keep_alive = settings.keepalive_timeout,
+        timeout_graceful_shutdown = settings.graceful_timeout,
+        limit_max_requests = settings.max_requests or None,
+        access_log = False,
+        log_level = os.getenv('LOG_LEVEL', 'INFO').lower(),
+        )
+
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Newsalyzer API server.")
+    parser.add_argument("--reload", action="store_true", help="Development mode: a single worker reloaded on code changes.")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (default: SERVER_WORKERS, or one per usable core).")
+    parser.add_argument("--port", type=int, help="Port to bind to (default: SERVER_PORT).")
+    args = parser.parse_args()
+
+    load_dotenv()
+    settings = ServerSettings.from_env()
+    overrides = {"reload": True} if args.reload else {}
+    if args.workers is not None:
+        overrides["workers"] = args.workers
+    if args.port is not None:
+        overrides["port"] = args.port
+    run(settings.model_copy(update=overrides))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Spike benchmark of the admission control.
+Drives the application in process against a stub PostgREST server with a small connection pool: a few steady callers fetch users
+('GET /users/{id}') while a spike of callers hammers the user listing ('GET /users/list'). Without a concurrency cap the spike takes
+every database connection and the steady callers queue behind it; with a cap on the listing, the excess of the spike is rejected
+quickly with 503 (the callers then back off for the 'Retry-After' delay) and the tail latency of the other route stays bounded.
+
+Usage:
+    python -m benchmarks.admission_control --spike 128 --steady 4 --duration 5 --route-limit 2
+"""
+
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List
+
+import httpx
+from .api_load import percentile
+from .stub_postgrest import StubPostgrest, serve_in_thread
+
+
+SEED_USERS = 100
+
+
+async def drive(client: httpx.AsyncClient, path: str, callers: int, deadline: float) -> Dict[str, List[float]]:
+    latencies: Dict[str, List[float]] = {"admitted": [], "rejected": []}
+
+    async def caller(offset: int):
+        sequence = offset
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.get(path.format(id=1 + sequence % SEED_USERS))
+            sequence += callers
+            if response.status_code in (429, 503):
+                latencies["rejected"].append(time.perf_counter() - started)
+                # Well-behaved clients back off as told instead of retrying at once
+                await asyncio.sleep(float(response.headers.get("retry-after", 1)))
+            else:
+                latencies["admitted"].append(time.perf_counter() - started)
+
+    await asyncio.gather(*(caller(offset) for offset in range(callers)))
+    return latencies
+
+
+def summarise(latencies: Dict[str, List[float]], duration: float) -> Dict[str, float]:
+    admitted, rejected = latencies["admitted"], latencies["rejected"]
+    return {
+        "admitted_rps": len(admitted) / duration,
+        "admitted_p50_ms": percentile(admitted, 0.50) * 1000 if admitted else 0.0,
+        "admitted_p99_ms": percentile(admitted, 0.99) * 1000 if admitted else 0.0,
+        "rejected": len(rejected),
+        "rejected_p99_ms": percentile(rejected, 0.99) * 1000 if rejected else 0.0,
+        }
+
+
+async def benchmark(latency: float, pool_size: int, spike: int, steady: int, duration: float, route_limit: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Function Overview:
+    Runs the spike without and with a concurrency cap on the user listing.
+
+    Parameters:
+    latency (float): Simulated database round-trip in seconds.
+    pool_size (int): Connections in the database pool.
+    spike (int): Concurrent callers of the user listing.
+    steady (int): Concurrent callers fetching users.
+    duration (float): Seconds each variant is driven for.
+    route_limit (int): Requests the user listing may handle at once in the capped variant.
+
+    Returns:
+    Dict[str, Dict[str, Dict[str, float]]]: For both variants and both routes, the admitted throughput and latency and the rejections.
+    """
+    stub = StubPostgrest(latency=latency)
+    database_url, stop_database = serve_in_thread(stub.app)
+    os.environ.update(
+        SUPABASE_URL = database_url,
+        SUPABASE_API_KEY = "benchmark-key",
+        DATABASE_BACKEND = "supabase",
+        DB_POOL_MAX_SIZE = str(pool_size),
+        DB_POOL_KEEPALIVE_INTERVAL = "0",
+        USER_CACHE_ENABLED = "false",
+        PASSWORD_SCRYPT_N = "1024",
+        ADMISSION_QUEUE_SIZE = str(2 * route_limit),
+        ADMISSION_QUEUE_TIMEOUT = "0.25",
+        )
+
+    from app.app import app
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    try:
+        for variant, limits in (("uncapped", ""), ("capped", f"GET /users/list={route_limit}")):
+            os.environ["ADMISSION_ROUTE_LIMITS"] = limits
+            async with app.router.lifespan_context(app):
+                async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=60.0) as client:
+                    if variant == "uncapped":
+                        users = [{"email_id": f"spike_{index}@example.com", "username": f"spike_{index}", "password": "Spike123!", "first_name": "Spike"} for index in range(SEED_USERS)]
+                        (await client.post("/users/bulk/create", json={"users": users})).raise_for_status()
+
+                    deadline = time.perf_counter() + duration
+                    spiking, fetching = await asyncio.gather(
+                        drive(client, "/users/list?limit=20", spike, deadline),
+                        drive(client, "/users/{id}", steady, deadline),
+                        )
+            results[variant] = {"GET /users/list": summarise(spiking, duration), "GET /users/{id}": summarise(fetching, duration)}
+    finally:
+        stop_database()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the tail latency of a route while another route is hit by a spike, with and without admission control.")
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated database round-trip in seconds.")
+    parser.add_argument("--pool-size", type=int, default=8, help="Connections in the database pool.")
+    parser.add_argument("--spike", type=int, default=128, help="Concurrent callers of the user listing.")
+    parser.add_argument("--steady", type=int, default=4, help="Concurrent callers fetching users.")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds each variant is driven for.")
+    parser.add_argument("--route-limit", type=int, default=2, help="Requests the user listing may handle at once when capped.")
+    parser.add_argument("--output", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    # The per-request logs would dominate the measurements, so only warnings are logged unless LOG_LEVEL is set
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    results = asyncio.run(benchmark(args.latency, args.pool_size, args.spike, args.steady, args.duration, args.route_limit))
+
+    print(f"{'variant':<9} {'route':<16} {'admitted/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'rejected':>9} {'rejected p99 ms':>16}")
+    for variant, routes in results.items():
+        for route, result in routes.items():
+            print(
+                f"{variant:<9} {route:<16} {result['admitted_rps']:>10.1f} {result['admitted_p50_ms']:>9.2f} {result['admitted_p99_ms']:>9.2f} "
+                f"{result['rejected']:>9} {result['rejected_p99_ms']:>16.2f}"
+                )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"latency": args.latency, "pool_size": args.pool_size, "spike": args.spike, "steady": args.steady, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
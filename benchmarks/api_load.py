@@ -0,0 +1,227 @@
+"""
+Load test and regression benchmark for the users API.
+Drives 'app.app:app' either in-process through httpx's ASGI transport or through a local uvicorn server, against the in-memory
+PostgREST stand-in, and reports throughput and p50/p95/p99 latency per endpoint at several concurrency levels.
+Results can be stored as JSON and compared with a stored baseline; the exit status is 1 when any endpoint regressed beyond the threshold.
+
+Usage:
+    python -m benchmarks.api_load --mode asgi --requests 500 --concurrency 1 16 64 --output results.json
+    python -m benchmarks.api_load --baseline baseline.json --threshold 0.2
+"""
+
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+from .stub_postgrest import StubPostgrest, serve_in_thread
+
+
+# Number of users created before the load starts
+SEED_USERS = 1000
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """
+    Function Overview:
+    Returns the nearest-rank percentile of a list of samples.
+
+    Parameters:
+    samples (List[float]): The samples, in any order.
+    fraction (float): The percentile as a fraction (e.g. 0.95).
+
+    Returns:
+    float: The smallest sample that is greater than or equal to 'fraction' of all samples.
+    """
+    ordered = sorted(samples)
+    return ordered[max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))]
+
+
+async def run_load(call: Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]], client: httpx.AsyncClient, total: int, concurrency: int) -> Dict[str, float]:
+    """
+    Function Overview:
+    Issues 'total' requests with at most 'concurrency' of them in flight and summarises their latencies.
+
+    Parameters:
+    call (Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]): Performs the request with the given sequence number.
+    client (httpx.AsyncClient): The client the requests are sent with.
+    total (int): Number of requests to issue.
+    concurrency (int): Number of concurrent callers.
+
+    Returns:
+    Dict[str, float]: Requests per second, p50/p95/p99 latency in milliseconds and the number of unexpected responses.
+    """
+    remaining = iter(range(total))
+    latencies, errors = [], 0
+
+    async def worker():
+        nonlocal errors
+        for sequence in remaining:
+            started = time.perf_counter()
+            response = await call(client, sequence)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "rps": total / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "errors": errors,
+        }
+
+
+def scenarios(seed: int) -> Dict[str, Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]]:
+    """
+    Function Overview:
+    Builds the request performed for each benchmarked endpoint, spreading the requests over the seeded users.
+
+    Parameters:
+    seed (int): Seed for the random choice of users, so runs are comparable.
+
+    Returns:
+    Dict[str, Callable]: The request factory of every endpoint, keyed by '<method> <route>'.
+    """
+    rng = random.Random(seed)
+    ids = [rng.randint(1, SEED_USERS) for _ in range(4096)]
+    created = itertools.count()
+
+    def user_id(sequence: int) -> int:
+        return ids[sequence % len(ids)]
+
+    return {
+        "GET /users/{id}": lambda client, n: client.get(f"/users/{user_id(n)}"),
+        "GET /users/get_id/{username}": lambda client, n: client.get(f"/users/get_id/load_user_{user_id(n)}"),
+        "POST /users/batch/ids": lambda client, n: client.post("/users/batch/ids", json={"ids": [user_id(n + offset) for offset in range(10)]}),
+        "GET /users/list": lambda client, n: client.get("/users/list", params={"limit": 20}),
+        "PATCH /users/{id}": lambda client, n: client.patch(f"/users/{user_id(n)}", json={"first_name": f"Load{n}"}),
+        "POST /users/create": lambda client, n: client.post("/users/create", json=new_user(f"new_user_{next(created)}")),
+        }
+
+
+def new_user(username: str) -> dict:
+    return {"email_id": f"{username}@example.com", "username": username, "password": "LoadTest123!", "first_name": "Load", "last_name": "Test"}
+
+
+async def benchmark(mode: str, latency: float, total: int, levels: List[int], seed: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    stub = StubPostgrest(latency=latency)
+    database_url, stop_database = serve_in_thread(stub.app)
+    os.environ["SUPABASE_URL"] = database_url
+    os.environ["SUPABASE_API_KEY"] = "benchmark-key"
+    os.environ.setdefault("DB_POOL_MAX_SIZE", str(max(levels)))
+    os.environ.setdefault("DB_POOL_KEEPALIVE_INTERVAL", "0")
+    # The password hash cost is measured by 'benchmarks/password_hashing.py'; a cheap hash keeps seeding and user creation from dominating here
+    os.environ.setdefault("PASSWORD_SCRYPT_N", "1024")
+
+    from app.app import app
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    stop_app = None
+    try:
+        if mode == "asgi":
+            lifespan = app.router.lifespan_context(app)
+            await lifespan.__aenter__()
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark")
+        else:
+            base_url, stop_app = serve_in_thread(app, lifespan="on")
+            client = httpx.AsyncClient(base_url=base_url, limits=httpx.Limits(max_connections=max(levels)))
+
+        async with client:
+            users = [new_user(f"load_user_{index}") for index in range(1, SEED_USERS + 1)]
+            seeded = await client.post("/users/bulk/create", json={"users": users})
+            seeded.raise_for_status()
+
+            for endpoint, call in scenarios(seed).items():
+                results[endpoint] = {}
+                for level in levels:
+                    await run_load(call, client, min(total, 50), level)
+                    results[endpoint][str(level)] = await run_load(call, client, total, level)
+    finally:
+        if mode == "asgi":
+            await lifespan.__aexit__(None, None, None)
+        elif stop_app is not None:
+            stop_app()
+        stop_database()
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Dict[str, float]]], baseline: Dict[str, Dict[str, Dict[str, float]]], threshold: float) -> List[str]:
+    """
+    Function Overview:
+    Compares the results with a stored baseline and lists every regression beyond the threshold.
+
+    Function Logic:
+    1. Only endpoints and concurrency levels present in both runs are compared.
+    2. Throughput regresses when it drops by more than 'threshold'; p95 and p99 latency regress when they grow by more than 'threshold'.
+
+    Parameters:
+    results (Dict): The results of this run.
+    baseline (Dict): The stored baseline results.
+    threshold (float): The tolerated relative change (e.g. 0.2 for 20%).
+
+    Returns:
+    List[str]: A description of every regression, empty if there is none.
+    """
+    regressions = []
+    for endpoint, levels in results.items():
+        for level, current in levels.items():
+            previous = baseline.get(endpoint, {}).get(level)
+            if previous is None:
+                continue
+            if current["rps"] < previous["rps"] * (1 - threshold):
+                regressions.append(f"{endpoint} @ {level}: throughput {current['rps']:.1f} req/s (baseline {previous['rps']:.1f})")
+            for key in ("p95_ms", "p99_ms"):
+                if current[key] > previous[key] * (1 + threshold):
+                    regressions.append(f"{endpoint} @ {level}: {key} {current[key]:.2f} ms (baseline {previous[key]:.2f})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the users API against an in-memory database stand-in.")
+    parser.add_argument("--mode", choices=["asgi", "uvicorn"], default="asgi", help="Drive the app in-process (asgi) or through a local uvicorn server.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated database round-trip in seconds.")
+    parser.add_argument("--requests", type=int, default=500, help="Requests issued per endpoint and concurrency level.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64], help="Concurrency levels to test.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the choice of users.")
+    parser.add_argument("--output", help="Optional path to write the results as JSON.")
+    parser.add_argument("--baseline", help="Optional path of a stored result to compare with.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Tolerated relative regression against the baseline.")
+    args = parser.parse_args()
+
+    # The per-request logs would dominate the measurements, so only warnings are logged unless LOG_LEVEL is set
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    results = asyncio.run(benchmark(args.mode, args.latency, args.requests, args.concurrency, args.seed))
+
+    print(f"{'endpoint':<30} {'callers':>8} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for endpoint, levels in results.items():
+        for level, result in levels.items():
+            print(f"{endpoint:<30} {level:>8} {result['rps']:>10.1f} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['errors']:>7}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"mode": args.mode, "latency": args.latency, "python": platform.python_version(), "results": results}, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline.get("results", baseline), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regression beyond {args.threshold:.0%} against {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Concurrency benchmark for the users data layer.
+Compares requests/sec of the previous blocking implementation (synchronous Supabase client called from a coroutine) against the asynchronous
+data layer in 'app/database/users.py', with N concurrent callers against a stub PostgREST server that simulates database latency.
+
+Usage:
+    python -m benchmarks.database_concurrency --latency 0.02 --requests 256 --concurrency 1 8 32 128
+"""
+
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from supabase import create_client
+from app.database import DatabasePool, SupabaseUserRepository, create_user, fetch_user
+from app.passwords import PasswordHasher
+from app.schema.users import UserDataRequest
+from config.database_config import PoolSettings
+from config.password_config import PasswordSettings
+from .stub_postgrest import StubPostgrest, serve_in_thread
+
+
+async def run_load(call: Callable[[], Awaitable], total: int, concurrency: int) -> float:
+    """
+    Function Overview:
+    Issues 'total' calls with at most 'concurrency' of them in flight and returns the achieved throughput.
+
+    Parameters:
+    call (Callable[[], Awaitable]): Coroutine factory performing a single request.
+    total (int): Number of calls to issue.
+    concurrency (int): Number of concurrent callers.
+
+    Returns:
+    float: Completed calls per second.
+    """
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            await call()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return total / (time.perf_counter() - started)
+
+
+async def benchmark(latency: float, total: int, levels: List[int]) -> Dict[str, Dict[int, float]]:
+    stub = StubPostgrest(latency=latency)
+    base_url, stop = serve_in_thread(stub.app)
+    settings = PoolSettings(database_url=base_url, database_api_key="benchmark-key", max_size=max(levels), keepalive_interval=0)
+    repository = SupabaseUserRepository(DatabasePool(settings))
+    await repository.open()
+
+    hasher = PasswordHasher(PasswordSettings())
+    await create_user(UserDataRequest(email_id="bench@example.com", username="bench", password="bench", first_name="Bench"), repository, hasher)
+    hasher.close()
+    legacy_client = create_client(base_url, "benchmark-key")
+
+    async def legacy_fetch_user():
+        # Previous implementation: a synchronous round-trip inside the coroutine blocks the event loop
+        return legacy_client.table("users").select("*").eq("user_id", 1).execute()
+
+    async def async_fetch_user():
+        return await fetch_user(1, repository)
+
+    results = {"blocking": {}, "async": {}}
+    try:
+        for level in levels:
+            results["blocking"][level] = await run_load(legacy_fetch_user, total, level)
+            results["async"][level] = await run_load(async_fetch_user, total, level)
+    finally:
+        await repository.close()
+        stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark blocking vs asynchronous users data layer.")
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated database round-trip in seconds.")
+    parser.add_argument("--requests", type=int, default=256, help="Requests issued per concurrency level.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128], help="Concurrency levels to test.")
+    parser.add_argument("--output", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    results = asyncio.run(benchmark(args.latency, args.requests, args.concurrency))
+
+    print(f"{'callers':>8} {'blocking req/s':>16} {'async req/s':>14} {'speedup':>9}")
+    for level in args.concurrency:
+        blocking, non_blocking = results["blocking"][level], results["async"][level]
+        print(f"{level:>8} {blocking:>16.1f} {non_blocking:>14.1f} {non_blocking / blocking:>8.1f}x")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
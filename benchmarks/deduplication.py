@@ -0,0 +1,136 @@
+"""
+Throughput and accuracy benchmark of the article deduplication index ('app/dedup.py').
+Generates a stream of synthetic articles at a given daily rate (1M articles/day by default): stories of random words, each published
+once and then republished by other feeds either verbatim (exact copies) or with a few words changed (near copies). The stream is
+deduplicated in batches, with the simulated clock advancing at the daily rate so the sliding window expires articles as it would in
+production, and reports:
+- the articles deduplicated per second, against the rate needed to keep up with the daily volume;
+- the memory held by the index for the articles of the window (and per article);
+- the near copies put in the cluster of their story (recall) and the distinct stories merged into another cluster (false merges).
+
+Usage:
+    python -m benchmarks.deduplication --articles 200000 --per-day 1000000 --window 86400
+"""
+
+
+import argparse
+import json
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from app.dedup import Deduplicator
+from app.schema.articles import ArticleRecord
+from config.dedup_config import DedupSettings
+
+
+# Words of the synthetic vocabulary, drawn with a Zipf-like frequency like the words of real text
+VOCABULARY = 20000
+STORY_WORDS = 80
+
+
+def generate(count: int, exact_share: float, near_share: float, edits: int, seed: int) -> Tuple[List[ArticleRecord], List[Tuple[int, str]]]:
+    """
+    Function Overview:
+    Generates the article stream, each article labelled with its story and whether it is an original, an exact or a near copy.
+
+    Returns:
+    Tuple[List[ArticleRecord], List[Tuple[int, str]]]: The articles, and the (story, kind) label of every article.
+    """
+    generator = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, VOCABULARY + 1)
+    words = [f"w{index}" for index in range(VOCABULARY)]
+    stories: List[List[str]] = []
+    articles, labels = [], []
+    for position in range(count):
+        draw = generator.random()
+        if stories and draw < exact_share + near_share:
+            story = int(generator.integers(max(0, len(stories) - 2000), len(stories)))
+            text = list(stories[story])
+            kind = "exact"
+            if draw >= exact_share:
+                kind = "near"
+                for index in generator.integers(0, len(text), size=edits):
+                    text[index] = words[int(generator.integers(0, VOCABULARY))]
+        else:
+            story = len(stories)
+            text = [words[index] for index in generator.choice(VOCABULARY, size=STORY_WORDS, p=weights / weights.sum())]
+            stories.append(text)
+            kind = "original"
+        articles.append(ArticleRecord(feed_url=f"https://feeds.example.com/{position % 500}", guid=str(position), title=" ".join(text[:8]), summary=" ".join(text[8:])))
+        labels.append((story, kind))
+    return articles, labels
+
+
+def benchmark(articles: List[ArticleRecord], labels: List[Tuple[int, str]], settings: DedupSettings, per_day: int, batch_size: int) -> Dict[str, float]:
+    """
+    Function Overview:
+    Deduplicates the stream in batches, advancing the simulated clock at 'per_day' articles a day.
+
+    Parameters:
+    articles (List[ArticleRecord]): The article stream.
+    labels (List[Tuple[int, str]]): The (story, kind) label of every article.
+    settings (DedupSettings): The deduplication settings.
+    per_day (int): Articles a day, setting the simulated time between articles.
+    batch_size (int): Articles deduplicated at once, as the ingestion writer does.
+
+    Returns:
+    Dict[str, float]: Throughput, memory and accuracy figures.
+    """
+    deduplicator = Deduplicator(settings)
+    clusters: Dict[int, int] = {}
+    started, peak_bytes, peak_articles = time.perf_counter(), 0, 0
+    for start in range(0, len(articles), batch_size):
+        batch = articles[start:start + batch_size]
+        deduplicator.assign(batch, now=start * 86400 / per_day)
+        if start % (50 * batch_size) == 0:
+            stats = deduplicator.stats()
+            peak_bytes, peak_articles = max(peak_bytes, stats["bytes"]), max(peak_articles, stats["articles"])
+    elapsed = time.perf_counter() - started
+    stats = deduplicator.stats()
+    peak_bytes, peak_articles = max(peak_bytes, stats["bytes"]), max(peak_articles, stats["articles"])
+
+    for article, (story, kind) in zip(articles, labels):
+        if kind == "original":
+            clusters[story] = article.cluster_id
+    near = [(article, story) for article, (story, kind) in zip(articles, labels) if kind == "near"]
+    originals = [article.cluster_id for article, (_, kind) in zip(articles, labels) if kind == "original"]
+    return {
+        "articles_per_second": len(articles) / elapsed,
+        "required_per_second": per_day / 86400,
+        "window_articles": peak_articles,
+        "index_bytes": peak_bytes,
+        "bytes_per_article": peak_bytes / max(1, peak_articles),
+        "near_recall": sum(1 for article, story in near if article.cluster_id == clusters[story]) / max(1, len(near)),
+        "false_merges": 1 - len(set(originals)) / max(1, len(originals)),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the throughput, memory and accuracy of the article deduplication index.")
+    parser.add_argument("--articles", type=int, default=200000, help="Articles in the stream.")
+    parser.add_argument("--per-day", type=int, default=1000000, help="Articles ingested a day, setting the simulated clock.")
+    parser.add_argument("--window", type=float, default=86400.0, help="Seconds articles are remembered for.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Articles deduplicated at once.")
+    parser.add_argument("--exact-share", type=float, default=0.3, help="Share of the stream made of exact copies.")
+    parser.add_argument("--near-share", type=float, default=0.3, help="Share of the stream made of near copies.")
+    parser.add_argument("--edits", type=int, default=2, help="Words changed in a near copy (out of 80).")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Estimated Jaccard similarity of near-duplicates.")
+    parser.add_argument("--output", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    articles, labels = generate(args.articles, args.exact_share, args.near_share, args.edits, seed=1)
+    settings = DedupSettings(window=args.window, threshold=args.threshold)
+    result = benchmark(articles, labels, settings, args.per_day, args.batch_size)
+
+    print(f"articles/s: {result['articles_per_second']:.0f} (needed for {args.per_day} a day: {result['required_per_second']:.1f})")
+    print(f"index: {result['window_articles']} articles, {result['index_bytes'] / 2 ** 20:.1f} MiB, {result['bytes_per_article']:.0f} bytes/article")
+    print(f"near copies clustered with their story: {result['near_recall']:.1%}, distinct stories merged: {result['false_merges']:.2%}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"articles": args.articles, "per_day": args.per_day, "window": args.window, "result": result}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Throughput and size benchmark of the TF-IDF featurization of articles ('app/features.py').
+Featurizes a stream of synthetic articles (the Zipf-like stories of the deduplication benchmark) in batches, as the ingestion
+writer does, into a fresh vector directory, and reports for a range of stream lengths:
+- the articles featurized and appended to the memory-mapped store per second;
+- the bytes per article on disk (CSR values, column indices, row offsets and IDs, plus the vocabulary) and the vocabulary size;
+- the time to open the store again (memory-mapping the files and loading the saved document frequencies);
+- the articles whose TF-IDF vectors are read back per second, for random batches of IDs.
+
+Usage:
+    python -m benchmarks.featurization --articles 10000 100000 --batch-size 500 --output featurization.json
+"""
+
+
+import argparse
+import json
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+from app.features import Featurizer
+from config.features_config import FeatureSettings
+from .deduplication import generate
+
+
+def benchmark(texts: List[str], batch_size: int, read_batch: int, directory: str) -> Dict[str, float]:
+    """
+    Function Overview:
+    Featurizes the texts into a new store, then reopens it and reads random vectors back.
+
+    Parameters:
+    texts (List[str]): The text of every article.
+    batch_size (int): Articles featurized at once.
+    read_batch (int): Articles whose vectors are read at once.
+    directory (str): Directory of the vector store.
+
+    Returns:
+    Dict[str, float]: Throughput and size figures.
+    """
+    settings = FeatureSettings(directory=directory)
+    featurizer = Featurizer(settings)
+    started = time.perf_counter()
+    for start in range(0, len(texts), batch_size):
+        featurizer.add(list(range(start + 1, start + 1 + len(texts[start:start + batch_size]))), texts[start:start + batch_size])
+    elapsed = time.perf_counter() - started
+    stats = featurizer.stats()
+    featurizer.close()
+    terms_bytes = sum(len(term.encode()) + 1 for term in featurizer.terms)
+
+    started = time.perf_counter()
+    featurizer = Featurizer(settings)
+    reopen = time.perf_counter() - started
+
+    generator = np.random.default_rng(0)
+    reads, started = 0, time.perf_counter()
+    while time.perf_counter() - started < 1.0:
+        ids, vectors = featurizer.vectors(generator.integers(1, len(texts) + 1, size=read_batch).tolist())
+        reads += len(ids)
+    read_elapsed = time.perf_counter() - started
+    featurizer.close()
+    return {
+        "articles_per_second": len(texts) / elapsed,
+        "bytes_per_article": (stats["bytes"] + terms_bytes) / len(texts),
+        "nonzeros_per_article": vectors.nnz / max(1, vectors.shape[0]),
+        "terms": stats["terms"],
+        "reopen_seconds": reopen,
+        "reads_per_second": reads / read_elapsed,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the throughput and size of the TF-IDF article featurization.")
+    parser.add_argument("--articles", type=int, nargs="+", default=[10000, 100000], help="Articles in the stream.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Articles featurized at once.")
+    parser.add_argument("--read-batch", type=int, default=1000, help="Articles whose vectors are read at once.")
+    parser.add_argument("--output", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    results = {}
+    for count in args.articles:
+        articles, _ = generate(count, exact_share=0.0, near_share=0.3, edits=2, seed=1)
+        texts = [f"{article.title} {article.summary}" for article in articles]
+        with tempfile.TemporaryDirectory() as directory:
+            result = results[count] = benchmark(texts, args.batch_size, args.read_batch, directory)
+        print(
+            f"{count:>8} articles: {result['articles_per_second']:>8.0f} articles/s, {result['bytes_per_article']:.0f} bytes/article "
+            f"({result['nonzeros_per_article']:.0f} terms each, {result['terms']} in the vocabulary), "
+            f"reopened in {result['reopen_seconds'] * 1000:.1f} ms, {result['reads_per_second']:.0f} vectors read/s"
+            )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"batch_size": args.batch_size, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Throughput benchmark of the feed ingestion pipeline ('app/ingestion.py').
+Serves N generated feeds from a local stub server and ingests them into the in-memory articles repository with the real pipeline
+(bounded worker pool, streaming parser, batched writes), for a range of source counts and pool sizes. Every level runs three passes:
+- full: every feed is new, all of its articles are parsed and stored;
+- unchanged: every feed answers '304 Not Modified' to the conditional request;
+- update: every feed published a few new articles, the document is parsed again and only the new articles are stored.
+The stored articles are checked against what the stub published.
+
+Usage:
+    python -m benchmarks.feed_ingestion --sources 1 10 100 1000 --items 50 --workers 1 8 --latency 0.05
+"""
+
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Dict
+
+# The pipeline's warnings are enough unless LOG_LEVEL is set; it is read when the app configures its loggers
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app.database import MemoryArticleRepository
+from app.ingestion import FeedIngestor
+from config.ingestion_config import IngestionSettings
+from .stub_feeds import StubFeeds
+from .stub_postgrest import serve_in_thread
+
+
+async def timed_pass(ingestor: FeedIngestor, repository: MemoryArticleRepository) -> Dict[str, float]:
+    stored = len(repository.rows)
+    started = time.perf_counter()
+    await ingestor.poll_all()
+    elapsed = time.perf_counter() - started
+    return {"seconds": elapsed, "stored": len(repository.rows) - stored, "articles_per_second": (len(repository.rows) - stored) / elapsed}
+
+
+async def benchmark(stub: StubFeeds, base_url: str, sources: int, workers: int, batch_size: int, updates: int) -> Dict[str, Dict[str, float]]:
+    """
+    Function Overview:
+    Runs the full, unchanged and update passes over the first 'sources' feeds with a pool of 'workers'.
+
+    Parameters:
+    stub (StubFeeds): The stub feed server, told to publish new articles before the update pass.
+    base_url (str): The URL the stub is served at.
+    sources (int): Number of feeds ingested.
+    workers (int): Feeds fetched at once.
+    batch_size (int): Articles written with a single insert.
+    updates (int): Articles published by every feed before the update pass.
+
+    Returns:
+    Dict[str, Dict[str, float]]: The duration, stored articles and articles per second of every pass.
+    """
+    settings = IngestionSettings(
+        enabled = True,
+        feeds = [f"{base_url}/feeds/{index}.xml" for index in range(sources)],
+        workers = workers,
+        batch_size = batch_size,
+        )
+    repository = MemoryArticleRepository()
+    ingestor = FeedIngestor(settings, repository)
+    await ingestor.start(schedule=False)
+    try:
+        results = {"full": await timed_pass(ingestor, repository)}
+        results["unchanged"] = await timed_pass(ingestor, repository)
+        stub.publish(updates)
+        results["update"] = await timed_pass(ingestor, repository)
+    finally:
+        await ingestor.stop()
+        stub.publish(-updates)
+
+    expected = sources * (stub.items + updates)
+    if len(repository.rows) != expected:
+        raise RuntimeError(f"Stored {len(repository.rows)} articles, expected {expected}.")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the articles ingested per second from a local stub feed server.")
+    parser.add_argument("--sources", type=int, nargs="+", default=[1, 10, 100, 1000], help="Numbers of feeds to ingest.")
+    parser.add_argument("--items", type=int, default=50, help="Articles listed by every feed.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8], help="Sizes of the worker pool to test.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Articles written with a single insert.")
+    parser.add_argument("--updates", type=int, default=5, help="New articles published by every feed before the update pass.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated round-trip to a feed server, in seconds.")
+    parser.add_argument("--output", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    stub = StubFeeds(max(args.sources), args.items, args.latency)
+    base_url, stop_server = serve_in_thread(stub.app)
+    results: Dict[str, Dict[str, Dict[str, Dict[str, float]]]] = {}
+    try:
+        for sources in args.sources:
+            results[str(sources)] = {}
+            for workers in args.workers:
+                results[str(sources)][str(workers)] = asyncio.run(benchmark(stub, base_url, sources, workers, args.batch_size, args.updates))
+    finally:
+        stop_server()
+
+    print(f"{'sources':>7} {'workers':>7} {'full articles/s':>16} {'full s':>8} {'unchanged s':>12} {'update articles/s':>18} {'update s':>9}")
+    for sources, levels in results.items():
+        for workers, passes in levels.items():
+            print(
+                f"{sources:>7} {workers:>7} {passes['full']['articles_per_second']:>16.0f} {passes['full']['seconds']:>8.2f} "
+                f"{passes['unchanged']['seconds']:>12.3f} {passes['update']['articles_per_second']:>18.0f} {passes['update']['seconds']:>9.2f}"
+                )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"items": args.items, "latency": args.latency, "batch_size": args.batch_size, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
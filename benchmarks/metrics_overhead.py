@@ -0,0 +1,117 @@
+"""
+Overhead benchmark for the '/metrics' instrumentation.
+Measures the cost of each metric update on the request hot path, the cost of the data layer decorator, and compares the instrumentation
+recorded per request with the time of a full in-process request, plus the time to render the registry when it is scraped.
+
+Usage:
+    python -m benchmarks.metrics_overhead --iterations 200000 --requests 2000
+"""
+
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Callable, Dict
+
+import httpx
+from app.metrics import Counter, Gauge, Histogram, MetricsRegistry, track_database_call
+
+
+def per_call(function: Callable[[], None], iterations: int) -> float:
+    """
+    Function Overview:
+    Times 'iterations' calls of a function, subtracting the cost of an empty loop, and returns the cost of one call.
+
+    Parameters:
+    function (Callable[[], None]): The operation to time.
+    iterations (int): Number of calls.
+
+    Returns:
+    float: Nanoseconds per call.
+    """
+    started = time.perf_counter()
+    for _ in range(iterations):
+        pass
+    empty = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return max(time.perf_counter() - started - empty, 0.0) / iterations * 1e9
+
+
+async def per_await(factory: Callable, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await factory()
+    return (time.perf_counter() - started) / iterations * 1e9
+
+
+async def benchmark(iterations: int, requests: int) -> Dict[str, float]:
+    counter = Counter("bench_total", "Benchmark counter.", ("method", "route", "status"))
+    gauge = Gauge("bench_in_flight", "Benchmark gauge.", ("method", "route"))
+    histogram = Histogram("bench_seconds", "Benchmark histogram.", ("method", "route", "status"))
+
+    def request_instrumentation():
+        # The updates LoggingRoute performs for every request
+        gauge.inc("GET", "/users/{id}")
+        gauge.dec("GET", "/users/{id}")
+        counter.inc("GET", "/users/{id}", 200)
+        histogram.observe(0.0123, "GET", "/users/{id}", 200)
+
+    results = {
+        "counter_inc_ns": per_call(lambda: counter.inc("GET", "/users/{id}", 200), iterations),
+        "histogram_observe_ns": per_call(lambda: histogram.observe(0.0123, "GET", "/users/{id}", 200), iterations),
+        "request_instrumentation_ns": per_call(request_instrumentation, iterations),
+        }
+
+    async def bare():
+        return None
+    tracked = track_database_call(bare)
+    results["database_decorator_ns"] = await per_await(tracked, iterations) - await per_await(bare, iterations)
+
+    # Full in-process request through the app, to put the per-request instrumentation in perspective
+    from app.app import app
+    from config.logging_config import configure_logging
+    configure_logging()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+        for _ in range(100):
+            await client.get("/")
+        started = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/")
+        results["request_ns"] = (time.perf_counter() - started) / requests * 1e9
+    results["request_overhead_percent"] = results["request_instrumentation_ns"] / results["request_ns"] * 100
+
+    # Scrape cost with a realistic number of series (30 routes x 4 statuses)
+    registry = MetricsRegistry()
+    scraped = registry.register(Histogram("bench_seconds", "Benchmark histogram.", ("method", "route", "status")))
+    for route in range(30):
+        for status in (200, 404, 409, 500):
+            scraped.observe(0.01, "GET", f"/route/{route}", status)
+    started = time.perf_counter()
+    for _ in range(100):
+        registry.render()
+    results["render_120_series_ms"] = (time.perf_counter() - started) / 100 * 1000
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the overhead of the metrics instrumentation.")
+    parser.add_argument("--iterations", type=int, default=200000, help="Iterations per micro-benchmark.")
+    parser.add_argument("--requests", type=int, default=2000, help="In-process requests used as the reference.")
+    parser.add_argument("--output", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    results = asyncio.run(benchmark(args.iterations, args.requests))
+    for name, value in results.items():
+        print(f"{name:>28} {value:>12.2f}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Concurrency benchmark of the login endpoint ('POST /users/login').
+Drives the application in process (in-memory backend) with N concurrent logins, verifying the scrypt hashes either in the password
+hasher's worker pool or inline on the event loop, and measures at the same time the latency of 'GET /' (a request that does no work),
+which shows how long the event loop is blocked by the hashing.
+The login throughput is bounded by the cores available to the hasher's pool; the latency of the other requests should not depend on it.
+
+Usage:
+    python -m benchmarks.password_hashing --requests 64 --concurrency 1 4 16 --workers 4
+"""
+
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+# The per-request logs would dominate the measurements, so only warnings are logged unless LOG_LEVEL is set; it is read when the app configures its loggers
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from app.passwords import PasswordHasher
+from config.password_config import PasswordSettings
+from .api_load import percentile
+
+
+class InlinePasswordHasher(PasswordHasher):
+    # The reference: every hash runs on the event loop, stalling every other request meanwhile
+    async def _run(self, operation: str, function: Callable[..., Any], *args: Any) -> Any:
+        return function(*args)
+
+
+async def measure(client: httpx.AsyncClient, total: int, concurrency: int) -> Dict[str, float]:
+    """
+    Function Overview:
+    Issues 'total' logins with 'concurrency' of them in flight, while a single probe requests 'GET /' every 5 ms.
+
+    Parameters:
+    client (httpx.AsyncClient): Client bound to the application.
+    total (int): Number of logins to issue.
+    concurrency (int): Number of concurrent logins.
+
+    Returns:
+    Dict[str, float]: Logins per second, p50/p99 login latency and p50/max probe latency in milliseconds, and the failed logins.
+    """
+    remaining = iter(range(total))
+    logins, probes, failures = [], [], 0
+    done = asyncio.Event()
+
+    async def login():
+        nonlocal failures
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.post("/users/login", json={"username": "bench_user", "password": "BenchPswrd123!"})
+            logins.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                failures += 1
+
+    async def probe():
+        # Timed from when the request is due, so the time the event loop is stalled before the probe wakes up is counted
+        while not done.is_set():
+            due = time.perf_counter() + 0.005
+            await asyncio.sleep(0.005)
+            await client.get("/")
+            probes.append(time.perf_counter() - due)
+
+    prober = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await prober
+    return {
+        "logins_per_second": total / elapsed,
+        "login_p50_ms": percentile(logins, 0.50) * 1000,
+        "login_p99_ms": percentile(logins, 0.99) * 1000,
+        "probe_p50_ms": percentile(probes, 0.50) * 1000,
+        "probe_max_ms": max(probes) * 1000,
+        "failures": failures,
+        }
+
+
+async def benchmark(total: int, levels: List[int], settings: PasswordSettings) -> Dict[str, Dict[str, Dict[str, float]]]:
+    os.environ["DATABASE_BACKEND"] = "memory"
+    from app.app import app
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    lifespan = app.router.lifespan_context(app)
+    await lifespan.__aenter__()
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+            user = {"email_id": "bench.user@example.com", "username": "bench_user", "password": "BenchPswrd123!", "first_name": "Bench"}
+            (await client.post("/users/create", json=user)).raise_for_status()
+
+            for variant, hasher in (("pool", PasswordHasher(settings)), ("inline", InlinePasswordHasher(settings))):
+                app.state.password_hasher = hasher
+                results[variant] = {}
+                for level in levels:
+                    await measure(client, min(total, level), level)
+                    results[variant][str(level)] = await measure(client, total, level)
+                hasher.close()
+    finally:
+        await lifespan.__aexit__(None, None, None)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the login endpoint with the password hashes verified in a worker pool or inline.")
+    parser.add_argument("--requests", type=int, default=64, help="Logins issued per concurrency level.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16], help="Concurrency levels to test.")
+    parser.add_argument("--workers", type=int, default=0, help="Threads of the hasher's pool (default: one per usable core).")
+    parser.add_argument("--scrypt-n", type=int, default=2 ** 14, help="scrypt CPU/memory cost.")
+    parser.add_argument("--output", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    settings = PasswordSettings(scrypt_n=args.scrypt_n, workers=args.workers)
+    results = asyncio.run(benchmark(args.requests, args.concurrency, settings))
+
+    print(f"hasher workers: {settings.worker_count()}, scrypt n={settings.scrypt_n}")
+    print(f"{'variant':<8} {'concurrency':>11} {'logins/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'GET / p50 ms':>13} {'GET / max ms':>13}")
+    for variant, levels in results.items():
+        for level, result in levels.items():
+            print(
+                f"{variant:<8} {level:>11} {result['logins_per_second']:>9.1f} {result['login_p50_ms']:>8.1f} {result['login_p99_ms']:>8.1f} "
+                f"{result['probe_p50_ms']:>13.2f} {result['probe_max_ms']:>13.2f}"
+                )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"workers": settings.worker_count(), "scrypt_n": settings.scrypt_n, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
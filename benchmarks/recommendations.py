@@ -0,0 +1,147 @@
+"""
+Latency benchmark of the personalised recommendations ('app/recommendations.py').
+Featurizes a corpus of synthetic articles (words drawn from a Zipf-like vocabulary, so frequent terms have long columns as in real
+news) into a fresh vector directory, records random interactions for a set of users in the in-memory articles repository (as
+'/users/{id}/interactions' does, folding each into the user's stored interest vector) and reports their latency, then for each
+candidate-set size reports:
+- the time and memory taken by the candidate matrix (rebuilt in the background in production);
+- the latency of an uncached recommendation request (p50, p99): reading the user's stored interest vector and ranking the
+  candidates, but not fetching the ranked articles (one 'in' query), against the 50 ms p99 target.
+
+Usage:
+    python -m benchmarks.recommendations --candidates 1000 10000 100000 1000000 --users 200 --limit 20
+"""
+
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+from app.database.articles import record_interaction
+from app.database.memory_repository import MemoryArticleRepository
+from app.features import Featurizer
+from app.recommendations import Recommender, CandidateMatrix
+from app.schema.articles import InteractionRequest
+from config.features_config import FeatureSettings
+from config.recommendation_config import RecommendationSettings
+from .api_load import percentile
+
+
+# Words of the synthetic vocabulary and per article
+VOCABULARY = 50000
+ARTICLE_WORDS = 60
+
+
+def corpus(count: int, seed: int, chunk: int = 50000):
+    """
+    Function Overview:
+    Yields the texts of 'count' synthetic articles in chunks, every word drawn from a Zipf-like distribution.
+    """
+    generator = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, VOCABULARY + 1)
+    words = np.array([f"w{index}" for index in range(VOCABULARY)])
+    for start in range(0, count, chunk):
+        drawn = words[generator.choice(VOCABULARY, size=(min(chunk, count - start), ARTICLE_WORDS), p=weights / weights.sum())]
+        yield [" ".join(article) for article in drawn]
+
+
+async def record(recommender: Recommender, repository: MemoryArticleRepository, users: int, articles: List[List[int]]) -> List[float]:
+    latencies = []
+    for user in range(1, users + 1):
+        for article in articles[user - 1]:
+            started = time.perf_counter()
+            await record_interaction(user, InteractionRequest(article_id=article, weight=1.0), recommender, repository)
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def rank(recommender: Recommender, repository: MemoryArticleRepository, users: List[int], limit: int, rounds: int) -> List[float]:
+    latencies = []
+    for _ in range(rounds):
+        for user in users:
+            started = time.perf_counter()
+            await recommender.recommend(await repository.get_interests(user), limit)
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def benchmark(sizes: List[int], users: int, interactions: int, limit: int, rounds: int, directory: str) -> Tuple[Dict[str, float], Dict[int, Dict[str, float]]]:
+    """
+    Function Overview:
+    Featurizes the corpus, records the users' interactions and measures the recording and ranking latency for every candidate-set size.
+
+    Parameters:
+    sizes (List[int]): The candidate-set sizes.
+    users (int): Users ranked at every size.
+    interactions (int): Interactions recorded per user.
+    limit (int): Articles recommended per request.
+    rounds (int): Rankings per user and size.
+    directory (str): Directory of the vector store.
+
+    Returns:
+    Tuple[Dict[str, float], Dict[int, Dict[str, float]]]: The recording latency, and build time, memory and latency figures per size.
+    """
+    featurizer = Featurizer(FeatureSettings(directory=directory))
+    started, next_id = time.perf_counter(), 1
+    for texts in corpus(max(sizes), seed=1):
+        for start in range(0, len(texts), 500):
+            batch = texts[start:start + 500]
+            featurizer.add(list(range(next_id, next_id + len(batch))), batch)
+            next_id += len(batch)
+    print(f"featurized {next_id - 1} articles in {time.perf_counter() - started:.1f} s")
+
+    recommender, repository = Recommender(RecommendationSettings(), featurizer), MemoryArticleRepository()
+    generator = np.random.default_rng(2)
+    latencies = asyncio.run(record(recommender, repository, users, generator.integers(max(1, next_id - min(sizes)), next_id, size=(users, interactions)).tolist()))
+
+    recording = {"p50_ms": percentile(latencies, 0.5) * 1000, "p99_ms": percentile(latencies, 0.99) * 1000}
+
+    results = {}
+    for size in sizes:
+        started = time.perf_counter()
+        recommender.candidates = CandidateMatrix.build(featurizer.snapshot(), size)
+        built = time.perf_counter() - started
+        latencies = asyncio.run(rank(recommender, repository, list(range(1, users + 1)), limit, rounds))
+        results[size] = {
+            "build_seconds": built,
+            "candidate_bytes": recommender.candidates.nbytes,
+            "p50_ms": percentile(latencies, 0.5) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "rankings_per_second": len(latencies) / sum(latencies),
+            }
+        recommender.candidates = None
+    featurizer.close()
+    return recording, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the latency of ranking the candidate articles for a user.")
+    parser.add_argument("--candidates", type=int, nargs="+", default=[1000, 10000, 100000, 1000000], help="Candidate-set sizes.")
+    parser.add_argument("--users", type=int, default=200, help="Users ranked at every size.")
+    parser.add_argument("--interactions", type=int, default=20, help="Interactions recorded per user.")
+    parser.add_argument("--limit", type=int, default=20, help="Articles recommended per request.")
+    parser.add_argument("--rounds", type=int, default=2, help="Rankings per user and size.")
+    parser.add_argument("--output", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        recording, results = benchmark(args.candidates, args.users, args.interactions, args.limit, args.rounds, directory)
+    print(f"recording interactions: p50 {recording['p50_ms']:6.2f} ms, p99 {recording['p99_ms']:6.2f} ms")
+    for size, result in results.items():
+        print(
+            f"{size:>8} candidates: p50 {result['p50_ms']:6.2f} ms, p99 {result['p99_ms']:6.2f} ms (target 50 ms), "
+            f"{result['rankings_per_second']:7.0f} rankings/s, matrix built in {result['build_seconds']:.2f} s, "
+            f"{result['candidate_bytes'] / 2 ** 20:.1f} MiB"
+            )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"users": args.users, "interactions": args.interactions, "limit": args.limit, "recording": recording, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Micro-benchmark of the cost of building and serializing a response.
+Compares the typed GeneralResponse[...] schemas (e.g. UserDetailsResponse) with the former 'data: Union[...]' schema, replaying what
+FastAPI does with the value returned by an endpoint (validation against the response model, then pydantic's direct JSON serialization),
+and compares the standard library and orjson renderings of the hand-built error bodies.
+
+Usage:
+    python -m benchmarks.serialization --iterations 20000 --output serialization.json
+"""
+
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List, Union
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from app.api.utils.responses import FastJSONResponse
+from app.schema.users import UserDataResponse, UserListResponse, UserDetailsResponse, UserIdResponse, UserDetailsBatchItem, UserDetailsBatch
+from app.schema.users import UserDetailsBatchResponse, UserPageResponse
+
+
+ROW = {
+    "user_id": 1001,
+    "email_id": "bench.user@example.com",
+    "username": "BenchUser_1001",
+    "password": "BenchPswrd123!",
+    "first_name": "Bench",
+    "last_name": "User",
+    "created_at": "2026-01-01T12:00:00.123456+00:00",
+    }
+
+
+class LegacyBatchItem(BaseModel):
+    key: Union[int, str]
+    found: bool
+    data: Union[None, int, UserDataResponse] = None
+
+
+class LegacyBatchResponse(BaseModel):
+    results: List[LegacyBatchItem]
+    not_found: List[Union[int, str]]
+
+
+class LegacyGeneralResponse(BaseModel):
+    # The response schema before it was made generic, kept here as the reference
+    detail: str
+    data: Union[None, str, int, UserDataResponse, LegacyBatchResponse, UserListResponse]
+
+
+def per_call(function: Callable[[], Any], iterations: int) -> float:
+    function()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def respond(adapter: TypeAdapter, build: Callable[[], BaseModel]) -> Callable[[], bytes]:
+    # What FastAPI does with an endpoint's return value when a response model is declared
+    return lambda: adapter.dump_json(adapter.validate_python(build(), from_attributes=True))
+
+
+def cases(batch_size: int) -> Dict[str, Dict[str, Callable[[], bytes]]]:
+    rows = [{**ROW, "user_id": ROW["user_id"] + offset} for offset in range(batch_size)]
+    legacy = TypeAdapter(LegacyGeneralResponse)
+    return {
+        "user": {
+            "typed": respond(TypeAdapter(UserDetailsResponse), lambda: UserDetailsResponse(detail="Fetched.", data=UserDataResponse(**ROW))),
+            "union": respond(legacy, lambda: LegacyGeneralResponse(detail="Fetched.", data=UserDataResponse(**ROW))),
+            },
+        "user_id": {
+            "typed": respond(TypeAdapter(UserIdResponse), lambda: UserIdResponse(detail="Fetched.", data=1001)),
+            "union": respond(legacy, lambda: LegacyGeneralResponse(detail="Fetched.", data=1001)),
+            },
+        f"batch_{batch_size}": {
+            "typed": respond(
+                TypeAdapter(UserDetailsBatchResponse),
+                lambda: UserDetailsBatchResponse(detail="Fetched.", data=UserDetailsBatch(
+                    results=[UserDetailsBatchItem(key=row["user_id"], found=True, data=UserDataResponse(**row)) for row in rows], not_found=[])),
+                ),
+            "union": respond(
+                legacy,
+                lambda: LegacyGeneralResponse(detail="Fetched.", data=LegacyBatchResponse(
+                    results=[LegacyBatchItem(key=row["user_id"], found=True, data=UserDataResponse(**row)) for row in rows], not_found=[])),
+                ),
+            },
+        f"list_{batch_size}": {
+            "typed": respond(TypeAdapter(UserPageResponse), lambda: UserPageResponse(detail="Fetched.", data=UserListResponse(users=rows))),
+            "union": respond(legacy, lambda: LegacyGeneralResponse(detail="Fetched.", data=UserListResponse(users=rows))),
+            },
+        "error_body": {
+            "orjson": lambda: FastJSONResponse(content={"detail": "User ID '1' not found."}, status_code=404).body,
+            "stdlib": lambda: JSONResponse(content={"detail": "User ID '1' not found."}, status_code=404).body,
+            },
+        }
+
+
+def benchmark(iterations: int, batch_size: int) -> Dict[str, Dict[str, float]]:
+    """
+    Function Overview:
+    Measures the cost of every variant of every response, after checking that the variants produce the same JSON.
+
+    Parameters:
+    iterations (int): Responses built per variant (divided by the batch size for the batch and list responses).
+    batch_size (int): Users per batch lookup or listing page.
+
+    Returns:
+    Dict[str, Dict[str, float]]: The cost of each variant in microseconds per response, for every response.
+    """
+    results = {}
+    for name, variants in cases(batch_size).items():
+        bodies = [json.loads(variant()) for variant in variants.values()]
+        if any(body != bodies[0] for body in bodies):
+            raise AssertionError(f"The variants of '{name}' do not produce the same JSON.")
+        repeat = max(1, iterations // batch_size) if name.startswith(("batch", "list")) else iterations
+        results[name] = {variant: per_call(function, repeat) for variant, function in variants.items()}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cost of building and serializing a response.")
+    parser.add_argument("--iterations", type=int, default=20000, help="Responses built per variant.")
+    parser.add_argument("--batch-size", type=int, default=100, help="Users per batch lookup or listing page.")
+    parser.add_argument("--output", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    results = benchmark(args.iterations, args.batch_size)
+    print(f"{'response':<12} {'variant':<8} {'us/response':>12}")
+    for name, variants in results.items():
+        for variant, cost in variants.items():
+            print(f"{name:<12} {variant:<8} {cost:>12.2f}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
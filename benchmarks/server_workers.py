@@ -0,0 +1,150 @@
+"""
+Throughput benchmark of the production server with different numbers of worker processes.
+Starts 'python -m app.server' with the in-memory backend for every worker count, drives it from several load generator processes
+(so the client is not the bottleneck), and reports throughput and p50/p99 latency per endpoint.
+The gain from extra workers is bounded by the cores available to both the server and the load generators.
+
+Usage:
+    python -m benchmarks.server_workers --workers 1 4 --clients 4 --concurrency 32 --duration 10
+"""
+
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+from config.server_config import available_cores
+from .api_load import percentile
+from .startup_time import child_environment, free_port
+
+
+# Endpoints driven by the load generators; they return the same answer from every worker, whose in-memory tables are independent
+ENDPOINTS = {
+    "root": "/",
+    "list_users": "/users/list?limit=10",
+    }
+
+
+async def generate_load(url: str, concurrency: int, duration: float) -> dict:
+    latencies, errors = [], 0
+
+    async def caller(client: httpx.AsyncClient, deadline: float):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await client.get(url)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(caller(client, deadline) for _ in range(concurrency)))
+    return {"latencies": latencies, "errors": errors}
+
+
+def load_process(arguments: tuple) -> dict:
+    url, concurrency, duration = arguments
+    return asyncio.run(generate_load(url, concurrency, duration))
+
+
+def wait_until_ready(base_url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.perf_counter() + timeout
+    with httpx.Client(timeout=1.0) as client:
+        while time.perf_counter() < deadline:
+            try:
+                if client.get(f"{base_url}/health/ready").status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            if process.poll() is not None:
+                raise RuntimeError(f"The server exited with status {process.returncode} before answering.")
+            time.sleep(0.05)
+    raise RuntimeError(f"The server did not answer within {timeout}s.")
+
+
+def benchmark(worker_counts: List[int], clients: int, concurrency: int, duration: float) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Function Overview:
+    Measures every endpoint against a server running each of the given numbers of workers.
+
+    Function Logic:
+    1. For every worker count, the server is started in an empty working directory and waited for until '/health/ready' answers.
+    2. Every endpoint is warmed up, then driven for 'duration' seconds by 'clients' processes with 'concurrency' callers each.
+    3. The server is stopped gracefully before the next worker count is measured.
+
+    Parameters:
+    worker_counts (List[int]): The numbers of worker processes to compare.
+    clients (int): Number of load generator processes.
+    concurrency (int): Concurrent callers per load generator.
+    duration (float): Seconds each endpoint is driven for.
+
+    Returns:
+    Dict[str, Dict[str, Dict[str, float]]]: For every endpoint and worker count, the requests per second, p50/p99 latency in
+    milliseconds and the number of unexpected responses.
+    """
+    results: Dict[str, Dict[str, Dict[str, float]]] = {endpoint: {} for endpoint in ENDPOINTS}
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(clients) as pool:
+        for workers in worker_counts:
+            port = free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            with tempfile.TemporaryDirectory() as workdir:
+                process = subprocess.Popen(
+                    [sys.executable, "-m", "app.server", "--workers", str(workers), "--port", str(port)],
+                    cwd = workdir,
+                    env = {**child_environment(), "SERVER_HOST": "127.0.0.1"},
+                    stdout = subprocess.DEVNULL,
+                    stderr = subprocess.DEVNULL,
+                    )
+                try:
+                    wait_until_ready(base_url, process)
+                    for endpoint, path in ENDPOINTS.items():
+                        pool.map(load_process, [(base_url + path, concurrency, 1.0)] * clients)
+                        runs = pool.map(load_process, [(base_url + path, concurrency, duration)] * clients)
+                        latencies = [latency for run in runs for latency in run["latencies"]]
+                        results[endpoint][str(workers)] = {
+                            "rps": len(latencies) / duration,
+                            "p50_ms": percentile(latencies, 0.50) * 1000,
+                            "p99_ms": percentile(latencies, 0.99) * 1000,
+                            "errors": sum(run["errors"] for run in runs),
+                            }
+                finally:
+                    process.terminate()
+                    process.wait()
+    return results
+
+
+def main():
+    cores = available_cores()
+    parser = argparse.ArgumentParser(description="Compare the throughput of the server with different numbers of worker processes.")
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, cores}), help="Worker counts to compare (default: 1 and one per core).")
+    parser.add_argument("--clients", type=int, default=max(2, cores), help="Load generator processes.")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent callers per load generator.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds each endpoint is driven for.")
+    parser.add_argument("--output", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    results = benchmark(args.workers, args.clients, args.concurrency, args.duration)
+
+    print(f"{'endpoint':<14} {'workers':>8} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for endpoint, levels in results.items():
+        for workers, result in levels.items():
+            print(f"{endpoint:<14} {workers:>8} {result['rps']:>10.1f} {result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['errors']:>7}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"cores": cores, "clients": args.clients, "concurrency": args.concurrency, "python": platform.python_version(), "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Recall and throughput benchmark of the approximate nearest-neighbour index of articles ('app/ann.py').
+Featurizes a corpus of synthetic articles (each mostly drawn from one of a set of topics, the rest from a Zipf-like background
+vocabulary, so articles have true neighbours as in real news) into a fresh directory, indexes them, then reports:
+- the indexing throughput (projection, k-means clustering and saving of the segments included);
+- for every number of probed lists, the queries per second of '/articles/{id}/similar' lookups and their recall@k against an
+  exact (brute-force) search of the same embeddings, and against an exact search of the TF-IDF vectors;
+- the time a worker takes to open the saved index (memory-mapped) and its size per article.
+
+Usage:
+    python -m benchmarks.similarity_index --articles 200000 --queries 500 --k 10 --probes 1 4 8 16 32
+"""
+
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+from app.ann import ArticleIndex, project
+from app.features import Featurizer
+from config.ann_config import AnnSettings
+from config.features_config import FeatureSettings
+from .api_load import percentile
+
+
+# Words of the synthetic vocabulary, of every topic, and per article (drawn from its topic, then from the whole vocabulary)
+VOCABULARY = 50000
+TOPIC_WORDS = 300
+ARTICLE_TOPIC_WORDS = 40
+ARTICLE_BACKGROUND_WORDS = 20
+
+
+def corpus(count: int, topics: int, seed: int, chunk: int = 50000):
+    """
+    Function Overview:
+    Yields the texts of 'count' synthetic articles in chunks, every article about one of 'topics' topics.
+    """
+    generator = np.random.default_rng(seed)
+    words = np.array([f"w{index}" for index in range(VOCABULARY)])
+    background = 1.0 / np.arange(1, VOCABULARY + 1)
+    topic_words = np.stack([generator.choice(VOCABULARY, size=TOPIC_WORDS, replace=False) for _ in range(topics)])
+    topic_weights = 1.0 / np.arange(1, TOPIC_WORDS + 1)
+    for start in range(0, count, chunk):
+        size = min(chunk, count - start)
+        drawn = np.concatenate([
+            topic_words[generator.integers(topics, size=size)[:, None], generator.choice(TOPIC_WORDS, size=(size, ARTICLE_TOPIC_WORDS), p=topic_weights / topic_weights.sum())],
+            generator.choice(VOCABULARY, size=(size, ARTICLE_BACKGROUND_WORDS), p=background / background.sum()),
+            ], axis=1)
+        yield [" ".join(article) for article in words[drawn]]
+
+
+def exact(scores: np.ndarray, ids: np.ndarray, id: int, k: int) -> set:
+    best = np.argpartition(-scores, k)[:k + 1]
+    return set(ids[best].tolist()) - {id}
+
+
+def benchmark(articles: int, topics: int, queries: int, k: int, probes: List[int], settings: AnnSettings, directory: str) -> Dict[str, object]:
+    """
+    Function Overview:
+    Featurizes and indexes the corpus, then measures the recall and throughput of the index for every number of probed lists.
+
+    Parameters:
+    articles (int): Articles in the corpus.
+    topics (int): Topics of the corpus.
+    queries (int): Articles whose neighbours are looked up.
+    k (int): Neighbours per lookup.
+    probes (List[int]): Numbers of lists probed per segment.
+    settings (AnnSettings): The index settings ('directory' is replaced by a subdirectory of 'directory').
+    directory (str): Directory of the vector store and index.
+
+    Returns:
+    Dict[str, object]: Indexing, reload and size figures, and the recall and throughput per number of probes.
+    """
+    featurizer = Featurizer(FeatureSettings(directory=f"{directory}/features"))
+    started, next_id = time.perf_counter(), 1
+    for texts in corpus(articles, topics, seed=1):
+        for start in range(0, len(texts), 500):
+            batch = texts[start:start + 500]
+            featurizer.add(list(range(next_id, next_id + len(batch))), batch)
+            next_id += len(batch)
+    print(f"featurized {articles} articles in {time.perf_counter() - started:.1f} s")
+
+    settings = settings.model_copy(update={"directory": f"{directory}/ann"})
+    index = ArticleIndex(settings)
+    started = time.perf_counter()
+    asyncio.run(index.catch_up(featurizer))
+    indexing = time.perf_counter() - started
+
+    started = time.perf_counter()
+    reader = ArticleIndex(settings, readonly=True)
+    reload = time.perf_counter() - started
+    saved = sum(len(segment) for segment in reader.segments)
+
+    snapshot = featurizer.snapshot()
+    ids = np.array(snapshot.arrays["ids"][:snapshot.rows])
+    tfidf = snapshot.matrix(np.arange(snapshot.rows))
+    embeddings = project(tfidf, settings.dimensions)
+    sample = np.random.default_rng(2).choice(snapshot.rows, size=min(queries, snapshot.rows), replace=False)
+    truth = [exact(embeddings @ embeddings[row], ids, int(ids[row]), k) for row in sample]
+    tfidf_truth = [exact((tfidf @ tfidf[row].T).toarray().ravel(), ids, int(ids[row]), k) for row in sample]
+
+    started = time.perf_counter()
+    for row in sample:
+        exact(embeddings @ embeddings[row], ids, int(ids[row]), k)
+    exact_qps = len(sample) / (time.perf_counter() - started)
+
+    results = {}
+    for probe in probes:
+        latencies, recall, tfidf_recall = [], 0.0, 0.0
+        for row, expected, tfidf_expected in zip(sample, truth, tfidf_truth):
+            begun = time.perf_counter()
+            found = {id for id, _ in index.similar(int(ids[row]), k, probes=probe)}
+            latencies.append(time.perf_counter() - begun)
+            recall += len(found & expected) / k
+            tfidf_recall += len(found & tfidf_expected) / k
+        results[probe] = {
+            "recall": recall / len(sample),
+            "tfidf_recall": tfidf_recall / len(sample),
+            "queries_per_second": len(latencies) / sum(latencies),
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            }
+    index.close()
+    featurizer.close()
+    return {
+        "indexing_articles_per_second": articles / indexing,
+        "reload_ms": reload * 1000,
+        "bytes_per_article": sum(segment.nbytes for segment in reader.segments) / max(1, saved),
+        "exact_queries_per_second": exact_qps,
+        "probes": results,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the recall and throughput of the article similarity index.")
+    parser.add_argument("--articles", type=int, default=200000, help="Articles in the corpus.")
+    parser.add_argument("--topics", type=int, default=500, help="Topics of the corpus.")
+    parser.add_argument("--queries", type=int, default=500, help="Articles whose neighbours are looked up.")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per lookup (recall@k).")
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 4, 8, 16, 32], help="Numbers of lists probed per segment.")
+    parser.add_argument("--dimensions", type=int, default=AnnSettings().dimensions, help="Dimensions of the embeddings.")
+    parser.add_argument("--segment-size", type=int, default=AnnSettings().segment_size, help="Articles per segment.")
+    parser.add_argument("--lists", type=int, default=AnnSettings().lists, help="Inverted lists per segment.")
+    parser.add_argument("--output", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    settings = AnnSettings(dimensions=args.dimensions, segment_size=args.segment_size, lists=args.lists)
+    with tempfile.TemporaryDirectory() as directory:
+        results = benchmark(args.articles, args.topics, args.queries, args.k, args.probes, settings, directory)
+    print(
+        f"indexed {results['indexing_articles_per_second']:.0f} articles/s, reopened in {results['reload_ms']:.1f} ms, "
+        f"{results['bytes_per_article']:.0f} B/article; exact search {results['exact_queries_per_second']:.0f} queries/s"
+        )
+    for probe, result in results["probes"].items():
+        print(
+            f"{probe:>4} probes: recall@{args.k} {result['recall']:.3f} (TF-IDF {result['tfidf_recall']:.3f}), "
+            f"{result['queries_per_second']:7.0f} queries/s, p99 {result['p99_ms']:.2f} ms"
+            )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({**vars(args), "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
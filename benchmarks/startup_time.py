@@ -0,0 +1,179 @@
+"""
+Startup benchmark for a worker process.
+Measures, in fresh interpreters, the time to import 'app.app' and the time from spawning a uvicorn worker to its first successful
+response on '/health/ready' (with the in-memory backend, so no network or credentials are needed), and checks that importing the app
+has no side effect (no log directory created, Supabase client not loaded).
+Results can be stored as JSON and compared with a stored baseline; the exit status is 1 when startup regressed beyond the threshold.
+
+Usage:
+    python -m benchmarks.startup_time --runs 5 --output startup.json
+    python -m benchmarks.startup_time --baseline startup.json --threshold 0.2
+"""
+
+
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+
+
+# Project root, put on the path of the child interpreters so they can import the app from any working directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run by a fresh interpreter: times the import and reports what the import left behind
+IMPORT_PROBE = """
+import json, os, sys, time
+started = time.perf_counter()
+import app.app
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "modules": len(sys.modules), "supabase_loaded": "supabase" in sys.modules, "logs_created": os.path.exists("logs")}))
+"""
+
+
+def child_environment() -> Dict[str, str]:
+    # No Supabase credentials: the app must be importable and start without them when the in-memory backend is selected
+    environment = {key: value for key, value in os.environ.items() if not key.startswith("SUPABASE_")}
+    environment.update(PYTHONPATH=ROOT, DATABASE_BACKEND="memory", LOG_LEVEL="WARNING", PYTHONDONTWRITEBYTECODE="1")
+    return environment
+
+
+def measure_import(workdir: str) -> dict:
+    """
+    Function Overview:
+    Imports the app in a fresh interpreter, started in an empty working directory.
+
+    Parameters:
+    workdir (str): The working directory of the child interpreter.
+
+    Returns:
+    dict: The import time, the number of loaded modules, and whether the Supabase client was loaded or the log directory created.
+    """
+    output = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=workdir, env=child_environment(), capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_response(workdir: str, timeout: float) -> float:
+    """
+    Function Overview:
+    Spawns a uvicorn worker serving the app and measures the time until '/health/ready' first answers 200.
+
+    Function Logic:
+    1. The clock starts before the process is spawned, so interpreter start-up, imports and the lifespan are all included.
+    2. The endpoint is polled every millisecond; connection errors are expected until the server is listening.
+    3. The worker is terminated once it has answered.
+
+    Parameters:
+    workdir (str): The working directory of the worker (its log directory is created there).
+    timeout (float): Seconds to wait for the first response before failing.
+
+    Returns:
+    float: The time to the first successful response, in seconds.
+    """
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.app:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd = workdir,
+        env = child_environment(),
+        stdout = subprocess.DEVNULL,
+        stderr = subprocess.DEVNULL,
+        )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - started < timeout:
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/health/ready").status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                if process.poll() is not None:
+                    raise RuntimeError(f"The worker exited with status {process.returncode} before answering.")
+                time.sleep(0.001)
+        raise RuntimeError(f"The worker did not answer within {timeout}s.")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def benchmark(runs: int, timeout: float) -> Dict[str, float]:
+    """
+    Function Overview:
+    Repeats both measurements 'runs' times and summarises them with their median and worst case.
+
+    Parameters:
+    runs (int): The number of fresh processes started for each measurement.
+    timeout (float): Seconds to wait for the first response of a worker.
+
+    Returns:
+    Dict[str, float]: The import and first-response timings in milliseconds, and the side effects observed on import.
+    """
+    imports: List[dict] = []
+    first_responses: List[float] = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as workdir:
+            imports.append(measure_import(workdir))
+        with tempfile.TemporaryDirectory() as workdir:
+            first_responses.append(measure_first_response(workdir, timeout))
+
+    import_times = [result["seconds"] for result in imports]
+    return {
+        "import_median_ms": statistics.median(import_times) * 1000,
+        "import_max_ms": max(import_times) * 1000,
+        "first_response_median_ms": statistics.median(first_responses) * 1000,
+        "first_response_max_ms": max(first_responses) * 1000,
+        "modules_loaded": imports[-1]["modules"],
+        "supabase_loaded_on_import": any(result["supabase_loaded"] for result in imports),
+        "logs_created_on_import": any(result["logs_created"] for result in imports),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the import time and time-to-first-response of a worker.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes started for each measurement.")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for the first response of a worker.")
+    parser.add_argument("--output", help="Optional path to write the results as JSON.")
+    parser.add_argument("--baseline", help="Optional path of a stored result to compare with.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Tolerated relative regression against the baseline.")
+    args = parser.parse_args()
+
+    results = benchmark(args.runs, args.timeout)
+    for name, value in results.items():
+        print(f"{name:>28} {value:>10.2f}" if isinstance(value, float) else f"{name:>28} {value!s:>10}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"runs": args.runs, "python": platform.python_version(), "results": results}, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        baseline = baseline.get("results", baseline)
+        regressions = [
+            f"{key}: {results[key]:.1f} ms (baseline {baseline[key]:.1f})"
+            for key in ("import_median_ms", "first_response_median_ms")
+            if key in baseline and results[key] > baseline[key] * (1 + args.threshold)
+            ]
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regression beyond {args.threshold:.0%} against {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Local stand-in for a set of news feed servers, used by the benchmarks to exercise the ingestion pipeline without network access.
+Serves 'sources' feeds at '/feeds/<index>.xml' (even indexes as RSS 2.0, odd ones as Atom), each listing the latest 'items' articles,
+streamed in small chunks and answering conditional requests ('If-None-Match' / 'If-Modified-Since') with '304 Not Modified'.
+"""
+
+
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, Tuple
+from xml.sax.saxutils import escape
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+
+# Size of the chunks a feed is streamed in, so clients receive (and can parse) a document in several pieces
+CHUNK_BYTES = 16 * 1024
+
+WORDS = (
+    "market economy election minister court climate energy football league health vaccine research university police storm "
+    "flood budget inflation bank technology startup software security breach festival film music museum transport rail airport "
+    "housing school teacher strike union trade export harbour farming drought wildfire council mayor parliament treaty summit"
+    ).split()
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+
+
+class StubFeeds:
+    """
+    Class Overview:
+    Generates and serves the feeds.
+
+    Function Logic:
+    1. Every feed publishes a new article per 'publish' call (the first 'items' are published up front); a document lists the
+       latest 'items' articles, newest first.
+    2. A document is rendered once per version and served with an 'ETag' and 'Last-Modified' identifying that version.
+    3. An optional delay before every response simulates the round-trip to a remote server.
+
+    Parameters:
+    sources (int): Number of feeds served.
+    items (int): Articles listed by every document.
+    latency (float): Seconds every response is delayed by.
+    """
+    def __init__(self, sources: int, items: int, latency: float = 0.0):
+        self.sources = sources
+        self.items = items
+        self.latency = latency
+        self.published = items
+        self.requests = {"200": 0, "304": 0}
+        self._documents: Dict[Tuple[int, int], bytes] = {}
+        self.app = Starlette(routes=[Route("/feeds/{index:int}.xml", self.serve)])
+
+
+    def publish(self, articles: int = 1) -> None:
+        self.published += articles
+        self._documents.clear()
+
+
+    def _article(self, feed: int, number: int) -> Tuple[str, str, str, datetime]:
+        words = [WORDS[(feed * 31 + number * 7 + position * position) % len(WORDS)] for position in range(90)]
+        title = " ".join(words[:8]).capitalize()
+        summary = f"<p>{' '.join(words)}.</p>"
+        return f"https://news.example.com/{feed}/{number}", title, summary, EPOCH + timedelta(minutes=number)
+
+
+    def render(self, feed: int) -> bytes:
+        key = (feed, self.published)
+        if key not in self._documents:
+            numbers = range(self.published, max(0, self.published - self.items), -1)
+            if feed % 2 == 0:
+                entries = "".join(
+                    f"<item><title>{escape(title)}</title><link>{link}</link><guid>{link}</guid><description>{escape(summary)}</description>"
+                    f"<author>desk{feed}@news.example.com</author><pubDate>{format_datetime(published)}</pubDate></item>"
+                    for link, title, summary, published in map(lambda number: self._article(feed, number), numbers)
+                    )
+                document = f'<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel><title>Feed {feed}</title>{entries}</channel></rss>'
+            else:
+                entries = "".join(
+                    f'<entry><id>{link}</id><title>{escape(title)}</title><link href="{link}"/><summary type="html">{escape(summary)}</summary>'
+                    f"<author><name>Desk {feed}</name></author><published>{published.isoformat()}</published></entry>"
+                    for link, title, summary, published in map(lambda number: self._article(feed, number), numbers)
+                    )
+                document = f'<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>Feed {feed}</title>{entries}</feed>'
+            self._documents[key] = document.encode()
+        return self._documents[key]
+
+
+    async def serve(self, request: Request) -> Response:
+        feed = request.path_params["index"]
+        if feed >= self.sources:
+            return Response(status_code=404)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        etag = f'"{feed}-{self.published}"'
+        last_modified = format_datetime(EPOCH + timedelta(minutes=self.published), usegmt=True)
+        headers = {"ETag": etag, "Last-Modified": last_modified}
+        if request.headers.get("if-none-match") == etag or request.headers.get("if-modified-since") == last_modified:
+            self.requests["304"] += 1
+            return Response(status_code=304, headers=headers)
+
+        self.requests["200"] += 1
+        document = self.render(feed)
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for start in range(0, len(document), CHUNK_BYTES):
+                yield document[start:start + CHUNK_BYTES]
+
+        return StreamingResponse(chunks(), media_type="application/xml", headers=headers)
@@ -0,0 +1,316 @@
+"""
+In-memory stand-in for the Supabase PostgREST API, used by the benchmarks to exercise the real data layer without network access or credentials.
+Only the subset of PostgREST behaviour used by 'app/database' is emulated: row filters, projections, ordering, limits, inserts, updates, deletes and unique-key violations.
+"""
+
+
+import asyncio
+import csv
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+
+# Query parameters with a special meaning that must not be treated as row filters
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+# Columns that carry a unique constraint in the Supabase 'users' table
+UNIQUE_COLUMNS = ("email_id", "username")
+
+
+
+
+class UsersTable:
+    """
+    Class Overview:
+    Minimal in-memory emulation of the Supabase 'users' table.
+
+    Function Logic:
+    1. Stores rows keyed by an auto-incrementing 'user_id' and stamps each new row with 'created_at' and 'updated_at'
+       (as the column defaults of the real table would).
+    2. Keeps a per-column index for every unique column so duplicate keys are rejected like Postgres would (SQLSTATE 23505).
+    3. All writes of a single statement are validated before any row is changed, so multi-row statements are atomic.
+    """
+    def __init__(self):
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self.unique_index: Dict[str, Dict[Any, int]] = {column: {} for column in UNIQUE_COLUMNS}
+        self.next_id = 1
+
+
+    def _conflict(self, column: str, value: Any) -> Dict[str, Any]:
+        return {
+            "code": "23505",
+            "details": f"Key ({column})=({value}) already exists.",
+            "hint": None,
+            "message": f'duplicate key value violates unique constraint "users_{column}_key"',
+        }
+
+
+    def insert(self, records: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        pending = {column: set() for column in UNIQUE_COLUMNS}
+        for record in records:
+            for column in UNIQUE_COLUMNS:
+                value = record.get(column)
+                if value in self.unique_index[column] or value in pending[column]:
+                    return [], self._conflict(column, value)
+                pending[column].add(value)
+
+        inserted = []
+        for record in records:
+            row = dict(record)
+            row["user_id"] = self.next_id
+            row["created_at"] = row["updated_at"] = datetime.now(timezone.utc).isoformat()
+            self.next_id += 1
+            self.rows[row["user_id"]] = row
+            for column in UNIQUE_COLUMNS:
+                self.unique_index[column][row.get(column)] = row["user_id"]
+            inserted.append(row)
+        return inserted, None
+
+
+    def update(self, matched: List[Dict[str, Any]], changes: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        matched_ids = {row["user_id"] for row in matched}
+        for column in UNIQUE_COLUMNS:
+            if column in changes:
+                owner = self.unique_index[column].get(changes[column])
+                if (owner is not None and owner not in matched_ids) or (owner is None and len(matched_ids) > 1):
+                    return [], self._conflict(column, changes[column])
+
+        for row in matched:
+            for column in UNIQUE_COLUMNS:
+                if column in changes:
+                    self.unique_index[column].pop(row.get(column), None)
+                    self.unique_index[column][changes[column]] = row["user_id"]
+            row.update(changes)
+        return matched, None
+
+
+    def delete(self, matched: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for row in matched:
+            self.rows.pop(row["user_id"], None)
+            for column in UNIQUE_COLUMNS:
+                self.unique_index[column].pop(row.get(column), None)
+        return matched
+
+
+
+
+def _coerce(sample: Any, raw: str) -> Any:
+    # Convert a query string criteria into the type of the stored column value
+    if isinstance(sample, bool):
+        return raw.lower() == "true"
+    if isinstance(sample, int):
+        return int(raw)
+    if isinstance(sample, float):
+        return float(raw)
+    return raw
+
+
+def _parse_list(raw: str) -> List[str]:
+    # Parse a PostgREST list literal such as '(1,2,"a,b")'
+    return next(csv.reader([raw.strip()[1:-1]])) if raw.strip() not in ("()", "") else []
+
+
+def _like_to_regex(pattern: str, flags: int = 0) -> re.Pattern:
+    # LIKE semantics: '*' (PostgREST's '%') and '%' match any run of characters, '_' any character, and '\\' escapes the next one
+    parts, escaped = [], False
+    for char in pattern:
+        if escaped:
+            parts.append(re.escape(char))
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        else:
+            parts.append(".*" if char in "*%" else "." if char == "_" else re.escape(char))
+    return re.compile(f"^{''.join(parts)}$", flags | re.DOTALL)
+
+
+def _split_top_level(raw: str) -> List[str]:
+    # Split a logic tree body such as 'a.eq.1,and(b.gt.2,c.lt.3)' on the commas that are not nested or quoted
+    parts, current, depth, quoted = [], "", 0, False
+    for char in raw:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == "," and depth == 0 and not quoted:
+            parts.append(current)
+            current = ""
+        else:
+            current += char
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _matches_logic(row: Dict[str, Any], operator: str, raw: str) -> bool:
+    # Evaluate an 'and'/'or' logic tree such as '(created_at.gt.x,and(created_at.eq.x,user_id.gt.1))'
+    results = []
+    for term in _split_top_level(raw.strip()[1:-1]):
+        negate = term.startswith("not.")
+        body = term[4:] if negate else term
+        if body.startswith(("and(", "or(")):
+            nested, _, rest = body.partition("(")
+            result = _matches_logic(row, nested, "(" + rest)
+        else:
+            column, _, expression = body.partition(".")
+            result = _matches(row, column, expression)
+        results.append(not result if negate else result)
+    return all(results) if operator == "and" else any(results)
+
+
+def _matches(row: Dict[str, Any], column: str, expression: str) -> bool:
+    if column in ("and", "or"):
+        return _matches_logic(row, column, expression)
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    operator, _, criteria = expression.partition(".")
+    if len(criteria) > 1 and criteria.startswith('"') and criteria.endswith('"'):
+        criteria = criteria[1:-1]
+    value = row.get(column)
+
+    if operator == "is":
+        result = value is None if criteria == "null" else value == (criteria == "true")
+    elif value is None:
+        result = False
+    elif operator == "in":
+        result = value in {_coerce(value, item) for item in _parse_list(criteria)}
+    elif operator == "like":
+        result = bool(_like_to_regex(criteria).match(str(value)))
+    elif operator == "ilike":
+        result = bool(_like_to_regex(criteria, re.IGNORECASE).match(str(value)))
+    else:
+        target = _coerce(value, criteria)
+        result = {
+            "eq": value == target,
+            "neq": value != target,
+            "gt": value > target,
+            "gte": value >= target,
+            "lt": value < target,
+            "lte": value <= target,
+        }.get(operator, False)
+    return not result if negate else result
+
+
+def _project(row: Dict[str, Any], select: str) -> Dict[str, Any]:
+    if select in ("", "*"):
+        return dict(row)
+    return {column: row.get(column) for column in select.split(",")}
+
+
+
+
+class StubPostgrest:
+    """
+    Class Overview:
+    Starlette application answering '/rest/v1/users' requests the same way PostgREST would.
+
+    Function Logic:
+    1. Applies every non-reserved query parameter as a row filter ('eq', 'neq', 'gt', 'gte', 'lt', 'lte', 'in', 'like', 'ilike', 'is', optionally negated with 'not.'),
+       including 'and'/'or' logic trees.
+    2. Supports 'select' projections, 'order' and 'limit'/'offset' on reads.
+    3. Sleeps for 'latency' seconds per request to model the round-trip to a remote database.
+
+    Parameters:
+    latency (float): Simulated database round-trip time, in seconds.
+    """
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.table = UsersTable()
+        self.request_count = 0
+        self.app = Starlette(routes=[
+            Route("/rest/v1/users", self.handle, methods=["GET", "HEAD", "POST", "PATCH", "DELETE"]),
+        ])
+
+
+    def _select(self, request: Request) -> List[Dict[str, Any]]:
+        rows = list(self.table.rows.values())
+        for column, expression in request.query_params.multi_items():
+            if column not in RESERVED_PARAMS:
+                rows = [row for row in rows if _matches(row, column, expression)]
+        return rows
+
+
+    def _order_and_limit(self, request: Request, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        order = request.query_params.get("order")
+        if order:
+            for term in reversed(order.split(",")):
+                column, _, direction = term.partition(".")
+                rows.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=direction.startswith("desc"))
+        offset = int(request.query_params.get("offset", 0))
+        limit = request.query_params.get("limit")
+        return rows[offset:offset + int(limit)] if limit is not None else rows[offset:]
+
+
+    async def handle(self, request: Request) -> Response:
+        self.request_count += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        select = request.query_params.get("select", "*")
+
+        if request.method in ("GET", "HEAD"):
+            rows = self._order_and_limit(request, self._select(request))
+            return JSONResponse([_project(row, select) for row in rows])
+
+        if request.method == "POST":
+            body = await request.json()
+            records = body if isinstance(body, list) else [body]
+            rows, error = self.table.insert(records)
+            if error:
+                return JSONResponse(error, status_code=409)
+            return JSONResponse([_project(row, select) for row in rows], status_code=201)
+
+        if request.method == "PATCH":
+            rows, error = self.table.update(self._select(request), await request.json())
+            if error:
+                return JSONResponse(error, status_code=409)
+            return JSONResponse([_project(row, select) for row in rows])
+
+        rows = self.table.delete(self._select(request))
+        return JSONResponse([_project(row, select) for row in rows])
+
+
+
+
+def serve_in_thread(app: Callable, host: str = "127.0.0.1", port: int = 0, lifespan: str = "off") -> Tuple[str, Callable[[], None]]:
+    """
+    Function Overview:
+    Runs an ASGI application with uvicorn on a background thread with its own event loop.
+
+    Function Logic:
+    1. Starts a uvicorn server in a daemon thread and waits until it is accepting connections.
+    2. Resolves the bound port (useful when 'port' is 0) and returns the base URL.
+
+    Parameters:
+    app (Callable): The ASGI application to serve.
+    host (str): Interface to bind to.
+    port (int): Port to bind to, 0 picks a free port.
+    lifespan (str): Whether the application's lifespan events are run ('on') or not ('off').
+
+    Returns:
+    Tuple[str, Callable[[], None]]: The base URL of the server and a function that stops it.
+    """
+    config = uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan=lifespan)
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    bound_port = server.servers[0].sockets[0].getsockname()[1]
+
+    def stop() -> None:
+        server.should_exit = True
+        thread.join()
+
+    return f"http://{host}:{bound_port}", stop
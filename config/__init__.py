@@ -1 +1,12 @@
-from .logging_config import fastapi_logging, healthcheck_logging, setup_tests_logging
+from .logging_config import configure_logging, fastapi_logging, healthcheck_logging, setup_tests_logging, flush_logging, stop_logging, logging_stats
+from .database_config import PoolSettings
+from .cache_config import CacheSettings
+from .health_config import HealthSettings
+from .server_config import ServerSettings
+from .password_config import PasswordSettings
+from .admission_config import AdmissionSettings
+from .ingestion_config import IngestionSettings
+from .dedup_config import DedupSettings
+from .features_config import FeatureSettings
+from .recommendation_config import RecommendationSettings
+from .ann_config import AnnSettings
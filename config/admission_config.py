@@ -0,0 +1,81 @@
+from pydantic import BaseModel, field_validator
+from typing import Dict, Optional
+import os
+
+
+
+
+def parse_route_limits(raw: str) -> Dict[str, int]:
+    """
+    Function Overview:
+    Parses per-route concurrency caps written as comma-separated '<METHOD> <route template>=<limit>' entries
+    (e.g. 'POST /users/create=8,POST /users/bulk/create=2').
+
+    Parameters:
+    raw (str): The value of the 'ADMISSION_ROUTE_LIMITS' setting.
+
+    Returns:
+    Dict[str, int]: The cap of every listed route, keyed by '<METHOD> <route template>'.
+    """
+    limits = {}
+    for entry in filter(None, (entry.strip() for entry in raw.split(","))):
+        route, separator, limit = entry.rpartition("=")
+        if not separator or not route.strip():
+            raise ValueError(f"Invalid route limit '{entry}' (expected '<METHOD> <route>=<limit>').")
+        method, _, path = route.strip().partition(" ")
+        limits[f"{method.upper()} {path.strip()}"] = int(limit)
+    return limits
+
+
+
+
+class AdmissionSettings(BaseModel):
+    """
+    Class Overview:
+    Settings for the admission control applied to every API request, read from environment variables.
+
+    Attributes:
+    rate (float): Requests per second allowed to each client, 0 disables rate limiting ('RATE_LIMIT_RATE').
+    burst (int): Requests a client may send at once above its rate, i.e. the size of its token bucket ('RATE_LIMIT_BURST').
+    max_clients (int): Clients whose bucket is kept in process before the least recently seen is dropped ('RATE_LIMIT_MAX_CLIENTS').
+    trust_forwarded (bool): Identify clients by the 'X-Forwarded-For' address added by a trusted proxy, when behind one ('RATE_LIMIT_TRUST_FORWARDED').
+    trusted_proxies (int): Trusted proxies in front of the API, each appending the address it received the request from to
+        'X-Forwarded-For'; the client is the entry this many from the end, since clients can forge the entries before it ('RATE_LIMIT_TRUSTED_PROXIES').
+    redis_url (Optional[str]): URL of a Redis-compatible server holding the buckets, so the rate is shared by all workers ('RATE_LIMIT_REDIS_URL').
+    route_concurrency (int): Requests a single route may handle at once in a worker, 0 for no cap ('ADMISSION_ROUTE_CONCURRENCY').
+    route_limits (Dict[str, int]): Caps of specific routes, overriding 'route_concurrency' ('ADMISSION_ROUTE_LIMITS').
+    queue_size (int): Requests that may wait for a capped route before further requests are rejected ('ADMISSION_QUEUE_SIZE').
+    queue_timeout (float): Seconds a request waits for a capped route before it is rejected ('ADMISSION_QUEUE_TIMEOUT').
+    """
+    rate: float = 0.0
+    burst: int = 20
+    max_clients: int = 10000
+    trust_forwarded: bool = False
+    trusted_proxies: int = 1
+    redis_url: Optional[str] = None
+    route_concurrency: int = 0
+    route_limits: Dict[str, int] = {}
+    queue_size: int = 64
+    queue_timeout: float = 1.0
+
+    @classmethod
+    def from_env(cls) -> "AdmissionSettings":
+        return cls(
+            rate = float(os.getenv('RATE_LIMIT_RATE', 0.0)),
+            burst = int(os.getenv('RATE_LIMIT_BURST', 20)),
+            max_clients = int(os.getenv('RATE_LIMIT_MAX_CLIENTS', 10000)),
+            trust_forwarded = os.getenv('RATE_LIMIT_TRUST_FORWARDED', 'false').lower() == 'true',
+            trusted_proxies = int(os.getenv('RATE_LIMIT_TRUSTED_PROXIES', 1)),
+            redis_url = os.getenv('RATE_LIMIT_REDIS_URL') or None,
+            route_concurrency = int(os.getenv('ADMISSION_ROUTE_CONCURRENCY', 0)),
+            route_limits = parse_route_limits(os.getenv('ADMISSION_ROUTE_LIMITS', '')),
+            queue_size = int(os.getenv('ADMISSION_QUEUE_SIZE', 64)),
+            queue_timeout = float(os.getenv('ADMISSION_QUEUE_TIMEOUT', 1.0)),
+            )
+
+    @field_validator("trusted_proxies")
+    @classmethod
+    def validate_trusted_proxies(cls, trusted_proxies: int) -> int:
+        if trusted_proxies < 1:
+            raise ValueError("At least one trusted proxy must add the client's address to 'X-Forwarded-For'.")
+        return trusted_proxies
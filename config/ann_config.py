@@ -0,0 +1,42 @@
+from pydantic import BaseModel
+import os
+
+
+
+
+class AnnSettings(BaseModel):
+    """
+    Class Overview:
+    Settings for the approximate nearest-neighbour index of article embeddings, read from environment variables.
+
+    Attributes:
+    enabled (bool): Whether featurized articles are indexed and '/articles/{id}/similar' is served ('ANN_ENABLED').
+    directory (str): Directory of the index segments, memory-mapped by every worker ('ANN_DIRECTORY').
+    dimensions (int): Dimensions of the dense embeddings the TF-IDF vectors are projected to ('ANN_DIMENSIONS').
+    window (float): Seconds an article stays in the index after it was stored ('ANN_WINDOW').
+    segment_size (int): Articles per immutable segment; the latest articles are searched exhaustively until a segment is full ('ANN_SEGMENT_SIZE').
+    lists (int): Inverted lists (k-means clusters) per segment ('ANN_LISTS').
+    probes (int): Lists searched per segment and query; more lists find more true neighbours, more slowly ('ANN_PROBES').
+    refresh_interval (float): Seconds between two checks for new segments by the workers not running the ingestion ('ANN_REFRESH_INTERVAL').
+    """
+    enabled: bool = True
+    directory: str = "data/ann"
+    dimensions: int = 128
+    window: float = 259200.0
+    segment_size: int = 32768
+    lists: int = 128
+    probes: int = 8
+    refresh_interval: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "AnnSettings":
+        return cls(
+            enabled = os.getenv('ANN_ENABLED', 'true').lower() == 'true',
+            directory = os.getenv('ANN_DIRECTORY', 'data/ann'),
+            dimensions = int(os.getenv('ANN_DIMENSIONS', 128)),
+            window = float(os.getenv('ANN_WINDOW', 259200.0)),
+            segment_size = int(os.getenv('ANN_SEGMENT_SIZE', 32768)),
+            lists = int(os.getenv('ANN_LISTS', 128)),
+            probes = int(os.getenv('ANN_PROBES', 8)),
+            refresh_interval = float(os.getenv('ANN_REFRESH_INTERVAL', 30.0)),
+            )
@@ -0,0 +1,46 @@
+from pydantic import BaseModel
+from typing import Optional
+import os
+
+
+
+
+class CacheSettings(BaseModel):
+    """
+    Class Overview:
+    Settings for the user read-through cache, read from environment variables.
+
+    Attributes:
+    enabled (bool): Whether user reads go through the cache at all ('USER_CACHE_ENABLED').
+    ttl (float): Seconds an entry stays valid in the shared backend ('USER_CACHE_TTL').
+    local_ttl (float): Seconds an entry stays valid in the in-process cache ('USER_CACHE_LOCAL_TTL').
+    max_entries (int): Entries kept in the in-process cache before the least recently used is evicted ('USER_CACHE_MAX_ENTRIES').
+    redis_url (Optional[str]): URL of a Redis-compatible server used as a shared cache between workers ('USER_CACHE_REDIS_URL').
+    http_max_age (int): Seconds clients may reuse a user response without revalidating it, 0 to always revalidate ('USER_HTTP_MAX_AGE').
+    http_public (bool): Whether shared caches (CDNs, proxies) may store user responses, not only the client ('USER_HTTP_PUBLIC').
+    """
+    enabled: bool = True
+    ttl: float = 60.0
+    local_ttl: float = 60.0
+    max_entries: int = 10000
+    redis_url: Optional[str] = None
+    http_max_age: int = 0
+    http_public: bool = False
+
+    @classmethod
+    def from_env(cls) -> "CacheSettings":
+        return cls(
+            enabled = os.getenv('USER_CACHE_ENABLED', 'true').lower() == 'true',
+            ttl = float(os.getenv('USER_CACHE_TTL', 60.0)),
+            local_ttl = float(os.getenv('USER_CACHE_LOCAL_TTL', os.getenv('USER_CACHE_TTL', 60.0))),
+            max_entries = int(os.getenv('USER_CACHE_MAX_ENTRIES', 10000)),
+            redis_url = os.getenv('USER_CACHE_REDIS_URL') or None,
+            http_max_age = int(os.getenv('USER_HTTP_MAX_AGE', 0)),
+            http_public = os.getenv('USER_HTTP_PUBLIC', 'false').lower() == 'true',
+            )
+
+
+    def cache_control(self) -> str:
+        # 'no-cache' lets clients store the response but makes them revalidate it (with 'If-None-Match') before every reuse
+        scope = "public" if self.http_public else "private"
+        return f"{scope}, max-age={self.http_max_age}" if self.http_max_age > 0 else f"{scope}, no-cache"
@@ -0,0 +1,49 @@
+from pydantic import BaseModel
+from typing import Literal, Optional
+import os
+
+
+
+
+class PoolSettings(BaseModel):
+    """
+    Class Overview:
+    Settings for the users storage backend and its connection pool, read from environment variables.
+
+    Attributes:
+    backend (Literal['supabase', 'postgres', 'memory']): The storage backend of the users repository ('DATABASE_BACKEND').
+    database_url (str): The Supabase project URL ('SUPABASE_URL').
+    database_api_key (str): The Supabase API key ('SUPABASE_API_KEY').
+    database_dsn (Optional[str]): Postgres connection string used by the 'postgres' backend ('DATABASE_DSN').
+    min_size (int): Connections opened when the pool starts and kept warm afterwards ('DB_POOL_MIN_SIZE').
+    max_size (int): Upper bound on connections held by a single worker ('DB_POOL_MAX_SIZE').
+    acquire_timeout (float): Seconds to wait for a free connection before failing ('DB_POOL_ACQUIRE_TIMEOUT').
+    request_timeout (float): Seconds to wait for a database response ('DB_REQUEST_TIMEOUT').
+    idle_timeout (float): Seconds an idle connection is kept before it is recycled ('DB_POOL_IDLE_TIMEOUT').
+    keepalive_interval (float): Seconds between keep-alive probes on the warm connections, 0 disables them ('DB_POOL_KEEPALIVE_INTERVAL').
+    """
+    backend: Literal["supabase", "postgres", "memory"] = "supabase"
+    database_url: str
+    database_api_key: str
+    database_dsn: Optional[str] = None
+    min_size: int = 1
+    max_size: int = 10
+    acquire_timeout: float = 5.0
+    request_timeout: float = 10.0
+    idle_timeout: float = 300.0
+    keepalive_interval: float = 60.0
+
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        return cls(
+            backend = os.getenv('DATABASE_BACKEND', 'supabase').lower(),
+            database_url = os.getenv('SUPABASE_URL', ''),
+            database_api_key = os.getenv('SUPABASE_API_KEY', ''),
+            database_dsn = os.getenv('DATABASE_DSN') or None,
+            min_size = int(os.getenv('DB_POOL_MIN_SIZE', 1)),
+            max_size = int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+            acquire_timeout = float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', 5.0)),
+            request_timeout = float(os.getenv('DB_REQUEST_TIMEOUT', 10.0)),
+            idle_timeout = float(os.getenv('DB_POOL_IDLE_TIMEOUT', 300.0)),
+            keepalive_interval = float(os.getenv('DB_POOL_KEEPALIVE_INTERVAL', 60.0)),
+            )
@@ -0,0 +1,48 @@
+from pydantic import BaseModel, model_validator
+import os
+
+
+
+
+class DedupSettings(BaseModel):
+    """
+    Class Overview:
+    Settings for the deduplication of ingested articles, read from environment variables.
+
+    Attributes:
+    enabled (bool): Whether ingested articles are grouped into duplicate clusters ('DEDUP_ENABLED').
+    window (float): Seconds an article is remembered for, bounding the memory used by the index ('DEDUP_WINDOW').
+    segment (float): Seconds of articles gathered in a segment of the index, the unit in which articles expire ('DEDUP_SEGMENT').
+    shingle_size (int): Words per shingle compared between articles ('DEDUP_SHINGLE_SIZE').
+    permutations (int): MinHash values computed per article ('DEDUP_PERMUTATIONS').
+    bands (int): LSH bands the MinHash values are split into; fewer, longer bands only match closer articles ('DEDUP_BANDS').
+    threshold (float): Estimated Jaccard similarity of the shingles above which two articles are near-duplicates ('DEDUP_THRESHOLD').
+    drop_exact (bool): Whether articles whose text exactly matches an article already seen are not stored ('DEDUP_DROP_EXACT').
+    """
+    enabled: bool = True
+    window: float = 86400.0
+    segment: float = 3600.0
+    shingle_size: int = 3
+    permutations: int = 64
+    bands: int = 8
+    threshold: float = 0.8
+    drop_exact: bool = True
+
+    @classmethod
+    def from_env(cls) -> "DedupSettings":
+        return cls(
+            enabled = os.getenv('DEDUP_ENABLED', 'true').lower() == 'true',
+            window = float(os.getenv('DEDUP_WINDOW', 86400.0)),
+            segment = float(os.getenv('DEDUP_SEGMENT', 3600.0)),
+            shingle_size = int(os.getenv('DEDUP_SHINGLE_SIZE', 3)),
+            permutations = int(os.getenv('DEDUP_PERMUTATIONS', 64)),
+            bands = int(os.getenv('DEDUP_BANDS', 8)),
+            threshold = float(os.getenv('DEDUP_THRESHOLD', 0.8)),
+            drop_exact = os.getenv('DEDUP_DROP_EXACT', 'true').lower() == 'true',
+            )
+
+    @model_validator(mode="after")
+    def validate_bands(self) -> "DedupSettings":
+        if self.bands < 1 or self.permutations % self.bands:
+            raise ValueError("The MinHash permutations must split evenly into the LSH bands.")
+        return self
@@ -0,0 +1,33 @@
+from pydantic import BaseModel
+import os
+
+
+
+
+class FeatureSettings(BaseModel):
+    """
+    Class Overview:
+    Settings for the TF-IDF featurization of ingested articles, read from environment variables.
+
+    Attributes:
+    enabled (bool): Whether stored articles are turned into TF-IDF vectors ('FEATURES_ENABLED').
+    directory (str): Directory of the vocabulary and of the memory-mapped vector files ('FEATURES_DIRECTORY').
+    max_terms (int): Largest vocabulary; words first seen once it is full are ignored ('FEATURES_MAX_TERMS').
+    min_term_length (int): Shortest word counted as a term ('FEATURES_MIN_TERM_LENGTH').
+    sublinear_tf (bool): Whether term counts are dampened to '1 + log(count)', so a repeated word does not dominate ('FEATURES_SUBLINEAR_TF').
+    """
+    enabled: bool = True
+    directory: str = "data/features"
+    max_terms: int = 1048576
+    min_term_length: int = 2
+    sublinear_tf: bool = True
+
+    @classmethod
+    def from_env(cls) -> "FeatureSettings":
+        return cls(
+            enabled = os.getenv('FEATURES_ENABLED', 'true').lower() == 'true',
+            directory = os.getenv('FEATURES_DIRECTORY', 'data/features'),
+            max_terms = int(os.getenv('FEATURES_MAX_TERMS', 1048576)),
+            min_term_length = int(os.getenv('FEATURES_MIN_TERM_LENGTH', 2)),
+            sublinear_tf = os.getenv('FEATURES_SUBLINEAR_TF', 'true').lower() == 'true',
+            )
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+import os
+
+
+
+
+class HealthSettings(BaseModel):
+    """
+    Class Overview:
+    Settings for the readiness check, read from environment variables.
+
+    Attributes:
+    cache_ttl (float): Seconds a readiness result is reused before the dependencies are probed again ('HEALTH_CACHE_TTL').
+    probe_timeout (float): Seconds to wait for the database probe before reporting the database as down ('HEALTH_PROBE_TIMEOUT').
+    pool_saturation_threshold (float): Fraction of pool connections in use above which the instance reports itself as not ready ('HEALTH_POOL_SATURATION_THRESHOLD').
+    """
+    cache_ttl: float = 5.0
+    probe_timeout: float = 2.0
+    pool_saturation_threshold: float = 0.9
+
+    @classmethod
+    def from_env(cls) -> "HealthSettings":
+        return cls(
+            cache_ttl = float(os.getenv('HEALTH_CACHE_TTL', 5.0)),
+            probe_timeout = float(os.getenv('HEALTH_PROBE_TIMEOUT', 2.0)),
+            pool_saturation_threshold = float(os.getenv('HEALTH_POOL_SATURATION_THRESHOLD', 0.9)),
+            )
@@ -0,0 +1,70 @@
+from pydantic import BaseModel
+from typing import List, Optional
+import os
+
+
+
+
+def parse_feeds(raw: str, path: Optional[str] = None) -> List[str]:
+    """
+    Function Overview:
+    Collects the feed URLs from a comma-separated list and, optionally, a file listing one URL per line ('#' starts a comment).
+
+    Parameters:
+    raw (str): The value of the 'INGESTION_FEEDS' setting.
+    path (Optional[str]): The value of the 'INGESTION_FEEDS_FILE' setting.
+
+    Returns:
+    List[str]: The feed URLs, without duplicates, in the order they were listed.
+    """
+    feeds = [feed.strip() for feed in raw.split(",")]
+    if path:
+        with open(path) as file:
+            feeds.extend(line.split("#", 1)[0].strip() for line in file)
+    return list(dict.fromkeys(feed for feed in feeds if feed))
+
+
+
+
+class IngestionSettings(BaseModel):
+    """
+    Class Overview:
+    Settings for the news feed ingestion pipeline, read from environment variables.
+
+    Attributes:
+    enabled (bool): Whether the feeds are polled, by the one worker process holding 'lock_file' ('INGESTION_ENABLED').
+    feeds (List[str]): URLs of the RSS and Atom feeds to poll ('INGESTION_FEEDS', comma-separated, and 'INGESTION_FEEDS_FILE', one per line).
+    workers (int): Feeds fetched and parsed at once, which is also the number of HTTP connections used ('INGESTION_WORKERS').
+    interval (float): Seconds between two polls of the same feed ('INGESTION_INTERVAL').
+    max_backoff (float): Longest delay in seconds before polling again a feed that keeps failing ('INGESTION_MAX_BACKOFF').
+    fetch_timeout (float): Seconds to wait for a feed server to connect or send data ('INGESTION_FETCH_TIMEOUT').
+    max_feed_bytes (int): Size above which a feed is abandoned, in bytes ('INGESTION_MAX_FEED_BYTES').
+    batch_size (int): Articles written to storage with a single multi-row insert ('INGESTION_BATCH_SIZE').
+    flush_interval (float): Seconds an incomplete batch waits for more articles before it is written ('INGESTION_FLUSH_INTERVAL').
+    lock_file (str): File locked by the single worker process running the ingestion, the others serving reads only ('INGESTION_LOCK_FILE').
+    """
+    enabled: bool = False
+    feeds: List[str] = []
+    workers: int = 8
+    interval: float = 300.0
+    max_backoff: float = 3600.0
+    fetch_timeout: float = 10.0
+    max_feed_bytes: int = 10 * 2 ** 20
+    batch_size: int = 500
+    flush_interval: float = 1.0
+    lock_file: str = "data/ingestion.lock"
+
+    @classmethod
+    def from_env(cls) -> "IngestionSettings":
+        return cls(
+            enabled = os.getenv('INGESTION_ENABLED', 'false').lower() == 'true',
+            feeds = parse_feeds(os.getenv('INGESTION_FEEDS', ''), os.getenv('INGESTION_FEEDS_FILE') or None),
+            workers = int(os.getenv('INGESTION_WORKERS', 8)),
+            interval = float(os.getenv('INGESTION_INTERVAL', 300.0)),
+            max_backoff = float(os.getenv('INGESTION_MAX_BACKOFF', 3600.0)),
+            fetch_timeout = float(os.getenv('INGESTION_FETCH_TIMEOUT', 10.0)),
+            max_feed_bytes = int(os.getenv('INGESTION_MAX_FEED_BYTES', 10 * 2 ** 20)),
+            batch_size = int(os.getenv('INGESTION_BATCH_SIZE', 500)),
+            flush_interval = float(os.getenv('INGESTION_FLUSH_INTERVAL', 1.0)),
+            lock_file = os.getenv('INGESTION_LOCK_FILE', 'data/ingestion.lock'),
+            )
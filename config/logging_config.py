@@ -1,38 +1,84 @@
 import logging
 import logging.config
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+from pydantic import BaseModel
+import atexit
+import copy
+import json
+import queue
 import os
 
 
-LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG')
+
+
+class LogSettings(BaseModel):
+    """
+    Class Overview:
+    Settings for the loggers and the bounded buffer between the request coroutines and the background log writer, read from
+    environment variables when a logger is configured (so values loaded from '.env' by the application lifespan apply).
+
+    Attributes:
+    level (str): Level of every configured logger and handler ('LOG_LEVEL').
+    queue_size (int): Maximum number of buffered log records ('LOG_QUEUE_SIZE').
+    queue_policy (str): What happens when the buffer is full: 'drop_new', 'drop_old' or 'block' ('LOG_QUEUE_POLICY').
+    queue_block_timeout (float): Seconds to wait for room in the buffer with the 'block' policy ('LOG_QUEUE_BLOCK_TIMEOUT').
+    """
+    level: str = 'DEBUG'
+    queue_size: int = 10000
+    queue_policy: str = 'drop_new'
+    queue_block_timeout: float = 0.05
+
+    @classmethod
+    def from_env(cls) -> "LogSettings":
+        return cls(
+            level = os.getenv('LOG_LEVEL', 'DEBUG').upper(),
+            queue_size = int(os.getenv('LOG_QUEUE_SIZE', 10000)),
+            queue_policy = os.getenv('LOG_QUEUE_POLICY', 'drop_new'),
+            queue_block_timeout = float(os.getenv('LOG_QUEUE_BLOCK_TIMEOUT', 0.05)),
+            )
+
+
+# The log directory is only created when a logger is configured, so importing this module has no side effect
 log_dir = os.path.join(os.getcwd(), 'logs')
-if not os.path.exists(log_dir):
-    os.makedirs(log_dir)
 fastapi_file = os.path.join(log_dir, 'FastAPI.log')
 healthcheck_file = os.path.join(log_dir, 'HealthCheck.log')
 tests_file = os.path.join(log_dir, "Tests.log")
 
+# Whether every process writes its own log files (named after its PID); set by the multi-worker server, since rotating handlers
+# of several processes sharing one file would each rotate it and lose or misplace records
+LOG_FILE_PER_PROCESS_ENV = 'LOG_FILE_PER_PROCESS'
+
+# ID of the request being handled, attached to every log record emitted while handling it
+request_id_var: ContextVar[str] = ContextVar('request_id', default='-')
 
-# Define the logging configuration for FastAPI
+# Mutable per-request counters (database time and calls), shared with any task spawned while handling the request
+request_stats_var: ContextVar[Optional[dict]] = ContextVar('request_stats', default=None)
+
+
+# Define the logging configuration for FastAPI (the level of every handler and logger is set from 'LogSettings' when it is applied)
 FASTAPI_CONFIG = {
     'version': 1,
     'disable_existing_loggers': False,
     'formatters': {
         'standard': {
-            'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            'format': '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] - %(message)s'
+        },
+        'json': {
+            '()': 'config.logging_config.JsonFormatter',
         },
     },
     'handlers': {
         'file': {
-            'level': LOG_LEVEL,
             'class': 'logging.handlers.RotatingFileHandler',
             'filename': fastapi_file,
             'maxBytes': 10 * 1024 * 1024,
             'backupCount': 5,
-            'formatter': 'standard',
+            'formatter': 'json',
         },
         'console': {
-            'level': LOG_LEVEL,
             'class': 'logging.StreamHandler',
             'formatter': 'standard',
         },
@@ -40,7 +86,6 @@ FASTAPI_CONFIG = {
     'loggers': {
         'fastapi_logger': {
             'handlers': ['file', 'console'],
-            'level': LOG_LEVEL,
             'propagate': False
         },
     }
@@ -52,24 +97,22 @@ HEALTHCHECK_CONFIG = {
     'version': 1,
     'disable_existing_loggers': False,
     'formatters': {
-        'standard': {
-            'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        'json': {
+            '()': 'config.logging_config.JsonFormatter',
         },
     },
     'handlers': {
         'file': {
-            'level': LOG_LEVEL,
             'class': 'logging.handlers.RotatingFileHandler',
             'filename': healthcheck_file,
             'maxBytes': 10 * 1024 * 1024,
             'backupCount': 5,
-            'formatter': 'standard',
+            'formatter': 'json',
         },
     },
     'loggers': {
         'health_check_logger': {
             'handlers': ['file'],
-            'level': LOG_LEVEL,
             'propagate': False
         },
     }
@@ -87,7 +130,6 @@ TESTS_CONFIG = {
     },
     'handlers': {
         'file': {
-            'level': LOG_LEVEL,
             'class': 'logging.handlers.RotatingFileHandler',
             'filename': tests_file,
             'maxBytes': 10 * 1024 * 1024,
@@ -98,20 +140,229 @@ TESTS_CONFIG = {
     'loggers': {
         'tests_logger': {
             'handlers': ['file'],
-            'level': LOG_LEVEL,
             'propagate': False
         },
     }
 }
 
 
+# Attributes every LogRecord has; any other attribute was passed through 'extra' and is emitted as a structured field
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'request_id'}
+
+
+# Formats the exceptions of queued records, as the logging module's default formatter does
+FORMATTER = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Class Overview:
+    Formats each log record as a single JSON object per line, so the logs can be parsed and aggregated by a log pipeline.
+
+    Function Logic:
+    1. Every record carries its timestamp, level, logger name, request ID and message.
+    2. Fields passed through 'extra' (e.g. the per-request timings from LoggingRoute) are added as top-level keys.
+    3. Exception tracebacks are added under 'exception' (already formatted by BoundedQueueHandler for queued records).
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, 'request_id', '-'),
+            "message": record.getMessage(),
+            }
+        entry.update((key, value) for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES)
+        if record.exc_info or record.exc_text:
+            entry["exception"] = record.exc_text or self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Class Overview:
+    Logging handler that hands records to a background writer thread through a bounded queue, so the caller never waits on file or console I/O.
+
+    Function Logic:
+    1. Records are put on a queue of at most 'maxsize' records; a QueueListener thread drains it into the wrapped handlers.
+    2. When the queue is full, the policy decides what happens:
+        - 'drop_new': The new record is dropped.
+        - 'drop_old': The oldest queued record is dropped to make room for the new one.
+        - 'block': The caller waits up to 'block_timeout' seconds for room (backpressure), then drops the new record.
+    3. Dropped records are counted in 'dropped'.
+    4. Records are tagged with the current request ID and queued as copies whose message is already built and whose exception is
+       already formatted ('exc_text'), like 'QueueHandler.prepare' does: the writer thread never reads arguments the caller may have
+       changed since, and queued records do not keep tracebacks (and the frames they reference) alive.
+    5. 'flush' waits until every queued record has been written; 'stop' also stops the writer thread.
+
+    Parameters:
+    handlers (list): The handlers that perform the actual I/O.
+    maxsize (int): The maximum number of queued records.
+    policy (str): The policy applied when the queue is full.
+    block_timeout (float): Seconds to wait for room in the queue with the 'block' policy.
+    """
+    def __init__(self, handlers: list, maxsize: int = 10000, policy: str = 'drop_new', block_timeout: float = 0.05):
+        super().__init__(queue.Queue(maxsize))
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.request_id = request_id_var.get()
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or FORMATTER.formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.policy == 'block':
+                self.queue.put(record, timeout=self.block_timeout)
+            elif self.policy == 'drop_old':
+                while True:
+                    try:
+                        self.queue.put_nowait(record)
+                        break
+                    except queue.Full:
+                        self.queue.get_nowait()
+                        self.queue.task_done()
+                        self.dropped += 1
+            else:
+                self.queue.put_nowait(record)
+        except (queue.Full, queue.Empty):
+            self.dropped += 1
+
+    def flush(self) -> None:
+        if self.listener._thread is not None:
+            self.queue.join()
+        for handler in self.listener.handlers:
+            handler.flush()
+
+    def stop(self) -> None:
+        if self.listener._thread is not None:
+            self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.flush()
+
+
+# Queue handler currently attached to each configured logger
+queue_handlers = {}
+
+
+def _enqueue_handlers(logger_name: str, settings: LogSettings):
+    """
+    Function Overview:
+    Moves the handlers configured for a logger behind a BoundedQueueHandler, so records are written by a background thread.
+
+    Function Logic:
+    1. Stops (and drains) the queue handler previously attached to the logger, if the logger is being reconfigured.
+    2. Replaces the logger's handlers with a single queue handler that forwards records to them.
+    """
+    logger = logging.getLogger(logger_name)
+    previous = queue_handlers.pop(logger_name, None)
+    if previous is not None:
+        previous.stop()
+        for handler in previous.listener.handlers:
+            handler.close()
+    handler = BoundedQueueHandler(
+        [handler for handler in logger.handlers if not isinstance(handler, QueueHandler)],
+        settings.queue_size, settings.queue_policy, settings.queue_block_timeout,
+        )
+    logger.handlers = [handler]
+    queue_handlers[logger_name] = handler
+
+
+def flush_logging():
+    """
+    Function Overview:
+    Blocks until every queued log record has been written (called on application shutdown).
+    """
+    for handler in list(queue_handlers.values()):
+        handler.flush()
+
+
+def stop_logging():
+    """
+    Function Overview:
+    Flushes every queued log record and stops the background writer threads (called at exit).
+    """
+    for handler in list(queue_handlers.values()):
+        handler.stop()
+
+
+def logging_stats() -> dict:
+    """
+    Function Overview:
+    Reports the number of queued and dropped log records for each logger.
+    """
+    return {
+        name: {"queued": handler.queue.qsize(), "dropped": handler.dropped}
+        for name, handler in queue_handlers.items()
+        }
+
+
+atexit.register(stop_logging)
+
+
+def log_file(path: str) -> str:
+    """
+    Function Overview:
+    Returns the log file a process writes to: the given path, or with 'LOG_FILE_PER_PROCESS' enabled the path with the process ID
+    before the extension (e.g. 'logs/FastAPI.4242.log'), so every worker owns and rotates its own files.
+    """
+    if os.getenv(LOG_FILE_PER_PROCESS_ENV, 'false').lower() != 'true':
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}.{os.getpid()}{extension}"
+
+
+def _configure(config: dict, logger_name: str):
+    """
+    Function Overview:
+    Applies a logging configuration once per process; later calls for an already configured logger are no-ops.
+
+    Function Logic:
+    1. Creates the log directory if it does not exist yet.
+    2. Reads the LogSettings from the environment, and sets their level on every handler and logger of the configuration.
+    3. Resolves the file of every file handler with 'log_file' (per process when enabled).
+    4. Applies the configuration and moves the logger's handlers behind a BoundedQueueHandler.
+    """
+    if logger_name in queue_handlers:
+        return
+    os.makedirs(log_dir, exist_ok=True)
+    settings = LogSettings.from_env()
+    config = copy.deepcopy(config)
+    for entry in (*config['handlers'].values(), *config['loggers'].values()):
+        entry['level'] = settings.level
+    for handler in config['handlers'].values():
+        if 'filename' in handler:
+            handler['filename'] = log_file(handler['filename'])
+    logging.config.dictConfig(config)
+    _enqueue_handlers(logger_name, settings)
+
+
 def fastapi_logging():
-    logging.config.dictConfig(FASTAPI_CONFIG)
+    _configure(FASTAPI_CONFIG, 'fastapi_logger')
 
 
 def healthcheck_logging():
-    logging.config.dictConfig(HEALTHCHECK_CONFIG)
+    _configure(HEALTHCHECK_CONFIG, 'health_check_logger')
 
 
 def setup_tests_logging():
-    logging.config.dictConfig(TESTS_CONFIG)
+    _configure(TESTS_CONFIG, 'tests_logger')
+
+
+def configure_logging():
+    """
+    Function Overview:
+    Configures the application loggers (FastAPI and health checks), called once by the application lifespan of each worker after
+    it loaded '.env', so the 'LOG_*' settings it defines apply.
+    """
+    fastapi_logging()
+    healthcheck_logging()
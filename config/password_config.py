@@ -0,0 +1,41 @@
+from pydantic import BaseModel, field_validator
+from .server_config import available_cores
+import os
+
+
+
+
+class PasswordSettings(BaseModel):
+    """
+    Class Overview:
+    Settings for password hashing with scrypt, read from environment variables.
+
+    Attributes:
+    scrypt_n (int): CPU/memory cost, a power of two; every hash uses 128 * scrypt_r * scrypt_n bytes of memory ('PASSWORD_SCRYPT_N').
+    scrypt_r (int): Block size ('PASSWORD_SCRYPT_R').
+    scrypt_p (int): Parallelization ('PASSWORD_SCRYPT_P').
+    workers (int): Threads hashing and verifying passwords at once, bounding the CPU and memory they use; 0 runs one per usable core ('PASSWORD_HASH_WORKERS').
+    """
+    scrypt_n: int = 2 ** 14
+    scrypt_r: int = 8
+    scrypt_p: int = 1
+    workers: int = 0
+
+    @classmethod
+    def from_env(cls) -> "PasswordSettings":
+        return cls(
+            scrypt_n = int(os.getenv('PASSWORD_SCRYPT_N', 2 ** 14)),
+            scrypt_r = int(os.getenv('PASSWORD_SCRYPT_R', 8)),
+            scrypt_p = int(os.getenv('PASSWORD_SCRYPT_P', 1)),
+            workers = int(os.getenv('PASSWORD_HASH_WORKERS', 0)),
+            )
+
+    @field_validator("scrypt_n")
+    @classmethod
+    def validate_scrypt_n(cls, scrypt_n: int) -> int:
+        if scrypt_n < 2 or scrypt_n & (scrypt_n - 1):
+            raise ValueError("The scrypt cost must be a power of two greater than 1.")
+        return scrypt_n
+
+    def worker_count(self) -> int:
+        return self.workers if self.workers > 0 else available_cores()
@@ -0,0 +1,45 @@
+from pydantic import BaseModel
+import os
+
+
+
+
+class RecommendationSettings(BaseModel):
+    """
+    Class Overview:
+    Settings for the personalised article recommendations, read from environment variables.
+
+    Attributes:
+    enabled (bool): Whether '/users/{id}/recommendations' ranks articles, in every worker where articles are featurized or read ('RECOMMENDATIONS_ENABLED').
+    candidates (int): Latest articles ranked for every user ('RECOMMENDATIONS_CANDIDATES').
+    refresh_interval (float): Seconds between two rebuilds of the candidate matrix when articles were added ('RECOMMENDATIONS_REFRESH_INTERVAL').
+    interest_terms (int): Terms kept in the interest vector of a user, the heaviest first ('RECOMMENDATIONS_INTEREST_TERMS').
+    history (int): Latest interactions a user's stored interest vector is rebuilt from when it is missing or that many interactions behind ('RECOMMENDATIONS_HISTORY').
+    half_life (float): Seconds after which the weight of past interactions in a user's interests is halved ('RECOMMENDATIONS_HALF_LIFE').
+    seen (int): Latest articles a user interacted with, kept with their interest vector and left out of their recommendations ('RECOMMENDATIONS_SEEN').
+    cache_ttl (float): Seconds a worker reuses a recommendation list for the same user and limit; interactions recorded by other workers show after at most that long ('RECOMMENDATIONS_CACHE_TTL').
+    cache_max_entries (int): Users whose recommendation lists are kept in the cache ('RECOMMENDATIONS_CACHE_MAX_ENTRIES').
+    """
+    enabled: bool = True
+    candidates: int = 100000
+    refresh_interval: float = 60.0
+    interest_terms: int = 256
+    history: int = 200
+    half_life: float = 604800.0
+    seen: int = 200
+    cache_ttl: float = 30.0
+    cache_max_entries: int = 10000
+
+    @classmethod
+    def from_env(cls) -> "RecommendationSettings":
+        return cls(
+            enabled = os.getenv('RECOMMENDATIONS_ENABLED', 'true').lower() == 'true',
+            candidates = int(os.getenv('RECOMMENDATIONS_CANDIDATES', 100000)),
+            refresh_interval = float(os.getenv('RECOMMENDATIONS_REFRESH_INTERVAL', 60.0)),
+            interest_terms = int(os.getenv('RECOMMENDATIONS_INTEREST_TERMS', 256)),
+            history = int(os.getenv('RECOMMENDATIONS_HISTORY', 200)),
+            half_life = float(os.getenv('RECOMMENDATIONS_HALF_LIFE', 604800.0)),
+            seen = int(os.getenv('RECOMMENDATIONS_SEEN', 200)),
+            cache_ttl = float(os.getenv('RECOMMENDATIONS_CACHE_TTL', 30.0)),
+            cache_max_entries = int(os.getenv('RECOMMENDATIONS_CACHE_MAX_ENTRIES', 10000)),
+            )
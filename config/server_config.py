@@ -0,0 +1,73 @@
+from pydantic import BaseModel
+import math
+import os
+
+
+
+
+def available_cores() -> int:
+    """
+    Function Overview:
+    Counts the CPU cores this process may actually use.
+
+    Function Logic:
+    1. Starts from the cores the process is allowed to run on (CPU affinity), falling back to the total number of cores.
+    2. Caps it with the CPU quota of the container (cgroup v2 'cpu.max'), if any, rounded up.
+
+    Returns:
+    int: The number of usable cores (at least 1).
+    """
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as file:
+            quota, period = file.read().split()
+        if quota != 'max':
+            cores = min(cores, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(cores, 1)
+
+
+
+
+class ServerSettings(BaseModel):
+    """
+    Class Overview:
+    Settings for the HTTP server running the application, read from environment variables.
+
+    Attributes:
+    host (str): Interface to bind to ('SERVER_HOST').
+    port (int): Port to bind to ('SERVER_PORT').
+    workers (int): Worker processes, each with its own event loop, connection pool and caches; 0 runs one per usable core ('SERVER_WORKERS').
+    reload (bool): Development mode: a single worker restarted whenever the code changes ('SERVER_RELOAD').
+    keepalive_timeout (int): Seconds an idle keep-alive connection is held open ('SERVER_KEEPALIVE_TIMEOUT').
+    backlog (int): Maximum number of connections waiting to be accepted ('SERVER_BACKLOG').
+    graceful_timeout (int): Seconds in-flight requests are given to complete on shutdown ('SERVER_GRACEFUL_TIMEOUT').
+    max_requests (int): Requests after which a worker is replaced, 0 disables recycling ('SERVER_MAX_REQUESTS').
+    """
+    host: str = "0.0.0.0"
+    port: int = 9000
+    workers: int = 0
+    reload: bool = False
+    keepalive_timeout: int = 5
+    backlog: int = 2048
+    graceful_timeout: int = 30
+    max_requests: int = 0
+
+    @classmethod
+    def from_env(cls) -> "ServerSettings":
+        return cls(
+            host = os.getenv('SERVER_HOST', '0.0.0.0'),
+            port = int(os.getenv('SERVER_PORT', 9000)),
+            workers = int(os.getenv('SERVER_WORKERS', 0)),
+            reload = os.getenv('SERVER_RELOAD', 'false').lower() == 'true',
+            keepalive_timeout = int(os.getenv('SERVER_KEEPALIVE_TIMEOUT', 5)),
+            backlog = int(os.getenv('SERVER_BACKLOG', 2048)),
+            graceful_timeout = int(os.getenv('SERVER_GRACEFUL_TIMEOUT', 30)),
+            max_requests = int(os.getenv('SERVER_MAX_REQUESTS', 0)),
+            )
+
+    def worker_count(self) -> int:
+        if self.reload:
+            return 1
+        return self.workers if self.workers > 0 else available_cores()
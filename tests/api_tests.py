@@ -4,7 +4,9 @@ Ensure endpoints behave as expected and proper handling of edge cases, errors an
 """
 
 
+import base64
 import httpx
+import json
 from config.logging_config import setup_tests_logging
 import logging
 import pytest
@@ -81,6 +83,83 @@ async def test_health_endpoint():
     assert response.status_code == expected_status, f"Unexpected status code for Health Check endpoint: {get_http_status(response)} (expected: {expected_status} OK)"
 
 
+# Readiness Check (http://localhost:port/health/ready)
+@pytest.mark.asyncio
+@pytest.mark.fastapi
+async def test_readiness_endpoint():
+    async with httpx.AsyncClient() as client:
+        response1 = await client.get(f"{base_url}/health/ready")
+        response2 = await client.get(f"{base_url}/health/ready")
+
+    expected_status = 200
+    pass_flag = True
+
+    if response1.json()["status"] != "ready" or response1.json()["components"]["database"]["status"] != "up":
+        tests_logger.error("Tag: General - Endpoint: Readiness Check - Test Status: FAILED - Cause: Unexpected response body: %s", response1.json())
+        pass_flag = False
+    if response1.status_code != expected_status:
+        tests_logger.error("Tag: General - Endpoint: Readiness Check - Test Status: FAILED - Cause: Unexpected status code: %s (expected: %s OK)", get_http_status(response1), expected_status)
+        pass_flag = False
+    if not response2.json()["cached"]:
+        tests_logger.error("Tag: General - Endpoint: Readiness Check - Test Status: FAILED - Cause: Second check was not served from the cache: %s", response2.json())
+        pass_flag = False
+    if pass_flag:
+        tests_logger.info(f"Tag: General - Endpoint: Readiness Check - Test Status - PASSED - HTTP Response: {get_http_status(response1)}")
+
+    assert response1.json()["status"] == "ready", f"Unexpected response body for Readiness Check endpoint: {response1.json()}"
+    assert response1.json()["components"]["database"]["status"] == "up", f"Unexpected database status for Readiness Check endpoint: {response1.json()}"
+    assert response1.status_code == expected_status, f"Unexpected status code for Readiness Check endpoint: {get_http_status(response1)} (expected: {expected_status} OK)"
+    assert response2.json()["cached"], f"Second readiness check was not served from the cache: {response2.json()}"
+
+
+# Request ID propagation (X-Request-ID header on any endpoint)
+@pytest.mark.asyncio
+@pytest.mark.fastapi
+async def test_request_id_header():
+    async with httpx.AsyncClient() as client:
+        supplied_response = await client.get(f"{base_url}/", headers={"X-Request-ID": "test-request-0001"})
+        generated_response = await client.get(f"{base_url}/", headers={"X-Request-ID": "invalid request id"})
+
+    pass_flag = True
+
+    if supplied_response.headers.get("x-request-id") != "test-request-0001":
+        tests_logger.error("Tag: General - Endpoint: Request ID - Test Status: FAILED - Cause: Supplied request ID not echoed: %s", supplied_response.headers.get("x-request-id"))
+        pass_flag = False
+    if len(generated_response.headers.get("x-request-id", "")) != 32:
+        tests_logger.error("Tag: General - Endpoint: Request ID - Test Status: FAILED - Cause: Invalid request ID not replaced: %s", generated_response.headers.get("x-request-id"))
+        pass_flag = False
+    if pass_flag:
+        tests_logger.info(f"Tag: General - Endpoint: Request ID - Test Status - PASSED - HTTP Response: {get_http_status(supplied_response)}")
+
+    assert supplied_response.headers.get("x-request-id") == "test-request-0001", f"Supplied request ID not echoed: {supplied_response.headers.get('x-request-id')}"
+    assert len(generated_response.headers.get("x-request-id", "")) == 32, f"Invalid request ID not replaced: {generated_response.headers.get('x-request-id')}"
+
+
+# Metrics (http://localhost:port/metrics)
+@pytest.mark.asyncio
+@pytest.mark.fastapi
+async def test_metrics_endpoint():
+    async with httpx.AsyncClient() as client:
+        await client.get(f"{base_url}/")
+        response = await client.get(f"{base_url}/metrics")
+
+    expected_sample = 'http_requests_total{method="GET",route="/",status="200"}'
+    expected_status = 200
+    pass_flag = True
+
+    if expected_sample not in response.text:
+        tests_logger.error("Tag: General - Endpoint: Metrics - Test Status: FAILED - Cause: Missing sample: %s", expected_sample)
+        pass_flag = False
+    if response.status_code != expected_status:
+        tests_logger.error("Tag: General - Endpoint: Metrics - Test Status: FAILED - Cause: Unexpected status code: %s (expected: %s OK)", get_http_status(response), expected_status)
+        pass_flag = False
+    if pass_flag:
+        tests_logger.info(f"Tag: General - Endpoint: Metrics - Test Status - PASSED - HTTP Response: {get_http_status(response)}")
+
+    assert expected_sample in response.text, f"Missing sample in Metrics endpoint: {expected_sample}"
+    assert response.status_code == expected_status, f"Unexpected status code for Metrics endpoint: {get_http_status(response)} (expected: {expected_status} OK)"
+
+
 
 
 """
@@ -232,6 +311,274 @@ async def test_fetch_user_details_endpoint():
         tests_logger.info(f"Tag: Users - Endpoint: Fetch User Details - Test Status - PASSED - HTTP Response: {get_http_status(response1)}")
 
 
+# Conditional Fetch User Details (http://localhost:port/users/{id} with 'If-None-Match')
+@pytest.mark.asyncio
+@pytest.mark.fastapi
+async def test_conditional_fetch_user_details_endpoint():
+    async with httpx.AsyncClient() as client:
+        get_id = await client.get(f"{base_url}/users/get_id/TestUser_101")
+        id1 = (get_id.json())["data"]
+        response1 = await client.get(f"{base_url}/users/{id1}")
+        etag = response1.headers.get("etag")
+        response2 = await client.get(f"{base_url}/users/{id1}", headers={"If-None-Match": f'"stale", W/{etag}'})
+        response3 = await client.get(f"{base_url}/users/{id1}", headers={"If-None-Match": '"stale"'})
+
+    expected_status1 = 200
+    expected_status2 = 304
+    pass_flag = True
+
+    if etag is None or "cache-control" not in response1.headers:
+        tests_logger.error("Tag: Users - Endpoint: Conditional Fetch User Details - Test Status: FAILED - Cause: Missing ETag or Cache-Control header: %s", dict(response1.headers))
+        pass_flag = False
+    if response2.status_code != expected_status2 or response2.content:
+        tests_logger.error("Tag: Users - Endpoint: Conditional Fetch User Details - Test Status: FAILED - Cause: Unexpected response: %s %s (expected: %s Not Modified without a body)", get_http_status(response2), response2.content, expected_status2)
+        pass_flag = False
+    if response3.status_code != expected_status1 or response3.json() != response1.json():
+        tests_logger.error("Tag: Users - Endpoint: Conditional Fetch User Details - Test Status: FAILED - Cause: Unexpected response: %s (expected: %s OK with the full body)", get_http_status(response3), expected_status1)
+        pass_flag = False
+    assert etag is not None and "cache-control" in response1.headers, f"Missing ETag or Cache-Control header for Conditional Fetch User Details endpoint: {dict(response1.headers)}"
+    assert response2.status_code == expected_status2 and not response2.content, f"Unexpected response for Conditional Fetch User Details endpoint: {get_http_status(response2)} (expected: {expected_status2} Not Modified)"
+    assert response2.headers.get("etag") == etag, f"Unexpected ETag for Conditional Fetch User Details endpoint: {response2.headers.get('etag')} (expected: {etag})"
+    assert response3.status_code == expected_status1 and response3.json() == response1.json(), f"Unexpected response for Conditional Fetch User Details endpoint: {get_http_status(response3)} (expected: {expected_status1} OK)"
+
+    if pass_flag:
+        tests_logger.info(f"Tag: Users - Endpoint: Conditional Fetch User Details - Test Status - PASSED - HTTP Response: {get_http_status(response2)}")
+
+
+# Conditional Fetch User Details (http://localhost:port/users/{id} with 'If-Modified-Since')
+@pytest.mark.asyncio
+@pytest.mark.fastapi
+async def test_modified_since_fetch_user_details_endpoint():
+    async with httpx.AsyncClient() as client:
+        get_id = await client.get(f"{base_url}/users/get_id/TestUser_101")
+        id1 = (get_id.json())["data"]
+        response1 = await client.get(f"{base_url}/users/{id1}")
+        last_modified = response1.headers.get("last-modified")
+        response2 = await client.get(f"{base_url}/users/{id1}", headers={"If-Modified-Since": last_modified or ""})
+        response3 = await client.get(f"{base_url}/users/{id1}", headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"})
+        response4 = await client.get(f"{base_url}/users/{id1}", headers={"If-Modified-Since": last_modified or "", "If-None-Match": '"stale"'})
+
+    expected_status1 = 200
+    expected_status2 = 304
+    pass_flag = True
+
+    if last_modified is None:
+        tests_logger.error("Tag: Users - Endpoint: Modified Since Fetch User Details - Test Status: FAILED - Cause: Missing Last-Modified header: %s", dict(response1.headers))
+        pass_flag = False
+    if response2.status_code != expected_status2 or response2.content:
+        tests_logger.error("Tag: Users - Endpoint: Modified Since Fetch User Details - Test Status: FAILED - Cause: Unexpected response: %s %s (expected: %s Not Modified without a body)", get_http_status(response2), response2.content, expected_status2)
+        pass_flag = False
+    if response3.status_code != expected_status1 or response4.status_code != expected_status1:
+        tests_logger.error("Tag: Users - Endpoint: Modified Since Fetch User Details - Test Status: FAILED - Cause: Unexpected responses: %s, %s (expected: %s OK)", get_http_status(response3), get_http_status(response4), expected_status1)
+        pass_flag = False
+    assert last_modified is not None, f"Missing Last-Modified header for Modified Since Fetch User Details endpoint: {dict(response1.headers)}"
+    assert response2.status_code == expected_status2 and not response2.content, f"Unexpected response for Modified Since Fetch User Details endpoint: {get_http_status(response2)} (expected: {expected_status2} Not Modified)"
+    assert response3.status_code == expected_status1 and response3.json() == response1.json(), f"Unexpected response for Modified Since Fetch User Details endpoint: {get_http_status(response3)} (expected: {expected_status1} OK)"
+    assert response4.status_code == expected_status1, f"Unexpected response for Modified Since Fetch User Details endpoint with a stale ETag: {get_http_status(response4)} (expected: {expected_status1} OK)"
+
+    if pass_flag:
+        tests_logger.info(f"Tag: Users - Endpoint: Modified Since Fetch User Details - Test Status - PASSED - HTTP Response: {get_http_status(response2)}")
+
+
+# Login User (http://localhost:port/users/login)
+@pytest.mark.asyncio
+@pytest.mark.fastapi
+async def test_login_user_endpoint():
+    async with httpx.AsyncClient() as client:
+        get_id = await client.get(f"{base_url}/users/get_id/TestUser_101")
+        id1 = (get_id.json())["data"]
+        request1 = {"username": "TestUser_101", "password": "TestPswrd123!"}
+        request2 = {"username": "TestUser_101", "password": "WrongPswrd123!"}
+        request3 = {"username": "TestUser_999", "password": "TestPswrd123!"}
+        response1 = await client.post(f"{base_url}/users/login", json=request1)
+        response2 = await client.post(f"{base_url}/users/login", json=request2)
+        response3 = await client.post(f"{base_url}/users/login", json=request3)
+        details = await client.get(f"{base_url}/users/{id1}")
+
+    request_username = request1["username"]
+    expected_body1 = f"User '{request_username}' authenticated successfully."
+    expected_body2 = expected_body3 = "Invalid username or password."
+    expected_status1 = 200
+    expected_status2 = expected_status3 = 401
+    pass_flag = True
+
+    response_arr = [response1, response2, response3]
+    body_arr = [expected_body1, expected_body2, expected_body3]
+    status_arr = [expected_status1, expected_status2, expected_status3]
+    for response, body, status in zip(response_arr, body_arr, status_arr):
+        response_detail = (response.json())["detail"]
+        if response_detail != body:
+            tests_logger.error("Tag: Users - Endpoint: Login User - Test Status: FAILED - Cause: Unexpected response body: %s (expected: %s)", response_detail, body)
+            pass_flag = False
+        if response.status_code != status:
+            tests_logger.error("Tag: Users - Endpoint: Login User - Test Status: FAILED - Cause: Unexpected status code: %s (expected: %s)", get_http_status(response), status)
+            pass_flag = False
+        assert response_detail == body, f"Unexpected response body for Login User endpoint: {response_detail} (expected: {body})"
+        assert response.status_code == status, f"Unexpected status code for Login User endpoint: {get_http_status(response)} (expected: {status})"
+
+    if (response1.json())["data"] != id1 or "password" in (details.json())["data"]:
+        tests_logger.error("Tag: Users - Endpoint: Login User - Test Status: FAILED - Cause: Unexpected user data: %s, %s (expected: user ID %s and no password)", response1.json(), details.json(), id1)
+        pass_flag = False
+    assert (response1.json())["data"] == id1, f"Unexpected user ID for Login User endpoint: {(response1.json())['data']} (expected: {id1})"
+    assert "password" not in (details.json())["data"], f"Password returned by Fetch User Details endpoint: {details.json()}"
+
+    if pass_flag:
+        tests_logger.info(f"Tag: Users - Endpoint: Login User - Test Status - PASSED - HTTP Response: {get_http_status(response1)}")
+
+
+# Batch Fetch User Details and User IDs (http://localhost:port/users/batch/ids, http://localhost:port/users/batch/usernames)
+@pytest.mark.asyncio
+@pytest.mark.fastapi
+async def test_batch_fetch_users_endpoint():
+    async with httpx.AsyncClient() as client:
+        get_id = await client.get(f"{base_url}/users/get_id/TestUser_101")
+        id1 = (get_id.json())["data"]
+        id2 = 1
+        request1 = {"ids": [id1, id2]}
+        request2 = {"usernames": ["TestUser_101", "NonExistentUser"]}
+        request3 = {"ids": list(range(1000))}
+        response1 = await client.post(f"{base_url}/users/batch/ids", json=request1)
+        response2 = await client.post(f"{base_url}/users/batch/usernames", json=request2)
+        response3 = await client.post(f"{base_url}/users/batch/ids", json=request3)
+
+    expected_body1 = "Details for 1 of 2 requested user IDs fetched successfully."
+    expected_body2 = "User IDs for 1 of 2 requested usernames fetched successfully."
+    expected_not_found1 = [id2]
+    expected_not_found2 = ["NonExistentUser"]
+    expected_status1 = 200
+    expected_status2 = 422
+    pass_flag = True
+
+    response_arr = [response1, response2]
+    body_arr = [expected_body1, expected_body2]
+    not_found_arr = [expected_not_found1, expected_not_found2]
+    for response, body, not_found in zip(response_arr, body_arr, not_found_arr):
+        response_detail = (response.json())["detail"]
+        response_not_found = (response.json())["data"]["not_found"]
+        if response_detail != body or response_not_found != not_found:
+            tests_logger.error("Tag: Users - Endpoint: Batch Fetch Users - Test Status: FAILED - Cause: Unexpected response body: %s (expected: %s, not found: %s)", response.json(), body, not_found)
+            pass_flag = False
+        if response.status_code != expected_status1:
+            tests_logger.error("Tag: Users - Endpoint: Batch Fetch Users - Test Status: FAILED - Cause: Unexpected status code: %s (expected: %s OK)", get_http_status(response), expected_status1)
+            pass_flag = False
+        assert response_detail == body, f"Unexpected response body for Batch Fetch Users endpoint: {response_detail} (expected: {body})"
+        assert response_not_found == not_found, f"Unexpected not found entries for Batch Fetch Users endpoint: {response_not_found} (expected: {not_found})"
+        assert response.status_code == expected_status1, f"Unexpected status code for Batch Fetch Users endpoint: {get_http_status(response)} (expected: {expected_status1} OK)"
+
+    if response3.status_code != expected_status2:
+        tests_logger.error("Tag: Users - Endpoint: Batch Fetch Users - Test Status: FAILED - Cause: Unexpected status code: %s (expected: %s)", get_http_status(response3), expected_status2)
+        pass_flag = False
+    assert response3.status_code == expected_status2, f"Unexpected status code for oversized Batch Fetch Users request: {get_http_status(response3)} (expected: {expected_status2})"
+
+    if pass_flag:
+        tests_logger.info(f"Tag: Users - Endpoint: Batch Fetch Users - Test Status - PASSED - HTTP Response: {get_http_status(response1)}")
+
+
+# List Users (http://localhost:port/users/list)
+@pytest.mark.asyncio
+@pytest.mark.fastapi
+async def test_list_users_endpoint():
+    async with httpx.AsyncClient() as client:
+        params1 = {"username_prefix": "TestUser_10", "fields": "user_id,username", "limit": 1}
+        params2 = {"fields": "password"}
+        forged_cursors = [
+            ({"order_by": "created_at"}, ["created_at", "not a date", 1]),
+            ({"order_by": "user_id"}, ["user_id", "1 OR 1=1", 1]),
+            ]
+        response1 = await client.get(f"{base_url}/users/list", params=params1)
+        response2 = await client.get(f"{base_url}/users/list", params=params2)
+        responses3 = [
+            await client.get(f"{base_url}/users/list", params={**params, "cursor": base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()})
+            for params, payload in forged_cursors
+            ]
+        response4 = await client.get(f"{base_url}/users/list", params={"username_prefix": "TestUse__10", "fields": "username"})
+
+    expected_body1 = "1 users fetched successfully."
+    expected_users1 = ["TestUser_101"]
+    expected_fields1 = {"user_id", "username"}
+    expected_status1 = 200
+    expected_status2 = 422
+    expected_status3 = 400
+    expected_users4 = []
+    pass_flag = True
+
+    response1_detail = (response1.json())["detail"]
+    response1_users = (response1.json())["data"]["users"]
+    response1_usernames = [user["username"] for user in response1_users]
+    response1_fields = set().union(*(user.keys() for user in response1_users))
+    if response1_detail != expected_body1 or response1_usernames != expected_users1 or response1_fields != expected_fields1:
+        tests_logger.error("Tag: Users - Endpoint: List Users - Test Status: FAILED - Cause: Unexpected response body: %s (expected: %s, users: %s)", response1.json(), expected_body1, expected_users1)
+        pass_flag = False
+    if response1.status_code != expected_status1:
+        tests_logger.error("Tag: Users - Endpoint: List Users - Test Status: FAILED - Cause: Unexpected status code: %s (expected: %s OK)", get_http_status(response1), expected_status1)
+        pass_flag = False
+    assert response1_detail == expected_body1, f"Unexpected response body for List Users endpoint: {response1_detail} (expected: {expected_body1})"
+    assert response1_usernames == expected_users1, f"Unexpected users for List Users endpoint: {response1_usernames} (expected: {expected_users1})"
+    assert response1_fields == expected_fields1, f"Unexpected fields for List Users endpoint: {response1_fields} (expected: {expected_fields1})"
+    assert response1.status_code == expected_status1, f"Unexpected status code for List Users endpoint: {get_http_status(response1)} (expected: {expected_status1} OK)"
+
+    if response2.status_code != expected_status2:
+        tests_logger.error("Tag: Users - Endpoint: List Users - Test Status: FAILED - Cause: Unexpected status code: %s (expected: %s)", get_http_status(response2), expected_status2)
+        pass_flag = False
+    assert response2.status_code == expected_status2, f"Unexpected status code for List Users endpoint with a non-listable field: {get_http_status(response2)} (expected: {expected_status2})"
+
+    for response3 in responses3:
+        if response3.status_code != expected_status3:
+            tests_logger.error("Tag: Users - Endpoint: List Users - Test Status: FAILED - Cause: Unexpected status code for a forged cursor: %s (expected: %s)", get_http_status(response3), expected_status3)
+            pass_flag = False
+        assert response3.status_code == expected_status3, f"Unexpected status code for List Users endpoint with a forged cursor: {get_http_status(response3)} (expected: {expected_status3})"
+
+    response4_usernames = [user["username"] for user in (response4.json())["data"]["users"]]
+    if response4_usernames != expected_users4:
+        tests_logger.error("Tag: Users - Endpoint: List Users - Test Status: FAILED - Cause: '_' of a prefix matched as a wildcard: %s", response4_usernames)
+        pass_flag = False
+    assert response4_usernames == expected_users4, f"Unexpected users for List Users endpoint with '_' in a prefix: {response4_usernames} (expected: {expected_users4})"
+
+    if pass_flag:
+        tests_logger.info(f"Tag: Users - Endpoint: List Users - Test Status - PASSED - HTTP Response: {get_http_status(response1)}")
+
+
+# Bulk Create and Delete Users (http://localhost:port/users/bulk/create, http://localhost:port/users/bulk/delete)
+@pytest.mark.asyncio
+@pytest.mark.fastapi
+async def test_bulk_create_and_delete_users_endpoint():
+    async with httpx.AsyncClient() as client:
+        users = [
+            {"email_id": "test.bulk1@gmail.com", "username": "TestBulk_101", "password": "TestPswrd123!", "first_name": "Test"},
+            {"email_id": "test.bulk2@gmail.com", "username": "TestBulk_102", "password": "TestPswrd123!", "first_name": "Test"},
+            {"email_id": "test.user1@gmail.com", "username": "TestBulk_103", "password": "TestPswrd123!", "first_name": "Test"},
+        ]
+        response1 = await client.post(f"{base_url}/users/bulk/create", json={"users": users})
+        created_ids = [item["data"] for item in (response1.json())["data"]["results"] if item["status"] == "created"]
+        response2 = await client.post(f"{base_url}/users/bulk/delete", json={"ids": created_ids + [1]})
+
+    expected_body1 = "2 of 3 users created successfully."
+    expected_statuses1 = ["created", "created", "conflict"]
+    expected_body2 = "2 of 3 users deleted successfully."
+    expected_statuses2 = ["deleted", "deleted", "not_found"]
+    expected_status = 200
+    pass_flag = True
+
+    response_arr = [response1, response2]
+    body_arr = [expected_body1, expected_body2]
+    statuses_arr = [expected_statuses1, expected_statuses2]
+    for response, body, statuses in zip(response_arr, body_arr, statuses_arr):
+        response_detail = (response.json())["detail"]
+        response_statuses = [item["status"] for item in (response.json())["data"]["results"]]
+        if response_detail != body or response_statuses != statuses:
+            tests_logger.error("Tag: Users - Endpoint: Bulk Create and Delete Users - Test Status: FAILED - Cause: Unexpected response body: %s (expected: %s, row statuses: %s)", response.json(), body, statuses)
+            pass_flag = False
+        if response.status_code != expected_status:
+            tests_logger.error("Tag: Users - Endpoint: Bulk Create and Delete Users - Test Status: FAILED - Cause: Unexpected status code: %s (expected: %s OK)", get_http_status(response), expected_status)
+            pass_flag = False
+        assert response_detail == body, f"Unexpected response body for Bulk Create and Delete Users endpoint: {response_detail} (expected: {body})"
+        assert response_statuses == statuses, f"Unexpected row statuses for Bulk Create and Delete Users endpoint: {response_statuses} (expected: {statuses})"
+        assert response.status_code == expected_status, f"Unexpected status code for Bulk Create and Delete Users endpoint: {get_http_status(response)} (expected: {expected_status} OK)"
+
+    if pass_flag:
+        tests_logger.info(f"Tag: Users - Endpoint: Bulk Create and Delete Users - Test Status - PASSED - HTTP Response: {get_http_status(response1)}")
+
+
 # Update User Details (http://localhost:port/users/update)
 @pytest.mark.asyncio
 @pytest.mark.fastapi
@@ -308,6 +655,53 @@ async def test_update_user_details_endpoint():
         tests_logger.info(f"Tag: Users - Endpoint: Update User Details - Test Status - PASSED - HTTP Response: {get_http_status(response6)}")
 
 
+# Patch User Details (http://localhost:port/users/{id})
+@pytest.mark.asyncio
+@pytest.mark.fastapi
+async def test_patch_user_details_endpoint():
+    async with httpx.AsyncClient() as client:
+        get_id = await client.get(f"{base_url}/users/get_id/TestUser_202")
+        id1 = (get_id.json())["data"]
+        id2 = 1
+        request1 = {"first_name": "Patched", "last_name": "User 2"}
+        request2 = {"first_name": "Patched", "username": "TestUser_101"}
+        request3 = {"user_id": id2}
+        response1 = await client.patch(f"{base_url}/users/{id1}", json=request1)
+        response2 = await client.patch(f"{base_url}/users/{id1}", json=request2)
+        response3 = await client.patch(f"{base_url}/users/{id2}", json=request1)
+        response4 = await client.patch(f"{base_url}/users/{id1}", json=request3)
+
+    expected_body1 = f"Details updated successfully for user ID '{id1}'."
+    expected_body2 = "User with username 'TestUser_101' already exists."
+    expected_body3 = f"User ID '{id2}' not found."
+    expected_status_arr = [200, 409, 404, 422]
+    pass_flag = True
+
+    response_arr = [response1, response2, response3]
+    body_arr = [expected_body1, expected_body2, expected_body3]
+    for response, body in zip(response_arr, body_arr):
+        response_detail = (response.json())["detail"]
+        if response_detail != body:
+            tests_logger.error("Tag: Users - Endpoint: Patch User Details - Test Status: FAILED - Cause: Unexpected response body: %s (expected: %s)", response_detail, body)
+            pass_flag = False
+        assert response_detail == body, f"Unexpected response body for Patch User Details endpoint: {response_detail} (expected: {body})"
+
+    response1_data = (response1.json())["data"]
+    if (response1_data["first_name"], response1_data["last_name"]) != (request1["first_name"], request1["last_name"]):
+        tests_logger.error("Tag: Users - Endpoint: Patch User Details - Test Status: FAILED - Cause: Unexpected updated data: %s (expected: %s)", response1_data, request1)
+        pass_flag = False
+    assert (response1_data["first_name"], response1_data["last_name"]) == (request1["first_name"], request1["last_name"]), f"Unexpected updated data for Patch User Details endpoint: {response1_data} (expected: {request1})"
+
+    for response, status in zip(response_arr + [response4], expected_status_arr):
+        if response.status_code != status:
+            tests_logger.error("Tag: Users - Endpoint: Patch User Details - Test Status: FAILED - Cause: Unexpected status code: %s (expected: %s)", get_http_status(response), status)
+            pass_flag = False
+        assert response.status_code == status, f"Unexpected status code for Patch User Details endpoint: {get_http_status(response)} (expected: {status})"
+
+    if pass_flag:
+        tests_logger.info(f"Tag: Users - Endpoint: Patch User Details - Test Status - PASSED - HTTP Response: {get_http_status(response1)}")
+
+
 # Delete User (http://localhost:port/users/delete/{id})
 @pytest.mark.asyncio
 @pytest.mark.fastapi
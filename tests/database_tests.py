@@ -0,0 +1,160 @@
+"""
+Test file for the data layer's consistency under concurrency, run without a server against the in-memory repository.
+Ensure reads racing writes (or a login rehashing a password) never leave stale data in the user cache, and every repository call is counted
+in the request's database statistics.
+"""
+
+
+import asyncio
+from config.logging_config import setup_tests_logging, request_stats_var
+import logging
+import pytest
+from app.database import MemoryUserRepository, MemoryCache, UserCache, authenticate_user, fetch_user, fetch_id, patch_user, delete_user
+from app.passwords import PasswordHasher
+from app.schema.users import UserLoginRequest, UserPatchRequest
+from config.password_config import PasswordSettings
+
+
+setup_tests_logging()
+tests_logger = logging.getLogger('tests_logger')
+
+
+class PausedReadRepository(MemoryUserRepository):
+    # In-memory repository whose reads take their rows, then wait until 'resume' is set, like a query answered before a write commits
+    def __init__(self):
+        super().__init__()
+        self.reading = asyncio.Event()
+        self.resume = asyncio.Event()
+
+    async def get_users(self, ids):
+        rows = await super().get_users(ids)
+        self.reading.set()
+        await self.resume.wait()
+        return rows
+
+    async def get_user_ids(self, usernames):
+        user_ids = await super().get_user_ids(usernames)
+        self.reading.set()
+        await self.resume.wait()
+        return user_ids
+
+
+async def create_paused_user():
+    repository = PausedReadRepository()
+    await repository.insert_users([{"email_id": "race@example.com", "username": "race", "password": "-", "first_name": "Old", "last_name": None}])
+    return repository, UserCache(MemoryCache(100, 60.0))
+
+
+async def race(repository, read, write):
+    # Starts the read on a cache miss, runs the write while the read holds its rows, then lets the read finish
+    reader = asyncio.create_task(read())
+    await repository.reading.wait()
+    await write()
+    repository.resume.set()
+    return await reader
+
+
+
+
+"""
+User Cache Consistency
+"""
+
+
+# Fetch User racing Patch User
+@pytest.mark.asyncio
+async def test_fetch_user_racing_patch_user():
+    repository, cache = await create_paused_user()
+    hasher = PasswordHasher(PasswordSettings())
+    try:
+        await race(
+            repository,
+            lambda: fetch_user(1, repository, cache),
+            lambda: patch_user(1, UserPatchRequest(first_name="New"), repository, hasher, cache),
+            )
+        cached = await cache.get_user(1)
+        fetched = await fetch_user(1, repository, cache)
+    finally:
+        hasher.close()
+
+    tests_logger.info("Tag: Database - Test: Fetch User racing Patch User - Cached: %s - Fetched: %s", cached, fetched.data.first_name)
+    assert cached is not None and cached["first_name"] == "New", f"Stale user cached after a racing patch: {cached}"
+    assert fetched.data.first_name == "New", f"Stale user fetched after a racing patch: {fetched.data.first_name}"
+
+
+# Fetch User racing Delete User
+@pytest.mark.asyncio
+async def test_fetch_user_racing_delete_user():
+    repository, cache = await create_paused_user()
+    await race(repository, lambda: fetch_user(1, repository, cache), lambda: delete_user(1, repository, cache))
+    cached = await cache.get_user(1)
+
+    tests_logger.info("Tag: Database - Test: Fetch User racing Delete User - Cached: %s", cached)
+    assert cached is None, f"Deleted user brought back into the cache by a racing read: {cached}"
+    with pytest.raises(ValueError):
+        await fetch_user(1, repository, cache)
+
+
+# Fetch ID racing a username change
+@pytest.mark.asyncio
+async def test_fetch_id_racing_username_change():
+    repository, cache = await create_paused_user()
+    hasher = PasswordHasher(PasswordSettings())
+    try:
+        await race(
+            repository,
+            lambda: fetch_id("race", repository, cache),
+            lambda: patch_user(1, UserPatchRequest(username="renamed"), repository, hasher, cache),
+            )
+    finally:
+        hasher.close()
+    cached = await cache.get_user_id("race")
+
+    tests_logger.info("Tag: Database - Test: Fetch ID racing Patch User - Cached: %s", cached)
+    assert cached is None, f"Previous username cached after a racing rename: {cached}"
+    with pytest.raises(ValueError):
+        await fetch_id("race", repository, cache)
+
+
+
+# Login rehashing a legacy password of a cached user
+@pytest.mark.asyncio
+async def test_login_rehash_refreshes_cached_user():
+    repository, cache = MemoryUserRepository(), UserCache(MemoryCache(100, 60.0))
+    await repository.insert_users([{"email_id": "legacy@example.com", "username": "legacy", "password": "TestPswrd123!", "first_name": "Old", "last_name": None}])
+    hasher = PasswordHasher(PasswordSettings(scrypt_n=2 ** 10))
+    try:
+        before = (await fetch_user(1, repository, cache)).data.updated_at
+        await authenticate_user(UserLoginRequest(username="legacy", password="TestPswrd123!"), repository, hasher, cache)
+        stored, credentials = (await repository.get_users([1]))[0], await repository.get_credentials("legacy")
+        cached = await cache.get_user(1)
+    finally:
+        hasher.close()
+
+    tests_logger.info("Tag: Database - Test: Login Rehash Cached User - Before: %s - Cached: %s", before, cached and cached["updated_at"])
+    assert credentials["password"] != "TestPswrd123!", "Legacy plaintext password not rehashed on login"
+    assert cached is not None and cached["updated_at"] == stored["updated_at"], f"Stale user cached after a login rehash: {cached} != {stored}"
+
+
+
+
+"""
+Request Statistics
+"""
+
+
+# Database calls of a request
+@pytest.mark.asyncio
+async def test_repository_calls_are_counted():
+    repository, _ = await create_paused_user()
+    repository.resume.set()
+    stats = {"db_time": 0.0, "db_calls": 0}
+    token = request_stats_var.set(stats)
+    try:
+        await fetch_user(1, repository)
+        await fetch_id("race", repository)
+    finally:
+        request_stats_var.reset(token)
+
+    tests_logger.info("Tag: Database - Test: Repository Calls are Counted - Stats: %s", stats)
+    assert stats["db_calls"] == 2 and stats["db_time"] > 0, f"Repository calls missing from the request's statistics: {stats}"
@@ -0,0 +1,233 @@
+"""
+Test file for the TF-IDF featurizer and its vector store, run without a server in a temporary directory.
+Ensure a feature directory and a similarity index directory have a single writer, batches added from a worker thread never show half-added to readers, the
+similarity window follows the times stored with the features, and a read-only featurizer of another worker serves recommendations from the interest vectors
+stored in the shared repository.
+"""
+
+
+import asyncio
+import threading
+import time
+from config.logging_config import setup_tests_logging
+import logging
+import numpy as np
+import pytest
+from app.ann import ArticleIndex
+from app.database.articles import record_interaction
+from app.database.memory_repository import MemoryArticleRepository
+from app.features import Featurizer, StoreLockedError
+from app.locks import try_lock
+from app.recommendations import Recommender
+from app.schema.articles import InteractionRequest
+from config.ann_config import AnnSettings
+from config.features_config import FeatureSettings
+from config.recommendation_config import RecommendationSettings
+
+
+setup_tests_logging()
+tests_logger = logging.getLogger('tests_logger')
+
+
+def texts(start: int, count: int):
+    return [f"article {id} about topic{id % 7} and word{id % 13} with word{id % 5}" for id in range(start, start + count)]
+
+
+
+
+"""
+Single Writer
+"""
+
+
+# Second Featurizer on the same directory
+def test_second_featurizer_is_refused(tmp_path):
+    settings = FeatureSettings(directory=str(tmp_path / "features"))
+    featurizer = Featurizer(settings)
+    featurizer.add(list(range(1, 51)), texts(1, 50))
+    with pytest.raises(StoreLockedError):
+        Featurizer(settings)
+    featurizer.close()
+
+    reopened = Featurizer(settings)
+    try:
+        stats, terms = reopened.stats(), reopened.terms
+    finally:
+        reopened.close()
+
+    tests_logger.info("Tag: Features - Test: Second Featurizer - Reopened: %s", stats)
+    assert stats["articles"] == 50, f"Unexpected articles after reopening the feature directory: {stats}"
+    assert terms == featurizer.terms, "Vocabulary changed after reopening the feature directory"
+
+
+# Second ingestion leader
+def test_second_ingestion_lock_is_refused(tmp_path):
+    path = str(tmp_path / "ingestion.lock")
+    leader = try_lock(path)
+    follower = try_lock(path)
+    leader.close()
+    successor = try_lock(path)
+    successor.close()
+
+    tests_logger.info("Tag: Features - Test: Second Ingestion Lock - Follower: %s", follower)
+    assert leader is not None and follower is None, "Two holders of the ingestion lock"
+    assert successor is not None, "Ingestion lock not released when its holder closed it"
+
+
+
+# Second writable similarity index, and a reader opened before the writer
+def test_second_ann_writer_is_refused(tmp_path):
+    featurizer = Featurizer(FeatureSettings(directory=str(tmp_path / "features")))
+    settings = AnnSettings(directory=str(tmp_path / "ann"), segment_size=64, lists=4, refresh_interval=0)
+    reader = ArticleIndex(settings, readonly=True)
+    writer = ArticleIndex(settings)
+    try:
+        with pytest.raises(StoreLockedError):
+            ArticleIndex(settings)
+        featurizer.add(list(range(1, 101)), texts(1, 100))
+        asyncio.run(writer.catch_up(featurizer))
+        asyncio.run(reader.refresh())
+        similar = reader.similar(1, 3)
+    finally:
+        writer.close()
+        featurizer.close()
+    successor = ArticleIndex(settings)
+    successor.close()
+
+    tests_logger.info("Tag: Features - Test: Second ANN Writer - Reader: %s", reader.stats())
+    assert reader.stats()["segments"] == 1, f"Reader missed the saved segment: {reader.stats()}"
+    assert len(similar) == 3 and 1 not in [id for id, _ in similar], f"Unexpected similar articles from the reader: {similar}"
+
+
+
+# Articles not frozen into a segment yet, found by a reader
+def test_readonly_ann_finds_unsaved_articles(tmp_path):
+    feature_settings = FeatureSettings(directory=str(tmp_path / "features"))
+    settings = AnnSettings(directory=str(tmp_path / "ann"), segment_size=64, lists=4, refresh_interval=0)
+    featurizer = Featurizer(feature_settings)
+    writer = ArticleIndex(settings)
+    reader = ArticleIndex(settings, readonly=True, featurizer=Featurizer(feature_settings, readonly=True))
+    try:
+        featurizer.add(list(range(1, 101)), texts(1, 100))
+        asyncio.run(writer.catch_up(featurizer))
+        asyncio.run(reader.refresh())
+        first = reader.similar(80, 3), reader.stats()
+        featurizer.add(list(range(101, 201)), texts(101, 100))
+        asyncio.run(writer.catch_up(featurizer))
+        asyncio.run(reader.refresh())
+        second = reader.similar(200, 3), reader.stats()
+        expected = writer.similar(200, 3)
+    finally:
+        writer.close()
+        featurizer.close()
+
+    tests_logger.info("Tag: Features - Test: Read-only ANN Unsaved Articles - Reader: %s, %s", first, second)
+    assert first[1] == {**first[1], "articles": 100, "segments": 1}, f"Reader missed the writer's active segment: {first[1]}"
+    assert second[1] == {**second[1], "articles": 200, "segments": 3}, f"Reader kept frozen rows in its active segment: {second[1]}"
+    assert second[0] == expected, f"Reader ranked a just-indexed article differently: {second[0]} != {expected}"
+
+
+
+
+"""
+Article Times
+"""
+
+
+# Articles stored before the window, indexed again after a restart and by a reader
+def test_ann_window_follows_stored_times(tmp_path):
+    feature_settings = FeatureSettings(directory=str(tmp_path / "features"))
+    settings = AnnSettings(directory=str(tmp_path / "ann"), window=3600, refresh_interval=0)
+    featurizer = Featurizer(feature_settings)
+    featurizer.add(list(range(1, 51)), texts(1, 50), [time.time() - 7200] * 50)
+    featurizer.add(list(range(51, 101)), texts(51, 50))
+    found = []
+    try:
+        for _ in range(2):
+            writer = ArticleIndex(settings)
+            try:
+                asyncio.run(writer.catch_up(featurizer))
+                found.append({id for id, _ in writer.search(writer.vector(60), 100)})
+            finally:
+                writer.close()
+        reader = ArticleIndex(settings, readonly=True, featurizer=Featurizer(feature_settings, readonly=True))
+        found.append({id for id, _ in reader.search(reader.vector(60), 100)})
+    finally:
+        featurizer.close()
+
+    tests_logger.info("Tag: Features - Test: ANN Window Stored Times - Found: %s", [len(ids) for ids in found])
+    assert all(ids == set(range(51, 101)) for ids in found), f"Articles stored before the window were indexed as new: {[sorted(ids)[:5] for ids in found]}"
+
+
+
+
+"""
+Concurrent Reads
+"""
+
+
+# Add from a worker thread while reading
+def test_add_in_thread_while_reading(tmp_path):
+    featurizer = Featurizer(FeatureSettings(directory=str(tmp_path / "features")))
+    batches, batch_size = 40, 25
+
+    def write():
+        for batch in range(batches):
+            start = 1 + batch * batch_size
+            featurizer.add(list(range(start, start + batch_size)), texts(start, batch_size))
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    reads = 0
+    try:
+        while writer.is_alive() or reads == 0:
+            snapshot = featurizer.snapshot()
+            matrix = snapshot.matrix(np.arange(snapshot.rows))
+            norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1))).ravel()
+            assert np.allclose(norms, 1.0, atol=1e-4), f"Vector of a half-added batch read: norms {norms[~np.isclose(norms, 1.0, atol=1e-4)]}"
+            ids, vectors = featurizer.vectors(list(range(1, batches * batch_size + 1)))
+            assert len(ids) == vectors.shape[0] and len(ids) % batch_size == 0, f"Half-added batch read: {len(ids)} vectors"
+            reads += 1
+    finally:
+        writer.join()
+        featurizer.close()
+
+    tests_logger.info("Tag: Features - Test: Add in Thread while Reading - Reads: %s", reads)
+    assert featurizer.store.rows == batches * batch_size, f"Unexpected articles after the concurrent adds: {featurizer.store.rows}"
+
+
+
+
+"""
+Read-only Workers
+"""
+
+
+# Recommendations served by a worker not running the ingestion
+def test_readonly_featurizer_serves_recommendations(tmp_path):
+    settings = FeatureSettings(directory=str(tmp_path / "features"))
+    writer = Featurizer(settings)
+    reader = Featurizer(settings, readonly=True)
+    repository = MemoryArticleRepository()
+    leader = Recommender(RecommendationSettings(refresh_interval=0), writer)
+    follower = Recommender(RecommendationSettings(refresh_interval=0), reader)
+
+    async def scenario():
+        writer.add(list(range(1, 101)), texts(1, 100))
+        await record_interaction(1, InteractionRequest(article_id=7), follower, repository)
+        writer.add(list(range(101, 201)), texts(101, 100))
+        stored = await repository.get_interests(1)
+        return await leader.recommend(stored, 5), await follower.recommend(stored, 5)
+
+    try:
+        expected, served = asyncio.run(scenario())
+        with pytest.raises(RuntimeError):
+            reader.add([201], texts(201, 1))
+    finally:
+        reader.close()
+        writer.close()
+
+    tests_logger.info("Tag: Features - Test: Read-only Featurizer Recommendations - Served: %s", served)
+    assert reader.store.rows == 200, f"Read-only featurizer missed the articles added since it was opened: {reader.store.rows}"
+    assert [id for id, _ in served] == [id for id, _ in expected], f"Read-only worker ranked differently: {served} != {expected}"
+    assert served[0][1] > 0 and 7 not in [id for id, _ in served], f"Interaction not reflected in the recommendations: {served}"
@@ -0,0 +1,99 @@
+"""
+Test file for the recommendation endpoints, run without a server against the in-memory backend and articles featurized in a temporary directory.
+Ensure interactions are validated and folded into the user's stored interest vector, and recommendations follow them and leave the articles already seen out.
+"""
+
+
+import asyncio
+import httpx
+from config.logging_config import setup_tests_logging
+import logging
+import pytest
+from app.features import Featurizer
+from config.features_config import FeatureSettings
+
+
+setup_tests_logging()
+tests_logger = logging.getLogger('tests_logger')
+
+
+TOPICS = ["football match goal league", "election vote parliament minister", "market stocks inflation bank"]
+
+
+def articles(count: int):
+    return [{"feed_url": "https://example.com/feed.xml", "guid": f"article-{id}", "title": f"Article {id}", "summary": TOPICS[id % 3]} for id in range(1, count + 1)]
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_BACKEND", "memory")
+    monkeypatch.setenv("INGESTION_ENABLED", "false")
+    monkeypatch.setenv("ANN_ENABLED", "false")
+    monkeypatch.setenv("FEATURES_DIRECTORY", str(tmp_path / "features"))
+    monkeypatch.setenv("RECOMMENDATIONS_REFRESH_INTERVAL", "0")
+    writer = Featurizer(FeatureSettings(directory=str(tmp_path / "features")))
+    writer.add([id for id in range(1, 31)], [f"{row['title']} {row['summary']}" for row in articles(30)])
+    writer.close()
+    from app.app import app
+    return app
+
+
+async def serve(app, scenario):
+    async with app.router.lifespan_context(app):
+        await app.state.article_repository.insert_articles(articles(30))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/users/create", json={"email_id": "reco.user@gmail.com", "username": "RecoUser_1", "password": "TestPswrd123!", "first_name": "Reco", "last_name": "User"})
+            assert response.status_code == 200, f"Unexpected status code creating the user: {response.status_code} {response.json()}"
+            id = (await client.get("/users/get_id/RecoUser_1")).json()["data"]
+            return await scenario(client, id)
+
+
+
+
+"""
+Recommendation Endpoints
+"""
+
+
+# Record User Interaction (/users/{id}/interactions)
+@pytest.mark.fastapi
+def test_record_interaction_endpoint(app):
+    async def scenario(client, id):
+        return (
+            await client.post(f"/users/{id}/interactions", json={"article_id": 3}),
+            await client.post(f"/users/{id}/interactions", json={"article_id": 999}),
+            await client.post(f"/users/{id + 1000}/interactions", json={"article_id": 3}),
+            await client.post(f"/users/{id}/interactions", json={"article_id": 3, "weight": 11}),
+            await app.state.article_repository.get_interests(id),
+            )
+
+    response1, response2, response3, response4, stored = asyncio.run(serve(app, scenario))
+
+    tests_logger.info("Tag: Recommendations - Endpoint: Record User Interaction - Responses: %s, %s, %s, %s", response1.status_code, response2.status_code, response3.status_code, response4.status_code)
+    assert response1.status_code == 200, f"Unexpected status code for Record User Interaction endpoint: {response1.status_code} {response1.json()}"
+    assert response2.status_code == 404 and response2.json()["detail"] == "Article ID '999' not found.", f"Unknown article not refused: {response2.status_code} {response2.json()}"
+    assert response3.status_code == 404, f"Unknown user not refused: {response3.status_code} {response3.json()}"
+    assert response4.status_code == 422, f"Out of range weight not refused: {response4.status_code} {response4.json()}"
+    assert stored is not None and stored["seen"] == [3] and len(stored["terms"]) > 0, f"Interaction not folded into the stored interest vector: {stored}"
+
+
+# Fetch User Recommendations (/users/{id}/recommendations)
+@pytest.mark.fastapi
+def test_fetch_recommendations_endpoint(app):
+    async def scenario(client, id):
+        cold = await client.get(f"/users/{id}/recommendations", params={"limit": 5})
+        await client.post(f"/users/{id}/interactions", json={"article_id": 3})
+        await client.post(f"/users/{id}/interactions", json={"article_id": 6, "weight": 5})
+        warm = await client.get(f"/users/{id}/recommendations", params={"limit": 5})
+        return cold, warm
+
+    cold, warm = asyncio.run(serve(app, scenario))
+    cold_ids = [row["article_id"] for row in cold.json()["data"]["recommendations"]]
+    warm_rows = warm.json()["data"]["recommendations"]
+    warm_ids = [row["article_id"] for row in warm_rows]
+
+    tests_logger.info("Tag: Recommendations - Endpoint: Fetch User Recommendations - Cold: %s - Warm: %s", cold_ids, warm_ids)
+    assert cold.status_code == 200 and warm.status_code == 200, f"Unexpected status codes for Fetch User Recommendations endpoint: {cold.status_code}, {warm.status_code}"
+    assert cold_ids == [30, 29, 28, 27, 26], f"A user without interactions did not get the latest articles: {cold_ids}"
+    assert len(warm_ids) == 5 and not {3, 6} & set(warm_ids), f"Articles already seen were recommended: {warm_ids}"
+    assert all(id % 3 == 0 and row["score"] > 0 for id, row in zip(warm_ids, warm_rows)), f"Recommendations do not follow the user's interactions (cached list served?): {warm_rows}"